@@ -20,6 +20,7 @@ import json
 import pickle
 import gc
 import subprocess
+import time
 import numpy as np
 
 # Add src to path
@@ -28,6 +29,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.embeddings.embedding_generator import SanTOKEmbeddingGenerator
 from src.embeddings.semantic_trainer import SanTOKSemanticTrainer
 from src.embeddings.vector_store import ChromaVectorStore, FAISSVectorStore
+from src.embeddings.bulk_ingest import BulkIngestPipeline
 from src.core.core_tokenizer import TextTokenizer, all_tokenizations
 
 
@@ -839,9 +841,34 @@ def test_full_workflow(text, output_dir="workflow_output", resume=False, max_bat
     # Start loading batches
     print(f"\n[INFO] Starting to load batches into vector store...")
     print(f"   Processing {len(batches_to_load)} batches in chunks of {batch_size:,} tokens")
+    ingest_started = time.perf_counter()
+    
+    if use_chroma:
+        # ChromaDB: pipelined load (disk read -> upsert) with bounded queues and
+        # a checkpoint, so an interrupted run resumes at the last stored chunk
+        def _embedding_batches():
+            for batch_idx, batch_file in enumerate(batches_to_load):
+                batch_embeddings = np.load(batch_file)
+                batch_start = batch_idx * metadata.get("batch_size", 50000)
+                yield all_tokens[batch_start:batch_start + len(batch_embeddings)], batch_embeddings
+        
+        loader = BulkIngestPipeline(
+            vector_store,
+            batch_size=batch_size,
+            checkpoint_path=os.path.join(output_dir, "chroma_ingest_checkpoint.json")
+        )
+        try:
+            ingest_stats = loader.ingest_batches(_embedding_batches(), resume=resume)
+            if ingest_stats["skipped_batches"]:
+                print(f"  [INFO] Resumed after {ingest_stats['skipped_batches']:,} already-stored chunks")
+            total_tokens_added = ingest_stats["total_rows"]
+        except Exception as e:
+            print(f"  [WARNING]  Bulk ingest stopped: {e}")
+            total_tokens_added = loader.load_checkpoint().get("rows_done", 0)
     
     # HARD LIMIT: Never exceed max_safe_tokens (only for FAISS)
-    for batch_idx, batch_file in enumerate(batches_to_load):
+    # (ChromaDB batches were already loaded by the bulk pipeline above)
+    for batch_idx, batch_file in enumerate([] if use_chroma else batches_to_load):
         if not use_chroma:
             # Check memory before loading each batch (FAISS only)
             if total_tokens_added >= max_safe_tokens:
@@ -987,7 +1014,10 @@ def test_full_workflow(text, output_dir="workflow_output", resume=False, max_bat
         print("[ERROR] No embeddings were added to vector store!")
         return
     
+    ingest_seconds = time.perf_counter() - ingest_started
     print("[OK] Vector store created!")
+    print(f"   Ingested {total_tokens_added:,} rows in {ingest_seconds:.1f}s "
+          f"({total_tokens_added / max(ingest_seconds, 1e-9):,.0f} rows/sec)")
     
     # Test similarity search
     print("\nTesting similarity search...")
@@ -15,20 +15,23 @@ One clean entry point for everything:
 import sys
 import os
 import json
-import numpy as np
+import importlib
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import argparse
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 sys.path.insert(0, os.path.dirname(__file__))
 
+from src.utils.lazy_import import lazy_import
+
+# NumPy and the embedding stack load on first use, so `santok tokenize`
+# only pays for the tokenizer
+np = lazy_import("numpy")
+
 # Import with proper error handling
 TextTokenizer = None
-SanTOKSemanticTrainer = None
-SanTOKEmbeddingGenerator = None
-EnhancedSanTOKSemanticTrainer = None
 
 try:
     from src.core.core_tokenizer import TextTokenizer
@@ -36,21 +39,27 @@ except ImportError as e:
     print(f"Error: Could not import TextTokenizer: {e}")
     sys.exit(1)
 
-try:
-    from src.embeddings.semantic_trainer import SanTOKSemanticTrainer
-except ImportError as e:
-    print(f"Warning: Could not import SanTOKSemanticTrainer: {e}")
+# Optional classes: name -> (module, warn if missing)
+_OPTIONAL_IMPORTS = {
+    "SanTOKSemanticTrainer": ("src.embeddings.semantic_trainer", True),
+    "SanTOKEmbeddingGenerator": ("src.embeddings.embedding_generator", True),
+    # Enhanced trainer is optional
+    "EnhancedSanTOKSemanticTrainer": ("enhanced_semantic_trainer.enhanced_trainer", False),
+}
+_optional_cache: Dict[str, Any] = {}
 
-try:
-    from src.embeddings.embedding_generator import SanTOKEmbeddingGenerator
-except ImportError as e:
-    print(f"Warning: Could not import SanTOKEmbeddingGenerator: {e}")
 
-try:
-    from enhanced_semantic_trainer.enhanced_trainer import EnhancedSanTOKSemanticTrainer
-except ImportError:
-    # Enhanced trainer is optional
-    pass
+def _optional(name: str) -> Optional[Any]:
+    """Import an optional class on first use; None if it is not available."""
+    if name not in _optional_cache:
+        module_name, warn = _OPTIONAL_IMPORTS[name]
+        try:
+            _optional_cache[name] = getattr(importlib.import_module(module_name), name)
+        except ImportError as e:
+            if warn:
+                print(f"Warning: Could not import {name}: {e}")
+            _optional_cache[name] = None
+    return _optional_cache[name]
 
 
 class SanTOKCLI:
@@ -315,6 +324,7 @@ class SanTOKCLI:
         print("Step 2: Training...")
         try:
             if enhanced:
+                EnhancedSanTOKSemanticTrainer = _optional("EnhancedSanTOKSemanticTrainer")
                 if EnhancedSanTOKSemanticTrainer is None:
                     print("Error: Enhanced trainer not available. Install enhanced_semantic_trainer module.")
                     return
@@ -329,6 +339,7 @@ class SanTOKCLI:
                 )
                 trainer.train(streams)
             else:
+                SanTOKSemanticTrainer = _optional("SanTOKSemanticTrainer")
                 if SanTOKSemanticTrainer is None:
                     print("Error: Semantic trainer not available.")
                     return
@@ -432,6 +443,7 @@ class SanTOKCLI:
         print("Generating embeddings...")
         try:
             if strategy == "semantic" and os.path.exists(model_path):
+                SanTOKSemanticTrainer = _optional("SanTOKSemanticTrainer")
                 if SanTOKSemanticTrainer is None:
                     print("Error: Semantic trainer not available.")
                     return
@@ -456,6 +468,7 @@ class SanTOKCLI:
                 
                 print(f"Generated {len(embeddings)} embeddings")
             else:
+                SanTOKEmbeddingGenerator = _optional("SanTOKEmbeddingGenerator")
                 if SanTOKEmbeddingGenerator is None:
                     print("Error: Embedding generator not available.")
                     return
@@ -526,6 +539,7 @@ class SanTOKCLI:
         # Embedding test
         print("Test 2: Embedding Generation")
         try:
+            SanTOKEmbeddingGenerator = _optional("SanTOKEmbeddingGenerator")
             if SanTOKEmbeddingGenerator is None:
                 print("  ✗ Failed: SanTOKEmbeddingGenerator not available")
             elif streams is None or "word" not in streams:
@@ -59,6 +59,8 @@ from .graph import (
     GraphNode,
     GraphEdge,
     GraphStore,
+    CompactGraph,
+    ReachabilityIndex,
     RelationType,
     RelationExtractor,
     ExtractedRelation,
@@ -152,9 +154,12 @@ from .algorithms import (
     SanTOKGraphWalker,
     WalkResult,
     WalkMode,
+    WalkEngine,
+    PageRankResult,
     # Semantic Similarity
     SanTOKSimilarity,
     SimilarityResult,
+    SimilarityIndex,
     # Query Parsing
     SanTOKQueryParser,
     ParsedQuery,
@@ -179,6 +184,8 @@ __all__ = [
     "GraphNode",
     "GraphEdge",
     "GraphStore",
+    "CompactGraph",
+    "ReachabilityIndex",
     "RelationType",
     "RelationExtractor",
     "ExtractedRelation",
@@ -236,8 +243,11 @@ __all__ = [
     "SanTOKGraphWalker",
     "WalkResult",
     "WalkMode",
+    "WalkEngine",
+    "PageRankResult",
     "SanTOKSimilarity",
     "SimilarityResult",
+    "SimilarityIndex",
     "SanTOKQueryParser",
     "ParsedQuery",
     
@@ -11,7 +11,9 @@ Algorithms:
 - SanTOKPatternMatcher: Relation extraction without ML
 - SanTOK9Scorer: 9-centric confidence propagation
 - SanTOKGraphWalker: Custom graph traversal with decay
+- WalkEngine: Batched random walks + personalized PageRank over CSR
 - SanTOKSimilarity: Semantic similarity without neural embeddings
+- SimilarityIndex: Vectorized SanTOKSimilarity over many candidates
 - SanTOKQueryParser: Natural language to structured query
 """
 
@@ -19,7 +21,9 @@ from .santok_ranker import SanTOKRanker, RankingResult
 from .pattern_matcher import SanTOKPatternMatcher, PatternMatch
 from .nine_scorer import SanTOK9Scorer
 from .graph_walker import SanTOKGraphWalker, WalkResult, WalkMode, WalkStep
+from .walk_engine import WalkEngine, PageRankResult
 from .semantic_similarity import SanTOKSimilarity, SimilarityResult
+from .similarity_index import SimilarityIndex
 from .query_parser import SanTOKQueryParser, ParsedQuery, QueryType
 
 __all__ = [
@@ -39,10 +43,13 @@ __all__ = [
     "WalkResult",
     "WalkMode",
     "WalkStep",
+    "WalkEngine",
+    "PageRankResult",
     
     # Semantic Similarity
     "SanTOKSimilarity",
     "SimilarityResult",
+    "SimilarityIndex",
     
     # Query Parsing
     "SanTOKQueryParser",
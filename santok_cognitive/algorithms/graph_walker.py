@@ -16,6 +16,7 @@ The SanTOK Walk Algorithm:
 
 Features:
 - Weighted random walks
+- Batched walks and personalized PageRank (WalkEngine, CSR + alias tables)
 - Deterministic shortest path
 - Multi-hop reasoning paths
 - Explanation generation
@@ -28,7 +29,8 @@ import random
 import math
 
 from ..graph import GraphStore, GraphNode, RelationType
-from ..graph.graph_edge import GraphEdge
+from ..graph.path_search import bfs_path
+from .walk_engine import WalkEngine, PageRankResult
 
 
 class WalkMode(Enum):
@@ -94,6 +96,10 @@ class SanTOKGraphWalker:
         
         # Random walk with energy budget
         result = walker.random_walk(source=1, energy=10.0, steps=20)
+        
+        # Thousands of walks at once / relevance to seed nodes
+        walks = walker.random_walks([1, 2, 3], steps=20, walks_per_source=1000)
+        ppr = walker.personalized_pagerank([1])
     """
     
     # Default relation weights (how much energy each relation consumes)
@@ -146,6 +152,57 @@ class SanTOKGraphWalker:
         self.graph = graph
         self.initial_energy = initial_energy
         self.decay_rate = decay_rate
+        self._engine: Optional[WalkEngine] = None
+    
+    @property
+    def engine(self) -> WalkEngine:
+        """Batched walk engine over the graph (transitions ∝ RELATION_SCORES)."""
+        if self._engine is None:
+            self._engine = WalkEngine(
+                self.graph, relation_weights=self.RELATION_SCORES,
+                use_edge_weights=False, default_weight=0.5
+            )
+        return self._engine
+    
+    def random_walks(
+        self,
+        sources: List[int],
+        steps: int = 10,
+        walks_per_source: int = 1
+    ) -> List[List[int]]:
+        """
+        Many weighted random walks at once (no energy budget).
+        
+        Same transition weights as random_walk, but sampled from alias
+        tables over CSR arrays, with all walks advanced together.
+        
+        Args:
+            sources: Starting node IDs
+            steps: Maximum steps per walk
+            walks_per_source: Walks started from each source
+            
+        Returns:
+            Node ID sequences, one per walk
+        """
+        return self.engine.random_walks(sources, steps, walks_per_source)
+    
+    def personalized_pagerank(
+        self,
+        seeds: List[int],
+        damping: float = 0.85,
+        time_budget: Optional[float] = None
+    ) -> PageRankResult:
+        """
+        Relevance of every node to the seed nodes (random walk with restart).
+        
+        Args:
+            seeds: Node IDs the walk restarts from
+            damping: Probability of following an edge instead of restarting
+            time_budget: Stop iterating after this many seconds
+        """
+        return self.engine.personalized_pagerank(
+            seeds, damping=damping, time_budget=time_budget
+        )
     
     def walk(
         self,
@@ -216,15 +273,15 @@ class SanTOKGraphWalker:
         ))
         
         for _ in range(steps):
-            # Get outgoing edges
-            edges = self.graph.get_outgoing_edges(current)
+            # Get outgoing edges as (target, edge_id, relation, weight)
+            edges = self.graph.adjacent(current, "outgoing")
             
             # Filter to unvisited (optional - allow revisits for random walk)
             if not edges:
                 break
             
             # Choose random edge weighted by score
-            weights = [self.RELATION_SCORES.get(e.relation_type, 0.5) for e in edges]
+            weights = [self.RELATION_SCORES.get(e[2], 0.5) for e in edges]
             total_weight = sum(weights)
             
             if total_weight == 0:
@@ -241,8 +298,10 @@ class SanTOKGraphWalker:
                     chosen_edge = edge
                     break
             
+            target_id, _, relation, edge_weight = chosen_edge
+            
             # Compute cost
-            cost = self.RELATION_COSTS.get(chosen_edge.relation_type, 0.5) + self.decay_rate
+            cost = self.RELATION_COSTS.get(relation, 0.5) + self.decay_rate
             
             # Check energy
             if energy < cost:
@@ -251,17 +310,17 @@ class SanTOKGraphWalker:
             energy -= cost
             
             # Move to next node
-            current = chosen_edge.target_id
+            current = target_id
             visited.add(current)
             
             node = self.graph.get_node(current)
-            score = self.RELATION_SCORES.get(chosen_edge.relation_type, 0.5) * chosen_edge.weight
+            score = self.RELATION_SCORES.get(relation, 0.5) * edge_weight
             total_score += score
             
             path.append(WalkStep(
                 node_id=current,
                 node_text=node.text if node else f"Node({current})",
-                relation=chosen_edge.relation_type,
+                relation=relation,
                 energy=energy,
                 accumulated_score=total_score
             ))
@@ -277,29 +336,12 @@ class SanTOKGraphWalker:
     
     def _shortest_path(self, source: int, target: int, max_hops: int) -> WalkResult:
         """Find shortest path using BFS."""
-        from collections import deque
-        
-        # BFS
-        queue = deque([(source, [source], [])])  # (node, path, edges)
-        visited = {source}
-        
-        while queue:
-            current, node_path, edge_path = queue.popleft()
-            
-            if current == target:
-                return self._build_result(node_path, edge_path, True, "target")
-            
-            if len(node_path) >= max_hops:
-                continue
-            
-            for edge in self.graph.get_outgoing_edges(current):
-                if edge.target_id not in visited:
-                    visited.add(edge.target_id)
-                    queue.append((
-                        edge.target_id,
-                        node_path + [edge.target_id],
-                        edge_path + [edge]
-                    ))
+        found = bfs_path(
+            lambda node_id: self.graph.adjacent(node_id, "outgoing"),
+            source, target, max_depth=max_hops - 1
+        )
+        if found is not None:
+            return self._build_result(found.nodes, found.edge_ids, True, "target")
         
         return WalkResult(
             path=[], total_score=0, total_energy_used=0,
@@ -327,16 +369,16 @@ class SanTOKGraphWalker:
             if len(node_path) >= max_hops:
                 continue
             
-            for edge in self.graph.get_outgoing_edges(current):
-                if edge.target_id not in visited:
-                    edge_score = self.RELATION_SCORES.get(edge.relation_type, 0.5) * edge.weight
+            for target_id, edge_id, relation, weight in self.graph.adjacent(current, "outgoing"):
+                if target_id not in visited:
+                    edge_score = self.RELATION_SCORES.get(relation, 0.5) * weight
                     new_score = -neg_score + edge_score
                     
                     heapq.heappush(heap, (
                         -new_score,
-                        edge.target_id,
-                        node_path + [edge.target_id],
-                        edge_path + [edge]
+                        target_id,
+                        node_path + [target_id],
+                        edge_path + [edge_id]
                     ))
         
         return WalkResult(
@@ -348,26 +390,26 @@ class SanTOKGraphWalker:
         """Random walk trying to reach target."""
         current = source
         node_path = [source]
-        edge_path: List[GraphEdge] = []
+        edge_path: List[int] = []
         
         for _ in range(max_hops * 3):  # Allow more attempts
             if current == target:
                 return self._build_result(node_path, edge_path, True, "target")
             
-            edges = self.graph.get_edges_from(current)
+            edges = self.graph.adjacent(current, "outgoing")
             if not edges:
                 break
             
             # Bias toward target if visible
-            target_edges = [e for e in edges if e.target_id == target]
+            target_edges = [e for e in edges if e[0] == target]
             if target_edges:
                 chosen = target_edges[0]
             else:
                 chosen = random.choice(edges)
             
-            current = chosen.target_id
+            current = chosen[0]
             node_path.append(current)
-            edge_path.append(chosen)
+            edge_path.append(chosen[1])
             
             if len(node_path) > max_hops:
                 break
@@ -381,11 +423,12 @@ class SanTOKGraphWalker:
     def _build_result(
         self,
         node_path: List[int],
-        edge_path: List[GraphEdge],
+        edge_path: List[int],
         reached: bool,
         reason: str
     ) -> WalkResult:
-        """Build WalkResult from path."""
+        """Build WalkResult from node ids and the edge ids between them."""
+        edge_path = [self.graph.get_edge(eid) for eid in edge_path]
         steps: List[WalkStep] = []
         energy = self.initial_energy
         total_score = 0.0
@@ -429,7 +472,7 @@ class SanTOKGraphWalker:
         """Find all paths between source and target (up to limit)."""
         all_paths: List[WalkResult] = []
         
-        def dfs(current: int, path: List[int], edges: List[GraphEdge], visited: Set[int]):
+        def dfs(current: int, path: List[int], edges: List[int], visited: Set[int]):
             if len(all_paths) >= max_paths:
                 return
             
@@ -441,16 +484,16 @@ class SanTOKGraphWalker:
             if len(path) >= max_hops:
                 return
             
-            for edge in self.graph.get_outgoing_edges(current):
-                if edge.target_id not in visited:
-                    visited.add(edge.target_id)
+            for target_id, edge_id, _, _ in self.graph.adjacent(current, "outgoing"):
+                if target_id not in visited:
+                    visited.add(target_id)
                     dfs(
-                        edge.target_id,
-                        path + [edge.target_id],
-                        edges + [edge],
+                        target_id,
+                        path + [target_id],
+                        edges + [edge_id],
                         visited
                     )
-                    visited.remove(edge.target_id)
+                    visited.remove(target_id)
         
         dfs(source, [source], [], {source})
         
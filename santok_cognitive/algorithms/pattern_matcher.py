@@ -19,6 +19,7 @@ from enum import Enum
 import re
 
 from ..graph import RelationType
+from ..graph.pattern_set import CompiledPatternSet
 
 
 @dataclass
@@ -139,13 +140,12 @@ class SanTOKPatternMatcher:
     
     def __init__(self):
         """Initialize SanTOK Pattern Matcher."""
-        # Compile patterns for efficiency
-        self._compiled_patterns: List[Tuple[re.Pattern, RelationType, int, int, str]] = []
+        # Built-in and custom patterns share one trigger-word prefilter;
+        # payload = (relation, subject_group, object_group, pattern_id)
+        self._patterns = CompiledPatternSet(re.IGNORECASE)
         
         for i, (pattern, relation, subj_group, obj_group) in enumerate(self.LEXICAL_PATTERNS):
-            compiled = re.compile(pattern, re.IGNORECASE)
-            pattern_id = f"lexical_{i}"
-            self._compiled_patterns.append((compiled, relation, subj_group, obj_group, pattern_id))
+            self._patterns.add(pattern, (relation, subj_group, obj_group, f"lexical_{i}"))
         
         # Custom patterns added by user
         self._custom_patterns: List[Tuple[re.Pattern, RelationType, int, int, str]] = []
@@ -165,47 +165,39 @@ class SanTOKPatternMatcher:
         """
         matches = []
         
-        # Apply all compiled patterns
-        for compiled, relation, subj_group, obj_group, pattern_id in self._compiled_patterns:
-            for match in compiled.finditer(text):
-                subject = self._clean_entity(match.group(subj_group))
-                obj = self._clean_entity(match.group(obj_group))
-                
-                if subject and obj and subject != obj:
-                    confidence = self._compute_confidence(subject, obj, text)
-                    
-                    matches.append(PatternMatch(
-                        subject=subject,
-                        relation=relation,
-                        obj=obj,
-                        confidence=confidence,
-                        pattern_id=pattern_id,
-                        span=(match.start(), match.end()),
-                    ))
-        
-        # Apply custom patterns
-        for compiled, relation, subj_group, obj_group, pattern_id in self._custom_patterns:
-            for match in compiled.finditer(text):
-                subject = self._clean_entity(match.group(subj_group))
-                obj = self._clean_entity(match.group(obj_group))
+        # Apply the patterns whose trigger words occur in the text
+        # (built-in first, then custom, in the order they were added)
+        for index, match in self._patterns.finditer(text):
+            relation, subj_group, obj_group, pattern_id = self._patterns.payload(index)
+            subject = self._clean_entity(match.group(subj_group))
+            obj = self._clean_entity(match.group(obj_group))
+            
+            if subject and obj and subject != obj:
+                confidence = self._compute_confidence(subject, obj, text)
                 
-                if subject and obj and subject != obj:
-                    confidence = self._compute_confidence(subject, obj, text)
-                    
-                    matches.append(PatternMatch(
-                        subject=subject,
-                        relation=relation,
-                        obj=obj,
-                        confidence=confidence,
-                        pattern_id=pattern_id,
-                        span=(match.start(), match.end()),
-                    ))
+                matches.append(PatternMatch(
+                    subject=subject,
+                    relation=relation,
+                    obj=obj,
+                    confidence=confidence,
+                    pattern_id=pattern_id,
+                    span=(match.start(), match.end()),
+                ))
         
         # Deduplicate
         matches = self._deduplicate(matches)
         
         return matches
     
+    def extract_batch(self, texts: List[str]) -> List[List[PatternMatch]]:
+        """
+        Extract relations from many texts (e.g. sentences).
+        
+        Returns:
+            One list of PatternMatch per text, in input order
+        """
+        return [self.extract(text) for text in texts]
+    
     def _clean_entity(self, entity: str) -> str:
         """Clean extracted entity."""
         if not entity:
@@ -289,9 +281,11 @@ class SanTOKPatternMatcher:
             Pattern ID
         """
         pattern_id = f"custom_{len(self._custom_patterns)}"
-        compiled = re.compile(pattern, re.IGNORECASE)
+        index = self._patterns.add(pattern, (relation, subject_group, object_group, pattern_id))
         
-        self._custom_patterns.append((compiled, relation, subject_group, object_group, pattern_id))
+        self._custom_patterns.append(
+            (self._patterns.regex(index), relation, subject_group, object_group, pattern_id)
+        )
         
         return pattern_id
     
@@ -319,6 +313,8 @@ class SanTOKPatternMatcher:
         return {
             "lexical_patterns": len(self.LEXICAL_PATTERNS),
             "custom_patterns": len(self._custom_patterns),
+            "trigger_words": self._patterns.stats()["triggers"],
+            "always_run_patterns": self._patterns.stats()["always_run"],
             "learned_cooccurrences": len(self._cooccurrence),
         }
     
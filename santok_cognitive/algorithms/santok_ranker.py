@@ -28,6 +28,7 @@ import math
 from ..graph import GraphStore, GraphNode, RelationType
 from ..trees import TreeStore, TreeNode
 from ..memory import MemoryObject
+from .walk_engine import WalkEngine
 
 
 @dataclass
@@ -105,7 +106,9 @@ class SanTOKRanker:
         self,
         graph: Optional[GraphStore] = None,
         trees: Optional[TreeStore] = None,
-        weights: Optional[Dict[str, float]] = None
+        weights: Optional[Dict[str, float]] = None,
+        centrality: str = "degree",
+        centrality_budget: float = 0.05
     ):
         """
         Initialize SanTOK Ranker.
@@ -114,13 +117,23 @@ class SanTOKRanker:
             graph: GraphStore for connectivity scoring
             trees: TreeStore for hierarchy scoring
             weights: Custom weights (alpha, beta, gamma, delta)
+            centrality: "degree" or "pagerank" (relation-weighted PageRank)
+            centrality_budget: Seconds of PageRank iteration allowed per
+                graph version; the estimate reached by then is used
         """
+        if centrality not in ("degree", "pagerank"):
+            raise ValueError(f"centrality must be 'degree' or 'pagerank', got {centrality!r}")
+        
         self.graph = graph
         self.trees = trees
         self.weights = weights or self.DEFAULT_WEIGHTS.copy()
+        self.centrality = centrality
+        self.centrality_budget = centrality_budget
         
         # Cache for graph centrality
         self._centrality_cache: Dict[int, float] = {}
+        self._engine: Optional[WalkEngine] = None
+        self._engine_version = -1
     
     def rank(
         self,
@@ -269,16 +282,27 @@ class SanTOKRanker:
     
     def _get_centrality(self, node_id: int) -> float:
         """
-        Compute centrality (degree-based).
+        Compute centrality.
         
-        Uses simple degree centrality:
+        "degree" (default):
             centrality = degree / (total_nodes - 1)
+        
+        "pagerank":
+            centrality = pagerank(node) / max(pagerank)
+            computed once per graph version for all nodes, within
+            centrality_budget seconds
         """
+        if not self.graph:
+            return 0.5
+        
+        if self.centrality == "pagerank":
+            self._refresh_pagerank()
+        
         if node_id in self._centrality_cache:
             return self._centrality_cache[node_id]
         
-        if not self.graph:
-            return 0.5
+        if self.centrality == "pagerank":
+            return 0.0
         
         total_nodes = self.graph.node_count
         if total_nodes <= 1:
@@ -294,6 +318,21 @@ class SanTOKRanker:
         
         return centrality
     
+    def _refresh_pagerank(self) -> None:
+        """Recompute PageRank centrality for all nodes if the graph changed."""
+        if self._engine is None:
+            self._engine = WalkEngine(self.graph, relation_weights=self.RELATION_WEIGHTS)
+        version = self._engine.current_version()
+        if version == self._engine_version:
+            return
+        
+        result = self._engine.pagerank(time_budget=self.centrality_budget)
+        top = max(result.scores.values(), default=0.0)
+        self._centrality_cache = {
+            node_id: score / top for node_id, score in result.scores.items()
+        } if top > 0 else {}
+        self._engine_version = version
+    
     def _compute_hierarchy(self, candidate: MemoryObject) -> float:
         """
         Compute hierarchy score from tree position.
@@ -389,6 +428,7 @@ class SanTOKRanker:
     def clear_cache(self) -> None:
         """Clear centrality cache."""
         self._centrality_cache.clear()
+        self._engine_version = -1
     
     def __repr__(self) -> str:
         return (
@@ -11,6 +11,10 @@ Computes semantic similarity using:
 4. Graph-based relatedness (if graph available)
 5. 9-centric harmonic combination
 
+batch_compute() scores many candidates at once through a SimilarityIndex
+(sparse token / n-gram postings, see similarity_index.py) when NumPy is
+available; node relatedness is memoized until the graph changes.
+
 The SanTOK Similarity Formula:
     sim(a, b) = α·Lexical + β·Ngram + γ·Position + δ·Graph
     
@@ -22,7 +26,15 @@ from dataclasses import dataclass
 from collections import Counter
 import math
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 from ..graph import GraphStore, RelationType
+from .similarity_index import SimilarityIndex
 
 
 @dataclass
@@ -94,6 +106,9 @@ class SanTOKSimilarity:
         "very", "really", "just", "only", "also", "too",
     }
     
+    # Candidate lists at least this long go through a SimilarityIndex
+    MIN_INDEX_CANDIDATES = 16
+    
     def __init__(
         self,
         graph: Optional[GraphStore] = None,
@@ -111,6 +126,11 @@ class SanTOKSimilarity:
         self.graph = graph
         self.weights = weights or self.DEFAULT_WEIGHTS.copy()
         self.ngram_size = ngram_size
+        
+        self._index: Optional[SimilarityIndex] = None
+        self._watched_graph: Optional[GraphStore] = None
+        self._graph_version = 0
+        self._relatedness: Dict[Tuple[int, int], float] = {}
     
     def compute(self, text_a: str, text_b: str) -> SimilarityResult:
         """
@@ -164,13 +184,32 @@ class SanTOKSimilarity:
     def batch_compute(
         self,
         query: str,
-        candidates: List[str]
+        candidates: List[str],
+        top_k: Optional[int] = None
     ) -> List[Tuple[int, SimilarityResult]]:
         """
         Compute similarity of query against multiple candidates.
         
+        The candidates are indexed once (and the index reused while the
+        same list is passed again), so each query only touches the
+        postings of its own tokens and n-grams.
+        
+        Args:
+            query: Query text
+            candidates: Candidate texts
+            top_k: Only return the top_k best results
+        
         Returns list of (index, result) sorted by score descending.
         """
+        if NUMPY_AVAILABLE and len(candidates) >= self.MIN_INDEX_CANDIDATES:
+            index = self.build_index(candidates, reuse=True)
+            if top_k is None:
+                components = index.scores(query)
+                order = np.argsort(-components["score"], kind="stable").tolist()
+                return list(zip(order, index.results(query, order, components)))
+            best = [i for i, _ in index.top_k(query, top_k)]
+            return list(zip(best, index.results(query, best)))
+        
         results = []
         
         for i, candidate in enumerate(candidates):
@@ -178,7 +217,25 @@ class SanTOKSimilarity:
             results.append((i, result))
         
         results.sort(key=lambda x: x[1].score, reverse=True)
-        return results
+        return results if top_k is None else results[:top_k]
+    
+    def build_index(self, candidates: List[str], reuse: bool = False) -> SimilarityIndex:
+        """
+        Preprocess candidates for repeated batch scoring.
+        
+        Args:
+            candidates: Candidate texts
+            reuse: Return the last index if it was built from equal candidates
+        """
+        index = self._index
+        if (
+            reuse and index is not None
+            and index.ngram_size == self.ngram_size
+            and index.candidates == list(candidates)
+        ):
+            return index
+        self._index = SimilarityIndex(self, candidates)
+        return self._index
     
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize and clean text."""
@@ -362,7 +419,7 @@ class SanTOKSimilarity:
         
         for node_a in nodes_a[:3]:  # Limit for efficiency
             for node_b in nodes_b[:3]:
-                relatedness = self._node_relatedness(node_a, node_b)
+                relatedness = self._cached_relatedness(node_a, node_b)
                 total_relatedness += relatedness
                 pairs += 1
         
@@ -384,6 +441,33 @@ class SanTOKSimilarity:
         
         return nodes
     
+    def _graph_state(self) -> Tuple[int, int]:
+        """(graph identity, change counter); clears memos on any change."""
+        graph = self.graph
+        if graph is not self._watched_graph:
+            if self._watched_graph is not None:
+                self._watched_graph.remove_listener(self._on_graph_event)
+            if graph is not None:
+                graph.add_listener(self._on_graph_event)
+            self._watched_graph = graph
+            self._on_graph_event("graph", None)
+        return id(graph), self._graph_version
+    
+    def _on_graph_event(self, event: str, item) -> None:
+        self._graph_version += 1
+        self._relatedness = {}
+    
+    def _cached_relatedness(self, node_a: int, node_b: int) -> float:
+        """_node_relatedness, memoized until the graph changes."""
+        self._graph_state()
+        key = (node_a, node_b)
+        value = self._relatedness.get(key)
+        if value is None:
+            if len(self._relatedness) >= 1_000_000:
+                self._relatedness = {}
+            value = self._relatedness[key] = self._node_relatedness(node_a, node_b)
+        return value
+    
     def _node_relatedness(self, node_a: int, node_b: int) -> float:
         """
         Compute relatedness between two nodes.
@@ -0,0 +1,478 @@
+"""
+SanTOK Similarity Index - Vectorized SanTOKSimilarity over Many Candidates
+=========================================================================
+
+Scores one query against a fixed candidate list with array operations,
+giving the same components as SanTOKSimilarity.compute():
+
+    Lexical   Jaccard / Dice over token sets
+    N-gram    Dice over character n-gram multisets
+    Position  position-weighted token matches
+    Graph     mean node relatedness (memoized per node pair)
+
+Candidates are preprocessed once into sparse count matrices stored
+column-wise (inverted lists): token -> (rows, counts) and
+n-gram -> (rows, counts). A query then only touches the postings of its
+own tokens and n-grams, and per-candidate sums are single np.bincount
+calls.
+
+N-grams are keyed by packing their code points into one uint64 (21 bits
+per character, exact for n <= 3) and longer n-grams by a 64-bit
+polynomial hash, so n-gram extraction for the whole corpus is a few
+array operations instead of one string slice per n-gram.
+
+Requires NumPy; SanTOKSimilarity.batch_compute falls back to pairwise
+compute() without it.
+"""
+
+import hashlib
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+_CHAR_BITS = 21                       # enough for any Unicode code point
+_SHORT_FLAG = 1 << 63                 # marks texts shorter than ngram_size
+_HASH_MULT = 0x100000001B3            # FNV-style multiplier for n > 3
+
+
+class _Postings:
+    """Column-wise sparse counts: feature id -> (rows, counts)."""
+
+    def __init__(self, rows: "np.ndarray", cols: "np.ndarray", counts: "np.ndarray", n_cols: int):
+        order = np.argsort(cols, kind="stable")
+        self.rows = rows[order].astype(np.int64)
+        self.counts = counts[order].astype(np.float64)
+        self.indptr = np.zeros(n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=n_cols), out=self.indptr[1:])
+
+    def gather(self, cols: Sequence[int], weights: Sequence[float]):
+        """(rows, counts, query weight) over the postings of cols."""
+        if not len(cols):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty.astype(np.float64), empty.astype(np.float64)
+        starts = self.indptr[cols]
+        lengths = self.indptr[np.asarray(cols) + 1] - starts
+        index = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return self.rows[index], self.counts[index], np.repeat(np.asarray(weights, dtype=np.float64), lengths)
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.counts.nbytes + self.indptr.nbytes
+
+
+class SimilarityIndex:
+    """
+    Preprocessed candidate set for SanTOKSimilarity.
+
+    Example:
+        sim = SanTOKSimilarity()
+        index = sim.build_index(documents)
+
+        scores = index.scores("machine learning")["score"]    # np.ndarray
+        best = index.top_k("machine learning", k=10)           # [(i, score)]
+        results = index.results("machine learning", best_ids)  # SimilarityResult
+    """
+
+    def __init__(self, similarity: Any, candidates: Sequence[str]):
+        """
+        Args:
+            similarity: The SanTOKSimilarity whose tokenizer, n-gram size,
+                weights and graph are used
+            candidates: Candidate texts
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("SimilarityIndex requires numpy")
+        self.similarity = similarity
+        self.candidates = list(candidates)
+        self.ngram_size = similarity.ngram_size
+        self.size = len(self.candidates)
+
+        self._build_tokens()
+        self._build_ngrams()
+        self._graph_version = None
+        self._cand_nodes = None
+        self._similar_cache: Dict[str, "np.ndarray"] = {}
+
+    # ═══════════════════════════════════════════════════════════════════
+    # BUILD
+    # ═══════════════════════════════════════════════════════════════════
+
+    def _build_tokens(self) -> None:
+        tokenize = self.similarity._tokenize
+        vocab: Dict[str, int] = {}
+        seq_ids: List[int] = []
+        lengths = np.zeros(self.size, dtype=np.int64)
+        for row, text in enumerate(self.candidates):
+            tokens = tokenize(text)
+            lengths[row] = len(tokens)
+            for token in tokens:
+                token_id = vocab.get(token)
+                if token_id is None:
+                    token_id = vocab[token] = len(vocab)
+                seq_ids.append(token_id)
+
+        self.vocab = vocab
+        self.tokens: List[str] = list(vocab)
+        self.seq_lengths = lengths
+        self.seq_indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.seq_indptr[1:])
+        self.seq_ids = np.asarray(seq_ids, dtype=np.int64)
+
+        # Token counts per row: sparse (row, token) -> tf
+        rows = np.repeat(np.arange(self.size, dtype=np.int64), lengths)
+        v = max(1, len(vocab))
+        keys, counts = np.unique(rows * v + self.seq_ids, return_counts=True)
+        pair_rows, pair_cols = keys // v, keys % v
+        self.token_postings = _Postings(pair_rows, pair_cols, counts, len(vocab))
+        self.distinct_tokens = np.bincount(pair_rows, minlength=self.size).astype(np.float64)
+        self.token_norms = np.sqrt(np.bincount(
+            pair_rows, weights=counts.astype(np.float64) ** 2, minlength=self.size
+        ))
+
+        # Vocabulary helpers for the position component's partial matches
+        self._vocab_blob = "\x00".join(self.tokens) + "\x00"
+        starts = np.zeros(len(self.tokens) + 1, dtype=np.int64)
+        np.cumsum([len(t) + 1 for t in self.tokens], out=starts[1:])
+        self._vocab_starts = starts
+        prefixes: Dict[str, int] = {}
+        self._prefix3 = np.asarray(
+            [prefixes.setdefault(t[:3], len(prefixes)) if len(t) >= 3 else -1 for t in self.tokens],
+            dtype=np.int64
+        )
+        self._prefix_ids = prefixes
+
+    def _build_ngrams(self) -> None:
+        n = self.ngram_size
+        texts = [t.lower().replace(" ", "_") for t in self.candidates]
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=self.size)
+        codes = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.uint64)
+        starts = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=starts[1:])
+
+        # Full n-grams: start positions that fit inside their text
+        gram_counts = np.maximum(lengths - n + 1, 0)
+        rows = np.repeat(np.arange(self.size, dtype=np.int64), gram_counts)
+        first = np.repeat(starts[:-1] - np.cumsum(gram_counts) + gram_counts, gram_counts)
+        positions = first + np.arange(gram_counts.sum(), dtype=np.int64)
+        keys = self._pack(codes, positions, n)
+
+        # Texts shorter than n count as one n-gram (the whole text)
+        short = np.nonzero(lengths < n)[0]
+        if len(short):
+            short_keys = np.asarray(
+                [self._short_key(texts[i]) for i in short], dtype=np.uint64
+            )
+            rows = np.concatenate([rows, short.astype(np.int64)])
+            keys = np.concatenate([keys, short_keys])
+
+        self.gram_keys, cols = np.unique(keys, return_inverse=True)
+        g = max(1, len(self.gram_keys))
+        pairs, counts = np.unique(rows * g + cols.astype(np.int64), return_counts=True)
+        pair_rows, pair_cols = pairs // g, pairs % g
+        self.gram_postings = _Postings(pair_rows, pair_cols, counts, len(self.gram_keys))
+        self.gram_totals = np.bincount(rows, minlength=self.size).astype(np.float64)
+
+    def _pack(self, codes: "np.ndarray", positions: "np.ndarray", n: int) -> "np.ndarray":
+        key = np.zeros(len(positions), dtype=np.uint64)
+        if n * _CHAR_BITS <= 63:
+            for k in range(n):
+                key = (key << np.uint64(_CHAR_BITS)) | codes[positions + k]
+        else:
+            mult = np.uint64(_HASH_MULT)
+            for k in range(n):
+                key = key * mult + codes[positions + k] + np.uint64(1)
+            key &= np.uint64(_SHORT_FLAG - 1)
+        return key
+
+    def _short_key(self, text: str) -> int:
+        if len(text) * _CHAR_BITS <= 60:
+            key = len(text)
+            for ch in text:
+                key = (key << _CHAR_BITS) | ord(ch)
+        else:
+            digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+            key = int.from_bytes(digest, "little") & (_SHORT_FLAG - 1)
+        return _SHORT_FLAG | key
+
+    def _query_grams(self, text: str) -> Tuple[List[int], List[float], float]:
+        """(gram columns present in the index, query counts, total query grams)."""
+        n = self.ngram_size
+        text = text.lower().replace(" ", "_")
+        if len(text) < n:
+            keys = np.asarray([self._short_key(text)], dtype=np.uint64)
+        else:
+            codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.uint64)
+            keys = self._pack(codes, np.arange(len(text) - n + 1, dtype=np.int64), n)
+        unique, counts = np.unique(keys, return_counts=True)
+        cols = np.searchsorted(self.gram_keys, unique)
+        cols = np.minimum(cols, max(0, len(self.gram_keys) - 1))
+        present = self.gram_keys[cols] == unique if len(self.gram_keys) else np.zeros(0, bool)
+        return cols[present].tolist(), counts[present].astype(np.float64).tolist(), float(len(keys))
+
+    # ═══════════════════════════════════════════════════════════════════
+    # COMPONENTS
+    # ═══════════════════════════════════════════════════════════════════
+
+    def _token_stats(self, query_tokens: List[str]):
+        """(intersection sizes, query distinct count, dot products, query norm)."""
+        tf: Dict[int, int] = {}
+        for token in query_tokens:
+            token_id = self.vocab.get(token)
+            if token_id is not None:
+                tf[token_id] = tf.get(token_id, 0) + 1
+        rows, counts, qtf = self.token_postings.gather(list(tf), list(tf.values()))
+        inter = np.bincount(rows, minlength=self.size).astype(np.float64)
+        dot = np.bincount(rows, weights=counts * qtf, minlength=self.size)
+        query_tf: Dict[str, int] = {}
+        for token in query_tokens:
+            query_tf[token] = query_tf.get(token, 0) + 1
+        norm = float(np.sqrt(sum(c * c for c in query_tf.values())))
+        return inter, float(len(query_tf)), dot, norm
+
+    def _lexical(self, inter, query_distinct: float) -> "np.ndarray":
+        cand = self.distinct_tokens
+        union = query_distinct + cand - inter
+        with np.errstate(divide="ignore", invalid="ignore"):
+            jaccard = inter / union
+            dice = 2 * inter / (query_distinct + cand)
+            score = (jaccard + dice) / 2
+        if query_distinct == 0:
+            return np.where(cand == 0, 1.0, 0.0)
+        return np.where(cand == 0, 0.0, score)
+
+    def _ngram(self, text: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        cols, qcounts, qtotal = self._query_grams(text)
+        rows, counts, qc = self.gram_postings.gather(cols, qcounts)
+        inter = np.bincount(rows, weights=np.minimum(counts, qc), minlength=self.size)
+        return 2 * inter / (qtotal + self.gram_totals), inter
+
+    def _similar_ids(self, token: str) -> "np.ndarray":
+        """Vocabulary mask of tokens SanTOKSimilarity._token_similar to token."""
+        cached = self._similar_cache.get(token)
+        if cached is not None:
+            return cached
+        mask = np.zeros(len(self.tokens), dtype=bool)
+
+        # Vocabulary tokens containing token
+        blob, position = self._vocab_blob, 0
+        hits = []
+        while True:
+            position = blob.find(token, position)
+            if position < 0:
+                break
+            hits.append(position)
+            position += 1
+        if hits:
+            mask[np.searchsorted(self._vocab_starts, np.asarray(hits), side="right") - 1] = True
+
+        # Vocabulary tokens contained in token
+        for i in range(len(token)):
+            for j in range(i + 1, len(token) + 1):
+                token_id = self.vocab.get(token[i:j])
+                if token_id is not None:
+                    mask[token_id] = True
+
+        # Common prefix of at least 3 characters
+        if len(token) >= 3:
+            prefix = self._prefix_ids.get(token[:3])
+            if prefix is not None:
+                mask |= self._prefix3 == prefix
+
+        if len(self._similar_cache) > 10_000:
+            self._similar_cache.clear()
+        self._similar_cache[token] = mask
+        return mask
+
+    def _position(self, query_tokens: List[str]) -> "np.ndarray":
+        la = len(query_tokens)
+        lb = self.seq_lengths
+        matches = np.zeros(self.size, dtype=np.float64)
+        if la == 0:
+            return matches
+
+        weights = [1.0 / (1.0 + math.log(i + 2)) for i in range(la)]
+        for i, token in enumerate(query_tokens):
+            rows = np.nonzero(lb > i)[0]
+            if not len(rows):
+                break
+            ids = self.seq_ids[self.seq_indptr[rows] + i]
+            token_id = self.vocab.get(token, -1)
+            exact = ids == token_id
+            partial = ~exact & self._similar_ids(token)[ids]
+            matches[rows] += np.where(exact, weights[i], np.where(partial, weights[i] * 0.5, 0.0))
+
+        # Σ weights over the first min(la, lb) positions, summed in order
+        cumulative = [0.0]
+        for w in weights:
+            cumulative.append(cumulative[-1] + w)
+        shorter = np.minimum(lb, la)
+        total = np.asarray(cumulative)[shorter]
+        longer = np.maximum(lb, la)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = (matches / total) * (shorter / longer)
+        return np.where(lb == 0, 0.0, score)
+
+    def _ensure_graph(self) -> None:
+        sim = self.similarity
+        version = sim._graph_state()
+        if self._graph_version == version:
+            return
+        cand_nodes = np.full((self.size, 3), -1, dtype=np.int64)
+        token_nodes = [sim._find_nodes([t]) for t in self.tokens]
+        seq = self.seq_ids.tolist()
+        indptr = self.seq_indptr.tolist()
+        for row in range(self.size):
+            slot = 0
+            for token_id in seq[indptr[row]:indptr[row + 1]]:
+                for node_id in token_nodes[token_id]:
+                    cand_nodes[row, slot] = node_id
+                    slot += 1
+                    if slot == 3:
+                        break
+                if slot == 3:
+                    break
+        self._cand_nodes = cand_nodes
+        self._graph_version = version
+
+    def _graph(self, query_tokens: List[str]) -> "np.ndarray":
+        sim = self.similarity
+        if not sim.graph or sim.graph.node_count == 0:
+            return np.full(self.size, 0.5)
+        query_nodes = sim._find_nodes(query_tokens)[:3]
+        if not query_nodes:
+            return np.full(self.size, 0.5)
+        self._ensure_graph()
+
+        cand = self._cand_nodes
+        valid = cand >= 0
+        unique = np.unique(cand[valid])
+        slots = np.searchsorted(unique, np.where(valid, cand, unique[0] if len(unique) else 0))
+        total = np.zeros(self.size)
+        for node_a in query_nodes:
+            related = np.asarray(
+                [sim._cached_relatedness(node_a, int(node_b)) for node_b in unique],
+                dtype=np.float64
+            )
+            if not len(related):
+                continue
+            for k in range(3):
+                total += np.where(valid[:, k], related[slots[:, k]], 0.0)
+        pairs = valid.sum(axis=1) * len(query_nodes)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(pairs == 0, 0.5, total / pairs)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # QUERIES
+    # ═══════════════════════════════════════════════════════════════════
+
+    def scores(self, query: str) -> Dict[str, "np.ndarray"]:
+        """
+        All component arrays (length = number of candidates).
+
+        Keys: score, digital_root, lexical, ngram, position, graph,
+        jaccard, dice, cosine, common_tokens (count), common_ngrams.
+        """
+        sim = self.similarity
+        query_tokens = sim._tokenize(query)
+        inter, query_distinct, dot, query_norm = self._token_stats(query_tokens)
+        lexical = self._lexical(inter, query_distinct)
+        ngram, common_ngrams = self._ngram(query)
+        position = self._position(query_tokens)
+        graph = self._graph(query_tokens)
+
+        w = sim.weights
+        score = w["alpha"] * lexical + w["beta"] * ngram + w["gamma"] * position + w["delta"] * graph
+        int_val = np.abs(np.trunc(score * 1000)).astype(np.int64)
+        digital_root = np.where(int_val == 0, 9, 1 + (int_val - 1) % 9)
+
+        cand = self.distinct_tokens
+        both_empty = (cand == 0) & (query_distinct == 0)
+        one_empty = (cand == 0) | (query_distinct == 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            jaccard = np.where(both_empty, 1.0, np.where(one_empty, 0.0, inter / (query_distinct + cand - inter)))
+            dice = np.where(both_empty, 1.0, np.where(one_empty, 0.0, 2 * inter / (query_distinct + cand)))
+            norms = self.token_norms * query_norm
+            cosine = np.where((self.seq_lengths == 0) | (len(query_tokens) == 0) | (norms == 0), 0.0, dot / norms)
+
+        return {
+            "score": score,
+            "digital_root": digital_root,
+            "lexical": lexical,
+            "ngram": ngram,
+            "position": position,
+            "graph": graph,
+            "jaccard": jaccard,
+            "dice": dice,
+            "cosine": cosine,
+            "common_tokens": inter,
+            "common_ngrams": common_ngrams,
+        }
+
+    def top_k(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """The k best (candidate index, score), ties in candidate order."""
+        score = self.scores(query)["score"]
+        if k < len(score):
+            part = np.argpartition(-score, k - 1)[:k]
+            threshold = score[part].min()
+            part = np.nonzero(score >= threshold)[0]
+        else:
+            part = np.arange(len(score))
+        order = part[np.argsort(-score[part], kind="stable")][:k]
+        return [(int(i), float(score[i])) for i in order]
+
+    def results(
+        self,
+        query: str,
+        indices: Optional[Sequence[int]] = None,
+        components: Optional[Dict[str, "np.ndarray"]] = None
+    ) -> List[Any]:
+        """SimilarityResult objects for the given candidates (default: all)."""
+        from .semantic_similarity import SimilarityResult
+
+        c = components or self.scores(query)
+        if indices is None:
+            indices = range(self.size)
+        query_set = set(self.similarity._tokenize(query))
+        seq = self.seq_ids
+        indptr = self.seq_indptr
+        tokens = self.tokens
+        out = []
+        for i in indices:
+            common = (
+                [t for t in {tokens[j] for j in seq[indptr[i]:indptr[i + 1]].tolist()} if t in query_set]
+                if c["common_tokens"][i] else []
+            )
+            out.append(SimilarityResult(
+                score=float(c["score"][i]),
+                digital_root=int(c["digital_root"][i]),
+                lexical_score=float(c["lexical"][i]),
+                ngram_score=float(c["ngram"][i]),
+                position_score=float(c["position"][i]),
+                graph_score=float(c["graph"][i]),
+                common_tokens=common,
+                common_ngrams=int(c["common_ngrams"][i]),
+            ))
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "candidates": self.size,
+            "vocabulary": len(self.tokens),
+            "ngrams": len(self.gram_keys),
+            "token_postings": len(self.token_postings.rows),
+            "ngram_postings": len(self.gram_postings.rows),
+            "bytes": self.token_postings.nbytes + self.gram_postings.nbytes + self.seq_ids.nbytes,
+        }
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"SimilarityIndex(candidates={self.size}, vocabulary={len(self.tokens)}, ngrams={len(self.gram_keys)})"
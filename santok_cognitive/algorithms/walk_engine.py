@@ -0,0 +1,486 @@
+"""
+SanTOK Walk Engine - Batched Random Walks and Personalized PageRank
+===================================================================
+
+Runs many walks at once over the CSR arrays of a CompactGraph snapshot
+instead of stepping one walker through GraphStore dicts.
+
+Transition weights:
+    w(edge) = relation_weight[relation] × edge.weight
+    P(u → v) = w(u → v) / Σ w(u → ·)
+
+Neighbor sampling uses one alias table per node (Vose's method), built
+once per snapshot in O(edges). Each walk step is then O(1): pick a slot
+in the node's adjacency run uniformly, keep it or jump to its alias.
+
+PageRank is power iteration with the same transition matrix:
+    r' = d·Pᵀr + (d·dangling_mass + (1 - d))·p
+where p is uniform (global PageRank) or concentrated on seed nodes
+(personalized PageRank). Each iteration is one sparse matrix-vector
+product over the CSR arrays. A time budget stops the iteration early and
+returns the current estimate.
+
+NumPy (optional) vectorizes all walkers of a step and the matrix-vector
+product; without it the same tables are used from pure Python.
+"""
+
+import random
+import time
+from array import array
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Union
+
+from ..graph import GraphStore, CompactGraph, RelationType
+from ..graph.graph_edge import GraphEdge
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+@dataclass
+class PageRankResult:
+    """Scores from a (personalized) PageRank run."""
+    scores: Dict[int, float]
+    iterations: int
+    residual: float         # L1 change in the last iteration
+    converged: bool
+    seconds: float
+    personalized: bool = False
+
+    def top(self, k: int = 10) -> List[tuple]:
+        """The k highest-scoring (node_id, score) pairs."""
+        return sorted(self.scores.items(), key=lambda x: x[1], reverse=True)[:k]
+
+
+class WalkEngine:
+    """
+    Batched walks and PageRank over a CSR snapshot of a GraphStore.
+
+    The snapshot is rebuilt lazily after the graph changes (edge events
+    from GraphStore listeners, or a different node count).
+
+    Example:
+        engine = WalkEngine(graph, relation_weights={RelationType.IS_A: 1.0})
+
+        # 10 walks of 20 steps from each seed
+        walks = engine.random_walks([dog_id, cat_id], length=20, walks_per_source=10)
+
+        # Nodes most relevant to "dog"
+        ppr = engine.personalized_pagerank([dog_id])
+        print(ppr.top(5))
+
+        # Global centrality, at most 50ms of iteration
+        pr = engine.pagerank(time_budget=0.05)
+    """
+
+    def __init__(
+        self,
+        graph: GraphStore,
+        relation_weights: Optional[Dict[RelationType, float]] = None,
+        use_edge_weights: bool = True,
+        direction: str = "outgoing",
+        default_weight: float = 0.5,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize Walk Engine.
+
+        Args:
+            graph: GraphStore to walk
+            relation_weights: Transition weight per relation (missing
+                relations use default_weight; None = all relations 1.0)
+            use_edge_weights: Multiply by each edge's own weight
+            direction: "outgoing" follows edges, "incoming" walks them backwards
+            default_weight: Weight of relations missing from relation_weights
+            seed: Random seed for reproducible walks
+        """
+        if direction not in ("outgoing", "incoming"):
+            raise ValueError(f"direction must be 'outgoing' or 'incoming', got {direction!r}")
+
+        self.graph = graph
+        self.relation_weights = relation_weights
+        self.use_edge_weights = use_edge_weights
+        self.direction = direction
+        self.default_weight = default_weight
+
+        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed) if NUMPY_AVAILABLE else None
+
+        self._snapshot: Optional[CompactGraph] = None
+        self._offsets: array = array('i')
+        self._neighbors: array = array('i')
+        self._trans: array = array('d')        # slot -> P(u -> neighbor)
+        self._alias_prob: array = array('d')   # slot -> keep probability
+        self._alias: array = array('i')        # slot -> alias slot
+        self._live: array = array('i')         # node -> 1 if it has a way out
+        self._arrays: Optional[Dict[str, Any]] = None
+        self._built_nodes = -1
+        self._stale = True
+        self.version = 0
+
+        graph.add_listener(self._on_graph_event)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # SNAPSHOT
+    # ═══════════════════════════════════════════════════════════════════
+
+    def refresh(self) -> None:
+        """Rebuild transition and alias tables from the current graph."""
+        compact = self.graph.compact
+        if compact is None:
+            compact = CompactGraph.from_store(self.graph)
+        elif compact.delta_size or compact.node_count != len(compact.out.offsets) - 1:
+            compact = compact.merged()
+
+        csr = compact.out if self.direction == "outgoing" else compact.inc
+        relation_scale = [
+            1.0 if self.relation_weights is None
+            else self.relation_weights.get(rel, self.default_weight)
+            for rel in CompactGraph.RELATIONS
+        ]
+
+        n = compact.node_count
+        offsets = csr.offsets
+        m = len(csr.neighbors)
+        trans = array('d', [0.0]) * m
+        alias_prob = array('d', [0.0]) * m
+        alias = array('i', [0]) * m
+        live = array('i', [0]) * n
+
+        for u in range(n):
+            start, end = offsets[u], offsets[u + 1]
+            if start == end:
+                continue
+            weights = [
+                max(0.0, relation_scale[csr.relations[k]] *
+                    (csr.weights[k] if self.use_edge_weights else 1.0))
+                for k in range(start, end)
+            ]
+            total = sum(weights)
+            if total <= 0.0:
+                continue
+            live[u] = 1
+            for k, w in enumerate(weights):
+                trans[start + k] = w / total
+            self._build_alias(weights, total, start, alias_prob, alias)
+
+        self._snapshot = compact
+        self._offsets = offsets
+        self._neighbors = csr.neighbors
+        self._trans = trans
+        self._alias_prob = alias_prob
+        self._alias = alias
+        self._live = live
+        self._arrays = self._numpy_views() if NUMPY_AVAILABLE else None
+        self._built_nodes = self.graph.node_count
+        self._stale = False
+        self.version += 1
+
+    @staticmethod
+    def _build_alias(
+        weights: List[float],
+        total: float,
+        start: int,
+        alias_prob: array,
+        alias: array
+    ) -> None:
+        """Vose alias table for one adjacency run (absolute slot numbers)."""
+        deg = len(weights)
+        scaled = [w * deg / total for w in weights]
+        small = [k for k, p in enumerate(scaled) if p < 1.0]
+        large = [k for k, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            g = large[-1]
+            alias_prob[start + s] = scaled[s]
+            alias[start + s] = start + g
+            scaled[g] -= 1.0 - scaled[s]
+            if scaled[g] < 1.0:
+                large.pop()
+                small.append(g)
+
+        for k in large + small:          # leftovers are 1 up to rounding
+            alias_prob[start + k] = 1.0
+            alias[start + k] = start + k
+
+    def _numpy_views(self) -> Dict[str, Any]:
+        offsets = np.frombuffer(self._offsets, dtype=np.int32).astype(np.int64)
+        degrees = np.diff(offsets)
+        live = np.frombuffer(self._live, dtype=np.int32) > 0
+        return {
+            # Copied: the live snapshot appends to node_ids on add_node
+            "node_ids": np.array(self._snapshot.node_ids, dtype=np.int64),
+            "offsets": offsets,
+            "degrees": np.where(live, degrees, 0),        # 0 = dangling
+            "neighbors": np.frombuffer(self._neighbors, dtype=np.int32),
+            "trans": np.frombuffer(self._trans, dtype=np.float64),
+            "alias_prob": np.frombuffer(self._alias_prob, dtype=np.float64),
+            "alias": np.frombuffer(self._alias, dtype=np.int32),
+            "sources": np.repeat(np.arange(len(degrees)), degrees),
+        }
+
+    def _ensure_built(self) -> None:
+        if self._stale or self._built_nodes != self.graph.node_count:
+            self.refresh()
+
+    def current_version(self) -> int:
+        """Snapshot version after rebuilding if the graph changed."""
+        self._ensure_built()
+        return self.version
+
+    def _on_graph_event(self, event: str, edge: GraphEdge) -> None:
+        self._stale = True
+
+    def close(self) -> None:
+        """Stop listening to graph changes."""
+        self.graph.remove_listener(self._on_graph_event)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # RANDOM WALKS
+    # ═══════════════════════════════════════════════════════════════════
+
+    def random_walks(
+        self,
+        sources: Iterable[int],
+        length: int = 10,
+        walks_per_source: int = 1
+    ) -> List[List[int]]:
+        """
+        Weighted random walks, all advanced together one step at a time.
+
+        A walk stops early at a node without outgoing transitions.
+
+        Args:
+            sources: Start node IDs (unknown IDs are skipped)
+            length: Maximum steps per walk
+            walks_per_source: Walks started from each source
+
+        Returns:
+            One list of node IDs per walk (start node first), grouped by source
+        """
+        self._ensure_built()
+        compact = self._snapshot
+        starts = [
+            idx for idx in (compact.index_of(s) for s in sources) if idx is not None
+            for _ in range(walks_per_source)
+        ]
+        if not starts:
+            return []
+
+        if self._arrays is not None:
+            return self._walks_numpy(starts, length)
+        return self._walks_python(starts, length)
+
+    def _walks_numpy(self, starts: List[int], length: int) -> List[List[int]]:
+        a = self._arrays
+        rng = self._np_rng
+        current = np.asarray(starts, dtype=np.int64)
+        walks = np.full((len(starts), length + 1), -1, dtype=np.int64)
+        walks[:, 0] = current
+        active = np.arange(len(starts))
+
+        for step in range(1, length + 1):
+            degrees = a["degrees"][current[active]]
+            active = active[degrees > 0]
+            if not active.size:
+                break
+            nodes = current[active]
+            degrees = a["degrees"][nodes]
+            slots = a["offsets"][nodes] + np.minimum(
+                (rng.random(active.size) * degrees).astype(np.int64), degrees - 1
+            )
+            keep = rng.random(active.size) < a["alias_prob"][slots]
+            slots = np.where(keep, slots, a["alias"][slots])
+            current[active] = a["neighbors"][slots]
+            walks[active, step] = current[active]
+
+        node_ids = a["node_ids"]
+        lengths = (walks >= 0).sum(axis=1)
+        return [
+            node_ids[row[:n]].tolist() for row, n in zip(walks, lengths)
+        ]
+
+    def _walks_python(self, starts: List[int], length: int) -> List[List[int]]:
+        rng = self._rng
+        offsets, neighbors = self._offsets, self._neighbors
+        alias_prob, alias, live = self._alias_prob, self._alias, self._live
+        node_ids = self._snapshot.node_ids
+
+        walks = []
+        for current in starts:
+            walk = [node_ids[current]]
+            for _ in range(length):
+                if not live[current]:
+                    break
+                start = offsets[current]
+                slot = start + int(rng.random() * (offsets[current + 1] - start))
+                if rng.random() >= alias_prob[slot]:
+                    slot = alias[slot]
+                current = neighbors[slot]
+                walk.append(node_ids[current])
+            walks.append(walk)
+        return walks
+
+    # ═══════════════════════════════════════════════════════════════════
+    # PAGERANK
+    # ═══════════════════════════════════════════════════════════════════
+
+    def pagerank(
+        self,
+        damping: float = 0.85,
+        personalization: Optional[Union[Dict[int, float], Iterable[int]]] = None,
+        tol: float = 1e-6,
+        max_iter: int = 100,
+        time_budget: Optional[float] = None
+    ) -> PageRankResult:
+        """
+        PageRank by power iteration over the transition matrix.
+
+        Mass reaching a node without outgoing transitions is sent back to
+        the personalization vector.
+
+        Args:
+            damping: Probability of following an edge (vs teleporting)
+            personalization: Teleport distribution as {node_id: weight} or
+                a list of seed node IDs (None = uniform = global PageRank)
+            tol: Stop when the L1 change between iterations is below this
+            max_iter: Maximum iterations
+            time_budget: Seconds after which iteration stops and the
+                current estimate is returned (snapshot build not counted)
+
+        Returns:
+            PageRankResult (scores sum to 1; zero scores are omitted)
+        """
+        self._ensure_built()
+        compact = self._snapshot
+        n = compact.node_count
+        t0 = time.perf_counter()
+
+        teleport: Optional[Dict[int, float]] = None
+        if personalization is not None:
+            if not isinstance(personalization, dict):
+                personalization = {node_id: 1.0 for node_id in personalization}
+            teleport = {}
+            for node_id, weight in personalization.items():
+                idx = compact.index_of(node_id)
+                if idx is not None and weight > 0:
+                    teleport[idx] = teleport.get(idx, 0.0) + weight
+            total = sum(teleport.values())
+            teleport = {idx: w / total for idx, w in teleport.items()}
+
+        if n == 0 or teleport == {}:
+            return PageRankResult({}, 0, 0.0, True, 0.0, teleport is not None)
+
+        if self._arrays is not None:
+            ranks, iterations, residual = self._power_numpy(
+                n, damping, teleport, tol, max_iter, time_budget, t0
+            )
+            nonzero = np.nonzero(ranks)[0]
+            scores = dict(zip(
+                self._arrays["node_ids"][nonzero].tolist(), ranks[nonzero].tolist()
+            ))
+        else:
+            ranks, iterations, residual = self._power_python(
+                n, damping, teleport, tol, max_iter, time_budget, t0
+            )
+            node_ids = compact.node_ids
+            scores = {node_ids[i]: r for i, r in enumerate(ranks) if r > 0.0}
+
+        return PageRankResult(
+            scores=scores,
+            iterations=iterations,
+            residual=residual,
+            converged=residual < tol,
+            seconds=time.perf_counter() - t0,
+            personalized=teleport is not None,
+        )
+
+    def personalized_pagerank(
+        self,
+        seeds: Union[Dict[int, float], Iterable[int]],
+        damping: float = 0.85,
+        **kwargs
+    ) -> PageRankResult:
+        """PageRank that teleports only to the seed nodes (relevance to seeds)."""
+        return self.pagerank(damping=damping, personalization=seeds, **kwargs)
+
+    def _power_numpy(self, n, damping, teleport, tol, max_iter, time_budget, t0):
+        a = self._arrays
+        if teleport is None:
+            p = np.full(n, 1.0 / n)
+        else:
+            p = np.zeros(n)
+            p[list(teleport)] = list(teleport.values())
+        dangling = a["degrees"] == 0
+
+        ranks = p.copy()
+        residual = float("inf")
+        iterations = 0
+        while iterations < max_iter:
+            flow = np.bincount(
+                a["neighbors"], weights=ranks[a["sources"]] * a["trans"], minlength=n
+            )
+            new = damping * flow + (damping * ranks[dangling].sum() + 1.0 - damping) * p
+            residual = float(np.abs(new - ranks).sum())
+            ranks = new
+            iterations += 1
+            if residual < tol:
+                break
+            if time_budget is not None and time.perf_counter() - t0 >= time_budget:
+                break
+        return ranks, iterations, residual
+
+    def _power_python(self, n, damping, teleport, tol, max_iter, time_budget, t0):
+        offsets, neighbors = self._offsets, self._neighbors
+        trans, live = self._trans, self._live
+        if teleport is None:
+            teleport = dict.fromkeys(range(n), 1.0 / n)
+
+        ranks = [0.0] * n
+        for idx, w in teleport.items():
+            ranks[idx] = w
+        residual = float("inf")
+        iterations = 0
+        while iterations < max_iter:
+            new = [0.0] * n
+            dangling_mass = 0.0
+            for u in range(n):
+                mass = ranks[u]
+                if mass == 0.0:
+                    continue
+                if not live[u]:
+                    dangling_mass += mass
+                    continue
+                mass *= damping
+                for k in range(offsets[u], offsets[u + 1]):
+                    new[neighbors[k]] += mass * trans[k]
+            jump = damping * dangling_mass + 1.0 - damping
+            for idx, w in teleport.items():
+                new[idx] += jump * w
+            residual = sum(abs(x - y) for x, y in zip(new, ranks))
+            ranks = new
+            iterations += 1
+            if residual < tol:
+                break
+            if time_budget is not None and time.perf_counter() - t0 >= time_budget:
+                break
+        return ranks, iterations, residual
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_built()
+        return {
+            "nodes": self._snapshot.node_count,
+            "edges": len(self._neighbors),
+            "direction": self.direction,
+            "numpy": self._arrays is not None,
+            "version": self.version,
+        }
+
+    def __repr__(self) -> str:
+        state = "stale" if self._stale else f"nodes={self._built_nodes}"
+        return f"WalkEngine({self.direction}, {state})"
@@ -0,0 +1,188 @@
+"""
+SanTOK Graph Benchmark
+======================
+
+Memory and traversal speed of GraphStore (dict/set adjacency) versus the
+frozen CSR arrays of CompactGraph.
+
+- CSR graphs are built straight from edge columns for 1M and 10M edges
+- The object store is only built up to --store-edges (it needs ~1KB/edge)
+  and its per-edge cost is projected to the larger sizes
+- Traversal = BFS over outgoing edges from random start nodes
+
+Run:
+    python -m santok_cognitive.benchmark_graph
+    python -m santok_cognitive.benchmark_graph --edges 1000000 --store-edges 200000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import deque
+from typing import Dict, List
+
+from .graph import GraphStore, GraphNode, CompactGraph
+
+
+def random_edges(node_count: int, edge_count: int, seed: int = 9):
+    """Random edge columns (dense indices + relation codes)."""
+    rng = random.Random(seed)
+    relation_count = len(CompactGraph.RELATIONS)
+    sources = array('i', (rng.randrange(node_count) for _ in range(edge_count)))
+    targets = array('i', (rng.randrange(node_count) for _ in range(edge_count)))
+    relations = array('B', (rng.randrange(relation_count) for _ in range(edge_count)))
+    weights = array('f', (rng.random() for _ in range(edge_count)))
+    return sources, targets, relations, weights
+
+
+def build_store(node_count: int, sources, targets, relations, weights) -> GraphStore:
+    store = GraphStore()
+    for i in range(node_count):
+        store.add_node(GraphNode(node_id=i, text=f"n{i}"))
+    rels = CompactGraph.RELATIONS
+    for s, t, r, w in zip(sources, targets, relations, weights):
+        store.add_edge(s, t, rels[r], weight=w)
+    return store
+
+
+def bfs_adjacent(graph, start: int, limit: int) -> int:
+    """BFS through GraphStore.adjacent / CompactGraph.adjacent; returns edges scanned."""
+    seen = {start}
+    queue = deque([start])
+    scanned = 0
+    while queue and len(seen) < limit:
+        current = queue.popleft()
+        for neighbor_id, _, _, _ in graph.adjacent(current, "outgoing"):
+            scanned += 1
+            if neighbor_id not in seen:
+                seen.add(neighbor_id)
+                queue.append(neighbor_id)
+    return scanned
+
+
+def bfs_arrays(compact: CompactGraph, start: int, limit: int) -> int:
+    """BFS over raw CSR arrays with a bytearray visited set."""
+    offsets = compact.out.offsets
+    neighbors = compact.out.neighbors
+    seen = bytearray(compact.node_count)
+    start = compact.index_of(start)
+    seen[start] = 1
+    visited = 1
+    queue = deque([start])
+    scanned = 0
+    while queue and visited < limit:
+        current = queue.popleft()
+        for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+            scanned += 1
+            if not seen[neighbor]:
+                seen[neighbor] = 1
+                visited += 1
+                queue.append(neighbor)
+    return scanned
+
+
+def time_traversal(fn, graph, starts: List[int], limit: int) -> Dict[str, float]:
+    t0 = time.perf_counter()
+    scanned = sum(fn(graph, s, limit) for s in starts)
+    elapsed = time.perf_counter() - t0
+    return {
+        "seconds": elapsed,
+        "edges_per_sec": scanned / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def measure(fn, *args):
+    """Return (result, seconds, traced bytes still allocated)."""
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+
+def run(edge_sizes: List[int], store_edges: int, starts: int, visit_limit: int):
+    print("=" * 70)
+    print("GRAPHSTORE vs COMPACTGRAPH (CSR)")
+    print("=" * 70)
+
+    # Object store baseline (small, projected per edge)
+    store_bytes_per_edge = None
+    if store_edges > 0:
+        nodes = max(1, store_edges // 10)
+        cols = random_edges(nodes, store_edges)
+        store, secs, used = measure(build_store, nodes, *cols)
+        store_bytes_per_edge = used / store_edges
+        print(f"\nGraphStore with {store_edges:,} edges / {nodes:,} nodes")
+        print(f"  build:  {secs:.1f}s")
+        print(f"  memory: {used / 1e6:.1f} MB ({store_bytes_per_edge:.0f} B/edge)")
+
+        rng = random.Random(1)
+        sample = [rng.randrange(nodes) for _ in range(starts)]
+        dict_speed = time_traversal(bfs_adjacent, store, sample, visit_limit)
+        store.freeze()
+        compact_speed = time_traversal(bfs_adjacent, store, sample, visit_limit)
+        array_speed = time_traversal(bfs_arrays, store.compact, sample, visit_limit)
+        print(f"  BFS dict adjacency:      {dict_speed['edges_per_sec']:>12,.0f} edges/s")
+        print(f"  BFS frozen adjacent():   {compact_speed['edges_per_sec']:>12,.0f} edges/s")
+        print(f"  BFS raw CSR arrays:      {array_speed['edges_per_sec']:>12,.0f} edges/s")
+        del store
+        gc.collect()
+
+    for edge_count in edge_sizes:
+        nodes = max(1, edge_count // 10)
+        cols = random_edges(nodes, edge_count)
+        node_ids = array('q', range(nodes))
+        # Not traced: tracemalloc slows the pure-Python build ~10x
+        t0 = time.perf_counter()
+        compact = CompactGraph.from_arrays(node_ids, *cols)
+        secs = time.perf_counter() - t0
+        used = compact.memory_bytes() + sys.getsizeof(compact._index)
+        del cols
+
+        print(f"\nCompactGraph with {edge_count:,} edges / {nodes:,} nodes")
+        print(f"  build:  {secs:.1f}s")
+        print(f"  arrays: {compact.memory_bytes() / 1e6:.1f} MB "
+              f"({compact.memory_bytes() / edge_count:.1f} B/edge)")
+        print(f"  total:  {used / 1e6:.1f} MB (arrays + node id index)")
+        if store_bytes_per_edge:
+            projected = store_bytes_per_edge * edge_count
+            print(f"  GraphStore projected: {projected / 1e9:.2f} GB "
+                  f"({projected / used:.0f}x larger)")
+
+        rng = random.Random(2)
+        sample = [rng.randrange(nodes) for _ in range(starts)]
+        adjacent_speed = time_traversal(bfs_adjacent, compact, sample, visit_limit)
+        array_speed = time_traversal(bfs_arrays, compact, sample, visit_limit)
+        print(f"  BFS adjacent():          {adjacent_speed['edges_per_sec']:>12,.0f} edges/s")
+        print(f"  BFS raw CSR arrays:      {array_speed['edges_per_sec']:>12,.0f} edges/s")
+
+        # Cost of a full merged() rewrite
+        t0 = time.perf_counter()
+        merged = compact.merged()
+        print(f"  merge (no deltas):       {time.perf_counter() - t0:.1f}s")
+        del compact, merged
+        gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphStore vs CompactGraph benchmark")
+    parser.add_argument("--edges", type=int, nargs="+", default=[1_000_000, 10_000_000],
+                        help="CSR graph sizes to benchmark")
+    parser.add_argument("--store-edges", type=int, default=200_000,
+                        help="Edges in the GraphStore baseline (0 = skip)")
+    parser.add_argument("--starts", type=int, default=20, help="BFS start nodes")
+    parser.add_argument("--visit-limit", type=int, default=50_000,
+                        help="Stop each BFS after this many nodes")
+    args = parser.parse_args()
+    run(args.edges, args.store_edges, args.starts, args.visit_limit)
+
+
+if __name__ == "__main__":
+    main()
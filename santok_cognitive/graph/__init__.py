@@ -6,20 +6,32 @@ Knowledge Graph implementation with:
 - GraphNode: Nodes in the graph
 - GraphEdge: Relationships between nodes
 - GraphStore: Storage and query engine
+- CompactGraph: Frozen CSR adjacency arrays (GraphStore.freeze())
+- ReachabilityIndex: Transitive closure for IS_A/PART_OF hierarchies
+- path_search: BFS / bidirectional BFS / A* / Yen k-shortest paths
 - RelationType: Types of relationships
 - RelationExtractor: Extract relations from text
+- CompiledPatternSet: Regexes behind a trigger-word prefilter
 """
 
 from .graph_node import GraphNode
 from .graph_edge import GraphEdge, RelationType
 from .graph_store import GraphStore
+from .compact_graph import CompactGraph
+from .reachability_index import ReachabilityIndex
+from .path_search import SearchPath
+from .pattern_set import CompiledPatternSet
 from .relation_extractor import RelationExtractor, ExtractedRelation
 
 __all__ = [
     "GraphNode",
     "GraphEdge",
     "GraphStore",
+    "CompactGraph",
+    "ReachabilityIndex",
+    "SearchPath",
     "RelationType",
     "RelationExtractor",
     "ExtractedRelation",
+    "CompiledPatternSet",
 ]
@@ -0,0 +1,465 @@
+"""
+CompactGraph: Frozen CSR (compressed sparse row) view of a GraphStore.
+
+Pure Python - packs adjacency into typed ``array`` buffers:
+
+    offsets    int32   node index → first slot of its adjacency run
+    neighbors  int32   dense index of the node at the other end
+    relations  uint8   RelationType code (position in CompactGraph.RELATIONS)
+    weights    float32 edge weight at freeze time
+    edge_ids   int64   GraphStore edge id (to recover the GraphEdge object)
+
+One CSR is kept per direction, so outgoing and incoming traversal are both
+a slice of contiguous memory instead of a set of edge ids plus dict lookups.
+
+The arrays are never mutated after construction (copy-on-write):
+- edges added after the freeze go into small per-node delta lists
+- removed edges are tombstoned by edge id
+- merged() folds the deltas into a brand-new CompactGraph, so anyone still
+  holding the old snapshot keeps a consistent view
+"""
+
+from array import array
+from typing import Dict, List, Optional, Set, Tuple, Iterable, Any
+
+from .graph_edge import GraphEdge, RelationType
+
+
+# (neighbor_index, relation_code, weight, edge_id)
+_DeltaEntry = Tuple[int, int, float, int]
+
+
+class _CSR:
+    """One direction of adjacency in CSR form."""
+
+    __slots__ = ("offsets", "neighbors", "relations", "weights", "edge_ids")
+
+    def __init__(
+        self,
+        offsets: array,
+        neighbors: array,
+        relations: array,
+        weights: array,
+        edge_ids: array
+    ):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.relations = relations
+        self.weights = weights
+        self.edge_ids = edge_ids
+
+    @classmethod
+    def build(
+        cls,
+        node_count: int,
+        rows: array,
+        cols: array,
+        relations: array,
+        weights: array,
+        edge_ids: array
+    ) -> "_CSR":
+        """Counting-sort edges by row (stable, so insertion order is kept)."""
+        offsets = array('i', [0]) * (node_count + 1)
+        for row in rows:
+            offsets[row + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+
+        m = len(rows)
+        out_neighbors = array('i', [0]) * m
+        out_relations = array('B', [0]) * m
+        out_weights = array('f', [0.0]) * m
+        out_edge_ids = array('q', [0]) * m
+
+        cursor = array('i', offsets[:-1]) if node_count else array('i')
+        for k in range(m):
+            row = rows[k]
+            slot = cursor[row]
+            cursor[row] = slot + 1
+            out_neighbors[slot] = cols[k]
+            out_relations[slot] = relations[k]
+            out_weights[slot] = weights[k]
+            out_edge_ids[slot] = edge_ids[k]
+
+        return cls(offsets, out_neighbors, out_relations, out_weights, out_edge_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            buf.itemsize * len(buf)
+            for buf in (self.offsets, self.neighbors, self.relations,
+                        self.weights, self.edge_ids)
+        )
+
+
+class CompactGraph:
+    """
+    Read-optimized adjacency for large graphs.
+
+    Built by ``GraphStore.freeze()``; the store keeps it up to date with
+    delta entries as edges are added/removed and swaps in a merged snapshot
+    once the deltas grow past ``merge_threshold``.
+
+    Example:
+        >>> compact = store.freeze()
+        >>> for nbr_id, edge_id, relation, weight in compact.adjacent(dog_id):
+        ...     print(nbr_id, relation, weight)
+
+        # Hot loops can work on dense indices and the raw arrays
+        >>> i = compact.index_of(dog_id)
+        >>> start, end = compact.out_range(i)
+        >>> targets = compact.out.neighbors[start:end]
+    """
+
+    # Relation code = position in this tuple (fits in uint8)
+    RELATIONS: Tuple[RelationType, ...] = tuple(RelationType)
+    RELATION_CODES: Dict[RelationType, int] = {rel: i for i, rel in enumerate(RELATIONS)}
+
+    def __init__(
+        self,
+        node_ids: array,
+        out_csr: _CSR,
+        in_csr: _CSR,
+        merge_threshold: float = 0.25
+    ):
+        """
+        Initialize from prebuilt CSR arrays (use from_store / from_arrays).
+
+        Args:
+            node_ids: int64 node id for each dense index
+            out_csr: Outgoing adjacency
+            in_csr: Incoming adjacency
+            merge_threshold: Delta size (fraction of frozen edges) that
+                makes ``needs_merge`` true
+        """
+        self.node_ids = node_ids
+        self.out = out_csr
+        self.inc = in_csr
+        self.merge_threshold = merge_threshold
+
+        self._index: Dict[int, int] = {nid: i for i, nid in enumerate(node_ids)}
+        self._frozen_nodes = len(node_ids)
+        self._frozen_edges = len(out_csr.neighbors)
+
+        # Copy-on-write deltas (index → entries) and tombstones (edge ids)
+        self._delta_out: Dict[int, List[_DeltaEntry]] = {}
+        self._delta_in: Dict[int, List[_DeltaEntry]] = {}
+        self._delta_edges = 0
+        self._removed: Set[int] = set()
+
+    # ═══════════════════════════════════════════════════════════════════
+    # CONSTRUCTION
+    # ═══════════════════════════════════════════════════════════════════
+
+    @classmethod
+    def from_store(cls, store: Any, merge_threshold: float = 0.25) -> "CompactGraph":
+        """Pack every node and edge of a GraphStore."""
+        node_ids = array('q', store._nodes.keys())
+        index = {nid: i for i, nid in enumerate(node_ids)}
+        codes = cls.RELATION_CODES
+
+        edges = store._edges.values()
+        sources = array('i', [index[e.source_id] for e in edges])
+        targets = array('i', [index[e.target_id] for e in edges])
+        relations = array('B', [codes[e.relation_type] for e in edges])
+        weights = array('f', [e.weight for e in edges])
+        edge_ids = array('q', store._edges.keys())
+
+        return cls.from_arrays(
+            node_ids, sources, targets, relations, weights, edge_ids,
+            merge_threshold=merge_threshold
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        node_ids: Iterable[int],
+        sources: Iterable[int],
+        targets: Iterable[int],
+        relations: Iterable[int],
+        weights: Optional[Iterable[float]] = None,
+        edge_ids: Optional[Iterable[int]] = None,
+        merge_threshold: float = 0.25
+    ) -> "CompactGraph":
+        """
+        Build directly from edge columns (no GraphNode/GraphEdge objects).
+
+        Args:
+            node_ids: Node id of each dense index
+            sources: Source dense index per edge
+            targets: Target dense index per edge
+            relations: Relation code per edge (see RELATION_CODES)
+            weights: Edge weights (default 1.0)
+            edge_ids: Edge ids (default 1..m)
+        """
+        node_ids = node_ids if isinstance(node_ids, array) else array('q', node_ids)
+        sources = sources if isinstance(sources, array) else array('i', sources)
+        targets = targets if isinstance(targets, array) else array('i', targets)
+        relations = relations if isinstance(relations, array) else array('B', relations)
+        m = len(sources)
+        if len(targets) != m or len(relations) != m:
+            raise ValueError("sources, targets and relations must have same length")
+        if weights is None:
+            weights = array('f', [1.0]) * m
+        elif not isinstance(weights, array):
+            weights = array('f', weights)
+        if edge_ids is None:
+            edge_ids = array('q', range(1, m + 1))
+        elif not isinstance(edge_ids, array):
+            edge_ids = array('q', edge_ids)
+
+        n = len(node_ids)
+        out_csr = _CSR.build(n, sources, targets, relations, weights, edge_ids)
+        in_csr = _CSR.build(n, targets, sources, relations, weights, edge_ids)
+        return cls(node_ids, out_csr, in_csr, merge_threshold=merge_threshold)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # DELTAS (kept in sync by GraphStore)
+    # ═══════════════════════════════════════════════════════════════════
+
+    def add_node(self, node_id: int) -> int:
+        """Register a node added after the freeze; returns its dense index."""
+        index = self._index.get(node_id)
+        if index is None:
+            index = len(self.node_ids)
+            self.node_ids.append(node_id)
+            self._index[node_id] = index
+        return index
+
+    def add_edge(self, edge: GraphEdge) -> None:
+        """Record an edge added after the freeze."""
+        src = self.add_node(edge.source_id)
+        tgt = self.add_node(edge.target_id)
+        code = self.RELATION_CODES[edge.relation_type]
+        weight = float(edge.weight)
+        self._delta_out.setdefault(src, []).append((tgt, code, weight, edge.edge_id))
+        self._delta_in.setdefault(tgt, []).append((src, code, weight, edge.edge_id))
+        self._delta_edges += 1
+        self._removed.discard(edge.edge_id)
+
+    def remove_edge(self, edge_id: int) -> None:
+        """Tombstone an edge (frozen or delta)."""
+        self._removed.add(edge_id)
+
+    @property
+    def delta_size(self) -> int:
+        """Edges recorded since the last merge (additions + removals)."""
+        return self._delta_edges + len(self._removed)
+
+    @property
+    def needs_merge(self) -> bool:
+        return self.delta_size > max(1024, self.merge_threshold * self._frozen_edges)
+
+    def merged(self) -> "CompactGraph":
+        """Return a new snapshot with deltas and tombstones folded in."""
+        removed = self._removed
+        out = self.out
+        sources = array('i')
+        targets = array('i')
+        relations = array('B')
+        weights = array('f')
+        edge_ids = array('q')
+
+        offsets = out.offsets
+        for src in range(self._frozen_nodes):
+            for k in range(offsets[src], offsets[src + 1]):
+                eid = out.edge_ids[k]
+                if eid in removed:
+                    continue
+                sources.append(src)
+                targets.append(out.neighbors[k])
+                relations.append(out.relations[k])
+                weights.append(out.weights[k])
+                edge_ids.append(eid)
+
+        for src, entries in self._delta_out.items():
+            for tgt, code, weight, eid in entries:
+                if eid in removed:
+                    continue
+                sources.append(src)
+                targets.append(tgt)
+                relations.append(code)
+                weights.append(weight)
+                edge_ids.append(eid)
+
+        return CompactGraph.from_arrays(
+            array('q', self.node_ids), sources, targets, relations, weights, edge_ids,
+            merge_threshold=self.merge_threshold
+        )
+
+    # ═══════════════════════════════════════════════════════════════════
+    # INDEX-LEVEL ACCESS (hot loops)
+    # ═══════════════════════════════════════════════════════════════════
+
+    def index_of(self, node_id: int) -> Optional[int]:
+        """Dense index of a node id (None if unknown)."""
+        return self._index.get(node_id)
+
+    def node_id_at(self, index: int) -> int:
+        return self.node_ids[index]
+
+    def out_range(self, index: int) -> Tuple[int, int]:
+        """Slot range of a node's frozen outgoing edges in ``self.out``."""
+        if index >= self._frozen_nodes:
+            return 0, 0
+        return self.out.offsets[index], self.out.offsets[index + 1]
+
+    def in_range(self, index: int) -> Tuple[int, int]:
+        """Slot range of a node's frozen incoming edges in ``self.inc``."""
+        if index >= self._frozen_nodes:
+            return 0, 0
+        return self.inc.offsets[index], self.inc.offsets[index + 1]
+
+    def adjacent_indices(
+        self,
+        index: int,
+        direction: str = "outgoing",
+        relation_codes: Optional[Set[int]] = None
+    ) -> List[_DeltaEntry]:
+        """
+        Adjacency of a dense index as (neighbor_index, code, weight, edge_id).
+
+        Args:
+            index: Dense node index
+            direction: "outgoing", "incoming", or "both"
+            relation_codes: Keep only these relation codes (None = all)
+        """
+        results: List[_DeltaEntry] = []
+        if direction in ("outgoing", "both"):
+            self._collect(self.out, index, self._delta_out, relation_codes, results)
+        if direction in ("incoming", "both"):
+            self._collect(self.inc, index, self._delta_in, relation_codes, results)
+        return results
+
+    def _collect(
+        self,
+        csr: _CSR,
+        index: int,
+        delta: Dict[int, List[_DeltaEntry]],
+        relation_codes: Optional[Set[int]],
+        results: List[_DeltaEntry]
+    ) -> None:
+        removed = self._removed
+        if index < self._frozen_nodes:
+            start, end = csr.offsets[index], csr.offsets[index + 1]
+            if start != end:
+                entries = zip(
+                    csr.neighbors[start:end], csr.relations[start:end],
+                    csr.weights[start:end], csr.edge_ids[start:end]
+                )
+                if relation_codes is None and not removed:
+                    results.extend(entries)
+                else:
+                    for entry in entries:
+                        if relation_codes is not None and entry[1] not in relation_codes:
+                            continue
+                        if entry[3] in removed:
+                            continue
+                        results.append(entry)
+        for entry in delta.get(index, ()):
+            if relation_codes is not None and entry[1] not in relation_codes:
+                continue
+            if entry[3] in removed:
+                continue
+            results.append(entry)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # NODE-ID LEVEL ACCESS
+    # ═══════════════════════════════════════════════════════════════════
+
+    def relation_codes(self, relation_types: Optional[Iterable[RelationType]]) -> Optional[Set[int]]:
+        """Translate relation types to a code filter (None or empty = all, as in GraphStore)."""
+        if relation_types is None:
+            return None
+        return {self.RELATION_CODES[rel] for rel in relation_types} or None
+
+    def adjacent(
+        self,
+        node_id: int,
+        direction: str = "outgoing",
+        relation_types: Optional[Iterable[RelationType]] = None
+    ) -> List[Tuple[int, int, RelationType, float]]:
+        """
+        Adjacency of a node as (neighbor_id, edge_id, relation_type, weight).
+
+        Same tuple layout as ``GraphStore.adjacent``.
+        """
+        index = self._index.get(node_id)
+        if index is None:
+            return []
+        ids = self.node_ids
+        rels = self.RELATIONS
+        return [
+            (ids[nbr], eid, rels[code], weight)
+            for nbr, code, weight, eid in self.adjacent_indices(
+                index, direction, self.relation_codes(relation_types)
+            )
+        ]
+
+    def has_edge_between(
+        self,
+        source_id: int,
+        target_id: int,
+        relation_type: Optional[RelationType] = None
+    ) -> bool:
+        src = self._index.get(source_id)
+        tgt = self._index.get(target_id)
+        if src is None or tgt is None:
+            return False
+        codes = None if relation_type is None else {self.RELATION_CODES[relation_type]}
+        return any(nbr == tgt for nbr, _, _, _ in self.adjacent_indices(src, "outgoing", codes))
+
+    def degree(self, node_id: int, direction: str = "outgoing") -> int:
+        index = self._index.get(node_id)
+        if index is None:
+            return 0
+        return len(self.adjacent_indices(index, direction))
+
+    # ═══════════════════════════════════════════════════════════════════
+    # STATS / EXPORT
+    # ═══════════════════════════════════════════════════════════════════
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Live edges (frozen + delta - tombstoned)."""
+        return self._frozen_edges + self._delta_edges - len(self._removed)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the CSR buffers (excludes deltas and the id index)."""
+        return (
+            self.node_ids.itemsize * len(self.node_ids)
+            + self.out.nbytes
+            + self.inc.nbytes
+        )
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Zero-copy NumPy views of the frozen arrays (requires numpy).
+
+        Keys: node_ids, out_offsets, out_neighbors, out_relations, out_weights,
+        out_edge_ids and the same with the "in_" prefix. node_ids is a copy,
+        since add_node appends to it (a view would lock the buffer).
+        """
+        import numpy as np
+
+        views = {"node_ids": np.array(self.node_ids, dtype=np.int64)}
+        for prefix, csr in (("out", self.out), ("in", self.inc)):
+            views[f"{prefix}_offsets"] = np.frombuffer(csr.offsets, dtype=np.int32)
+            views[f"{prefix}_neighbors"] = np.frombuffer(csr.neighbors, dtype=np.int32)
+            views[f"{prefix}_relations"] = np.frombuffer(csr.relations, dtype=np.uint8)
+            views[f"{prefix}_weights"] = np.frombuffer(csr.weights, dtype=np.float32)
+            views[f"{prefix}_edge_ids"] = np.frombuffer(csr.edge_ids, dtype=np.int64)
+        return views
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactGraph(nodes={self.node_count}, edges={self.edge_count}, "
+            f"delta={self.delta_size}, bytes={self.memory_bytes()})"
+        )
@@ -5,7 +5,7 @@ Pure Python implementation - NO external graph libraries.
 Provides O(1) node/edge lookup and efficient traversal.
 """
 
-from typing import Dict, List, Set, Optional, Tuple, Iterator, Any
+from typing import Dict, List, Set, Optional, Tuple, Iterator, Any, Callable
 from dataclasses import dataclass, field
 from collections import defaultdict
 import json
@@ -13,6 +13,10 @@ import pickle
 
 from .graph_node import GraphNode
 from .graph_edge import GraphEdge, RelationType
+from .compact_graph import CompactGraph
+from .reachability_index import ReachabilityIndex
+from .path_search import SearchPath, bidirectional_bfs, k_shortest_paths
+from ..storage.columnar import write_columnar, ColumnarReader
 
 
 @dataclass
@@ -33,7 +37,7 @@ class GraphStore:
     - Pure Python (no networkx, no neo4j)
     - O(1) node/edge lookup
     - Efficient neighbor traversal
-    - Serializable to JSON/pickle
+    - Serializable to JSON/pickle/columnar binary
     
     Data Structures:
     - _nodes: Dict[node_id, GraphNode]
@@ -41,6 +45,7 @@ class GraphStore:
     - _outgoing: Dict[node_id, Set[edge_id]]  # Adjacency list
     - _incoming: Dict[node_id, Set[edge_id]]  # Reverse adjacency
     - _by_type: Dict[relation_type, Set[edge_id]]  # Index by relation type
+    - _compact: Optional CompactGraph (CSR arrays) after freeze()
     
     Example:
         >>> store = GraphStore()
@@ -50,6 +55,17 @@ class GraphStore:
         >>> neighbors = store.get_neighbors(1)
     """
     
+    # Column layout for save_binary / columnar snapshots (GraphNode/GraphEdge.to_dict keys)
+    NODE_COLUMNS = [
+        ("node_id", "i64"), ("text", "str"), ("node_type", "str"), ("stream", "str"),
+        ("confidence", "f64"), ("created_at", "ostr"), ("properties", "json"),
+    ]
+    EDGE_COLUMNS = [
+        ("edge_id", "i64"), ("source_id", "i64"), ("target_id", "i64"),
+        ("relation_type", "str"), ("weight", "f64"), ("evidence", "str"),
+        ("created_at", "ostr"), ("properties", "json"),
+    ]
+    
     def __init__(self):
         # === PRIMARY STORAGE ===
         self._nodes: Dict[int, GraphNode] = {}
@@ -66,6 +82,15 @@ class GraphStore:
         
         # === EDGE ID GENERATOR ===
         self._next_edge_id = 1
+        
+        # === COMPACT (CSR) MODE ===
+        self._compact: Optional[CompactGraph] = None
+        
+        # === CHANGE LISTENERS (not persisted) ===
+        self._listeners: List[Callable[[str, GraphEdge], None]] = []
+        
+        # === TRANSITIVE-CLOSURE INDICES (built on demand, not persisted) ===
+        self._reachability: Dict[frozenset, ReachabilityIndex] = {}
     
     # ═══════════════════════════════════════════════════════════════════
     # NODE OPERATIONS
@@ -73,7 +98,7 @@ class GraphStore:
     
     def add_node(self, node: GraphNode) -> int:
         """
-        Add a node to the graph.
+        Add a node to the graph (replacing any node with the same ID).
         
         Args:
             node: GraphNode to add
@@ -81,9 +106,17 @@ class GraphStore:
         Returns:
             node_id of the added node
         """
+        old = self._nodes.get(node.node_id)
+        if old is not None and old is not node:
+            # Replacing a node keeps its edges and drops its old index entries
+            node._outgoing_edge_ids = old._outgoing_edge_ids
+            node._incoming_edge_ids = old._incoming_edge_ids
+            self._by_node_type[old.node_type].discard(old.node_id)
+            self._by_text[old.text.lower()].discard(old.node_id)
         self._nodes[node.node_id] = node
         self._by_node_type[node.node_type].add(node.node_id)
         self._by_text[node.text.lower()].add(node.node_id)
+        self._notify("add_node", node)
         return node.node_id
     
     def add_node_simple(self, node_id: int, text: str, node_type: str = "token") -> int:
@@ -142,6 +175,7 @@ class GraphStore:
         self._outgoing.pop(node_id, None)
         self._incoming.pop(node_id, None)
         
+        self._notify("remove_node", node)
         return True
     
     def get_nodes_by_type(self, node_type: str) -> List[GraphNode]:
@@ -180,7 +214,8 @@ class GraphStore:
             relation_type: Type of relationship
             weight: Edge weight (0.0 to 1.0)
             evidence: Why this edge exists
-            edge_id: Optional specific edge ID (auto-generated if None)
+            edge_id: Optional specific edge ID (auto-generated if None);
+                an existing edge with this ID is replaced
         
         Returns:
             edge_id if successful, None if nodes don't exist
@@ -205,6 +240,23 @@ class GraphStore:
             weight=weight,
             evidence=evidence
         )
+        self._attach_edge(edge)
+        
+        return edge_id
+    
+    def _attach_edge(self, edge: GraphEdge) -> None:
+        """Store a fully built edge and update adjacency, indices and listeners."""
+        edge_id = edge.edge_id
+        source_id = edge.source_id
+        target_id = edge.target_id
+        self._next_edge_id = max(self._next_edge_id, edge_id + 1)
+        
+        # An explicit edge_id that is already taken replaces that edge. CSR
+        # tombstones are keyed by edge id, so fold this one in before reusing it
+        if edge_id in self._edges:
+            self.remove_edge(edge_id)
+            if self.compact is not None:
+                self._compact = self.compact.merged()
         
         # Store edge
         self._edges[edge_id] = edge
@@ -218,9 +270,16 @@ class GraphStore:
         self._nodes[target_id]._incoming_edge_ids.add(edge_id)
         
         # Update indices
-        self._by_relation_type[relation_type.value].add(edge_id)
+        self._by_relation_type[edge.relation_type.value].add(edge_id)
         
-        return edge_id
+        # Keep the CSR view in sync (delta), merging once deltas pile up
+        compact = self.compact
+        if compact is not None:
+            compact.add_edge(edge)
+            if compact.needs_merge:
+                self._compact = compact.merged()
+        
+        self._notify("add_edge", edge)
     
     def get_edge(self, edge_id: int) -> Optional[GraphEdge]:
         """Get edge by ID. O(1)."""
@@ -233,6 +292,9 @@ class GraphStore:
     def has_edge_between(self, source_id: int, target_id: int, 
                          relation_type: Optional[RelationType] = None) -> bool:
         """Check if an edge exists between two nodes."""
+        compact = self.compact
+        if compact is not None:
+            return compact.has_edge_between(source_id, target_id, relation_type)
         for edge_id in self._outgoing.get(source_id, set()):
             edge = self._edges.get(edge_id)
             if edge and edge.target_id == target_id:
@@ -268,8 +330,16 @@ class GraphStore:
         # Update indices
         self._by_relation_type[edge.relation_type.value].discard(edge_id)
         
+        compact = self.compact
+        if compact is not None:
+            compact.remove_edge(edge_id)
+            if compact.needs_merge:
+                self._compact = compact.merged()
+        
         # Remove edge
         del self._edges[edge_id]
+        
+        self._notify("remove_edge", edge)
         return True
     
     def get_edges_by_type(self, relation_type: RelationType) -> List[GraphEdge]:
@@ -336,6 +406,136 @@ class GraphStore:
         edge_ids = self._incoming.get(node_id, set())
         return [self._edges[eid] for eid in edge_ids if eid in self._edges]
     
+    def adjacent(
+        self,
+        node_id: int,
+        direction: str = "outgoing",
+        relation_types: Optional[List[RelationType]] = None
+    ) -> List[Tuple[int, int, RelationType, float]]:
+        """
+        Lightweight adjacency: (neighbor_id, edge_id, relation_type, weight).
+        
+        Reads the CSR arrays when the graph is frozen, otherwise the
+        adjacency sets. No GraphNode/GraphEdge objects are touched, so
+        traversal code should use this and call get_edge() only for the
+        edges it actually returns.
+        
+        Args:
+            node_id: Starting node
+            direction: "outgoing", "incoming", or "both"
+            relation_types: Allowed relation types (None = all)
+        """
+        compact = self.compact
+        if compact is not None:
+            return compact.adjacent(node_id, direction, relation_types)
+        
+        allowed = set(relation_types) if relation_types else None
+        results = []
+        if direction in ("outgoing", "both"):
+            for edge_id in self._outgoing.get(node_id, ()):
+                edge = self._edges.get(edge_id)
+                if edge and (allowed is None or edge.relation_type in allowed):
+                    results.append((edge.target_id, edge_id, edge.relation_type, edge.weight))
+        if direction in ("incoming", "both"):
+            for edge_id in self._incoming.get(node_id, ()):
+                edge = self._edges.get(edge_id)
+                if edge and (allowed is None or edge.relation_type in allowed):
+                    results.append((edge.source_id, edge_id, edge.relation_type, edge.weight))
+        return results
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # CHANGE LISTENERS
+    # ═══════════════════════════════════════════════════════════════════
+    
+    def add_listener(self, callback: Callable[[str, GraphEdge], None]) -> None:
+        """
+        Subscribe to graph changes.
+        
+        callback(event, item) is called after each change: event is
+        "add_edge" / "remove_edge" with the GraphEdge, or "add_node" /
+        "remove_node" with the GraphNode. Used to maintain derived
+        structures (inference results, reachability indices, write-ahead
+        logs) incrementally.
+        """
+        listeners = self.__dict__.setdefault("_listeners", [])
+        if callback not in listeners:
+            listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, GraphEdge], None]) -> None:
+        listeners = getattr(self, "_listeners", [])
+        if callback in listeners:
+            listeners.remove(callback)
+    
+    def _notify(self, event: str, edge: GraphEdge) -> None:
+        for callback in list(getattr(self, "_listeners", ())):
+            callback(event, edge)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Listeners are bound methods of other components - don't pickle them
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        state["_reachability"] = {}
+        return state
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # REACHABILITY
+    # ═══════════════════════════════════════════════════════════════════
+    
+    def reachability(self, relations: List[RelationType]) -> ReachabilityIndex:
+        """
+        Transitive-closure index over the given relation types.
+        
+        Created on first use and kept up to date as edges change, so
+        "is X a Y", ancestor sets and cycle checks don't walk the graph.
+        
+        Args:
+            relations: Relation types followed as one reachability relation
+        """
+        key = frozenset(relations)
+        indices = self.__dict__.setdefault("_reachability", {})
+        index = indices.get(key)
+        if index is None:
+            index = ReachabilityIndex(self, key)
+            indices[key] = index
+            self.add_listener(index._on_graph_event)
+        return index
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # COMPACT (CSR) MODE
+    # ═══════════════════════════════════════════════════════════════════
+    
+    def freeze(self, merge_threshold: float = 0.25) -> CompactGraph:
+        """
+        Pack adjacency into CSR arrays for fast, low-overhead traversal.
+        
+        The store keeps working normally afterwards: new/removed edges are
+        recorded as deltas on the CompactGraph and merged into fresh arrays
+        once they exceed merge_threshold * frozen edges. Edge weights are
+        captured at freeze time - call freeze() again after bulk weight edits.
+        
+        Args:
+            merge_threshold: Delta fraction that triggers a merge
+        
+        Returns:
+            The CompactGraph (also available as ``store.compact``)
+        """
+        self._compact = CompactGraph.from_store(self, merge_threshold=merge_threshold)
+        return self._compact
+    
+    def thaw(self) -> None:
+        """Drop the CSR arrays and go back to pure dict/set adjacency."""
+        self._compact = None
+    
+    @property
+    def compact(self) -> Optional[CompactGraph]:
+        """The CompactGraph if frozen, else None."""
+        # getattr: stores pickled before compact mode existed
+        return getattr(self, "_compact", None)
+    
+    @property
+    def is_frozen(self) -> bool:
+        return self.compact is not None
+    
     # ═══════════════════════════════════════════════════════════════════
     # PATH FINDING
     # ═══════════════════════════════════════════════════════════════════
@@ -347,7 +547,7 @@ class GraphStore:
         max_depth: int = 5
     ) -> Optional[List[Tuple[GraphNode, Optional[GraphEdge]]]]:
         """
-        Find shortest path between two nodes using BFS.
+        Find shortest path between two nodes (bidirectional BFS).
         
         Args:
             source_id: Starting node ID
@@ -362,48 +562,14 @@ class GraphStore:
         if source_id not in self._nodes or target_id not in self._nodes:
             return None
         
-        if source_id == target_id:
-            return [(self._nodes[source_id], None)]
-        
-        # BFS with path tracking
-        visited = {source_id}
-        # Queue: (current_node_id, path_so_far)
-        # path_so_far is list of (node_id, edge_id_to_get_here)
-        queue = [(source_id, [(source_id, None)])]
-        
-        while queue:
-            current_id, path = queue.pop(0)
-            
-            if len(path) > max_depth:
-                continue
-            
-            # Explore neighbors
-            for edge_id in self._outgoing.get(current_id, set()):
-                edge = self._edges.get(edge_id)
-                if not edge:
-                    continue
-                
-                next_id = edge.target_id
-                
-                if next_id == target_id:
-                    # Found! Build result path
-                    result_path = []
-                    for nid, eid in path:
-                        node = self._nodes[nid]
-                        edge_obj = self._edges.get(eid) if eid else None
-                        result_path.append((node, edge_obj))
-                    # Add the edge to target
-                    result_path[-1] = (result_path[-1][0], edge)
-                    # Add target node
-                    result_path.append((self._nodes[target_id], None))
-                    return result_path
-                
-                if next_id not in visited:
-                    visited.add(next_id)
-                    new_path = path + [(next_id, edge_id)]
-                    queue.append((next_id, new_path))
-        
-        return None  # No path found
+        path = bidirectional_bfs(
+            lambda nid: self.adjacent(nid, "outgoing"),
+            lambda nid: self.adjacent(nid, "incoming"),
+            source_id, target_id, max_depth=max_depth
+        )
+        if path is None:
+            return None  # No path found
+        return self._materialize_path(path)
     
     def find_all_paths(
         self,
@@ -413,56 +579,33 @@ class GraphStore:
         max_paths: int = 10
     ) -> List[List[Tuple[GraphNode, Optional[GraphEdge]]]]:
         """
-        Find all paths between two nodes using DFS.
+        Find the shortest loopless paths between two nodes (Yen's algorithm).
         
         Args:
             source_id: Starting node ID
             target_id: Target node ID
-            max_depth: Maximum path length
+            max_depth: Maximum number of nodes on a path (so at most
+                max_depth - 1 edges, as in the earlier DFS version)
             max_paths: Maximum number of paths to return
         
         Returns:
-            List of paths, where each path is a list of (node, edge) tuples
+            List of paths (fewest hops first), where each path is a list
+            of (node, edge) tuples
         """
         if source_id not in self._nodes or target_id not in self._nodes:
             return []
         
-        all_paths = []
-        
-        def dfs(current_id: int, path: List[Tuple[int, Optional[int]]], visited: Set[int]):
-            if len(all_paths) >= max_paths:
-                return
-            if len(path) > max_depth:
-                return
-            
-            if current_id == target_id:
-                # Convert path to result format
-                result = []
-                for i, (nid, eid) in enumerate(path):
-                    node = self._nodes[nid]
-                    edge = self._edges.get(eid) if eid else None
-                    result.append((node, edge))
-                all_paths.append(result)
-                return
-            
-            # Explore neighbors
-            for edge_id in self._outgoing.get(current_id, set()):
-                edge = self._edges.get(edge_id)
-                if not edge or edge.target_id in visited:
-                    continue
-                
-                next_id = edge.target_id
-                visited.add(next_id)
-                path.append((next_id, edge_id if next_id != target_id else None))
-                # Fix: set the edge on previous node
-                if len(path) >= 2:
-                    path[-2] = (path[-2][0], edge_id)
-                dfs(next_id, path, visited)
-                path.pop()
-                visited.remove(next_id)
-        
-        dfs(source_id, [(source_id, None)], {source_id})
-        return all_paths
+        paths = k_shortest_paths(
+            lambda nid: self.adjacent(nid, "outgoing"),
+            source_id, target_id, max_paths, max_depth=max_depth - 1
+        )
+        return [self._materialize_path(path) for path in paths]
+    
+    def _materialize_path(self, path: SearchPath) -> List[Tuple[GraphNode, Optional[GraphEdge]]]:
+        """Turn node/edge ids into (node, edge_to_next) tuples."""
+        edges: List[Optional[GraphEdge]] = [self._edges.get(eid) for eid in path.edge_ids]
+        edges.append(None)
+        return [(self._nodes[nid], edge) for nid, edge in zip(path.nodes, edges)]
     
     # ═══════════════════════════════════════════════════════════════════
     # STATISTICS
@@ -568,6 +711,38 @@ class GraphStore:
         with open(filepath, 'rb') as f:
             return pickle.load(f)
     
+    def columnar_tables(self) -> Dict[str, Any]:
+        """Nodes and edges as columnar tables (see storage.columnar)."""
+        return {
+            "graph_nodes": (self.NODE_COLUMNS, [n.to_dict() for n in self._nodes.values()]),
+            "graph_edges": (self.EDGE_COLUMNS, [e.to_dict() for e in self._edges.values()]),
+        }
+    
+    @classmethod
+    def from_columnar(cls, reader: ColumnarReader) -> "GraphStore":
+        """Rebuild from the graph_nodes / graph_edges tables of a snapshot."""
+        store = cls()
+        for row in reader.records("graph_nodes"):
+            store.add_node(GraphNode.from_dict(row))
+        for row in reader.records("graph_edges"):
+            edge = GraphEdge.from_dict(row)
+            if edge.source_id in store._nodes and edge.target_id in store._nodes:
+                store._attach_edge(edge)
+        store._next_edge_id = max(store._next_edge_id, reader.meta.get("next_edge_id", 1))
+        return store
+    
+    def save_binary(self, filepath: str) -> int:
+        """Save graph as a columnar binary snapshot; returns bytes written."""
+        return write_columnar(
+            filepath, self.columnar_tables(), meta={"next_edge_id": self._next_edge_id}
+        )
+    
+    @classmethod
+    def load_binary(cls, filepath: str) -> "GraphStore":
+        """Load graph from a columnar binary snapshot (memory-mapped)."""
+        with ColumnarReader(filepath) as reader:
+            return cls.from_columnar(reader)
+    
     # ═══════════════════════════════════════════════════════════════════
     # DISPLAY
     # ═══════════════════════════════════════════════════════════════════
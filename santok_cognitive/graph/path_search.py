@@ -0,0 +1,378 @@
+"""
+Path search over GraphStore adjacency.
+
+Pure Python - all searches keep parent pointers instead of copying paths,
+and take an ``expand(node_id)`` callable returning
+(neighbor_id, edge_id, relation_type, weight) tuples, i.e. a bound
+``GraphStore.adjacent`` (dict or CSR backed):
+
+- bfs_path:              unweighted shortest path (deque frontier)
+- bidirectional_bfs:     unweighted shortest path growing from both ends
+- best_path:             Dijkstra, or A* when a heuristic is given
+- k_shortest_paths:      Yen's algorithm (k best loopless paths)
+- all_paths:             every loopless path up to a hop limit (DFS)
+"""
+
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .graph_edge import RelationType
+
+
+Adjacency = List[Tuple[int, int, RelationType, float]]
+Expand = Callable[[int], Adjacency]
+CostFn = Callable[[RelationType, float], float]
+
+# node -> (previous node, edge id) ; None for the search root
+_Parents = Dict[int, Optional[Tuple[int, int]]]
+
+
+@dataclass
+class SearchPath:
+    """A path as node ids, the edge ids between them, and its cost."""
+    nodes: List[int]
+    edge_ids: List[int]
+    cost: float = 0.0
+    step_costs: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def hops(self) -> int:
+        return len(self.edge_ids)
+
+
+def hop_cost(relation: RelationType, weight: float) -> float:
+    """Every edge costs 1 (shortest = fewest hops)."""
+    return 1.0
+
+
+def _unwind(parents: _Parents, node: int) -> Tuple[List[int], List[int]]:
+    """Follow parent pointers back to the root; returns root-first lists."""
+    nodes = [node]
+    edge_ids = []
+    link = parents[node]
+    while link is not None:
+        prev, edge_id = link
+        nodes.append(prev)
+        edge_ids.append(edge_id)
+        link = parents[prev]
+    nodes.reverse()
+    edge_ids.reverse()
+    return nodes, edge_ids
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# UNWEIGHTED
+# ═══════════════════════════════════════════════════════════════════════
+
+def bfs_path(
+    expand: Expand,
+    source: int,
+    target: int,
+    max_depth: Optional[int] = None
+) -> Optional[SearchPath]:
+    """
+    Shortest path by hop count.
+
+    Args:
+        expand: Adjacency function
+        source: Start node
+        target: Goal node
+        max_depth: Maximum number of edges (None = unlimited)
+    """
+    if source == target:
+        return SearchPath([source], [])
+
+    parents: _Parents = {source: None}
+    queue = deque([(source, 0)])
+
+    while queue:
+        node, depth = queue.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for neighbor, edge_id, _, _ in expand(node):
+            if neighbor in parents:
+                continue
+            parents[neighbor] = (node, edge_id)
+            if neighbor == target:
+                nodes, edge_ids = _unwind(parents, target)
+                return SearchPath(nodes, edge_ids, float(len(edge_ids)))
+            queue.append((neighbor, depth + 1))
+
+    return None
+
+
+def bidirectional_bfs(
+    forward: Expand,
+    backward: Expand,
+    source: int,
+    target: int,
+    max_depth: Optional[int] = None
+) -> Optional[SearchPath]:
+    """
+    Shortest path by hop count, searching from both ends.
+
+    Always grows the smaller frontier by one full level, so the explored
+    area is ~2·b^(d/2) instead of b^d.
+
+    Args:
+        forward: Adjacency following edges forward (e.g. outgoing)
+        backward: Adjacency following edges backward (e.g. incoming);
+            pass the same function as forward for undirected search
+        source: Start node
+        target: Goal node
+        max_depth: Maximum number of edges (None = unlimited)
+    """
+    if source == target:
+        return SearchPath([source], [])
+
+    parents_f: _Parents = {source: None}
+    parents_b: _Parents = {target: None}
+    dist_f = {source: 0}
+    dist_b = {target: 0}
+    frontier_f = [source]
+    frontier_b = [target]
+    depth_f = depth_b = 0
+
+    while frontier_f and frontier_b:
+        if max_depth is not None and depth_f + depth_b >= max_depth:
+            return None
+
+        if len(frontier_f) <= len(frontier_b):
+            frontier_f, meet = _expand_level(forward, frontier_f, parents_f, dist_f, dist_b)
+            depth_f += 1
+        else:
+            frontier_b, meet = _expand_level(backward, frontier_b, parents_b, dist_b, dist_f)
+            depth_b += 1
+
+        if meet is not None:
+            head_nodes, head_edges = _unwind(parents_f, meet)
+            tail_nodes, tail_edges = _unwind(parents_b, meet)
+            nodes = head_nodes + tail_nodes[::-1][1:]
+            edge_ids = head_edges + tail_edges[::-1]
+            return SearchPath(nodes, edge_ids, float(len(edge_ids)))
+
+    return None
+
+
+def _expand_level(
+    expand: Expand,
+    frontier: List[int],
+    parents: _Parents,
+    dist: Dict[int, int],
+    other_dist: Dict[int, int]
+) -> Tuple[List[int], Optional[int]]:
+    """Expand one BFS level; return the next frontier and the best meeting node."""
+    next_frontier = []
+    meet = None
+    best = None
+    for node in frontier:
+        depth = dist[node] + 1
+        for neighbor, edge_id, _, _ in expand(node):
+            if neighbor in parents:
+                continue
+            parents[neighbor] = (node, edge_id)
+            dist[neighbor] = depth
+            next_frontier.append(neighbor)
+            other = other_dist.get(neighbor)
+            if other is not None and (best is None or other < best):
+                best = other
+                meet = neighbor
+    return next_frontier, meet
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# WEIGHTED
+# ═══════════════════════════════════════════════════════════════════════
+
+def best_path(
+    expand: Expand,
+    source: int,
+    target: int,
+    cost: CostFn = hop_cost,
+    heuristic: Optional[Callable[[int], float]] = None,
+    banned_nodes: Optional[Set[int]] = None,
+    banned_edges: Optional[Set[int]] = None
+) -> Optional[SearchPath]:
+    """
+    Lowest-cost path (Dijkstra; A* when heuristic is given).
+
+    Args:
+        expand: Adjacency function
+        source: Start node
+        target: Goal node
+        cost: Non-negative cost of an edge from (relation, weight)
+        heuristic: Admissible estimate of remaining cost from a node
+        banned_nodes: Nodes that may not be entered
+        banned_edges: Edge ids that may not be used
+    """
+    banned_nodes = banned_nodes or set()
+    banned_edges = banned_edges or set()
+
+    best = {source: 0.0}
+    steps: Dict[int, float] = {source: 0.0}
+    parents: _Parents = {source: None}
+    done: Set[int] = set()
+    start_h = heuristic(source) if heuristic else 0.0
+    heap = [(start_h, 0.0, source)]
+
+    while heap:
+        _, g, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        if node == target:
+            nodes, edge_ids = _unwind(parents, target)
+            return SearchPath(nodes, edge_ids, g, [steps[n] for n in nodes[1:]])
+        done.add(node)
+
+        for neighbor, edge_id, relation, weight in expand(node):
+            if neighbor in done or neighbor in banned_nodes or edge_id in banned_edges:
+                continue
+            step = cost(relation, weight)
+            new_g = g + step
+            if new_g < best.get(neighbor, float("inf")):
+                best[neighbor] = new_g
+                steps[neighbor] = step
+                parents[neighbor] = (node, edge_id)
+                h = heuristic(neighbor) if heuristic else 0.0
+                heapq.heappush(heap, (new_g + h, new_g, neighbor))
+
+    return None
+
+
+def k_shortest_paths(
+    expand: Expand,
+    source: int,
+    target: int,
+    k: int,
+    cost: CostFn = hop_cost,
+    max_depth: Optional[int] = None
+) -> List[SearchPath]:
+    """
+    The k lowest-cost loopless paths (Yen's algorithm), cheapest first.
+
+    Args:
+        expand: Adjacency function
+        source: Start node
+        target: Goal node
+        k: Number of paths
+        cost: Non-negative cost of an edge from (relation, weight)
+        max_depth: Drop paths with more edges than this (None = no limit).
+            With hop_cost the first longer path ends the search; with
+            other costs candidates are still generated in cost order, so
+            the search gives up after 10·k rejected candidates.
+    """
+    if k <= 0:
+        return []
+    first = best_path(expand, source, target, cost)
+    if first is None:
+        return []
+
+    accepted: List[SearchPath] = []
+    generated = [first]          # every path spur searches branch from
+    candidates: List[Tuple[float, int, SearchPath]] = []
+    seen = {tuple(first.edge_ids)}
+    counter = 0
+    rejected = 0
+
+    def consider(path: SearchPath) -> bool:
+        nonlocal rejected
+        if max_depth is not None and path.hops > max_depth:
+            # Hop costs come out in length order: nothing later fits either
+            rejected += 10 * k + 1 if cost is hop_cost else 1
+            return False
+        accepted.append(path)
+        return True
+
+    consider(first)
+    last = first
+
+    while len(accepted) < k and rejected <= 10 * k:
+        for i in range(len(last.nodes) - 1):
+            spur = last.nodes[i]
+            root_nodes = last.nodes[:i + 1]
+            root_edges = last.edge_ids[:i]
+
+            banned_edges = {
+                p.edge_ids[i] for p in generated
+                if len(p.edge_ids) > i and p.edge_ids[:i] == root_edges
+                and p.nodes[:i + 1] == root_nodes
+            }
+            banned_nodes = set(root_nodes[:-1])
+
+            spur_path = best_path(
+                expand, spur, target, cost,
+                banned_nodes=banned_nodes, banned_edges=banned_edges
+            )
+            if spur_path is None:
+                continue
+
+            edge_ids = root_edges + spur_path.edge_ids
+            key = tuple(edge_ids)
+            if key in seen:
+                continue
+            seen.add(key)
+            step_costs = last.step_costs[:i] + spur_path.step_costs
+            path = SearchPath(
+                root_nodes[:-1] + spur_path.nodes, edge_ids,
+                sum(step_costs), step_costs
+            )
+            counter += 1
+            heapq.heappush(candidates, (path.cost, counter, path))
+
+        if not candidates:
+            break
+        _, _, last = heapq.heappop(candidates)
+        generated.append(last)
+        consider(last)
+
+    return accepted
+
+
+def all_paths(
+    expand: Expand,
+    source: int,
+    target: int,
+    max_depth: int
+) -> List[SearchPath]:
+    """
+    Every loopless path with at most max_depth edges, in DFS order.
+
+    Exponential in max_depth on dense graphs; prefer k_shortest_paths when
+    only the best few paths are needed.
+    """
+    if source == target:
+        return [SearchPath([source], [])]
+    if max_depth < 1:
+        return []
+
+    found: List[SearchPath] = []
+    nodes = [source]
+    edge_ids: List[int] = []
+    on_path = {source}
+    # One adjacency iterator per node on the current path
+    stack = [iter(expand(source))]
+
+    while stack:
+        step = next(stack[-1], None)
+        if step is None:
+            stack.pop()
+            on_path.discard(nodes.pop())
+            if edge_ids:
+                edge_ids.pop()
+            continue
+        neighbor, edge_id = step[0], step[1]
+        if neighbor in on_path:
+            continue
+        if neighbor == target:
+            found.append(SearchPath(nodes + [target], edge_ids + [edge_id], float(len(edge_ids) + 1)))
+            continue
+        if len(edge_ids) + 1 >= max_depth:
+            continue
+        nodes.append(neighbor)
+        edge_ids.append(edge_id)
+        on_path.add(neighbor)
+        stack.append(iter(expand(neighbor)))
+
+    return found
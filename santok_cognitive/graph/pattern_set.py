@@ -0,0 +1,216 @@
+"""
+CompiledPatternSet - Many extraction regexes behind one trigger prefilter.
+
+Relation patterns like ``(\\w+)\\s+causes\\s+(\\w+)`` are expensive to run
+(the capture groups try every word position) but each one needs some
+literal text - here "causes" - to match at all. When a pattern is added,
+its regex is parsed and the most selective set of literals that any
+match must contain is kept as its triggers:
+
+    (\\w+)\\s+causes\\s+(\\w+)                 -> {"causes"}
+    (\\w+)\\s+(?:causes?|leads?\\s+to)\\s+(\\w+) -> {"cause", "lead"}
+
+candidates(text) case-folds the text once and returns only the patterns
+whose triggers occur; only those run their full regex. Patterns without
+a usable trigger (nothing but classes and groups) always run.
+
+Word-character triggers can only occur inside a word of the text, so
+they are found per distinct word by looking up the word's substrings of
+each trigger length in a dict, and the result is cached per word. The
+cost of a text is then about one dict lookup per word, however many
+patterns there are. Triggers containing other characters fall back to a
+substring scan each.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+_WORD_RE = re.compile(r"\w+")
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(sre_parse.POSSESSIVE_REPEAT)
+
+
+def required_literals(pattern: str, min_length: int = 2, flags: int = 0) -> Optional[Set[str]]:
+    """
+    Lowercased literals of which every match of pattern contains one.
+
+    flags are the re flags the pattern is compiled with (re.VERBOSE
+    changes what is literal). Returns None when no such set of strings of
+    at least min_length characters can be derived (the pattern must
+    always run).
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError):
+        return None
+    found = _required(list(parsed), min_length)
+    return {_fold(s) for s in found} if found else None
+
+
+def _fold(text: str) -> str:
+    """Case folding at least as loose as re.IGNORECASE (e.g. 'ſ' -> 's')."""
+    # re matches both dotted and dotless I against 'i'; casefold() turns
+    # 'İ' into 'i' + U+0307, so map it before folding
+    return text.replace("\u0130", "i").casefold().replace("\u0131", "i")
+
+
+def _required(items: List[Tuple[Any, Any]], min_length: int) -> Optional[Set[str]]:
+    """Best trigger set for a parsed sequence (longest shortest-literal)."""
+    candidates: List[Set[str]] = []
+    run: List[str] = []
+
+    def flush() -> None:
+        if len(run) >= min_length:
+            candidates.append({"".join(run)})
+        run.clear()
+
+    for op, arg in items:
+        if op == sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        flush()
+        if op == sre_parse.SUBPATTERN:
+            found = _required(list(arg[-1]), min_length)
+        elif op == sre_parse.BRANCH:
+            found = set()
+            for alternative in arg[1]:
+                alt = _required(list(alternative), min_length)
+                if alt is None:
+                    found = None
+                    break
+                found |= alt
+        elif op in _REPEATS and arg[0] >= 1:
+            found = _required(list(arg[2]), min_length)
+        elif getattr(sre_parse, "ATOMIC_GROUP", None) == op:
+            found = _required(list(arg), min_length)
+        else:
+            found = None
+        if found:
+            candidates.append(found)
+    flush()
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: (min(len(s) for s in c), -len(c)))
+
+
+class CompiledPatternSet:
+    """
+    Regexes with payloads, filtered by required trigger literals.
+
+    Example:
+        patterns = CompiledPatternSet()
+        patterns.add(r"(\\w+)\\s+causes\\s+(\\w+)", RelationType.CAUSES)
+        patterns.add(r"(\\w+)\\s+uses\\s+(\\w+)", RelationType.USES)
+
+        for index in patterns.candidates("Smoking causes cancer"):
+            regex, relation = patterns.regex(index), patterns.payload(index)
+            ...                               # only the CAUSES pattern runs
+    """
+
+    def __init__(self, flags: int = re.IGNORECASE, min_trigger_length: int = 2):
+        """
+        Args:
+            flags: re flags every pattern is compiled with
+            min_trigger_length: Shorter literals are not used as triggers
+        """
+        self.flags = flags
+        self.min_trigger_length = min_trigger_length
+        self._regexes: List[re.Pattern] = []
+        self._payloads: List[Any] = []
+        self._triggers: List[Optional[Set[str]]] = []
+        self._by_trigger: Dict[str, List[int]] = {}     # non-word triggers (scanned)
+        self._by_word_trigger: Dict[str, List[int]] = {}
+        self._word_lengths: List[int] = []
+        self._always: List[int] = []
+        self._word_cache: Dict[str, Tuple[int, ...]] = {}
+    
+    WORD_CACHE_SIZE = 100_000
+
+    def add(self, pattern: str, payload: Any = None) -> int:
+        """Compile and index a pattern; returns its index."""
+        index = len(self._regexes)
+        self._regexes.append(re.compile(pattern, self.flags))
+        self._payloads.append(payload)
+
+        triggers = required_literals(pattern, self.min_trigger_length, self.flags)
+        self._triggers.append(triggers)
+        if triggers is None:
+            self._always.append(index)
+        else:
+            for trigger in triggers:
+                if _WORD_RE.fullmatch(trigger):
+                    self._by_word_trigger.setdefault(trigger, []).append(index)
+                else:
+                    self._by_trigger.setdefault(trigger, []).append(index)
+            self._word_lengths = sorted({len(t) for t in self._by_word_trigger})
+            self._word_cache = {}
+        return index
+
+    def regex(self, index: int) -> re.Pattern:
+        return self._regexes[index]
+
+    def payload(self, index: int) -> Any:
+        return self._payloads[index]
+
+    def triggers(self, index: int) -> Optional[Set[str]]:
+        return self._triggers[index]
+
+    def candidates(self, text: str) -> List[int]:
+        """Indices (ascending) of patterns that may match text."""
+        lowered = text.lower() if text.isascii() else _fold(text)
+        hits = set(self._always)
+        cache = self._word_cache
+        for word in set(_WORD_RE.findall(lowered)):
+            found = cache.get(word)
+            if found is None:
+                found = self._word_hits(word)
+                if len(cache) >= self.WORD_CACHE_SIZE:
+                    cache.clear()
+                cache[word] = found
+            hits.update(found)
+        for trigger, indices in self._by_trigger.items():
+            if trigger in lowered:
+                hits.update(indices)
+        return sorted(hits)
+    
+    def _word_hits(self, word: str) -> Tuple[int, ...]:
+        """Patterns with a word trigger that is a substring of word."""
+        by_trigger = self._by_word_trigger
+        found = set()
+        for length in self._word_lengths:
+            if length > len(word):
+                break
+            for start in range(len(word) - length + 1):
+                indices = by_trigger.get(word[start:start + length])
+                if indices:
+                    found.update(indices)
+        return tuple(found)
+
+    def finditer(self, text: str):
+        """(index, match) for every match of every candidate pattern, in pattern order."""
+        for index in self.candidates(text):
+            for match in self._regexes[index].finditer(text):
+                yield index, match
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "patterns": len(self._regexes),
+            "triggers": len(self._by_word_trigger) + len(self._by_trigger),
+            "always_run": len(self._always),
+        }
+
+    def __len__(self) -> int:
+        return len(self._regexes)
+
+    def __repr__(self) -> str:
+        s = self.stats()
+        return f"CompiledPatternSet(patterns={s['patterns']}, triggers={s['triggers']}, always_run={s['always_run']})"
@@ -0,0 +1,329 @@
+"""
+ReachabilityIndex: Precomputed transitive closure for hierarchy relations.
+
+Pure Python - answers "does X reach Y through IS_A (or PART_OF, ...)" without
+walking the graph:
+
+1. Edges of the indexed relations are condensed into strongly connected
+   components (iterative Tarjan). Component ids are assigned in Tarjan's
+   completion order, which is a post-order of the condensed DAG.
+2. Each component stores the set of component ids it reaches as a sorted
+   list of merged intervals. Because ids are post-order numbers, a DFS
+   subtree is one contiguous interval, so tree-like hierarchies need ~1
+   interval per node and multiple inheritance adds a few more.
+3. reaches(u, v) = binary search of v's component id in u's intervals.
+
+Kept up to date through GraphStore listeners:
+- a new edge that does not close a cycle merges the target's intervals into
+  the source and its ancestors (stops where nothing changes)
+- an edge that closes a cycle, or any removal, marks the index dirty and it
+  is rebuilt on the next query
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Iterable, Any
+
+from .graph_edge import GraphEdge, RelationType
+
+
+Interval = Tuple[int, int]
+
+
+def _merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sort and merge overlapping/adjacent integer intervals."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ReachabilityIndex:
+    """
+    Transitive-closure index over one or more relation types.
+
+    Edges of all given relation types count as one reachability relation,
+    e.g. ReachabilityIndex(graph, [IS_A, PART_OF]) follows mixed chains.
+
+    Example:
+        >>> is_a = graph.reachability([RelationType.IS_A])
+        >>> is_a.reaches(dog_id, animal_id)        # dog IS_A* animal
+        True
+        >>> is_a.closure(dog_id)                   # all supertypes
+        {mammal_id, animal_id}
+        >>> is_a.would_create_cycle(animal_id, dog_id)
+        True
+    """
+
+    def __init__(self, graph: Any, relations: Iterable[RelationType]):
+        """
+        Build the index.
+
+        Args:
+            graph: GraphStore to index
+            relations: Relation types whose edges are followed
+        """
+        self.graph = graph
+        self.relations: frozenset = frozenset(relations)
+
+        self._comp_of: Dict[int, int] = {}              # node_id -> component
+        self._members: List[List[int]] = []             # component -> node_ids
+        self._succ: List[Set[int]] = []                 # condensed DAG
+        self._pred: List[Set[int]] = []
+        self._intervals: List[List[Interval]] = []      # component -> reach set
+        self._ancestor_cache: Dict[int, Set[int]] = {}
+        self._dirty = True
+
+    # ═══════════════════════════════════════════════════════════════════
+    # QUERIES
+    # ═══════════════════════════════════════════════════════════════════
+
+    def reaches(self, source_id: int, target_id: int) -> bool:
+        """True if target is reachable from source (a node reaches itself)."""
+        if source_id == target_id:
+            return True
+        self._ensure_built()
+        source = self._comp_of.get(source_id)
+        target = self._comp_of.get(target_id)
+        if source is None or target is None:
+            return False
+        return self._comp_reaches(source, target)
+
+    def would_create_cycle(self, source_id: int, target_id: int) -> bool:
+        """True if adding source -> target would close a cycle."""
+        return self.reaches(target_id, source_id)
+
+    def closure(self, node_id: int, direction: str = "outgoing") -> Set[int]:
+        """
+        All nodes reachable from node_id ("outgoing", e.g. supertypes) or
+        that reach node_id ("incoming", e.g. subtypes). Excludes node_id.
+        """
+        self._ensure_built()
+        comp = self._comp_of.get(node_id)
+        if comp is None:
+            return set()
+
+        if direction == "outgoing":
+            comps: Iterable[int] = (
+                c for start, end in self._intervals[comp] for c in range(start, end + 1)
+            )
+        else:
+            comps = self._ancestors(comp)
+
+        members = self._members
+        result = {nid for c in comps for nid in members[c]}
+        result.discard(node_id)
+        return result
+
+    def common(self, node_ids: List[int], direction: str = "outgoing") -> Set[int]:
+        """Nodes in the closure of every given node (e.g. shared supertypes)."""
+        if not node_ids:
+            return set()
+        candidates = self.closure(node_ids[0], direction)
+        for other in node_ids[1:]:
+            if not candidates:
+                break
+            if direction == "outgoing":
+                candidates = {c for c in candidates if c != other and self.reaches(other, c)}
+            else:
+                candidates = {c for c in candidates if c != other and self.reaches(c, other)}
+        return candidates
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_built()
+        interval_count = sum(len(iv) for iv in self._intervals)
+        return {
+            "relations": sorted(r.value for r in self.relations),
+            "nodes": len(self._comp_of),
+            "components": len(self._members),
+            "intervals": interval_count,
+            "avg_intervals": interval_count / len(self._members) if self._members else 0.0,
+        }
+
+    # ═══════════════════════════════════════════════════════════════════
+    # MAINTENANCE
+    # ═══════════════════════════════════════════════════════════════════
+
+    def rebuild(self) -> None:
+        """Recompute components and intervals from the graph."""
+        adjacency: Dict[int, List[int]] = defaultdict(list)
+        for relation in self.relations:
+            for edge in self.graph.get_edges_by_type(relation):
+                adjacency[edge.source_id].append(edge.target_id)
+                adjacency.setdefault(edge.target_id, [])
+
+        components = self._strongly_connected(adjacency)
+
+        self._comp_of = {}
+        for comp, members in enumerate(components):
+            for node_id in members:
+                self._comp_of[node_id] = comp
+        self._members = components
+        self._succ = [set() for _ in components]
+        self._pred = [set() for _ in components]
+        for source_id, targets in adjacency.items():
+            source = self._comp_of[source_id]
+            for target_id in targets:
+                target = self._comp_of[target_id]
+                if target != source:
+                    self._succ[source].add(target)
+                    self._pred[target].add(source)
+
+        # Successors complete before their predecessors (reverse topological)
+        self._intervals = []
+        for comp in range(len(components)):
+            spans = [(comp, comp)]
+            for succ in self._succ[comp]:
+                spans.extend(self._intervals[succ])
+            self._intervals.append(_merge_intervals(spans))
+
+        self._ancestor_cache = {}
+        self._dirty = False
+
+    def add_edge(self, source_id: int, target_id: int) -> None:
+        """Account for a new edge of an indexed relation."""
+        if self._dirty:
+            return
+        if self.reaches(target_id, source_id):
+            # Closes a cycle: components merge, rebuild lazily
+            self._dirty = True
+            return
+
+        source = self._component(source_id)
+        target = self._component(target_id)
+        self._ancestor_cache = {}
+        if target in self._succ[source]:
+            return
+        self._succ[source].add(target)
+        self._pred[target].add(source)
+        if self._comp_reaches(source, target):
+            return
+
+        # Push target's reach set up through source and its ancestors
+        added = self._intervals[target]
+        stack = [source]
+        seen = {source}
+        while stack:
+            comp = stack.pop()
+            merged = _merge_intervals(self._intervals[comp] + added)
+            if merged == self._intervals[comp]:
+                continue
+            self._intervals[comp] = merged
+            for pred in self._pred[comp]:
+                if pred not in seen:
+                    seen.add(pred)
+                    stack.append(pred)
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def _on_graph_event(self, event: str, edge: GraphEdge) -> None:
+        if event not in ("add_edge", "remove_edge") or edge.relation_type not in self.relations:
+            return
+        if event == "add_edge":
+            self.add_edge(edge.source_id, edge.target_id)
+        else:
+            self._dirty = True
+
+    # ═══════════════════════════════════════════════════════════════════
+    # INTERNALS
+    # ═══════════════════════════════════════════════════════════════════
+
+    def _ensure_built(self) -> None:
+        if self._dirty:
+            self.rebuild()
+
+    def _comp_reaches(self, source: int, target: int) -> bool:
+        intervals = self._intervals[source]
+        i = bisect_right(intervals, (target, float("inf"))) - 1
+        return i >= 0 and intervals[i][1] >= target
+
+    def _component(self, node_id: int) -> int:
+        """Component of a node, creating a singleton for unseen nodes."""
+        comp = self._comp_of.get(node_id)
+        if comp is None:
+            comp = len(self._members)
+            self._comp_of[node_id] = comp
+            self._members.append([node_id])
+            self._succ.append(set())
+            self._pred.append(set())
+            self._intervals.append([(comp, comp)])
+        return comp
+
+    def _ancestors(self, comp: int) -> Set[int]:
+        """Components that reach comp (including itself), cached."""
+        cached = self._ancestor_cache.get(comp)
+        if cached is not None:
+            return cached
+        seen = {comp}
+        stack = [comp]
+        while stack:
+            current = stack.pop()
+            for pred in self._pred[current]:
+                if pred not in seen:
+                    seen.add(pred)
+                    stack.append(pred)
+        self._ancestor_cache[comp] = seen
+        return seen
+
+    @staticmethod
+    def _strongly_connected(adjacency: Dict[int, List[int]]) -> List[List[int]]:
+        """Iterative Tarjan; components are returned in completion order."""
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in adjacency:
+            if root in index:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(adjacency[root]))]
+
+            while work:
+                node, neighbors = work[-1]
+                descended = False
+                for nxt in neighbors:
+                    if nxt not in index:
+                        index[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter(adjacency[nxt])))
+                        descended = True
+                        break
+                    if nxt in on_stack and index[nxt] < low[node]:
+                        low[node] = index[nxt]
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def __repr__(self) -> str:
+        rels = ",".join(sorted(r.value for r in self.relations))
+        state = "dirty" if self._dirty else f"components={len(self._members)}"
+        return f"ReachabilityIndex({rels}, {state})"
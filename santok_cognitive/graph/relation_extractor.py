@@ -10,6 +10,7 @@ from dataclasses import dataclass
 import re
 
 from .graph_edge import RelationType
+from .pattern_set import CompiledPatternSet
 
 
 @dataclass
@@ -132,13 +133,42 @@ class RelationExtractor:
         """
         self.min_confidence = min_confidence
         
-        # Compile patterns
-        self._compiled_patterns: Dict[RelationType, List[Tuple]] = {}
+        # Compile patterns behind a trigger-word prefilter
+        self._patterns = CompiledPatternSet(re.IGNORECASE)
+        self._indices_by_type: Dict[RelationType, List[int]] = {}
         for rel_type, patterns in self.PATTERNS.items():
-            self._compiled_patterns[rel_type] = [
-                (re.compile(pattern, re.IGNORECASE), subj, obj, conf)
-                for pattern, subj, obj, conf in patterns
-            ]
+            for pattern, subj, obj, conf in patterns:
+                self.add_pattern(pattern, rel_type, subj, obj, conf)
+    
+    def add_pattern(
+        self,
+        pattern: str,
+        relation: RelationType,
+        subject_group: int = 1,
+        object_group: int = 2,
+        confidence: float = 0.8
+    ) -> int:
+        """
+        Add an extraction pattern.
+        
+        Only texts containing one of the pattern's literal trigger words
+        run its regex, so extra patterns cost little on unrelated text.
+        
+        Args:
+            pattern: Regex with groups for subject and object
+            relation: Relation type to extract
+            subject_group: Group number for subject
+            object_group: Group number for object
+            confidence: Base confidence of matches
+            
+        Returns:
+            Pattern index
+        """
+        index = self._patterns.add(
+            pattern, (relation, subject_group, object_group, confidence)
+        )
+        self._indices_by_type.setdefault(relation, []).append(index)
+        return index
     
     def extract(
         self,
@@ -157,45 +187,65 @@ class RelationExtractor:
         """
         relations = []
         
-        # Determine which relation types to check
-        types_to_check = relation_types or list(self._compiled_patterns.keys())
+        # Only patterns whose trigger words occur in the text can match
+        candidates = self._patterns.candidates(text)
         
-        for rel_type in types_to_check:
-            if rel_type not in self._compiled_patterns:
-                continue
-            
-            for pattern, subj_group, obj_group, base_conf in self._compiled_patterns[rel_type]:
-                for match in pattern.finditer(text):
-                    subject = self._clean_entity(match.group(subj_group))
-                    obj = self._clean_entity(match.group(obj_group))
-                    
-                    # Skip if entities are too short or are stop words
-                    if not subject or not obj:
-                        continue
-                    if subject.lower() in self.STOP_WORDS:
-                        continue
-                    if obj.lower() in self.STOP_WORDS:
-                        continue
-                    if subject.lower() == obj.lower():
-                        continue
-                    
-                    # Calculate confidence
-                    confidence = base_conf * self._calculate_confidence_modifier(
-                        subject, obj, match.group(0)
-                    )
-                    
-                    if confidence >= self.min_confidence:
-                        relations.append(ExtractedRelation(
-                            subject=subject,
-                            relation=rel_type,
-                            obj=obj,
-                            confidence=confidence,
-                            source_text=match.group(0)
-                        ))
+        # Restrict to the requested relation types (in that order)
+        if relation_types:
+            hits = set(candidates)
+            candidates = [
+                index
+                for rel_type in relation_types
+                for index in self._indices_by_type.get(rel_type, ())
+                if index in hits
+            ]
+        
+        for index in candidates:
+            rel_type, subj_group, obj_group, base_conf = self._patterns.payload(index)
+            for match in self._patterns.regex(index).finditer(text):
+                subject = self._clean_entity(match.group(subj_group))
+                obj = self._clean_entity(match.group(obj_group))
+                
+                # Skip if entities are too short or are stop words
+                if not subject or not obj:
+                    continue
+                if subject.lower() in self.STOP_WORDS:
+                    continue
+                if obj.lower() in self.STOP_WORDS:
+                    continue
+                if subject.lower() == obj.lower():
+                    continue
+                
+                # Calculate confidence
+                confidence = base_conf * self._calculate_confidence_modifier(
+                    subject, obj, match.group(0)
+                )
+                
+                if confidence >= self.min_confidence:
+                    relations.append(ExtractedRelation(
+                        subject=subject,
+                        relation=rel_type,
+                        obj=obj,
+                        confidence=confidence,
+                        source_text=match.group(0)
+                    ))
         
         # Remove duplicates
         return self._deduplicate(relations)
     
+    def extract_batch(
+        self,
+        texts: List[str],
+        relation_types: Optional[List[RelationType]] = None
+    ) -> List[List[ExtractedRelation]]:
+        """
+        Extract relationships from many texts (e.g. sentences).
+        
+        Returns:
+            One list of ExtractedRelation per text, in input order
+        """
+        return [self.extract(text, relation_types) for text in texts]
+    
     def _clean_entity(self, entity: str) -> str:
         """Clean and normalize an entity string."""
         if not entity:
@@ -309,5 +359,5 @@ class RelationExtractor:
         return suggestions
     
     def __repr__(self) -> str:
-        return f"RelationExtractor(min_confidence={self.min_confidence})"
+        return f"RelationExtractor(min_confidence={self.min_confidence}, patterns={len(self._patterns)})"
 
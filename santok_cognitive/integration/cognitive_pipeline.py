@@ -11,11 +11,13 @@ Combines:
 This is the main integration point between santok_complete and santok_cognitive.
 """
 
-from typing import Dict, Any, List, Optional, Callable, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import time
 
-from ..graph import GraphStore, GraphNode, RelationType, RelationExtractor
+from ..graph import GraphStore, GraphNode, GraphEdge, RelationType, RelationExtractor
 from ..trees import TreeStore, Tree
 from ..memory import UnifiedMemory, MemoryObject
 from ..reasoning import (
@@ -55,6 +57,87 @@ class ProcessingResult:
         }
 
 
+@dataclass
+class BatchProcessingResult:
+    """
+    Result from CognitivePipeline.process_batch.
+    
+    process_batch used to return List[ProcessingResult]; iterating,
+    indexing and len() still work on the per-document results.
+    """
+    results: List[ProcessingResult]     # per document (inference/contradictions are batch-wide)
+    relations_extracted: int
+    nodes_created: int
+    edges_created: int
+    inferences: int
+    contradictions: int
+    workers: int
+    processing_time: float
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    
+    @property
+    def documents(self) -> int:
+        return len(self.results)
+    
+    def __iter__(self) -> Iterator[ProcessingResult]:
+        return iter(self.results)
+    
+    def __len__(self) -> int:
+        return len(self.results)
+    
+    def __getitem__(self, index):
+        return self.results[index]
+    
+    @property
+    def docs_per_sec(self) -> float:
+        return self.documents / self.processing_time if self.processing_time > 0 else 0.0
+    
+    @property
+    def facts_per_sec(self) -> float:
+        return self.relations_extracted / self.processing_time if self.processing_time > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "relations_extracted": self.relations_extracted,
+            "nodes_created": self.nodes_created,
+            "edges_created": self.edges_created,
+            "inferences": self.inferences,
+            "contradictions": self.contradictions,
+            "workers": self.workers,
+            "processing_time_ms": self.processing_time * 1000,
+            "docs_per_sec": self.docs_per_sec,
+            "facts_per_sec": self.facts_per_sec,
+            "stage_times_ms": {k: v * 1000 for k, v in self.stage_times.items()},
+        }
+
+
+# (subject, relation value, object, confidence) - picklable extraction output
+RelationTuple = Tuple[str, str, str, float]
+
+_worker_extractor: Optional[RelationExtractor] = None
+
+
+def _init_extract_worker(extractor: RelationExtractor) -> None:
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_chunk_with(
+    extractor: RelationExtractor,
+    texts: List[str]
+) -> List[List[RelationTuple]]:
+    return [
+        [(r.subject, r.relation.value, r.obj, r.confidence) for r in relations]
+        for relations in extractor.extract_batch(texts)
+    ]
+
+
+def _extract_chunk(texts: List[str]) -> List[List[RelationTuple]]:
+    """Process-pool task: relations of each text in a chunk."""
+    return _extract_chunk_with(_worker_extractor or RelationExtractor(), texts)
+
+
 @dataclass
 class PipelineConfig:
     """Configuration for the cognitive pipeline."""
@@ -82,6 +165,11 @@ class PipelineConfig:
     
     # Relation extraction
     extract_relations: bool = True
+    
+    # Batch processing (process_batch)
+    batch_workers: int = 1
+    batch_chunk_size: int = 64
+    min_parallel_batch: int = 256   # smaller batches extract in-process
 
 
 class CognitivePipeline:
@@ -222,43 +310,11 @@ class CognitivePipeline:
             ProcessingResult with statistics
         """
         start_time = time.time()
-        
-        tokens_created = 0
-        nodes_created = 0
         edges_created = 0
-        memory_uids = []
-        
-        # 1. Tokenize if configured
-        tokens = []
-        if self.config.tokenize_text and self._tokenizer:
-            try:
-                result = self._tokenizer.tokenize(text)
-                tokens = result.tokens if hasattr(result, 'tokens') else result
-                tokens_created = len(tokens)
-            except Exception:
-                pass
-        
-        # 2. Create graph nodes from tokens
-        if self.config.create_token_nodes and tokens:
-            node_ids = self.token_bridge.add_tokens(
-                tokens,
-                create_sequence_edges=self.config.create_sequence_edges,
-                create_cooccurrence_edges=self.config.create_cooccurrence_edges,
-                window_size=self.config.cooccurrence_window
-            )
-            nodes_created = len(node_ids)
         
-        # 3. Add to memory with embeddings
-        if self.config.generate_embeddings:
-            obj = self.embedding_bridge.add_with_embedding(
-                text, 
-                content_type="text",
-                auto_link_graph=True
-            )
-            memory_uids.append(obj.uid)
-        else:
-            obj = self.memory.add(text, "text", auto_link_graph=True)
-            memory_uids.append(obj.uid)
+        # 1-3. Tokenize, create token nodes, add to memory with embeddings
+        tokens_created, nodes_created, obj = self._ingest_text(text)
+        memory_uids = [obj.uid]
         
         # 4. Extract relations
         if self.config.extract_relations:
@@ -295,7 +351,7 @@ class CognitivePipeline:
         # 5. Run inference
         inferences = 0
         if self.config.run_inference:
-            inf_result = self.inference_engine.infer_all(
+            inf_result = self.inference_engine.infer(
                 max_iterations=self.config.max_inference_iterations,
                 min_confidence=self.config.min_inference_confidence
             )
@@ -324,9 +380,182 @@ class CognitivePipeline:
             processing_time=elapsed
         )
     
-    def process_batch(self, texts: List[str]) -> List[ProcessingResult]:
-        """Process multiple texts."""
-        return [self.process(text) for text in texts]
+    def process_batch(
+        self,
+        texts: List[str],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> BatchProcessingResult:
+        """
+        Process many texts with one inference / contradiction pass.
+        
+        Steps:
+        1. Tokenize, create token nodes and memory objects per text
+        2. Extract relations (in a process pool when workers > 1)
+        3. Merge entity nodes and edges in bulk, deduplicated across the batch
+        4. Derive the consequences of all new edges in one incremental pass
+        5. Check contradictions involving the new edges only
+        
+        Args:
+            texts: Input texts
+            workers: Extraction processes (default config.batch_workers)
+            chunk_size: Texts per pool task (default config.batch_chunk_size)
+            
+        Returns:
+            BatchProcessingResult with per-document results and throughput
+        """
+        start_time = time.time()
+        workers = workers or self.config.batch_workers
+        chunk_size = chunk_size or self.config.batch_chunk_size
+        stage_times: Dict[str, float] = {}
+        
+        # 1. Per-document work that needs the shared stores
+        stage = time.time()
+        results = []
+        for text in texts:
+            doc_start = time.time()
+            tokens_created, nodes_created, obj = self._ingest_text(text)
+            results.append(ProcessingResult(
+                text=text,
+                tokens_created=tokens_created,
+                nodes_created=nodes_created,
+                edges_created=0,
+                memory_objects=[obj.uid],
+                inferences=0,
+                contradictions=0,
+                processing_time=time.time() - doc_start
+            ))
+        stage_times["ingest"] = time.time() - stage
+        
+        # 2. Relation extraction
+        stage = time.time()
+        extracted: List[List[RelationTuple]] = []
+        used_workers = 1
+        if self.config.extract_relations and texts:
+            if workers > 1 and len(texts) >= self.config.min_parallel_batch:
+                extracted = self._extract_parallel(texts, workers, chunk_size)
+                if extracted is not None:
+                    used_workers = workers
+            if not extracted:
+                extracted = _extract_chunk_with(self.relation_extractor, texts)
+        stage_times["extract"] = time.time() - stage
+        
+        # 3. Bulk merge (inference is deferred to one pass on exit)
+        stage = time.time()
+        new_edges: List[GraphEdge] = []
+        entity_nodes: Dict[str, int] = {}
+        nodes_before = self.graph.node_count
+        inferred_before = self.inference_engine.get_stats()["total_inferences"]
+        with self.inference_engine.bulk():
+            for result, relations in zip(results, extracted):
+                for subject, relation, target, confidence in relations:
+                    subj_id = self._entity_node(subject, entity_nodes)
+                    obj_id = self._entity_node(target, entity_nodes)
+                    rel_type = RelationType(relation)
+                    if self.graph.has_edge_between(subj_id, obj_id, rel_type):
+                        continue
+                    edge_id = self.graph.add_edge(subj_id, obj_id, rel_type, weight=confidence)
+                    if edge_id is not None:
+                        new_edges.append(self.graph.get_edge(edge_id))
+                        result.edges_created += 1
+            stage_times["merge"] = time.time() - stage
+            stage = time.time()
+        
+        # 4. Inference (incremental unless nothing was materialized yet)
+        if self.config.run_inference:
+            self.inference_engine.infer(
+                max_iterations=self.config.max_inference_iterations,
+                min_confidence=self.config.min_inference_confidence
+            )
+        inferences = max(
+            0, self.inference_engine.get_stats()["total_inferences"] - inferred_before
+        )
+        stage_times["inference"] = time.time() - stage
+        
+        # 5. Contradictions among / against the new edges
+        stage = time.time()
+        contradictions = 0
+        if self.config.check_contradictions and new_edges:
+            contradictions = len(self.contradiction_detector.check_edges(new_edges).contradictions)
+        stage_times["contradictions"] = time.time() - stage
+        
+        elapsed = time.time() - start_time
+        self._stats["texts_processed"] += len(texts)
+        self._stats["total_tokens"] += sum(r.tokens_created for r in results)
+        self._stats["total_inferences"] += inferences
+        
+        return BatchProcessingResult(
+            results=results,
+            relations_extracted=sum(len(r) for r in extracted),
+            nodes_created=self.graph.node_count - nodes_before,
+            edges_created=len(new_edges),
+            inferences=inferences,
+            contradictions=contradictions,
+            workers=used_workers,
+            processing_time=elapsed,
+            stage_times=stage_times
+        )
+    
+    def _ingest_text(self, text: str) -> Tuple[int, int, MemoryObject]:
+        """Tokenize, add token nodes and the memory object for one text."""
+        tokens = []
+        if self.config.tokenize_text and self._tokenizer:
+            try:
+                result = self._tokenizer.tokenize(text)
+                tokens = result.tokens if hasattr(result, 'tokens') else result
+            except Exception:
+                pass
+        
+        nodes_created = 0
+        if self.config.create_token_nodes and tokens:
+            nodes_created = len(self.token_bridge.add_tokens(
+                tokens,
+                create_sequence_edges=self.config.create_sequence_edges,
+                create_cooccurrence_edges=self.config.create_cooccurrence_edges,
+                window_size=self.config.cooccurrence_window
+            ))
+        
+        if self.config.generate_embeddings:
+            obj = self.embedding_bridge.add_with_embedding(
+                text, content_type="text", auto_link_graph=True
+            )
+        else:
+            obj = self.memory.add(text, "text", auto_link_graph=True)
+        return len(tokens), nodes_created, obj
+    
+    def _extract_parallel(
+        self,
+        texts: List[str],
+        workers: int,
+        chunk_size: int
+    ) -> Optional[List[List[RelationTuple]]]:
+        """Extract in a process pool; None if processes are unavailable."""
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_extract_worker,
+                initargs=(self.relation_extractor,)
+            ) as pool:
+                extracted = []
+                for chunk_result in pool.map(_extract_chunk, chunks):
+                    extracted.extend(chunk_result)
+                return extracted
+        except (OSError, BrokenProcessPool, NotImplementedError):
+            return None
+    
+    def _entity_node(self, text: str, cache: Dict[str, int]) -> int:
+        """Node id for an entity, creating the node if needed."""
+        node_id = cache.get(text)
+        if node_id is None:
+            nodes = self.graph.get_nodes_by_text(text)
+            if nodes:
+                node_id = nodes[0].node_id
+            else:
+                node_id = hash(text) & 0x7FFFFFFF
+                self.graph.add_node(GraphNode(node_id, text, "entity"))
+            cache[text] = node_id
+        return node_id
     
     def query(self, question: str) -> HybridAnswer:
         """
@@ -204,6 +204,7 @@ class EmbeddingBridge:
             self._embedding_cache[embedding_key] = embedding
             obj.embedding_id = embedding_key
             obj.embedding_vector = embedding.tolist()[:10]  # Store first 10 dims for preview
+            self.memory.touch(obj.uid)
             
             # Link to graph node if exists
             if obj.graph_node_id:
@@ -103,6 +103,7 @@ class VectorBridge:
             embedding = self.embedding_fn(content)
             self._store_embedding(obj.uid, embedding)
             obj.embedding_id = obj.uid  # Use UID as embedding ID
+            self.memory.touch(obj.uid)
             self._stats["embeddings_created"] += 1
         
         return obj
@@ -128,6 +129,7 @@ class VectorBridge:
         
         self._store_embedding(uid, embedding)
         obj.embedding_id = uid
+        self.memory.touch(uid)
         self._stats["embeddings_created"] += 1
         return True
     
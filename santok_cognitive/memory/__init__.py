@@ -10,10 +10,14 @@ Unified memory that links:
 Core classes:
 - MemoryObject: Single knowledge unit with all links
 - UnifiedMemory: Central hub for all operations
+- TextIndex: Token + trigram index behind UnifiedMemory content search
+- MemoryStorage: Columnar snapshot + write-ahead log persistence
 """
 
 from .memory_object import MemoryObject
+from .text_index import TextIndex
+from .memory_storage import MemoryStorage
 from .unified_memory import UnifiedMemory
 
-__all__ = ["MemoryObject", "UnifiedMemory"]
+__all__ = ["MemoryObject", "TextIndex", "MemoryStorage", "UnifiedMemory"]
 
@@ -0,0 +1,208 @@
+"""
+TextIndex - Incremental text index for UnifiedMemory.
+
+Two posting maps over the lowercased content of each memory object:
+- token index:   word -> object ids            (search_tokens)
+- trigram index: 3-character gram -> object ids (substring search)
+
+Substring search intersects the postings of the query's trigrams,
+starting with the rarest, then confirms each candidate with a plain
+``in`` check. Only objects sharing every trigram with the query are
+touched, so latency depends on the match count, not on memory size.
+
+Objects get increasing integer ids, so results come back in insertion
+order, the same order a scan over ``UnifiedMemory.objects`` gives.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class TextIndex:
+    """
+    Token + trigram index with add/remove maintenance.
+
+    Example:
+        index = TextIndex()
+        index.add("a1", "Transformers use attention")
+        index.add("b2", "Attention computes weighted sums")
+
+        index.search("attention")         # ["a1", "b2"]
+        index.search("former")            # ["a1"]
+        index.search_tokens("attention sums")  # [("b2", 2), ("a1", 1)]
+    """
+
+    NGRAM = 3
+
+    def __init__(self):
+        self._doc_of: Dict[str, int] = {}          # uid -> doc id
+        self._uid_of: Dict[int, str] = {}          # doc id -> uid
+        self._text: Dict[int, str] = {}            # doc id -> lowercased content
+        self._tokens: Dict[str, Set[int]] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        self._next_doc = 0
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercase word tokens."""
+        return _TOKEN_RE.findall(text.lower())
+
+    @classmethod
+    def ngrams(cls, text: str) -> Set[str]:
+        """Distinct character n-grams of already-lowercased text."""
+        n = cls.NGRAM
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    # ═══════════════════════════════════════════════════════════════════
+    # MAINTENANCE
+    # ═══════════════════════════════════════════════════════════════════
+
+    def add(self, uid: str, content: str) -> None:
+        """Index (or re-index) one object; a re-indexed object keeps its place."""
+        text = content.lower()
+        doc = self._doc_of.get(uid)
+        if doc is not None:
+            self._unpost(doc, self._text[doc])
+        else:
+            doc = self._next_doc
+            self._next_doc += 1
+            self._doc_of[uid] = doc
+            self._uid_of[doc] = uid
+        self._text[doc] = text
+
+        for token in set(_TOKEN_RE.findall(text)):
+            self._tokens.setdefault(token, set()).add(doc)
+        for gram in self.ngrams(text):
+            self._grams.setdefault(gram, set()).add(doc)
+
+    def remove(self, uid: str) -> bool:
+        """Drop one object; returns True if it was indexed."""
+        doc = self._doc_of.pop(uid, None)
+        if doc is None:
+            return False
+        del self._uid_of[doc]
+        self._unpost(doc, self._text.pop(doc))
+        return True
+
+    def _unpost(self, doc: int, text: str) -> None:
+        for token in set(_TOKEN_RE.findall(text)):
+            self._discard(self._tokens, token, doc)
+        for gram in self.ngrams(text):
+            self._discard(self._grams, gram, doc)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[int]], key: str, doc: int) -> None:
+        docs = postings.get(key)
+        if docs is not None:
+            docs.discard(doc)
+            if not docs:
+                del postings[key]
+
+    def clear(self) -> None:
+        self._doc_of.clear()
+        self._uid_of.clear()
+        self._text.clear()
+        self._tokens.clear()
+        self._grams.clear()
+        self._next_doc = 0
+
+    # ═══════════════════════════════════════════════════════════════════
+    # QUERIES
+    # ═══════════════════════════════════════════════════════════════════
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        UIDs whose content contains query (case-insensitive), in insertion order.
+
+        Queries shorter than NGRAM characters fall back to a scan, which
+        stops as soon as limit matches are found.
+        """
+        query = query.lower()
+        if limit is not None and limit <= 0:
+            return []
+
+        if len(query) < self.NGRAM:
+            docs = iter(self._text)
+        else:
+            docs = iter(sorted(self._candidates(query)))
+
+        results = []
+        for doc in docs:
+            if query in self._text[doc]:
+                results.append(self._uid_of[doc])
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def _candidates(self, query: str) -> Set[int]:
+        """Docs containing every trigram of query (rarest postings first)."""
+        postings = []
+        for gram in self.ngrams(query):
+            docs = self._grams.get(gram)
+            if not docs:
+                return set()
+            postings.append(docs)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for docs in postings[1:]:
+            candidates &= docs
+            if not candidates:
+                break
+        return candidates
+
+    def search_tokens(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        match_all: bool = False
+    ) -> List[Tuple[str, int]]:
+        """
+        UIDs sharing words with query, as (uid, matched_word_count).
+
+        Sorted by matched words (descending), then insertion order.
+
+        Args:
+            query: Free text
+            limit: Maximum results
+            match_all: Only return objects containing every query word
+        """
+        words = set(self.tokenize(query))
+        if not words:
+            return []
+
+        counts: Counter = Counter()
+        for word in words:
+            counts.update(self._tokens.get(word, ()))
+
+        if match_all:
+            ranked = sorted(doc for doc, c in counts.items() if c == len(words))
+            ranked = [(doc, len(words)) for doc in ranked]
+        else:
+            ranked = sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self._uid_of[doc], count) for doc, count in ranked]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "documents": len(self._doc_of),
+            "tokens": len(self._tokens),
+            "ngrams": len(self._grams),
+            "token_postings": sum(len(d) for d in self._tokens.values()),
+            "ngram_postings": sum(len(d) for d in self._grams.values()),
+        }
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self._doc_of
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def __repr__(self) -> str:
+        return f"TextIndex(documents={len(self)}, tokens={len(self._tokens)}, ngrams={len(self._grams)})"
@@ -6,6 +6,11 @@ It coordinates:
 - Vector storage (similarity search)
 - Graph storage (relationship queries)
 - Tree storage (hierarchical queries)
+
+Persistence:
+- save(dir) / load(dir): JSON files (objects.json, graph.json, trees.json)
+- save(dir, format="binary"): columnar snapshot + write-ahead log
+  (MemoryStorage); repeated saves append only the changes
 """
 
 from typing import Dict, Any, Optional, List, Tuple
@@ -13,6 +18,8 @@ from pathlib import Path
 import json
 
 from .memory_object import MemoryObject
+from .text_index import TextIndex
+from .memory_storage import MemoryStorage
 from ..graph import GraphStore, GraphNode, GraphEdge, RelationType
 from ..trees import TreeStore, Tree, TreeNode
 
@@ -55,6 +62,10 @@ class UnifiedMemory:
         
         # Index for fast lookup
         self._content_index: Dict[str, str] = {}  # content_hash -> uid
+        self._text_index: Optional[TextIndex] = None  # built on first search
+        
+        # Incremental binary persistence (save(..., format="binary"))
+        self._storage: Optional[MemoryStorage] = None
         
         # Auto-increment for graph node IDs
         self._next_graph_id = 1
@@ -86,8 +97,8 @@ class UnifiedMemory:
         
         # Create object
         obj = MemoryObject.create(content, content_type, metadata)
-        self.objects[obj.uid] = obj
-        self._content_index[content_hash] = obj.uid
+        self._put_object(obj)
+        self._log("obj", obj)
         
         # Auto-link to graph if requested
         if auto_link_graph:
@@ -119,14 +130,87 @@ class UnifiedMemory:
             if tree:
                 tree.remove_node(obj.tree_node_id)
         
-        # Remove from index
+        # Remove object and its index entries
+        self._drop_object(uid)
+        self._log("obj_del", uid)
+        return True
+    
+    def touch(self, uid: str) -> bool:
+        """
+        Mark an object as changed after editing it in place
+        (e.g. obj.embedding_id = ...), so binary saves persist the edit.
+        """
+        obj = self.objects.get(uid)
+        if not obj:
+            return False
+        self._log("obj", obj)
+        return True
+    
+    def touch_graph_node(self, node_id: int) -> bool:
+        """Like touch(), for a graph node edited in place (e.g. node.properties[...] = ...)."""
+        node = self.graph.get_node(node_id)
+        if node is None:
+            return False
+        self._log("g_node", node)
+        return True
+    
+    def touch_graph_edge(self, edge_id: int) -> bool:
+        """Like touch(), for a graph edge edited in place (e.g. edge.weight = ...)."""
+        edge = self.graph.get_edge(edge_id)
+        if edge is None:
+            return False
+        self._log("g_edge", edge)
+        return True
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # INTERNALS (shared with MemoryStorage replay)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    def _put_object(self, obj: MemoryObject) -> None:
+        """Store an object and index it."""
+        old = self.objects.get(obj.uid)
+        if old is not None:
+            # Replace in place: keeps the object's position in insertion order
+            content_hash = MemoryObject.generate_uid(old.content)
+            if self._content_index.get(content_hash) == obj.uid:
+                del self._content_index[content_hash]
+        self.objects[obj.uid] = obj
+        self._content_index[MemoryObject.generate_uid(obj.content)] = obj.uid
+        if self._text_index is not None:
+            self._text_index.add(obj.uid, obj.content)
+    
+    def _drop_object(self, uid: str) -> None:
+        """Remove an object and its index entries (no graph/tree cleanup)."""
+        obj = self.objects.pop(uid, None)
+        if obj is None:
+            return
         content_hash = MemoryObject.generate_uid(obj.content)
-        if content_hash in self._content_index:
+        if self._content_index.get(content_hash) == uid:
             del self._content_index[content_hash]
-        
-        # Remove object
-        del self.objects[uid]
-        return True
+        if self._text_index is not None:
+            self._text_index.remove(uid)
+    
+    def _reset_objects(self, objects) -> None:
+        """Replace all objects (indices rebuilt; text index lazily)."""
+        self.objects = {}
+        self._content_index = {}
+        self._text_index = None
+        for obj in objects:
+            self.objects[obj.uid] = obj
+            self._content_index[MemoryObject.generate_uid(obj.content)] = obj.uid
+    
+    def _text(self) -> TextIndex:
+        """The text index, built on first use."""
+        if self._text_index is None:
+            index = TextIndex()
+            for uid, obj in self.objects.items():
+                index.add(uid, obj.content)
+            self._text_index = index
+        return self._text_index
+    
+    def _log(self, op: str, item: Any = None) -> None:
+        if self._storage is not None:
+            self._storage.record(op, item)
     
     def link_to_graph(
         self,
@@ -168,6 +252,7 @@ class UnifiedMemory:
         
         self.graph.add_node(node)
         obj.graph_node_id = graph_id
+        self._log("obj", obj)
         
         return graph_id
     
@@ -212,6 +297,7 @@ class UnifiedMemory:
         # Update object
         obj.tree_node_id = tree_node.node_id
         obj.tree_id = tree_id
+        self._log("obj", obj)
         
         return tree_node.node_id
     
@@ -377,24 +463,56 @@ class UnifiedMemory:
     def search_by_content(
         self,
         query: str,
-        limit: int = 10
+        limit: int = 10,
+        content_types: Optional[List[str]] = None
     ) -> List[MemoryObject]:
         """
-        Simple substring search across all objects.
+        Case-insensitive substring search across all objects.
         
+        Uses the trigram index, so only objects sharing every trigram with
+        the query are checked. Results are in insertion order.
         For semantic search, integrate with santok_complete's vector store.
+        
+        Args:
+            query: Substring to find
+            limit: Maximum results
+            content_types: Only return objects of these types
         """
-        query_lower = query.lower()
-        results = []
+        if not content_types:
+            uids = self._text().search(query, limit)
+            return [self.objects[uid] for uid in uids]
         
-        for obj in self.objects.values():
-            if query_lower in obj.content.lower():
+        results = []
+        for uid in self._text().search(query):
+            obj = self.objects[uid]
+            if obj.content_type in content_types:
                 results.append(obj)
                 if len(results) >= limit:
                     break
-        
         return results
     
+    def search_by_tokens(
+        self,
+        query: str,
+        limit: int = 10,
+        match_all: bool = False
+    ) -> List[Tuple[MemoryObject, int]]:
+        """
+        Word search: objects sharing words with the query.
+        
+        Args:
+            query: Free text (split into lowercase words)
+            limit: Maximum results
+            match_all: Only objects containing every query word
+            
+        Returns:
+            (MemoryObject, matched_word_count), most matches first
+        """
+        return [
+            (self.objects[uid], count)
+            for uid, count in self._text().search_tokens(query, limit, match_all)
+        ]
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics for the unified memory."""
         linked_to_graph = sum(
@@ -415,15 +533,32 @@ class UnifiedMemory:
             "trees": len(self.trees),
         }
     
-    def save(self, directory: str) -> None:
+    def save(self, directory: str, format: str = "json") -> None:
         """
         Save all data to a directory.
         
-        Creates:
+        format="json" creates:
         - objects.json (memory objects)
         - graph.json (graph store)
         - trees.json (tree store)
+        
+        format="binary" creates snapshot.bin + wal.log (MemoryStorage).
+        The first binary save writes a snapshot; later saves to the same
+        directory append only the changes since the previous save. Saving
+        to another directory moves change tracking there. Objects, graph
+        nodes and edges edited in place after a save need touch(),
+        touch_graph_node() or touch_graph_edge() to be persisted.
         """
+        if format == "binary":
+            storage = self._storage
+            if storage is None or storage.directory != Path(directory):
+                storage = MemoryStorage(directory)
+                storage.attach(self)  # detaches the previous storage
+            storage.flush()
+            return
+        if format != "json":
+            raise ValueError(f"Unknown format: {format}")
+        
         path = Path(directory)
         path.mkdir(parents=True, exist_ok=True)
         
@@ -445,13 +580,29 @@ class UnifiedMemory:
         # Save trees
         self.trees.save(str(path / "trees.json"))
     
-    def load(self, directory: str) -> None:
-        """Load all data from a directory."""
+    def load(self, directory: str, format: Optional[str] = None) -> None:
+        """
+        Load all data from a directory.
+        
+        Args:
+            directory: Directory written by save()
+            format: "json" or "binary" (None = binary if a snapshot exists)
+        """
         path = Path(directory)
         
         if not path.exists():
             raise FileNotFoundError(f"Directory not found: {directory}")
         
+        if format is None:
+            format = "binary" if MemoryStorage.exists(directory) else "json"
+        if format == "binary":
+            MemoryStorage(directory).load_into(self)
+            return
+        
+        # Attached binary storage must re-snapshot after a wholesale replace
+        if self._storage is not None:
+            self._storage.record("reset")
+        
         # Load objects
         objects_path = path / "objects.json"
         if objects_path.exists():
@@ -459,14 +610,10 @@ class UnifiedMemory:
                 data = json.load(f)
             
             self._next_graph_id = data.get("next_graph_id", 1)
-            self.objects = {}
-            self._content_index = {}
-            
-            for uid, obj_data in data.get("objects", {}).items():
-                obj = MemoryObject.from_dict(obj_data)
-                self.objects[uid] = obj
-                content_hash = MemoryObject.generate_uid(obj.content)
-                self._content_index[content_hash] = uid
+            self._reset_objects(
+                MemoryObject.from_dict(obj_data)
+                for obj_data in data.get("objects", {}).values()
+            )
         
         # Load graph
         graph_path = path / "graph.json"
@@ -477,14 +624,22 @@ class UnifiedMemory:
         trees_path = path / "trees.json"
         if trees_path.exists():
             self.trees.load(str(trees_path))
+        
+        if self._storage is not None:
+            self._storage.rewatch()
     
     def clear(self) -> None:
         """Clear all data."""
         self.objects.clear()
         self._content_index.clear()
+        self._text_index = None
         self._next_graph_id = 1
         self.graph = GraphStore()
         self.trees = TreeStore()
+        
+        if self._storage is not None:
+            self._storage.record("reset")
+            self._storage.rewatch()
     
     def __len__(self) -> int:
         return len(self.objects)
@@ -14,6 +14,7 @@ from enum import Enum
 from collections import defaultdict
 
 from ..graph import GraphStore, GraphNode, GraphEdge, RelationType
+from ..graph.path_search import bfs_path
 
 
 class ContradictionType(Enum):
@@ -189,6 +190,140 @@ class ContradictionDetector:
             time_elapsed=elapsed
         )
     
+    def check_edges(self, edges: List[GraphEdge]) -> ContradictionReport:
+        """
+        Run all checks, but only for contradictions involving given edges.
+        
+        Call after adding a batch of edges: every contradiction detect_all()
+        would report that involves one of them is found, while the cost
+        depends on the batch and its neighborhood, not the graph size.
+        
+        Args:
+            edges: Newly added edges (already in the graph)
+        """
+        import time
+        start = time.time()
+        
+        contradictions: List[Contradiction] = []
+        seen_pairs: Set[Tuple[int, int]] = set()
+        seen_cycles: Set[Tuple[RelationType, frozenset]] = set()
+        seen_types: Set[Tuple[int, int, int]] = set()
+        
+        for edge in edges:
+            src, tgt, relation = edge.source_id, edge.target_id, edge.relation_type
+            
+            # Exclusive relations on the same pair
+            for other in self.graph.get_outgoing_edges(src):
+                if other.target_id != tgt or other.edge_id == edge.edge_id:
+                    continue
+                pair = (min(edge.edge_id, other.edge_id), max(edge.edge_id, other.edge_id))
+                if pair in seen_pairs or not self._are_exclusive(relation, other.relation_type):
+                    continue
+                seen_pairs.add(pair)
+                contradictions.append(Contradiction(
+                    contradiction_type=ContradictionType.DIRECT_OPPOSITE,
+                    nodes=[src, tgt],
+                    edges=list(pair),
+                    description=f"'{self._name(src)}' has both {relation.value} and {other.relation_type.value} to '{self._name(tgt)}'",
+                    severity=0.9,
+                    suggestion="Remove one of the conflicting edges"
+                ))
+            
+            # Self-reference
+            if src == tgt and relation in self.NON_REFLEXIVE:
+                contradictions.append(Contradiction(
+                    contradiction_type=ContradictionType.ASYMMETRIC_VIOLATION,
+                    nodes=[src],
+                    edges=[edge.edge_id],
+                    description=f"'{self._name(src)}' has {relation.value} relation to itself",
+                    severity=0.8,
+                    suggestion="Remove self-referential edge"
+                ))
+            
+            # Cycles closed by this edge
+            if relation in self.ACYCLIC_RELATIONS:
+                cycle = self._cycle_through(src, tgt, relation)
+                if cycle:
+                    key = (relation, frozenset(cycle))
+                    if key not in seen_cycles:
+                        seen_cycles.add(key)
+                        names = [self._name(nid) for nid in cycle]
+                        contradictions.append(Contradiction(
+                            contradiction_type=ContradictionType.CAUSAL_CYCLE,
+                            nodes=cycle,
+                            edges=[],
+                            description=f"Cycle in {relation.value}: {' → '.join(names)} → {names[0]}",
+                            severity=0.85,
+                            suggestion="Break the cycle by removing one edge"
+                        ))
+            
+            # Type conflicts: new IS_A next to an opposite type, or new
+            # OPPOSITE_OF between two types of one entity
+            for source, t1, t2 in self._type_conflicts_for(edge):
+                key = (source, min(t1, t2), max(t1, t2))
+                if key in seen_types:
+                    continue
+                seen_types.add(key)
+                contradictions.append(Contradiction(
+                    contradiction_type=ContradictionType.TYPE_CONFLICT,
+                    nodes=[source, t1, t2],
+                    edges=[],
+                    description=f"'{self._name(source)}' IS_A both '{self._name(t1)}' and '{self._name(t2)}', which are opposites",
+                    severity=0.95,
+                    suggestion="Review type assignments - entity cannot be two opposite types"
+                ))
+        
+        return ContradictionReport(
+            contradictions=contradictions,
+            nodes_checked=len({n for e in edges for n in (e.source_id, e.target_id)}),
+            edges_checked=len(edges),
+            time_elapsed=time.time() - start
+        )
+    
+    def _name(self, node_id: int) -> str:
+        node = self.graph.get_node(node_id)
+        return node.text if node else f"Node({node_id})"
+    
+    def _cycle_through(
+        self,
+        source_id: int,
+        target_id: int,
+        relation: RelationType
+    ) -> Optional[List[int]]:
+        """Nodes of a cycle using edge source -> target, or None."""
+        if source_id == target_id:
+            return [source_id]
+        if not self.graph.reachability([relation]).reaches(target_id, source_id):
+            return None
+        path = bfs_path(
+            lambda n: self.graph.adjacent(n, "outgoing", [relation]),
+            target_id, source_id
+        )
+        return [source_id] + path.nodes[:-1] if path else None
+    
+    def _type_conflicts_for(self, edge: GraphEdge) -> List[Tuple[int, int, int]]:
+        """(entity, type1, type2) conflicts that involve edge."""
+        conflicts = []
+        if edge.relation_type == RelationType.IS_A:
+            source, new_type = edge.source_id, edge.target_id
+            opposites = {
+                n for n, _, _, _ in self.graph.adjacent(
+                    new_type, "both", [RelationType.OPPOSITE_OF]
+                )
+            }
+            for other, _, _, _ in self.graph.adjacent(source, "outgoing", [RelationType.IS_A]):
+                if other != new_type and other in opposites:
+                    conflicts.append((source, new_type, other))
+        elif edge.relation_type == RelationType.OPPOSITE_OF:
+            t1, t2 = edge.source_id, edge.target_id
+            members = {
+                n for n, _, _, _ in self.graph.adjacent(t1, "incoming", [RelationType.IS_A])
+            }
+            for source, _, _, _ in self.graph.adjacent(t2, "incoming", [RelationType.IS_A]):
+                if source in members and t1 != t2:
+                    conflicts.append((source, t1, t2))
+        return conflicts
+    
     def check_node(self, node_id: int) -> List[Contradiction]:
         """Check contradictions involving a specific node."""
         contradictions = []
@@ -414,24 +549,7 @@ class ContradictionDetector:
         relation: RelationType
     ) -> bool:
         """Check if adding edge would create a cycle."""
-        # DFS from target to see if we can reach source
-        visited = set()
-        stack = [target_id]
-        
-        while stack:
-            current = stack.pop()
-            if current == source_id:
-                return True
-            
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            for edge in self.graph.get_outgoing_edges(current):
-                if edge.relation_type == relation:
-                    stack.append(edge.target_id)
-        
-        return False
+        return self.graph.reachability([relation]).would_create_cycle(source_id, target_id)
     
     def _find_cycles_for_relation(self, relation: RelationType) -> List[List[int]]:
         """Find all cycles for a specific relation type."""
@@ -308,7 +308,7 @@ class HybridReasoner:
             })
         
         # 2. Run inference
-        inference_result = self.inference.infer_all(
+        inference_result = self.inference.infer(
             max_iterations=50,
             min_confidence=self.config["min_confidence"]
         )
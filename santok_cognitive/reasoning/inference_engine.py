@@ -8,9 +8,11 @@ Performs:
 - Derived fact generation
 """
 
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
+from contextlib import contextmanager
+import heapq
 import time
 
 from ..graph import GraphStore, GraphNode, GraphEdge, RelationType
@@ -115,6 +117,9 @@ class InferenceEngine:
         # Run inference
         result = engine.infer_all()
         
+        # Or materialize once and follow graph.add_edge() incrementally
+        result = engine.infer()
+        
         # Check specific inference
         is_dog_animal = engine.can_infer(dog_id, animal_id, RelationType.IS_A)
         
@@ -136,9 +141,24 @@ class InferenceEngine:
         # Cache of inferred facts
         self._inferred: Dict[Tuple[int, int, RelationType], InferredFact] = {}
         
+        # Every derivation per key that no other one beats on both confidence
+        # and depth, by confidence (the last one is in _inferred). A weaker but
+        # shallower one still extends where max_depth stops the best one.
+        self._alts: Dict[Tuple[int, int, RelationType], List[InferredFact]] = {}
+        
         # Index: node_id -> set of inferred facts involving this node
         self._by_node: Dict[int, Set[InferredFact]] = defaultdict(set)
         
+        # Base facts and adjacency over base + inferred facts, per relation
+        # (built by infer_all, then maintained incrementally)
+        self._base: Optional[Dict[Tuple[int, int, RelationType], float]] = None
+        self._succ: Dict[RelationType, Dict[int, Set[int]]] = {}
+        self._pred: Dict[RelationType, Dict[int, Set[int]]] = {}
+        self._min_confidence = 0.1
+        self._dirty = False
+        self._watching = False
+        self._deferred: Optional[List[Tuple[int, int, RelationType, float]]] = None
+        
         # Statistics
         self._stats = {
             "total_inferences": 0,
@@ -154,7 +174,9 @@ class InferenceEngine:
         """
         Run full inference over the graph.
         
-        Applies all enabled rules until no new facts are derived
+        Semi-naive evaluation: the first round joins every base edge, each
+        later round joins only the facts derived in the previous round
+        against base + inferred relations, until no new facts are derived
         or max_iterations is reached.
         
         Args:
@@ -165,31 +187,19 @@ class InferenceEngine:
             InferenceResult with all inferred facts
         """
         start_time = time.time()
-        rules_applied = defaultdict(int)
-        iteration = 0
         
         # Clear previous inferences
         self._inferred.clear()
+        self._alts.clear()
         self._by_node.clear()
+        self._load_base()
+        self._min_confidence = min_confidence
+        self._dirty = False
         
-        # Get all enabled rules
-        all_rules = self.rules.get_all_enabled_rules()
-        
-        # Iterate until fixpoint
-        new_facts_found = True
-        while new_facts_found and iteration < max_iterations:
-            new_facts_found = False
-            iteration += 1
-            
-            for rule in all_rules:
-                new_facts = self._apply_rule(rule, min_confidence)
-                
-                if new_facts:
-                    new_facts_found = True
-                    rules_applied[rule.rule_id] += len(new_facts)
-                    
-                    for fact in new_facts:
-                        self._add_inferred_fact(fact)
+        rules_applied, iteration = self._evaluate(
+            [(key,) + self._fact_infos(key)[0] for key in self._base],
+            max_iterations, min_confidence
+        )
         
         elapsed = time.time() - start_time
         
@@ -200,274 +210,380 @@ class InferenceEngine:
             time_elapsed=elapsed
         )
     
-    def _apply_rule(
+    def infer(
         self,
-        rule: InferenceRule,
-        min_confidence: float
-    ) -> List[InferredFact]:
-        """Apply a single rule and return new facts."""
-        
-        if rule.rule_type == RuleType.TRANSITIVITY:
-            return self._apply_transitivity(rule, min_confidence)
+        max_iterations: int = 100,
+        min_confidence: float = 0.1
+    ) -> InferenceResult:
+        """
+        Materialize inferences once, then keep them up to date.
         
-        elif rule.rule_type == RuleType.INHERITANCE:
-            return self._apply_inheritance(rule, min_confidence)
+        The first call runs infer_all() and subscribes to the graph, so
+        every later GraphStore.add_edge() only derives that edge's
+        consequences. A full re-run happens only if edges were removed,
+        min_confidence changed, or a new edge states an inferred fact with
+        less confidence than it was derived with.
+        """
+        if self._base is None or self._dirty or min_confidence != self._min_confidence:
+            result = self.infer_all(max_iterations, min_confidence)
+            self.enable_incremental()
+            return result
+        return InferenceResult(
+            inferred_facts=list(self._inferred.values()),
+            rules_applied={},
+            total_iterations=0,
+            time_elapsed=0.0
+        )
+    
+    def add_edge(
+        self,
+        source_id: int,
+        target_id: int,
+        relation: RelationType,
+        weight: float = 1.0,
+        max_iterations: int = 100
+    ) -> InferenceResult:
+        """
+        Derive only the consequences of one new base edge.
         
-        elif rule.rule_type == RuleType.INVERSE:
-            return self._apply_inverse(rule, min_confidence)
+        Call after the edge was added to the graph (enable_incremental()
+        does this automatically on GraphStore.add_edge).
+        """
+        return self.add_edges([(source_id, target_id, relation, weight)], max_iterations)
+    
+    def add_edges(
+        self,
+        edges: Iterable[Tuple[int, int, RelationType, float]],
+        max_iterations: int = 100
+    ) -> InferenceResult:
+        """
+        Derive the consequences of several new base edges in one pass.
         
-        elif rule.rule_type == RuleType.SYMMETRY:
-            return self._apply_symmetry(rule, min_confidence)
+        All new edges form the first delta, so a batch costs one
+        semi-naive evaluation instead of one per edge. An edge that states
+        an inferred fact with less confidence than it was derived with
+        retracts whatever was built on it, so that falls back to a full pass.
         
-        elif rule.rule_type == RuleType.COMPOSITION:
-            return self._apply_composition(rule, min_confidence)
+        Args:
+            edges: (source_id, target_id, relation, weight) tuples
+            max_iterations: Maximum inference iterations
+        """
+        start_time = time.time()
+        if self._base is None:
+            return self.infer_all(max_iterations, self._min_confidence)
+        
+        before = set(self._inferred)
+        delta: Dict[Tuple[int, int, RelationType], None] = {}
+        for source_id, target_id, relation, weight in edges:
+            key = (source_id, target_id, relation)
+            if self._base.get(key, -1.0) >= weight:
+                continue
+            existing = self._inferred.get(key)
+            if existing is not None and existing.confidence > weight:
+                result = self.infer_all(max_iterations, self._min_confidence)
+                result.inferred_facts = [
+                    f for f in result.inferred_facts
+                    if (f.source_id, f.target_id, f.relation) not in before
+                ]
+                return result
+            # A previously inferred fact that is now stated directly
+            self._remove_inferred(key)
+            self._index_fact(key)
+            self._base[key] = weight
+            delta[key] = None
+        
+        if not delta:
+            return InferenceResult([], {}, 0, time.time() - start_time)
+        
+        rules_applied, iteration = self._evaluate(
+            [(key,) + self._fact_infos(key)[0] for key in delta],
+            max_iterations, self._min_confidence
+        )
         
-        elif rule.rule_type == RuleType.CHAIN:
-            return self._apply_chain(rule, min_confidence)
+        return InferenceResult(
+            inferred_facts=[f for k, f in self._inferred.items() if k not in before],
+            rules_applied=dict(rules_applied),
+            total_iterations=iteration,
+            time_elapsed=time.time() - start_time
+        )
+    
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """
+        Queue graph edge additions and derive their consequences on exit.
         
-        return []
+        Example:
+            with engine.bulk():
+                for s, t, rel in facts:
+                    graph.add_edge(s, t, rel)   # no inference yet
+            # one add_edges() pass over all new edges here
+        """
+        if self._deferred is not None:
+            yield
+            return
+        self._deferred = []
+        try:
+            yield
+        finally:
+            deferred, self._deferred = self._deferred, None
+            if deferred:
+                self.add_edges(deferred)
     
-    def _apply_transitivity(
+    def enable_incremental(self) -> None:
+        """Follow GraphStore edge additions/removals."""
+        if not self._watching:
+            self.graph.add_listener(self._on_graph_event)
+            self._watching = True
+    
+    def disable_incremental(self) -> None:
+        if self._watching:
+            self.graph.remove_listener(self._on_graph_event)
+            self._watching = False
+    
+    def _on_graph_event(self, event: str, edge: GraphEdge) -> None:
+        if self._base is None:
+            return
+        if event == "add_edge":
+            if self._deferred is not None:
+                self._deferred.append(
+                    (edge.source_id, edge.target_id, edge.relation_type, edge.weight)
+                )
+            else:
+                self.add_edge(edge.source_id, edge.target_id, edge.relation_type, edge.weight)
+        elif event == "remove_edge":
+            # Retracting derived facts needs a full pass; do it lazily
+            self._dirty = True
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # SEMI-NAIVE EVALUATION
+    # ═══════════════════════════════════════════════════════════════════
+    
+    def _load_base(self) -> None:
+        """Index graph edges as base facts: (src, tgt, rel) -> weight."""
+        self._base = {}
+        self._succ = defaultdict(lambda: defaultdict(set))
+        self._pred = defaultdict(lambda: defaultdict(set))
+        
+        for edge in self.graph.get_all_edges():
+            key = (edge.source_id, edge.target_id, edge.relation_type)
+            if edge.weight > self._base.get(key, -1.0):
+                self._base[key] = edge.weight
+            self._index_fact(key)
+    
+    def _index_fact(self, key: Tuple[int, int, RelationType]) -> None:
+        source, target, relation = key
+        self._succ[relation][source].add(target)
+        self._pred[relation][target].add(source)
+    
+    def _fact_infos(
         self,
-        rule: InferenceRule,
+        key: Tuple[int, int, RelationType]
+    ) -> List[Tuple[float, int, List[Tuple[int, RelationType, int]]]]:
+        """(confidence, depth, chain) of each derivation of a base or inferred fact."""
+        weight = self._base.get(key)
+        if weight is not None:
+            return [(weight, 1, [(key[0], key[2], key[1])])]
+        return [(f.confidence, f.depth, f.chain) for f in self._alts[key]]
+    
+    def _evaluate(
+        self,
+        delta: List[Tuple[Tuple[int, int, RelationType], float, int, List[Tuple[int, RelationType, int]]]],
+        max_iterations: int,
         min_confidence: float
-    ) -> List[InferredFact]:
+    ) -> Tuple[Dict[str, int], int]:
         """
-        Apply transitive rule.
-        
-        If A->B and B->C exist with the antecedent relation,
-        derive A->C with the consequent relation.
+        Propagate a delta of new derivations, (key, confidence, depth, chain),
+        to fixpoint; returns (rules_applied, rounds).
         """
-        if len(rule.antecedent_relations) != 2:
-            return []
-        
-        rel1, rel2 = rule.antecedent_relations
-        new_facts = []
-        
-        # Get all edges of the first relation type
-        edges1 = self.graph.get_edges_by_type(rel1)
+        rules = [
+            r for r in self.rules.get_all_enabled_rules()
+            if r.consequent_relation is not None
+        ]
+        rules_applied: Dict[str, int] = defaultdict(int)
+        iteration = 0
         
-        for edge1 in edges1:
-            # Find edges that continue from edge1's target
-            mid_node = edge1.target_id
+        while delta and iteration < max_iterations:
+            iteration += 1
             
-            for edge2 in self.graph.get_outgoing_edges(mid_node):
-                if edge2.relation_type != rel2:
-                    continue
-                
-                # Found a chain: edge1.source -> mid -> edge2.target
-                source = edge1.source_id
-                target = edge2.target_id
-                
-                # Skip if same node or already exists
-                if source == target:
-                    continue
-                
-                key = (source, target, rule.consequent_relation)
-                if key in self._inferred:
-                    continue
-                
-                if self.graph.has_edge_between(source, target, rule.consequent_relation):
-                    continue
-                
-                # Calculate confidence
-                confidence = edge1.weight * edge2.weight * rule.confidence_decay
-                
-                if confidence >= min_confidence:
-                    fact = InferredFact(
-                        source_id=source,
-                        target_id=target,
-                        relation=rule.consequent_relation,
-                        confidence=confidence,
-                        rule_id=rule.rule_id,
-                        chain=[
-                            (edge1.source_id, rel1, mid_node),
-                            (mid_node, rel2, edge2.target_id)
-                        ],
-                        depth=2
-                    )
-                    new_facts.append(fact)
+            by_relation: Dict[RelationType, List[Tuple]] = defaultdict(list)
+            for item in delta:
+                by_relation[item[0][2]].append(item)
+            
+            next_delta = []
+            for rule in rules:
+                for fact in self._apply_rule(rule, by_relation, min_confidence):
+                    if self._add_inferred_fact(fact):
+                        key = (fact.source_id, fact.target_id, fact.relation)
+                        next_delta.append((key, fact.confidence, fact.depth, fact.chain))
+                        rules_applied[rule.rule_id] += 1
+                        self._stats["rules_fired"][rule.rule_id] += 1
+            
+            delta = next_delta
         
-        return new_facts
+        return rules_applied, iteration
     
-    def _apply_inheritance(
+    def _apply_rule(
         self,
         rule: InferenceRule,
+        delta: Dict[RelationType, List[Tuple]],
         min_confidence: float
     ) -> List[InferredFact]:
-        """
-        Apply inheritance rule.
-        
-        If A IS_A B and B has property P, then A inherits P.
-        """
-        if len(rule.antecedent_relations) != 2:
-            return []
-        
-        is_a_rel, prop_rel = rule.antecedent_relations
-        new_facts = []
-        
-        # For each IS_A edge
-        is_a_edges = self.graph.get_edges_by_type(is_a_rel)
+        """Join a rule against the delta derivations and return candidate facts."""
+        relations = rule.antecedent_relations
+        
+        if rule.rule_type in (RuleType.INVERSE, RuleType.SYMMETRY):
+            if len(relations) != 1:
+                return []
+            return self._apply_unary(rule, delta.get(relations[0], ()), min_confidence)
+        
+        if rule.rule_type in (
+            RuleType.TRANSITIVITY, RuleType.COMPOSITION,
+            RuleType.INHERITANCE, RuleType.CHAIN
+        ):
+            # TODO: Support chains longer than 2 hops
+            if len(relations) != 2:
+                return []
+            return self._apply_join(rule, delta, min_confidence)
         
-        for is_a_edge in is_a_edges:
-            subclass = is_a_edge.source_id
-            superclass = is_a_edge.target_id
-            
-            # Find properties of superclass
-            for prop_edge in self.graph.get_outgoing_edges(superclass):
-                if prop_edge.relation_type != prop_rel:
-                    continue
-                
-                property_target = prop_edge.target_id
-                
-                # Check if subclass already has this property
-                key = (subclass, property_target, rule.consequent_relation)
-                if key in self._inferred:
-                    continue
-                
-                if self.graph.has_edge_between(subclass, property_target, rule.consequent_relation):
-                    continue
-                
-                confidence = is_a_edge.weight * prop_edge.weight * rule.confidence_decay
-                
-                if confidence >= min_confidence:
-                    fact = InferredFact(
-                        source_id=subclass,
-                        target_id=property_target,
-                        relation=rule.consequent_relation,
-                        confidence=confidence,
-                        rule_id=rule.rule_id,
-                        chain=[
-                            (subclass, is_a_rel, superclass),
-                            (superclass, prop_rel, property_target)
-                        ],
-                        depth=2
-                    )
-                    new_facts.append(fact)
-        
-        return new_facts
+        return []
     
-    def _apply_inverse(
+    def _apply_unary(
         self,
         rule: InferenceRule,
+        delta: List[Tuple],
         min_confidence: float
     ) -> List[InferredFact]:
         """
-        Apply inverse rule.
+        Apply inverse/symmetry rule.
         
-        If A->B exists, derive B->A with inverse relation.
+        If A->B exists, derive B->A with the consequent relation.
         """
-        if len(rule.antecedent_relations) != 1:
-            return []
-        
-        source_rel = rule.antecedent_relations[0]
         new_facts = []
-        
-        for edge in self.graph.get_edges_by_type(source_rel):
-            # Inverse: swap source and target
-            key = (edge.target_id, edge.source_id, rule.consequent_relation)
-            
-            if key in self._inferred:
-                continue
-            
-            if self.graph.has_edge_between(edge.target_id, edge.source_id, rule.consequent_relation):
-                continue
-            
-            confidence = edge.weight * rule.confidence_decay
-            
-            if confidence >= min_confidence:
-                fact = InferredFact(
-                    source_id=edge.target_id,
-                    target_id=edge.source_id,
-                    relation=rule.consequent_relation,
-                    confidence=confidence,
-                    rule_id=rule.rule_id,
-                    chain=[(edge.source_id, source_rel, edge.target_id)],
-                    depth=1
-                )
+        for key, confidence, depth, chain in delta:
+            fact = self._candidate(
+                rule, key[1], key[0], confidence * rule.confidence_decay,
+                depth, chain, min_confidence
+            )
+            if fact:
                 new_facts.append(fact)
-        
         return new_facts
     
-    def _apply_symmetry(
+    def _apply_join(
         self,
         rule: InferenceRule,
+        delta: Dict[RelationType, List[Tuple]],
         min_confidence: float
     ) -> List[InferredFact]:
         """
-        Apply symmetry rule.
+        Apply a two-hop rule (transitivity, composition, inheritance).
         
-        If A->B exists, derive B->A with same relation.
+        If A -rel1-> B and B -rel2-> C, derive A -consequent-> C.
+        Only pairs with at least one side in the delta are joined, each
+        delta derivation against every derivation of the other side.
         """
-        if len(rule.antecedent_relations) != 1:
-            return []
-        
-        rel = rule.antecedent_relations[0]
+        rel1, rel2 = rule.antecedent_relations
         new_facts = []
         
-        for edge in self.graph.get_edges_by_type(rel):
-            # Check if reverse already exists
-            key = (edge.target_id, edge.source_id, rel)
-            
-            if key in self._inferred:
-                continue
-            
-            if self.graph.has_edge_between(edge.target_id, edge.source_id, rel):
-                continue
-            
-            confidence = edge.weight * rule.confidence_decay
-            
-            if confidence >= min_confidence:
-                fact = InferredFact(
-                    source_id=edge.target_id,
-                    target_id=edge.source_id,
-                    relation=rel,
-                    confidence=confidence,
-                    rule_id=rule.rule_id,
-                    chain=[(edge.source_id, rel, edge.target_id)],
-                    depth=1
-                )
+        def combine(a: int, c: int, first: Tuple, second: Tuple) -> None:
+            if a == c:
+                return
+            conf1, depth1, chain1 = first
+            conf2, depth2, chain2 = second
+            fact = self._candidate(
+                rule, a, c, conf1 * conf2 * rule.confidence_decay,
+                depth1 + depth2, chain1 + chain2, min_confidence
+            )
+            if fact:
                 new_facts.append(fact)
         
+        # Δ(rel1) ⋈ All(rel2)
+        successors = self._succ[rel2]
+        for (a, b, _), *first in delta.get(rel1, ()):
+            for c in list(successors.get(b, ())):
+                for second in self._fact_infos((b, c, rel2)):
+                    combine(a, c, first, second)
+        
+        # All(rel1) ⋈ Δ(rel2)
+        predecessors = self._pred[rel1]
+        for (b, c, _), *second in delta.get(rel2, ()):
+            for a in list(predecessors.get(b, ())):
+                for first in self._fact_infos((a, b, rel1)):
+                    combine(a, c, first, second)
+        
         return new_facts
     
-    def _apply_composition(
+    def _candidate(
         self,
         rule: InferenceRule,
+        source: int,
+        target: int,
+        confidence: float,
+        depth: int,
+        chain: List[Tuple[int, RelationType, int]],
         min_confidence: float
-    ) -> List[InferredFact]:
-        """Apply composition rule (same as transitivity but for mixed relations)."""
-        return self._apply_transitivity(rule, min_confidence)
+    ) -> Optional[InferredFact]:
+        """Build a fact if it is new (or more confident or shallower) and within limits."""
+        if confidence < min_confidence or depth > rule.max_depth:
+            return None
+        
+        key = (source, target, rule.consequent_relation)
+        if key in self._base or self._dominated(key, confidence, depth):
+            return None
+        
+        return InferredFact(
+            source_id=source,
+            target_id=target,
+            relation=rule.consequent_relation,
+            confidence=confidence,
+            rule_id=rule.rule_id,
+            chain=list(chain),
+            depth=depth
+        )
     
-    def _apply_chain(
-        self,
-        rule: InferenceRule,
-        min_confidence: float
-    ) -> List[InferredFact]:
-        """Apply custom chain rule (multi-hop)."""
-        if len(rule.antecedent_relations) < 2:
-            return []
-        
-        # For now, handle 2-hop chains
-        if len(rule.antecedent_relations) == 2:
-            return self._apply_transitivity(rule, min_confidence)
-        
-        # TODO: Support longer chains
-        return []
+    def _dominated(self, key: Tuple[int, int, RelationType], confidence: float, depth: int) -> bool:
+        """True if a known derivation is at least as confident and no deeper."""
+        return any(
+            f.confidence >= confidence and f.depth <= depth
+            for f in self._alts.get(key, ())
+        )
     
-    def _add_inferred_fact(self, fact: InferredFact) -> None:
-        """Add an inferred fact to the cache."""
+    def _add_inferred_fact(self, fact: InferredFact) -> bool:
+        """Add a derivation to the cache; True unless an existing one dominates it."""
         key = (fact.source_id, fact.target_id, fact.relation)
+        if self._dominated(key, fact.confidence, fact.depth):
+            return False
+        
+        alts = self._alts.get(key)
+        if alts is None:
+            self._index_fact(key)
+            alts = []
+        alts = [
+            f for f in alts
+            if f.confidence > fact.confidence or f.depth < fact.depth
+        ]
+        alts.append(fact)
+        alts.sort(key=lambda f: f.confidence)
+        self._alts[key] = alts
         
         # Keep highest confidence version
-        if key in self._inferred:
-            if self._inferred[key].confidence >= fact.confidence:
-                return
-        
-        self._inferred[key] = fact
-        self._by_node[fact.source_id].add(fact)
-        self._by_node[fact.target_id].add(fact)
+        best = alts[-1]
+        existing = self._inferred.get(key)
+        if existing is not best:
+            if existing is not None:
+                self._by_node[fact.source_id].discard(existing)
+                self._by_node[fact.target_id].discard(existing)
+            self._inferred[key] = best
+            self._by_node[fact.source_id].add(best)
+            self._by_node[fact.target_id].add(best)
         self._stats["total_inferences"] += 1
+        return True
+    
+    def _remove_inferred(self, key: Tuple[int, int, RelationType]) -> None:
+        self._alts.pop(key, None)
+        fact = self._inferred.pop(key, None)
+        if fact is not None:
+            self._by_node[fact.source_id].discard(fact)
+            self._by_node[fact.target_id].discard(fact)
     
     def can_infer(
         self,
@@ -479,6 +595,12 @@ class InferenceEngine:
         """
         Check if a relation can be inferred between two nodes.
         
+        For relations with a transitivity rule, the graph's reachability
+        index answers without running inference. A reachable chain counts
+        when its best confidence (edge weights times the rule's decay per
+        join, within the rule's max_depth) is at least min_confidence, and
+        comes back as (True, None) when it was not materialized.
+        
         Returns:
             (can_infer, InferredFact or None)
         """
@@ -495,8 +617,61 @@ class InferenceEngine:
         if self.graph.has_edge_between(source_id, target_id, relation):
             return True, None
         
+        # Check transitive reachability
+        rule = self._transitive_rules().get(relation)
+        if rule is not None and source_id != target_id:
+            index = self.graph.reachability([relation])
+            if index.reaches(source_id, target_id):
+                confidence = self._chain_confidence(source_id, target_id, rule, index)
+                if confidence >= min_confidence:
+                    return True, None
+        
         return False, None
     
+    def _transitive_rules(self) -> Dict[RelationType, InferenceRule]:
+        """Enabled rules R, R => R by relation (the least decaying one per relation)."""
+        rules: Dict[RelationType, InferenceRule] = {}
+        for rule in self.rules.get_rules_by_type(RuleType.TRANSITIVITY):
+            relation = rule.consequent_relation
+            if rule.antecedent_relations != [relation] * 2:
+                continue
+            if relation not in rules or rule.confidence_decay > rules[relation].confidence_decay:
+                rules[relation] = rule
+        return rules
+    
+    def _chain_confidence(
+        self,
+        source_id: int,
+        target_id: int,
+        rule: InferenceRule,
+        index: Any
+    ) -> float:
+        """
+        Best confidence of a source -> target chain, as transitive inference
+        would derive it: product of edge weights, times the rule's decay per
+        join, at most rule.max_depth edges. Best-first over the nodes that
+        still reach the target.
+        """
+        relation = rule.consequent_relation
+        heap = [(-1.0, 0, source_id)]  # (-confidence, hops, node)
+        fewest_hops: Dict[int, int] = {}
+        while heap:
+            neg_conf, hops, node = heapq.heappop(heap)
+            if node == target_id:
+                return -neg_conf
+            # Popped in confidence order: a later visit only helps if it is shorter
+            if fewest_hops.get(node, rule.max_depth + 1) <= hops:
+                continue
+            fewest_hops[node] = hops
+            if hops >= rule.max_depth:
+                continue
+            for next_id, _, _, weight in self.graph.adjacent(node, "outgoing", [relation]):
+                if next_id != target_id and not index.reaches(next_id, target_id):
+                    continue
+                confidence = -neg_conf * weight * (rule.confidence_decay if hops else 1.0)
+                heapq.heappush(heap, (-confidence, hops + 1, next_id))
+        return 0.0
+    
     def get_inferred_relations(
         self,
         node_id: int,
@@ -533,6 +708,12 @@ class InferenceEngine:
         """
         results = []
         visited = {node_id}
+        step = "outgoing" if direction == "outgoing" else "incoming"
+        
+        # The closure index bounds the search; stop once everything is found
+        reachable = len(self.graph.reachability([relation]).closure(node_id, step))
+        if reachable == 0:
+            return results
         
         # BFS with confidence tracking
         current = [(node_id, 1.0, 0)]  # (node, confidence, depth)
@@ -544,28 +725,18 @@ class InferenceEngine:
                 if depth >= max_depth:
                     continue
                 
-                # Get edges in specified direction
-                if direction == "outgoing":
-                    edges = self.graph.get_outgoing_edges(curr_id)
-                    get_next = lambda e: e.target_id
-                else:
-                    edges = self.graph.get_incoming_edges(curr_id)
-                    get_next = lambda e: e.source_id
-                
-                for edge in edges:
-                    if edge.relation_type != relation:
-                        continue
-                    
-                    next_id = get_next(edge)
+                for next_id, _, _, weight in self.graph.adjacent(curr_id, step, [relation]):
                     if next_id in visited:
                         continue
                     
                     visited.add(next_id)
-                    new_conf = curr_conf * edge.weight * 0.95  # Decay per hop
+                    new_conf = curr_conf * weight * 0.95  # Decay per hop
                     
                     results.append((next_id, new_conf, depth + 1))
                     next_level.append((next_id, new_conf, depth + 1))
             
+            if len(results) >= reachable:
+                break
             current = next_level
         
         return results
@@ -614,12 +785,18 @@ class InferenceEngine:
             "cache_hits": self._stats["cache_hits"],
             "rules_fired": dict(self._stats["rules_fired"]),
             "nodes_with_inferences": len(self._by_node),
+            "base_facts": len(self._base) if self._base is not None else 0,
+            "incremental": self._watching,
         }
     
     def clear_cache(self) -> None:
         """Clear the inference cache."""
         self._inferred.clear()
+        self._alts.clear()
         self._by_node.clear()
+        self._base = None
+        self._succ = {}
+        self._pred = {}
         self._stats = {
             "total_inferences": 0,
             "cache_hits": 0,
@@ -5,12 +5,12 @@ Uses graph traversal + tree hierarchy to find
 meaningful paths between concepts.
 """
 
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, field
 from collections import deque
-import heapq
 
 from ..graph import GraphStore, GraphNode, GraphEdge, RelationType
+from ..graph.path_search import all_paths, bidirectional_bfs, best_path, k_shortest_paths
 
 
 @dataclass
@@ -46,9 +46,9 @@ class PathFinder:
     Find reasoning paths through the knowledge graph.
     
     Supports:
-    - Shortest path (BFS)
-    - Weighted path (Dijkstra)
-    - All paths up to max depth
+    - Shortest path (bidirectional BFS)
+    - Weighted path (Dijkstra / A*)
+    - k best paths up to max depth (Yen)
     - Constrained paths (by relation type)
     
     Example:
@@ -57,7 +57,7 @@ class PathFinder:
         # Find shortest path
         path = finder.find_shortest_path(node1, node2)
         
-        # Find all paths
+        # Find the best paths (up to 10)
         paths = finder.find_all_paths(node1, node2, max_depth=4)
         
         # Find weighted best path
@@ -98,15 +98,17 @@ class PathFinder:
         self,
         source_id: int,
         target_id: int,
-        relation_types: Optional[List[RelationType]] = None
+        relation_types: Optional[List[RelationType]] = None,
+        max_depth: Optional[int] = None
     ) -> Optional[ReasoningPath]:
         """
-        Find shortest path using BFS.
+        Find shortest path using bidirectional BFS.
         
         Args:
             source_id: Starting node ID
             target_id: Target node ID
             relation_types: Allowed relation types (None = all)
+            max_depth: Maximum number of edges (None = unlimited)
             
         Returns:
             ReasoningPath or None if no path exists
@@ -117,85 +119,32 @@ class PathFinder:
                 return ReasoningPath(nodes=[node], edges=[], score=0)
             return None
         
-        # BFS
-        queue = deque([(source_id, [source_id], [])])
-        visited = {source_id}
-        
-        while queue:
-            current_id, path, edges = queue.popleft()
-            
-            # Get neighbors via outgoing edges
-            for edge in self.graph.get_outgoing_edges(current_id):
-                if relation_types and edge.relation_type not in relation_types:
-                    continue
-                
-                neighbor_id = edge.target_id
-                
-                if neighbor_id == target_id:
-                    # Found!
-                    new_path = path + [neighbor_id]
-                    new_edges = edges + [edge]
-                    nodes = [self.graph.get_node(nid) for nid in new_path]
-                    return ReasoningPath(
-                        nodes=[n for n in nodes if n],
-                        edges=new_edges,
-                        score=len(new_edges),
-                        explanation=self._generate_explanation(
-                            [n for n in nodes if n], new_edges
-                        )
-                    )
-                
-                if neighbor_id not in visited:
-                    visited.add(neighbor_id)
-                    queue.append((
-                        neighbor_id,
-                        path + [neighbor_id],
-                        edges + [edge]
-                    ))
-            
-            # Also check incoming edges (bidirectional search)
-            for edge in self.graph.get_incoming_edges(current_id):
-                if relation_types and edge.relation_type not in relation_types:
-                    continue
-                
-                neighbor_id = edge.source_id
-                
-                if neighbor_id == target_id:
-                    new_path = path + [neighbor_id]
-                    new_edges = edges + [edge]
-                    nodes = [self.graph.get_node(nid) for nid in new_path]
-                    return ReasoningPath(
-                        nodes=[n for n in nodes if n],
-                        edges=new_edges,
-                        score=len(new_edges),
-                        explanation=self._generate_explanation(
-                            [n for n in nodes if n], new_edges
-                        )
-                    )
-                
-                if neighbor_id not in visited:
-                    visited.add(neighbor_id)
-                    queue.append((
-                        neighbor_id,
-                        path + [neighbor_id],
-                        edges + [edge]
-                    ))
+        # Edges are followed in both directions
+        expand = self._expander(relation_types)
+        found = bidirectional_bfs(expand, expand, source_id, target_id, max_depth)
+        if found is None:
+            return None
         
-        return None
+        path = self._build_path(found.nodes, found.edge_ids)
+        path.score = len(path.edges)
+        return path
     
     def find_best_path(
         self,
         source_id: int,
         target_id: int,
-        relation_types: Optional[List[RelationType]] = None
+        relation_types: Optional[List[RelationType]] = None,
+        heuristic: Optional[Callable[[int], float]] = None
     ) -> Optional[ReasoningPath]:
         """
-        Find best weighted path using Dijkstra's algorithm.
+        Find best weighted path using Dijkstra's algorithm (A* with a heuristic).
         
         Args:
             source_id: Starting node ID
             target_id: Target node ID
             relation_types: Allowed relation types (None = all)
+            heuristic: Admissible lower bound on the remaining score from
+                a node to the target (never overestimates)
             
         Returns:
             ReasoningPath with lowest score
@@ -206,148 +155,53 @@ class PathFinder:
                 return ReasoningPath(nodes=[node], edges=[], score=0)
             return None
         
-        # Priority queue: (score, node_id, path, edges)
-        heap = [(0.0, source_id, [source_id], [])]
-        visited = set()
-        
-        while heap:
-            score, current_id, path, edges = heapq.heappop(heap)
-            
-            if current_id in visited:
-                continue
-            visited.add(current_id)
-            
-            if current_id == target_id:
-                nodes = [self.graph.get_node(nid) for nid in path]
-                return ReasoningPath(
-                    nodes=[n for n in nodes if n],
-                    edges=edges,
-                    score=score,
-                    explanation=self._generate_explanation(
-                        [n for n in nodes if n], edges
-                    )
-                )
-            
-            # Explore neighbors via outgoing
-            for edge in self.graph.get_outgoing_edges(current_id):
-                if relation_types and edge.relation_type not in relation_types:
-                    continue
-                
-                neighbor_id = edge.target_id
-                if neighbor_id not in visited:
-                    edge_weight = self.RELATION_WEIGHTS.get(
-                        edge.relation_type, 1.0
-                    ) * edge.weight
-                    
-                    heapq.heappush(heap, (
-                        score + edge_weight,
-                        neighbor_id,
-                        path + [neighbor_id],
-                        edges + [edge]
-                    ))
-            
-            # Also check incoming
-            for edge in self.graph.get_incoming_edges(current_id):
-                if relation_types and edge.relation_type not in relation_types:
-                    continue
-                
-                neighbor_id = edge.source_id
-                if neighbor_id not in visited:
-                    edge_weight = self.RELATION_WEIGHTS.get(
-                        edge.relation_type, 1.0
-                    ) * edge.weight
-                    
-                    heapq.heappush(heap, (
-                        score + edge_weight,
-                        neighbor_id,
-                        path + [neighbor_id],
-                        edges + [edge]
-                    ))
+        found = best_path(
+            self._expander(relation_types), source_id, target_id,
+            cost=self._edge_cost, heuristic=heuristic
+        )
+        if found is None:
+            return None
         
-        return None
+        path = self._build_path(found.nodes, found.edge_ids)
+        path.score = self._path_cost(path.edges)
+        return path
     
     def find_all_paths(
         self,
         source_id: int,
         target_id: int,
         max_depth: int = 5,
-        relation_types: Optional[List[RelationType]] = None
+        relation_types: Optional[List[RelationType]] = None,
+        max_paths: Optional[int] = None
     ) -> List[ReasoningPath]:
         """
-        Find all paths up to max_depth.
+        Find all loopless paths up to max_depth edges.
         
         Args:
             source_id: Starting node ID
             target_id: Target node ID
-            max_depth: Maximum path length
+            max_depth: Maximum number of edges on a path
             relation_types: Allowed relation types (None = all)
+            max_paths: Return only the best-scoring max_paths paths, found
+                with Yen's algorithm instead of enumerating all (None = all)
             
         Returns:
-            List of all valid ReasoningPaths
+            ReasoningPaths sorted by score (best first)
         """
-        paths = []
-        
-        def dfs(
-            current_id: int,
-            target: int,
-            path: List[int],
-            edges: List[GraphEdge],
-            visited: Set[int],
-            depth: int
-        ):
-            if depth > max_depth:
-                return
-            
-            if current_id == target:
-                nodes = [self.graph.get_node(nid) for nid in path]
-                valid_nodes = [n for n in nodes if n]
-                score = sum(
-                    self.RELATION_WEIGHTS.get(e.relation_type, 1.0) * e.weight
-                    for e in edges
-                )
-                paths.append(ReasoningPath(
-                    nodes=valid_nodes,
-                    edges=edges.copy(),
-                    score=score,
-                    explanation=self._generate_explanation(valid_nodes, edges)
-                ))
-                return
-            
-            # Explore outgoing
-            for edge in self.graph.get_outgoing_edges(current_id):
-                if relation_types and edge.relation_type not in relation_types:
-                    continue
-                
-                neighbor_id = edge.target_id
-                if neighbor_id not in visited:
-                    visited.add(neighbor_id)
-                    path.append(neighbor_id)
-                    edges.append(edge)
-                    
-                    dfs(neighbor_id, target, path, edges, visited, depth + 1)
-                    
-                    path.pop()
-                    edges.pop()
-                    visited.remove(neighbor_id)
-            
-            # Explore incoming
-            for edge in self.graph.get_incoming_edges(current_id):
-                if relation_types and edge.relation_type not in relation_types:
-                    continue
-                
-                neighbor_id = edge.source_id
-                if neighbor_id not in visited:
-                    visited.add(neighbor_id)
-                    path.append(neighbor_id)
-                    edges.append(edge)
-                    
-                    dfs(neighbor_id, target, path, edges, visited, depth + 1)
-                    
-                    path.pop()
-                    edges.pop()
-                    visited.remove(neighbor_id)
+        expand = self._expander(relation_types)
+        if max_paths is None:
+            found = all_paths(expand, source_id, target_id, max_depth)
+        else:
+            found = k_shortest_paths(
+                expand, source_id, target_id, max_paths,
+                cost=self._edge_cost, max_depth=max_depth
+            )
         
-        dfs(source_id, target_id, [source_id], [], {source_id}, 0)
+        paths = []
+        for result in found:
+            path = self._build_path(result.nodes, result.edge_ids)
+            path.score = self._path_cost(path.edges)
+            paths.append(path)
         
         # Sort by score
         paths.sort(key=lambda p: p.score)
@@ -356,16 +210,32 @@ class PathFinder:
     def find_common_ancestors(
         self,
         node_ids: List[int],
-        max_depth: int = 5
+        max_depth: Optional[int] = 5
     ) -> List[GraphNode]:
         """
         Find common ancestors of multiple nodes.
         
         Useful for finding shared concepts/categories.
+        
+        Args:
+            node_ids: Nodes to compare
+            max_depth: Limit on IS_A/PART_OF hops (None = unlimited,
+                answered from the graph's reachability index)
         """
         if not node_ids:
             return []
         
+        # Look for IS_A and PART_OF relations going up
+        upward = [RelationType.IS_A, RelationType.PART_OF]
+        
+        if max_depth is None:
+            common = self.graph.reachability(upward).common(list(node_ids))
+            return [
+                self.graph.get_node(nid)
+                for nid in common
+                if self.graph.get_node(nid)
+            ]
+        
         # Get ancestors for each node
         ancestors_sets = []
         
@@ -380,11 +250,9 @@ class PathFinder:
                     continue
                 visited.add(current_id)
                 
-                # Look for IS_A and PART_OF relations going up
-                for edge in self.graph.get_outgoing_edges(current_id):
-                    if edge.relation_type in [RelationType.IS_A, RelationType.PART_OF]:
-                        ancestors.add(edge.target_id)
-                        queue.append((edge.target_id, depth + 1))
+                for parent_id, _, _, _ in self.graph.adjacent(current_id, "outgoing", upward):
+                    ancestors.add(parent_id)
+                    queue.append((parent_id, depth + 1))
             
             ancestors_sets.append(ancestors)
         
@@ -402,6 +270,32 @@ class PathFinder:
             if self.graph.get_node(nid)
         ]
     
+    def _build_path(self, node_ids: List[int], edge_ids: List[int]) -> ReasoningPath:
+        """Materialize node/edge objects only for the final path."""
+        nodes = [self.graph.get_node(nid) for nid in node_ids]
+        nodes = [n for n in nodes if n]
+        edges = [self.graph.get_edge(eid) for eid in edge_ids]
+        edges = [e for e in edges if e]
+        return ReasoningPath(
+            nodes=nodes,
+            edges=edges,
+            explanation=self._generate_explanation(nodes, edges)
+        )
+    
+    def _expander(self, relation_types: Optional[List[RelationType]]):
+        """Adjacency over both edge directions, filtered by relation type."""
+        graph = self.graph
+        return lambda node_id: graph.adjacent(node_id, "both", relation_types)
+    
+    def _edge_cost(self, relation: RelationType, weight: float) -> float:
+        return self.RELATION_WEIGHTS.get(relation, 1.0) * weight
+    
+    def _path_cost(self, edges: List[GraphEdge]) -> float:
+        return sum(
+            self.RELATION_WEIGHTS.get(e.relation_type, 1.0) * e.weight
+            for e in edges
+        )
+    
     def _generate_explanation(
         self,
         nodes: List[GraphNode],
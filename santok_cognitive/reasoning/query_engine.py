@@ -101,16 +101,9 @@ class QueryEngine:
         Returns:
             QueryResult with matching objects
         """
-        results = self.memory.search_by_content(query, limit=limit * 2)
-        
-        # Filter by content type if specified
-        if content_types:
-            results = [
-                obj for obj in results
-                if obj.content_type in content_types
-            ]
-        
-        results = results[:limit]
+        results = self.memory.search_by_content(
+            query, limit=limit, content_types=content_types
+        )
         
         return QueryResult(
             objects=results,
@@ -252,7 +252,7 @@ class SanTOKReasoner:
         
         # 2. Run inference
         if self.config["run_inference"]:
-            inf_result = self.inference_engine.infer_all(
+            inf_result = self.inference_engine.infer(
                 max_iterations=50,
                 min_confidence=self.config["min_confidence"]
             )
@@ -0,0 +1,17 @@
+"""
+SanTOK Cognitive - Storage Primitives
+=====================================
+
+Dependency-free building blocks for persistence:
+- columnar: Columnar binary snapshots (memory-mapped, per-column decode)
+- WriteAheadLog: Append-only, checksummed operation log
+"""
+
+from .columnar import write_columnar, ColumnarReader
+from .write_ahead_log import WriteAheadLog
+
+__all__ = [
+    "write_columnar",
+    "ColumnarReader",
+    "WriteAheadLog",
+]
@@ -0,0 +1,238 @@
+"""
+Columnar binary snapshot format.
+
+Pure Python - one file holds several tables, each stored column by column:
+
+    magic "SNTKCOL1" | u64 manifest length | manifest (JSON) | column data
+
+The manifest records, for every column, its kind and its byte range in
+the data section. Column kinds:
+
+    i64    int64 array
+    f64    float64 array
+    str    int64 offsets (rows + 1) followed by one UTF-8 blob
+    ostr   null mask (1 byte/row) followed by a "str" column
+    json   one JSON array (dicts, lists, optional ints)
+
+Readers mmap the file and decode only the columns they ask for, so a
+table is one array copy / one blob decode per column instead of one
+JSON object per row.
+
+Example:
+    write_columnar("graph.bin", {
+        "nodes": ([("node_id", "i64"), ("text", "str")], node_rows),
+    }, meta={"next_edge_id": 10})
+
+    with ColumnarReader("graph.bin") as reader:
+        rows = reader.records("nodes")       # list of dicts
+        ids = reader.column("nodes", "node_id")
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional, Iterable
+
+MAGIC = b"SNTKCOL1"
+FORMAT_VERSION = 1
+
+Schema = List[Tuple[str, str]]              # [(column, kind), ...]
+Table = Tuple[Schema, List[Dict[str, Any]]]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# COLUMN CODECS
+# ═══════════════════════════════════════════════════════════════════════
+
+def _encode_str(values: Iterable[str]) -> bytes:
+    offsets = array('q', [0])
+    chunks = []
+    position = 0
+    for value in values:
+        data = value.encode("utf-8")
+        chunks.append(data)
+        position += len(data)
+        offsets.append(position)
+    return offsets.tobytes() + b"".join(chunks)
+
+
+def _decode_str(buf: memoryview, rows: int, swap: bool) -> List[str]:
+    offsets = array('q')
+    offsets.frombytes(buf[:8 * (rows + 1)])
+    if swap:
+        offsets.byteswap()
+    blob = bytes(buf[8 * (rows + 1):])
+    text = blob.decode("utf-8")
+    if len(text) == len(blob):
+        # ASCII: byte offsets are character offsets, slice the decoded text
+        return [text[offsets[i]:offsets[i + 1]] for i in range(rows)]
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(rows)]
+
+
+def encode_column(kind: str, values: List[Any]) -> bytes:
+    """Encode one column of values."""
+    if kind == "i64":
+        return array('q', values).tobytes()
+    if kind == "f64":
+        return array('d', values).tobytes()
+    if kind == "str":
+        return _encode_str(values)
+    if kind == "ostr":
+        mask = bytes(0 if v is None else 1 for v in values)
+        return mask + _encode_str("" if v is None else v for v in values)
+    if kind == "json":
+        return json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def decode_column(kind: str, buf: memoryview, rows: int, swap: bool = False) -> List[Any]:
+    """Decode one column (swap = file written with the other byte order)."""
+    if kind in ("i64", "f64"):
+        values = array('q' if kind == "i64" else 'd')
+        values.frombytes(buf)
+        if swap:
+            values.byteswap()
+        return values.tolist()
+    if kind == "str":
+        return _decode_str(buf, rows, swap)
+    if kind == "ostr":
+        mask = bytes(buf[:rows])
+        strings = _decode_str(buf[rows:], rows, swap)
+        return [s if present else None for s, present in zip(strings, mask)]
+    if kind == "json":
+        return json.loads(bytes(buf).decode("utf-8"))
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# WRITER
+# ═══════════════════════════════════════════════════════════════════════
+
+def write_columnar(
+    path: str,
+    tables: Dict[str, Table],
+    meta: Optional[Dict[str, Any]] = None,
+    sync: bool = False
+) -> int:
+    """
+    Write tables to path atomically (temp file + rename).
+
+    Args:
+        path: Output file
+        tables: {name: (schema, rows)} where rows are dicts keyed by column
+        meta: Small JSON-serializable header values
+        sync: fsync before the rename
+
+    Returns:
+        File size in bytes
+    """
+    manifest: Dict[str, Any] = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "meta": meta or {},
+        "tables": {},
+    }
+    blobs = []
+    position = 0
+    for name, (schema, rows) in tables.items():
+        columns = {}
+        for column, kind in schema:
+            data = encode_column(kind, [row.get(column) for row in rows])
+            columns[column] = [kind, position, len(data)]
+            blobs.append(data)
+            position += len(data)
+        manifest["tables"][name] = {"rows": len(rows), "columns": columns}
+
+    header = json.dumps(manifest, separators=(",", ":"), default=str).encode("utf-8")
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, target)
+    return len(MAGIC) + 8 + len(header) + position
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# READER
+# ═══════════════════════════════════════════════════════════════════════
+
+class ColumnarReader:
+    """Memory-mapped reader; columns are decoded on first access."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        view = memoryview(self._map) if self._map is not None else memoryview(b"")
+
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            view.release()
+            self.close()
+            raise ValueError(f"Not a columnar snapshot: {self.path}")
+        (header_len,) = struct.unpack("<Q", view[len(MAGIC):len(MAGIC) + 8])
+        start = len(MAGIC) + 8
+        self.manifest: Dict[str, Any] = json.loads(bytes(view[start:start + header_len]))
+        view.release()
+
+        self._data_start = start + header_len
+        self._swap = self.manifest.get("byteorder", sys.byteorder) != sys.byteorder
+        self._cache: Dict[Tuple[str, str], List[Any]] = {}
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.manifest.get("meta", {})
+
+    def tables(self) -> List[str]:
+        return list(self.manifest["tables"])
+
+    def rows(self, table: str) -> int:
+        info = self.manifest["tables"].get(table)
+        return info["rows"] if info else 0
+
+    def column(self, table: str, column: str) -> List[Any]:
+        """Decode one column (cached)."""
+        key = (table, column)
+        if key not in self._cache:
+            info = self.manifest["tables"][table]
+            kind, offset, length = info["columns"][column]
+            start = self._data_start + offset
+            with memoryview(self._map)[start:start + length] as buf:
+                self._cache[key] = decode_column(kind, buf, info["rows"], self._swap)
+        return self._cache[key]
+
+    def records(self, table: str) -> List[Dict[str, Any]]:
+        """All rows of a table as dicts (empty if the table is absent)."""
+        info = self.manifest["tables"].get(table)
+        if not info or not info["rows"]:
+            return []
+        names = list(info["columns"])
+        columns = [self.column(table, name) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def close(self) -> None:
+        self._cache = {}
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ColumnarReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
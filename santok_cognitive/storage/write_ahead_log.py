@@ -0,0 +1,129 @@
+"""
+Append-only write-ahead log.
+
+File layout:
+
+    magic "SNTKWAL1" | u64 base (snapshot sequence the log applies to)
+    record*          | u32 length | u32 crc32 | payload (length bytes)
+
+Payloads are compact JSON arrays ``[op, arg, ...]``. A torn or corrupt
+tail (crash mid-append) ends replay at the last intact record, and the
+next open for appending truncates it away.
+"""
+
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+
+MAGIC = b"SNTKWAL1"
+_HEADER = struct.Struct("<Q")
+_FRAME = struct.Struct("<II")
+
+
+class WriteAheadLog:
+    """
+    Length-prefixed, checksummed record log.
+
+    Example:
+        wal = WriteAheadLog("data/wal.log")
+        wal.append([["put", {"id": 1}], ["delete", 2]])
+        for op in wal.replay():
+            print(op)                      # ["put", {"id": 1}] ...
+        wal.reset(base=7)                  # after writing snapshot 7
+    """
+
+    def __init__(self, path: str, sync: bool = False):
+        """
+        Args:
+            path: Log file (created on first append)
+            sync: fsync after every append
+        """
+        self.path = Path(path)
+        self.sync = sync
+        self._end = None        # end of the last intact record, found once
+
+    @property
+    def base(self) -> int:
+        """Snapshot sequence this log extends (-1 if there is no log)."""
+        if not self.path.exists():
+            return -1
+        with open(self.path, "rb") as f:
+            head = f.read(len(MAGIC) + _HEADER.size)
+        if len(head) < len(MAGIC) + _HEADER.size or head[:len(MAGIC)] != MAGIC:
+            return -1
+        return _HEADER.unpack(head[len(MAGIC):])[0]
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def reset(self, base: int) -> None:
+        """Start an empty log on top of snapshot ``base`` (atomic replace)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + _HEADER.pack(base))
+            if self.sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._end = len(MAGIC) + _HEADER.size
+
+    def append(self, records: List[Any]) -> int:
+        """Append records in one write; returns bytes written."""
+        if not records:
+            return 0
+        if self.base < 0:
+            self.reset(0)
+
+        frames = []
+        for record in records:
+            payload = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+            frames.append(_FRAME.pack(len(payload), zlib.crc32(payload)))
+            frames.append(payload)
+        data = b"".join(frames)
+
+        if self._end is None:
+            self._end = self._valid_end()
+        with open(self.path, "r+b") as f:
+            f.truncate(self._end)
+            f.seek(self._end)
+            f.write(data)
+            if self.sync:
+                f.flush()
+                os.fsync(f.fileno())
+        self._end += len(data)
+        return len(data)
+
+    def replay(self) -> Iterator[Any]:
+        """Yield records in append order, stopping at a damaged tail."""
+        for _, record in self._scan():
+            yield record
+
+    def _valid_end(self) -> int:
+        end = len(MAGIC) + _HEADER.size
+        for end, _ in self._scan():
+            pass
+        return end
+
+    def _scan(self) -> Iterator[Tuple[int, Any]]:
+        """(offset after record, record) for every intact record."""
+        if self.base < 0:
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        position = len(MAGIC) + _HEADER.size
+        while position + _FRAME.size <= len(data):
+            length, crc = _FRAME.unpack_from(data, position)
+            start = position + _FRAME.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            position = start + length
+            yield position, json.loads(payload)
+
+    def __repr__(self) -> str:
+        return f"WriteAheadLog({str(self.path)!r}, base={self.base}, bytes={self.size})"
@@ -38,6 +38,9 @@ class Tree:
         self.nodes: Dict[str, TreeNode] = {}
         self.root_id: Optional[str] = None
         
+        # Change listeners (not persisted)
+        self._listeners: List[Callable[[str, "Tree", TreeNode], None]] = []
+        
         # Create root node
         root_content = root_content or name
         self._create_root(root_content)
@@ -105,6 +108,7 @@ class Tree:
         self.nodes[node_id] = node
         parent.add_child(node_id)
         
+        self._notify("add_node", node)
         return node
     
     def get_node(self, node_id: str) -> Optional[TreeNode]:
@@ -141,8 +145,35 @@ class Tree:
         
         # Remove node
         del self.nodes[node_id]
+        self._notify("remove_node", node)
         return True
     
+    def add_listener(self, callback: Callable[[str, "Tree", TreeNode], None]) -> None:
+        """
+        Subscribe to node changes.
+        
+        callback(event, tree, node) is called after each change, with event
+        "add_node" or "remove_node". A recursive removal reports every
+        descendant before the node itself.
+        """
+        listeners = self.__dict__.setdefault("_listeners", [])
+        if callback not in listeners:
+            listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, "Tree", TreeNode], None]) -> None:
+        listeners = getattr(self, "_listeners", [])
+        if callback in listeners:
+            listeners.remove(callback)
+    
+    def _notify(self, event: str, node: TreeNode) -> None:
+        for callback in list(getattr(self, "_listeners", ())):
+            callback(event, self, node)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
+    
     def get_path_to_root(self, node_id: str) -> List[TreeNode]:
         """
         Get path from node to root (inclusive).
@@ -355,6 +386,7 @@ class Tree:
             nid: TreeNode.from_dict(ndata)
             for nid, ndata in data["nodes"].items()
         }
+        tree._listeners = []
         return tree
     
     def print_tree(self, node_id: Optional[str] = None, indent: str = "") -> str:
@@ -4,15 +4,16 @@ TreeStore - Manages multiple knowledge trees.
 Supports:
 - Multiple trees (concept tree, document tree, etc.)
 - Cross-tree operations
-- Persistence (JSON)
+- Persistence (JSON, columnar binary)
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from pathlib import Path
 import json
 
 from .tree_node import TreeNode
 from .tree import Tree
+from ..storage.columnar import write_columnar, ColumnarReader
 
 
 class TreeStore:
@@ -35,9 +36,20 @@ class TreeStore:
         store.save("knowledge_trees.json")
     """
     
+    # Column layout for save_binary / columnar snapshots
+    TREE_COLUMNS = [("tree_id", "str"), ("name", "str"), ("root_id", "ostr")]
+    NODE_COLUMNS = [
+        ("tree_id", "str"), ("node_id", "str"), ("content", "str"),
+        ("parent_id", "ostr"), ("children_ids", "json"), ("depth", "i64"),
+        ("metadata", "json"), ("embedding_ref", "ostr"), ("graph_node_ref", "json"),
+    ]
+    
     def __init__(self):
         """Initialize empty tree store."""
         self.trees: Dict[str, Tree] = {}
+        
+        # Change listeners (not persisted)
+        self._listeners: List[Callable[[str, Optional[Tree], Optional[TreeNode]], None]] = []
     
     def create_tree(
         self,
@@ -61,6 +73,8 @@ class TreeStore:
         
         tree = Tree(tree_id, name, root_content)
         self.trees[tree_id] = tree
+        self._watch(tree)
+        self._notify("create_tree", tree, tree.get_root())
         return tree
     
     def get_tree(self, tree_id: str) -> Optional[Tree]:
@@ -70,7 +84,9 @@ class TreeStore:
     def delete_tree(self, tree_id: str) -> bool:
         """Delete a tree. Returns True if deleted."""
         if tree_id in self.trees:
-            del self.trees[tree_id]
+            tree = self.trees.pop(tree_id)
+            self._unwatch(tree)
+            self._notify("delete_tree", tree, None)
             return True
         return False
     
@@ -231,10 +247,107 @@ class TreeStore:
         self.trees = {}
         for tree_id, tree_data in data.get("trees", {}).items():
             self.trees[tree_id] = Tree.from_dict(tree_data)
+            self._watch(self.trees[tree_id])
+        self._notify("reset", None, None)
+    
+    def columnar_tables(self) -> Dict[str, Any]:
+        """Trees and their nodes as columnar tables (see storage.columnar)."""
+        trees = []
+        nodes = []
+        for tree_id, tree in self.trees.items():
+            trees.append({"tree_id": tree_id, "name": tree.name, "root_id": tree.root_id})
+            for node in tree.nodes.values():
+                row = node.to_dict()
+                row["tree_id"] = tree_id
+                nodes.append(row)
+        return {
+            "trees": (self.TREE_COLUMNS, trees),
+            "tree_nodes": (self.NODE_COLUMNS, nodes),
+        }
+    
+    def load_columnar(self, reader: ColumnarReader) -> None:
+        """Replace all trees with the trees / tree_nodes tables of a snapshot."""
+        for tree in self.trees.values():
+            self._unwatch(tree)
+        self.trees = {}
+        for row in reader.records("trees"):
+            self.trees[row["tree_id"]] = Tree.from_dict({**row, "nodes": {}})
+        for row in reader.records("tree_nodes"):
+            tree = self.trees.get(row.pop("tree_id"))
+            if tree is not None:
+                tree.nodes[row["node_id"]] = TreeNode.from_dict(row)
+        for tree in self.trees.values():
+            self._watch(tree)
+        self._notify("reset", None, None)
+    
+    def save_binary(self, filepath: str) -> int:
+        """Save all trees as a columnar binary snapshot; returns bytes written."""
+        return write_columnar(filepath, self.columnar_tables())
+    
+    def load_binary(self, filepath: str) -> None:
+        """Load trees from a columnar binary snapshot (memory-mapped)."""
+        if not Path(filepath).exists():
+            raise FileNotFoundError(f"File not found: {filepath}")
+        with ColumnarReader(filepath) as reader:
+            self.load_columnar(reader)
     
     def clear(self) -> None:
         """Remove all trees."""
+        for tree in self.trees.values():
+            self._unwatch(tree)
         self.trees.clear()
+        self._notify("reset", None, None)
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # CHANGE LISTENERS
+    # ═══════════════════════════════════════════════════════════════════
+    
+    def add_listener(
+        self,
+        callback: Callable[[str, Optional[Tree], Optional[TreeNode]], None]
+    ) -> None:
+        """
+        Subscribe to changes in every tree of the store.
+        
+        callback(event, tree, node) is called with event:
+        - "create_tree" (node = root) / "delete_tree" (node = None)
+        - "add_node" / "remove_node" (forwarded from the tree)
+        - "reset" (tree and node None): load()/clear() replaced everything
+        """
+        listeners = self.__dict__.setdefault("_listeners", [])
+        if callback not in listeners:
+            listeners.append(callback)
+        for tree in self.trees.values():
+            self._watch(tree)
+    
+    def remove_listener(
+        self,
+        callback: Callable[[str, Optional[Tree], Optional[TreeNode]], None]
+    ) -> None:
+        listeners = getattr(self, "_listeners", [])
+        if callback in listeners:
+            listeners.remove(callback)
+    
+    def _notify(self, event: str, tree: Optional[Tree], node: Optional[TreeNode]) -> None:
+        for callback in list(getattr(self, "_listeners", ())):
+            callback(event, tree, node)
+    
+    def _forward(self, event: str, tree: Tree, node: TreeNode) -> None:
+        # Only trees still in this store report through it
+        if self.trees.get(tree.tree_id) is tree:
+            self._notify(event, tree, node)
+    
+    def _watch(self, tree: Tree) -> None:
+        if getattr(self, "_listeners", None):
+            tree.add_listener(self._forward)
+    
+    def _unwatch(self, tree: Tree) -> None:
+        tree.remove_listener(self._forward)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
     
     def __len__(self) -> int:
         return len(self.trees)
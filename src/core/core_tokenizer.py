@@ -16,6 +16,20 @@ try:
 except Exception:
     json = None
 
+try:
+    from time import perf_counter as _perf_counter  # standard library allowed
+except Exception:
+    _perf_counter = None
+
+# Stage timing hook: hook(stage, seconds), installed by utils.metrics when
+# metrics are enabled. None (the default) means no timing at all.
+_stage_hook = None
+
+
+def set_stage_hook(hook):
+    global _stage_hook
+    _stage_hook = hook if _perf_counter is not None else None
+
 
 # -------------------------- Primitive helpers --------------------------
 
@@ -871,6 +885,74 @@ def all_tokenizations(text):
     }
 
 
+def selected_tokenizations(text, names):
+    """
+    Same as all_tokenizations, but only runs the requested strategies.
+    """
+    builders = {
+        "space": lambda: tokenize_space(text),
+        "word": lambda: tokenize_word(text),
+        "char": lambda: tokenize_char(text),
+        "grammar": lambda: tokenize_grammar(text),
+        "subword": lambda: tokenize_subword(text, 3, "fixed"),
+        "subword_bpe": lambda: tokenize_subword(text, 3, "bpe"),
+        "subword_syllable": lambda: tokenize_subword(text, 3, "syllable"),
+        "subword_frequency": lambda: tokenize_subword(text, 3, "frequency"),
+        "byte": lambda: tokenize_bytes(text),
+    }
+    result = {}
+    for name in names:
+        if name in builders:
+            result[name] = builders[name]()
+    return result
+
+
+def _safe_cut(text, limit):
+    """
+    Largest cut position p in 1..limit where text[p] starts a whitespace run
+    (text[p - 1] is not whitespace), or -1 if there is none.
+    """
+    p = -1
+    for ch in (" ", "\t", "\n", "\r"):
+        q = text.rfind(ch, 1, limit + 1)
+        if q > p:
+            p = q
+    while p > 0 and _is_space(text[p - 1]):
+        p -= 1
+    return p if p > 0 else -1
+
+
+def iter_text_chunks(text, chunk_chars=1 << 18):
+    """
+    Split text (a string or an iterable of strings) into pieces of about
+    chunk_chars characters that tokenize exactly like the whole text.
+
+    Every tokenizer here breaks tokens at whitespace and treats each
+    whitespace run as a unit, so pieces are cut where a whitespace run
+    starts: the last such position within chunk_chars characters, else
+    within 4 * chunk_chars (a longer piece). Only when the first
+    4 * chunk_chars characters hold no whitespace run start is the text
+    cut hard at chunk_chars (a token may then be split in two).
+    """
+    pieces = (text,) if isinstance(text, str) else text
+    buf = ""
+    for piece in pieces:
+        buf = buf + piece if buf else piece
+        while _len(buf) > chunk_chars:
+            cut = _safe_cut(buf, chunk_chars)
+            if cut < 0:
+                size = _len(buf)
+                cut = _safe_cut(buf, min(size - 1, 4 * chunk_chars))
+            if cut < 0:
+                if size < 4 * chunk_chars:
+                    break
+                cut = chunk_chars
+            yield buf[:cut]
+            buf = buf[cut:]
+    if buf:
+        yield buf
+
+
 # ---------------------------- COMPRESSION FUNCTIONS -------------------------------
 
 def compress_tokens(tokens, compression_type="rle"):
@@ -2667,9 +2749,19 @@ class TextTokenizer:
         # session id derived from seed
         self.session_id = (seed ^ 0x9E3779B97F4A7C15) & ((1 << 64) - 1)
 
-    def build(self, text):
+    def build(self, text, stream_names=None):
         # text is math view; do not alter
-        toks = all_tokenizations(text)
+        # stream_names limits work to some streams (e.g. ("word",)); records are
+        # identical to the ones a full build produces for those streams
+        hook = _stage_hook
+        if hook is not None:
+            t0 = _perf_counter()
+        toks = all_tokenizations(text) if stream_names is None else selected_tokenizations(text, stream_names)
+        if hook is not None:
+            t1 = _perf_counter()
+            hook("all_tokenizations", t1 - t0)
+            uid_seconds = 0.0
+            record_seconds = 0.0
         streams = {}
         # Include all tokenization strategies
         tokenizer_names = ("space", "word", "char", "grammar", "subword", "subword_bpe", "subword_syllable", "subword_frequency", "byte")
@@ -2679,33 +2771,74 @@ class TextTokenizer:
                 stream = toks[name]
                 with_uids = assign_uids(stream, self.seed)
                 with_neighbors = neighbor_uids(with_uids)
+                if hook is not None:
+                    t2 = _perf_counter()
+                    uid_seconds += t2 - t1
                 ts = TokenStream(name)
                 i = 0
                 for rec in with_neighbors:
-                    backend = compose_backend_number(rec["text"], i, rec["uid"], rec["prev_uid"], rec["next_uid"], self.embedding_bit)
-                    digit = combined_digit(rec["text"], self.embedding_bit)
-                    scaled = (backend % 100000)
-                    # global id: combine uid, content_id, index, and stream hash
-                    sid = ts.stream_id
-                    gid = (rec["uid"] ^ _content_id(rec["text"]) ^ (i << 17) ^ sid ^ self.session_id) & ((1 << 64) - 1)
-                    tok = TokenRecord(
-                        text=rec["text"],
-                        stream=name,
-                        index=i,
-                        uid=rec["uid"],
-                        prev_uid=rec["prev_uid"],
-                        next_uid=rec["next_uid"],
-                        content_id=_content_id(rec["text"]),
-                        frontend=digit,
-                        backend_huge=backend,
-                        backend_scaled=scaled,
-                        global_id=gid,
-                    )
-                    ts.add(tok)
+                    ts.add(self._record(name, ts.stream_id, i, rec["text"], rec["uid"], rec["prev_uid"], rec["next_uid"]))
                     i += 1
                 streams[name] = ts
+                if hook is not None:
+                    t1 = _perf_counter()
+                    record_seconds += t1 - t2
+        if hook is not None:
+            hook("uid_assignment", uid_seconds)
+            hook("backend_composition", record_seconds)
         return streams
 
+    def _record(self, name, stream_id, i, text, uid, prev_uid, next_uid):
+        backend = compose_backend_number(text, i, uid, prev_uid, next_uid, self.embedding_bit)
+        digit = combined_digit(text, self.embedding_bit)
+        scaled = (backend % 100000)
+        content_id = _content_id(text)
+        # global id: combine uid, content_id, index, and stream hash
+        gid = (uid ^ content_id ^ (i << 17) ^ stream_id ^ self.session_id) & ((1 << 64) - 1)
+        return TokenRecord(
+            text=text,
+            stream=name,
+            index=i,
+            uid=uid,
+            prev_uid=prev_uid,
+            next_uid=next_uid,
+            content_id=content_id,
+            frontend=digit,
+            backend_huge=backend,
+            backend_scaled=scaled,
+            global_id=gid,
+        )
+
+    def iter_stream(self, pieces, name):
+        """
+        Build one stream incrementally from text pieces (see iter_text_chunks).
+
+        Yields a list of TokenRecord per piece; together they equal
+        build("".join(pieces), (name,))[name].tokens. Only one piece and one
+        record are held at a time (a record waits for its successor's uid).
+        """
+        rng = XorShift64Star(self.seed)
+        stream_id = _content_id(name)
+        i = 0
+        held = None              # (text, uid, prev_uid) of the last token seen
+        for piece in pieces:
+            raw = selected_tokenizations(piece, (name,))
+            if name not in raw:
+                raise ValueError("unknown stream: " + str(name))
+            batch = []
+            for t in raw[name]:
+                uid = rng.next_u64()
+                prev_uid = None
+                if held is not None:
+                    batch.append(self._record(name, stream_id, i, held[0], held[1], held[2], uid))
+                    i += 1
+                    prev_uid = held[1]
+                held = (t["text"], uid, prev_uid)
+            if batch:
+                yield batch
+        if held is not None:
+            yield [self._record(name, stream_id, i, held[0], held[1], held[2], None)]
+
     def validate(self, streams):
         # Basic validations: non-empty, checksums
         manifest = {}
@@ -3,29 +3,53 @@ SanTOK Embedding Generation System
 
 This module provides embedding generation from SanTOK tokens,
 enabling inference-ready vector representations.
+
+Submodules are imported on first access of one of their names, so
+`import embeddings` stays cheap until a class is actually used.
 """
 
-from .embedding_generator import SanTOKEmbeddingGenerator
-from .vector_store import SanTOKVectorStore, ChromaVectorStore, FAISSVectorStore
-
-# Try importing WeaviateVectorStore (optional dependency)
-try:
-    from .weaviate_vector_store import WeaviateVectorStore
-    WEAVIATE_AVAILABLE = True
-except ImportError:
-    WeaviateVectorStore = None
-    WEAVIATE_AVAILABLE = False
-
-from .inference_pipeline import SanTOKInferencePipeline
-
-__all__ = [
-    "SanTOKEmbeddingGenerator",
-    "SanTOKVectorStore",
-    "ChromaVectorStore",
-    "FAISSVectorStore",
-    "SanTOKInferencePipeline",
-]
-
-# Conditionally add WeaviateVectorStore to __all__ if available
-if WEAVIATE_AVAILABLE:
-    __all__.append("WeaviateVectorStore")
\ No newline at end of file
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "SanTOKEmbeddingGenerator": ".embedding_generator",
+    "SanTOKVectorStore": ".vector_store",
+    "ChromaVectorStore": ".vector_store",
+    "FAISSVectorStore": ".vector_store",
+    "SanTOKInferencePipeline": ".inference_pipeline",
+    "BulkIngestPipeline": ".bulk_ingest",
+    "SanTOKDocumentIndex": ".document_index",
+    "SanTOKBM25Index": ".lexical_index",
+    "SanTOKHybridSearcher": ".hybrid_search",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def _load_weaviate():
+    # Try importing WeaviateVectorStore (optional dependency)
+    try:
+        from .weaviate_vector_store import WeaviateVectorStore
+        available = True
+    except ImportError:
+        WeaviateVectorStore = None
+        available = False
+    globals().update(WeaviateVectorStore=WeaviateVectorStore, WEAVIATE_AVAILABLE=available)
+    # Conditionally add WeaviateVectorStore to __all__ if available
+    if available and "WeaviateVectorStore" not in __all__:
+        __all__.append("WeaviateVectorStore")
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name in ("WeaviateVectorStore", "WEAVIATE_AVAILABLE"):
+        _load_weaviate()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | {"WeaviateVectorStore", "WEAVIATE_AVAILABLE"})
@@ -0,0 +1,417 @@
+"""
+SanTOK Bulk Ingest Pipeline
+
+Pipelines tokenize -> embed -> upsert for large corpora. Each stage runs in
+its own thread and hands fixed-size batches to the next one through a bounded
+queue, so a slow vector store applies backpressure instead of letting
+tokenized/embedded batches pile up in memory. Completed batches are recorded
+in a checkpoint file so an interrupted run can resume where it stopped; for
+texts the checkpoint also names the input text the last stored row came
+from, so a resumed run skips the texts before it without tokenizing them.
+
+With a dataset_id every row gets the ID "<dataset_id>:<row>" (row = position
+in the input) and a "dataset_id" metadata field, so runs over different
+datasets never overwrite each other's vectors and one dataset's vectors can
+be deleted with vector_store.delete_by_metadata("dataset_id", dataset_id).
+"""
+
+import contextlib
+import json
+import os
+import queue
+import threading
+import time
+import warnings
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .vector_store import ChromaVectorStore, SanTOKVectorStore, _suppress_stdout_stderr, _token_metadata
+
+
+_DONE = object()
+
+
+class _StageError:
+    """Carries an exception raised inside a worker thread to the consumer."""
+
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        self.error = error
+
+
+class BulkIngestPipeline:
+    """
+    Bounded producer/consumer loader for SanTOK vector stores.
+
+    Flow:
+    1. Tokenize texts with SanTOK (producer thread)
+    2. Generate embeddings per batch (embedding thread)
+    3. Upsert batches into the vector store (caller's thread)
+
+    Every batch carries a sequence number. Batches are cut at exactly
+    ``batch_size`` rows, so the same input always produces the same batches
+    and the checkpoint can skip the ones that were already stored.
+    """
+
+    def __init__(
+        self,
+        vector_store: SanTOKVectorStore,
+        embedding_generator=None,
+        tokenizer=None,
+        batch_size: int = 5000,
+        max_pending_batches: int = 4,
+        checkpoint_path: Optional[str] = None,
+        stream_type: Optional[str] = None,
+        dataset_id: Optional[str] = None
+    ):
+        """
+        Initialize bulk ingest pipeline.
+
+        Args:
+            vector_store: SanTOKVectorStore instance to load into
+            embedding_generator: SanTOKEmbeddingGenerator (required for ingest_texts)
+            tokenizer: TextTokenizer instance (required for ingest_texts)
+            batch_size: Rows per upsert (ChromaDB rejects batches above ~5461)
+            max_pending_batches: Queue depth between stages (backpressure bound)
+            checkpoint_path: JSON file recording completed batches (None = no resume)
+            stream_type: Specific tokenization stream to ingest (None = all)
+            dataset_id: ID namespace and metadata tag of the rows (None = IDs
+                derived from each token, see vector_store._token_id)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if max_pending_batches < 1:
+            raise ValueError("max_pending_batches must be >= 1")
+
+        self.vector_store = vector_store
+        self.embedding_generator = embedding_generator
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
+        self.checkpoint_path = checkpoint_path
+        self.stream_type = stream_type
+        self.dataset_id = dataset_id
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def ingest_texts(
+        self,
+        texts: Iterable[str],
+        resume: bool = True,
+        show_progress: bool = False
+    ) -> Dict:
+        """
+        Tokenize, embed and store an iterable of texts.
+
+        Args:
+            texts: Texts to ingest (may be a lazy generator)
+            resume: Skip batches recorded in the checkpoint file
+            show_progress: Print a line per stored batch
+
+        Returns:
+            Ingest statistics (rows, batches, seconds, rows_per_sec, ...)
+        """
+        if self.tokenizer is None or self.embedding_generator is None:
+            raise ValueError("ingest_texts requires a tokenizer and an embedding_generator")
+
+        state = self.load_checkpoint() if resume else {}
+        if not state or "text" in state:
+            # Start at the text holding the last stored row; earlier batches are never rebuilt
+            start, first_seq = state, state.get("batches_done", 0)
+        else:
+            # Checkpoint from before text positions were recorded: rebuild and skip
+            start, first_seq = {}, 0
+        # Position of the text being tokenized, read as each batch is cut
+        cursor: Dict = {}
+        batches = self._batched(self._iter_tokens(texts, start, cursor))
+
+        return self._run(
+            ((batch, dict(cursor)) for batch in batches),
+            embed=self._embed,
+            state=state,
+            first_seq=first_seq,
+            show_progress=show_progress
+        )
+
+    def ingest_batches(
+        self,
+        batches: Iterable[Tuple[List, np.ndarray]],
+        resume: bool = True,
+        show_progress: bool = False
+    ) -> Dict:
+        """
+        Store already-embedded ``(token_records, embeddings)`` pairs.
+
+        Input pairs of any size are re-cut into ``batch_size`` rows.
+
+        Args:
+            batches: Iterable of (token_records, embeddings) pairs
+            resume: Skip batches recorded in the checkpoint file
+            show_progress: Print a line per stored batch
+
+        Returns:
+            Ingest statistics (rows, batches, seconds, rows_per_sec, ...)
+        """
+        return self._run(
+            ((batch, None) for batch in self._rebatched(batches)),
+            embed=None,
+            state=self.load_checkpoint() if resume else {},
+            first_seq=0,
+            show_progress=show_progress
+        )
+
+    def load_checkpoint(self) -> Dict:
+        """Return the checkpoint state ({} when there is none)."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            warnings.warn(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return {}
+        if state.get("batch_size") != self.batch_size:
+            warnings.warn(
+                f"Checkpoint batch_size {state.get('batch_size')} != {self.batch_size}; "
+                "starting from the beginning"
+            )
+            return {}
+        return state
+
+    def reset_checkpoint(self):
+        """Delete the checkpoint file so the next run starts from scratch."""
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    # ------------------------------------------------------------------
+    # Batch sources
+    # ------------------------------------------------------------------
+
+    def _iter_tokens(self, texts: Iterable[str], start: Dict, cursor: Dict) -> Iterator:
+        """
+        Yield token records for every text, in order, from a checkpoint
+        position: texts before start["text"] are skipped untokenized (that
+        text begins at row start["text_row"]) and rows before
+        start["rows_done"] are dropped. cursor is kept pointing at the
+        text being tokenized and the row it starts at.
+        """
+        first_text = start.get("text", 0)
+        row = start.get("text_row", 0)
+        skip_rows = start.get("rows_done", 0)
+        for text_no, text in enumerate(texts):
+            if text_no < first_text:
+                continue
+            cursor.update(text=text_no, text_row=row)
+            streams = self.tokenizer.build(text)
+            if self.stream_type:
+                if self.stream_type not in streams:
+                    raise ValueError(f"Stream type '{self.stream_type}' not found")
+                tokens = streams[self.stream_type].tokens
+            else:
+                tokens = [token for token_stream in streams.values() for token in token_stream.tokens]
+            for token in tokens:
+                row += 1
+                if row > skip_rows:
+                    yield token
+
+    def _batched(self, tokens: Iterator) -> Iterator[List]:
+        """Group a token iterator into lists of exactly batch_size (last may be short)."""
+        batch = []
+        for token in tokens:
+            batch.append(token)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _rebatched(self, batches: Iterable[Tuple[List, np.ndarray]]) -> Iterator[Tuple[List, np.ndarray]]:
+        """Re-cut (tokens, embeddings) pairs into batch_size rows."""
+        pending_tokens: List = []
+        pending_embeddings: List[np.ndarray] = []
+        pending_rows = 0
+
+        for tokens, embeddings in batches:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            if embeddings.ndim == 1:
+                embeddings = embeddings.reshape(1, -1)
+            if len(tokens) != len(embeddings):
+                raise ValueError("token_records and embeddings must have same length")
+
+            start = 0
+            while start < len(tokens):
+                take = min(self.batch_size - pending_rows, len(tokens) - start)
+                pending_tokens.extend(tokens[start:start + take])
+                pending_embeddings.append(embeddings[start:start + take])
+                pending_rows += take
+                start += take
+                if pending_rows == self.batch_size:
+                    yield pending_tokens, np.concatenate(pending_embeddings)
+                    pending_tokens, pending_embeddings, pending_rows = [], [], 0
+
+        if pending_rows:
+            yield pending_tokens, np.concatenate(pending_embeddings)
+
+    def _embed(self, tokens: List) -> Tuple[List, np.ndarray]:
+        embeddings = self.embedding_generator.generate_batch(tokens, batch_size=self.batch_size)
+        if isinstance(embeddings, dict):
+            embeddings = embeddings["embeddings"]
+        return tokens, embeddings
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
+    def _run(
+        self,
+        source: Iterator,
+        embed: Optional[Callable],
+        state: Dict,
+        first_seq: int,
+        show_progress: bool
+    ) -> Dict:
+        """
+        source yields (batch, checkpoint mark) with batches numbered from
+        first_seq; batches below the checkpoint's batches_done are skipped.
+        """
+        start_batch = state.get("batches_done", 0)
+        rows_done = state.get("rows_done", 0)
+
+        stop = threading.Event()
+        source_queue: "queue.Queue" = queue.Queue(maxsize=self.max_pending_batches)
+        threads = [threading.Thread(
+            target=self._produce,
+            args=(source, first_seq, start_batch, source_queue, stop),
+            name="santok-ingest-source",
+            daemon=True
+        )]
+
+        ready_queue = source_queue
+        if embed is not None:
+            ready_queue = queue.Queue(maxsize=self.max_pending_batches)
+            threads.append(threading.Thread(
+                target=self._transform,
+                args=(embed, source_queue, ready_queue, stop),
+                name="santok-ingest-embed",
+                daemon=True
+            ))
+
+        for thread in threads:
+            thread.start()
+
+        rows = 0
+        batches = 0
+        started = time.perf_counter()
+        # ChromaDB chatter is silenced once for the whole run instead of
+        # swapping sys.stdout around every single upsert.
+        quiet = isinstance(self.vector_store, ChromaVectorStore) and not show_progress
+
+        try:
+            with _suppress_stdout_stderr() if quiet else contextlib.nullcontext():
+                while True:
+                    item = ready_queue.get()
+                    if item is _DONE:
+                        break
+                    if isinstance(item, _StageError):
+                        raise RuntimeError(f"Bulk ingest failed in {item.stage} stage: {item.error}") from item.error
+
+                    seq, ((tokens, embeddings), mark) = item
+                    self._store(tokens, embeddings, seq * self.batch_size)
+
+                    rows += len(tokens)
+                    batches += 1
+                    self._save_checkpoint(seq + 1, rows_done + rows, mark)
+
+                    if show_progress:
+                        elapsed = time.perf_counter() - started
+                        print(f"  Stored batch {seq + 1} ({rows_done + rows:,} rows, "
+                              f"{rows / elapsed if elapsed > 0 else 0.0:,.0f} rows/sec)")
+        finally:
+            stop.set()
+            # Unblock producers waiting on a full queue so they can exit
+            for q in (source_queue, ready_queue):
+                try:
+                    while True:
+                        q.get_nowait()
+                except queue.Empty:
+                    pass
+            for thread in threads:
+                thread.join(timeout=5.0)
+
+        seconds = time.perf_counter() - started
+        return {
+            "rows": rows,
+            "batches": batches,
+            "skipped_batches": start_batch,
+            "total_rows": rows_done + rows,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds > 0 else 0.0,
+            "batch_size": self.batch_size
+        }
+
+    def _store(self, tokens: List, embeddings: np.ndarray, first_row: int):
+        kwargs = {}
+        if self.dataset_id is not None:
+            kwargs["ids"] = [f"{self.dataset_id}:{first_row + i}" for i in range(len(tokens))]
+            kwargs["metadata"] = [dict(_token_metadata(token), dataset_id=self.dataset_id) for token in tokens]
+        if isinstance(self.vector_store, ChromaVectorStore):
+            kwargs["suppress_output"] = False
+        self.vector_store.add_tokens(tokens, embeddings, **kwargs)
+
+    def _put(self, q: "queue.Queue", item, stop: threading.Event) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, source: Iterator, first_seq: int, start_batch: int, out_q: "queue.Queue", stop: threading.Event):
+        try:
+            for seq, batch in enumerate(source, first_seq):
+                if seq < start_batch:
+                    continue
+                if not self._put(out_q, (seq, batch), stop):
+                    return
+            self._put(out_q, _DONE, stop)
+        except BaseException as e:
+            self._put(out_q, _StageError("source", e), stop)
+
+    def _transform(self, fn: Callable, in_q: "queue.Queue", out_q: "queue.Queue", stop: threading.Event):
+        try:
+            while not stop.is_set():
+                try:
+                    item = in_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _DONE or isinstance(item, _StageError):
+                    self._put(out_q, item, stop)
+                    return
+                seq, (batch, mark) = item
+                if not self._put(out_q, (seq, (fn(batch), mark)), stop):
+                    return
+        except BaseException as e:
+            self._put(out_q, _StageError("embed", e), stop)
+
+    def _save_checkpoint(self, batches_done: int, rows_done: int, mark: Optional[Dict] = None):
+        if not self.checkpoint_path:
+            return
+        state = {
+            "batch_size": self.batch_size,
+            "batches_done": batches_done,
+            "rows_done": rows_done,
+            "updated_at": time.time()
+        }
+        if mark:
+            state.update(mark)      # text / text_row of the last stored row
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
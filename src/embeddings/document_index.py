@@ -0,0 +1,371 @@
+"""
+SanTOK Document Index
+
+Persistent, mmap-backed store of pooled document vectors (see
+SanTOKInferencePipeline.get_document_embeddings) with ids and metadata.
+
+On-disk layout (one directory per index):
+    manifest.json  - embedding_dim, method, row count, capacity
+    vectors.f32    - float32 matrix, capacity x embedding_dim, L2-normalized rows
+    alive.u8       - one byte per row, 0 once the row was deleted/replaced
+    docs.jsonl     - append-only log of {"row", "id", "metadata"} and {"delete"} records
+
+Adds and deletes only touch the rows involved plus one log line, so the index
+grows incrementally. Search is a chunked matrix-vector product over the
+memory-mapped matrix, which keeps peak memory bounded for millions of rows.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+class SanTOKDocumentIndex:
+    """
+    Incremental top-k cosine index over document embeddings.
+
+    Example:
+        index = SanTOKDocumentIndex("doc_index", embedding_dim=768)
+        pipeline.index_documents(index, texts, ids=doc_ids)
+        hits = pipeline.search_documents(index, "query text", top_k=5)
+    """
+
+    MANIFEST = "manifest.json"
+    VECTORS = "vectors.f32"
+    ALIVE = "alive.u8"
+    DOCS = "docs.jsonl"
+
+    def __init__(
+        self,
+        path: str,
+        embedding_dim: int = 768,
+        method: str = "mean",
+        initial_capacity: int = 1024,
+        search_chunk_rows: int = 262144
+    ):
+        """
+        Open (or create) a document index.
+
+        Args:
+            path: Directory holding the index files
+            embedding_dim: Vector dimension (must match an existing index)
+            method: Pooling method the vectors were built with ("mean", "max", ...)
+            initial_capacity: Rows pre-allocated for a new index
+            search_chunk_rows: Rows scored per matrix-vector product in search()
+        """
+        self.path = path
+        self.search_chunk_rows = max(1, search_chunk_rows)
+        os.makedirs(path, exist_ok=True)
+
+        manifest_path = os.path.join(path, self.MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest["embedding_dim"] != embedding_dim:
+                raise ValueError(
+                    f"Index at {path} has embedding_dim {manifest['embedding_dim']}, "
+                    f"not {embedding_dim}"
+                )
+            self.embedding_dim = manifest["embedding_dim"]
+            self.method = manifest.get("method", method)
+            self._rows = manifest["rows"]
+            self._capacity = manifest["capacity"]
+        else:
+            self.embedding_dim = embedding_dim
+            self.method = method
+            self._rows = 0
+            self._capacity = max(1, initial_capacity)
+            self._resize_files(self._capacity)
+
+        self._open_maps()
+
+        # id -> row and row -> (id, metadata), rebuilt from the append-only log
+        self._row_of: Dict[str, int] = {}
+        self._doc_at: Dict[int, Dict[str, Any]] = {}
+        self._replay_log()
+        self._log = open(os.path.join(path, self.DOCS), 'a', encoding='utf-8')
+        self._write_manifest()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return str(doc_id) in self._row_of
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: np.ndarray,
+        metadata: Optional[Sequence[Optional[Dict]]] = None
+    ) -> int:
+        """
+        Add (or replace) documents.
+
+        Args:
+            ids: Document ids; an existing id is replaced by the new vector
+            embeddings: Array of shape (len(ids), embedding_dim)
+            metadata: Optional per-document metadata dicts (JSON-serializable)
+
+        Returns:
+            Number of documents written
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if len(ids) != len(embeddings):
+            raise ValueError("ids and embeddings must have same length")
+        if embeddings.shape[1] != self.embedding_dim:
+            raise ValueError(
+                f"Expected embeddings of dim {self.embedding_dim}, got {embeddings.shape[1]}"
+            )
+        if metadata is not None and len(metadata) != len(ids):
+            raise ValueError("metadata must have one entry per id")
+        if len(ids) == 0:
+            return 0
+
+        self._ensure_capacity(self._rows + len(ids))
+
+        # Store unit vectors so search is a plain dot product
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        start = self._rows
+        end = start + len(ids)
+        self._vectors[start:end] = embeddings / np.where(norms > 1e-8, norms, 1.0)
+        self._alive[start:end] = 1
+
+        lines = []
+        for offset, doc_id in enumerate(ids):
+            doc_id = str(doc_id)
+            old_row = self._row_of.get(doc_id)
+            if old_row is not None:
+                self._alive[old_row] = 0
+                self._doc_at.pop(old_row, None)
+            row = start + offset
+            meta = metadata[offset] if metadata is not None else None
+            self._row_of[doc_id] = row
+            self._doc_at[row] = {"id": doc_id, "metadata": meta or {}}
+            lines.append(json.dumps({"row": row, "id": doc_id, "metadata": meta or {}}))
+
+        self._rows = end
+        self._log.write("\n".join(lines) + "\n")
+        return len(ids)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        Delete documents by id.
+
+        Returns:
+            Number of documents that existed and were removed
+        """
+        removed = 0
+        lines = []
+        for doc_id in ids:
+            doc_id = str(doc_id)
+            row = self._row_of.pop(doc_id, None)
+            if row is None:
+                continue
+            self._alive[row] = 0
+            self._doc_at.pop(row, None)
+            lines.append(json.dumps({"delete": doc_id}))
+            removed += 1
+        if lines:
+            self._log.write("\n".join(lines) + "\n")
+        return removed
+
+    def get(self, doc_id: str) -> Optional[np.ndarray]:
+        """Return the stored (normalized) vector for a document."""
+        row = self._row_of.get(str(doc_id))
+        if row is None:
+            return None
+        return np.array(self._vectors[row])
+
+    def get_metadata(self, doc_id: str) -> Optional[Dict]:
+        """Return the metadata stored with a document."""
+        row = self._row_of.get(str(doc_id))
+        if row is None:
+            return None
+        return self._doc_at[row]["metadata"]
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 10) -> List[Dict]:
+        """
+        Find the documents most similar to a query vector (cosine similarity).
+
+        Args:
+            query_embedding: Query vector of shape (embedding_dim,)
+            top_k: Number of results
+
+        Returns:
+            List of {"id", "similarity", "metadata"} dicts, best first
+        """
+        if top_k <= 0 or not self._row_of:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if norm > 1e-8:
+            query = query / norm
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, self._rows, self.search_chunk_rows):
+            end = min(start + self.search_chunk_rows, self._rows)
+            scores = self._vectors[start:end] @ query
+            scores[self._alive[start:end] == 0] = -np.inf
+            if end - start > top_k:
+                keep = np.argpartition(scores, -top_k)[-top_k:]
+            else:
+                keep = np.arange(end - start)
+            best_scores = np.concatenate([best_scores, scores[keep]])
+            best_rows = np.concatenate([best_rows, keep + start])
+            if len(best_scores) > top_k:
+                keep = np.argpartition(best_scores, -top_k)[-top_k:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.argsort(best_scores)[::-1]
+        results = []
+        for i in order:
+            if not np.isfinite(best_scores[i]):
+                continue
+            doc = self._doc_at[int(best_rows[i])]
+            results.append({
+                "id": doc["id"],
+                "similarity": float(best_scores[i]),
+                "metadata": doc["metadata"]
+            })
+        return results
+
+    def flush(self):
+        """Persist vectors, tombstones, log and manifest to disk."""
+        self._vectors.flush()
+        self._alive.flush()
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._write_manifest()
+
+    def compact(self):
+        """Drop deleted rows and rewrite the log (reclaims disk space)."""
+        rows = sorted(self._doc_at)
+        vectors = np.array(self._vectors[rows]) if rows else np.empty((0, self.embedding_dim), np.float32)
+        docs = [self._doc_at[r] for r in rows]
+
+        self._log.close()
+        del self._vectors, self._alive
+        capacity = max(1, len(rows))
+        self._resize_files(capacity, truncate=True)
+        self._capacity = capacity
+        self._open_maps()
+        self._vectors[:len(rows)] = vectors
+        self._alive[:len(rows)] = 1
+        self._rows = len(rows)
+
+        self._row_of = {}
+        self._doc_at = {}
+        tmp_path = os.path.join(self.path, self.DOCS + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for row, doc in enumerate(docs):
+                self._row_of[doc["id"]] = row
+                self._doc_at[row] = doc
+                f.write(json.dumps({"row": row, "id": doc["id"], "metadata": doc["metadata"]}) + "\n")
+        os.replace(tmp_path, os.path.join(self.path, self.DOCS))
+        self._log = open(os.path.join(self.path, self.DOCS), 'a', encoding='utf-8')
+        self.flush()
+
+    def close(self):
+        """Flush and release file handles."""
+        if self._log.closed:
+            return
+        self.flush()
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _open_maps(self):
+        self._vectors = np.memmap(
+            os.path.join(self.path, self.VECTORS), dtype=np.float32, mode='r+',
+            shape=(self._capacity, self.embedding_dim)
+        )
+        self._alive = np.memmap(
+            os.path.join(self.path, self.ALIVE), dtype=np.uint8, mode='r+',
+            shape=(self._capacity,)
+        )
+
+    def _resize_files(self, capacity: int, truncate: bool = False):
+        for name, row_bytes in ((self.VECTORS, 4 * self.embedding_dim), (self.ALIVE, 1)):
+            file_path = os.path.join(self.path, name)
+            mode = 'r+b' if os.path.exists(file_path) and not truncate else 'w+b'
+            with open(file_path, mode) as f:
+                f.truncate(capacity * row_bytes)
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < rows:
+            capacity *= 2
+        self._vectors.flush()
+        self._alive.flush()
+        del self._vectors, self._alive
+        self._resize_files(capacity)
+        self._capacity = capacity
+        self._open_maps()
+        self._write_manifest()
+
+    def _replay_log(self):
+        log_path = os.path.join(self.path, self.DOCS)
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn last line after a crash
+                if "delete" in record:
+                    row = self._row_of.pop(record["delete"], None)
+                    if row is not None:
+                        self._doc_at.pop(row, None)
+                    continue
+                row = record["row"]
+                if row >= self._rows:
+                    # Logged but the manifest was not flushed; vectors are there
+                    self._rows = row + 1
+                old_row = self._row_of.get(record["id"])
+                if old_row is not None:
+                    self._doc_at.pop(old_row, None)
+                self._row_of[record["id"]] = row
+                self._doc_at[row] = {"id": record["id"], "metadata": record.get("metadata", {})}
+
+        # Rows without a live log entry must never show up in search
+        if self._rows:
+            alive = np.zeros(self._rows, dtype=np.uint8)
+            if self._doc_at:
+                alive[list(self._doc_at)] = 1
+            self._alive[:self._rows] = alive
+
+    def _write_manifest(self):
+        manifest = {
+            "embedding_dim": self.embedding_dim,
+            "method": self.method,
+            "rows": self._rows,
+            "capacity": self._capacity,
+            "documents": len(self._row_of)
+        }
+        tmp_path = os.path.join(self.path, self.MANIFEST + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(self.path, self.MANIFEST))
@@ -14,11 +14,15 @@ from multiprocessing import Pool, cpu_count
 from functools import partial
 
 try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
+    from ..utils.lazy_import import lazy_import, module_available
+    from ..utils import metrics
 except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    # Warning removed - handled by user choice in comprehensive example
+    from utils.lazy_import import lazy_import, module_available
+    from utils import metrics
+
+# sentence-transformers pulls in torch (seconds): probe now, import on first hybrid use
+sentence_transformers = lazy_import("sentence_transformers")
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
 
 try:
     from .semantic_trainer import SanTOKSemanticTrainer
@@ -221,7 +225,7 @@ class SanTOKEmbeddingGenerator:
                 )
             if text_model is None:
                 text_model = "sentence-transformers/all-MiniLM-L6-v2"
-            self.text_embedder = SentenceTransformer(text_model)
+            self.text_embedder = sentence_transformers.SentenceTransformer(text_model)
             self.text_embedding_dim = self.text_embedder.get_sentence_embedding_dimension()
         else:
             self.text_embedder = None
@@ -300,6 +304,14 @@ class SanTOKEmbeddingGenerator:
             numpy array of shape (len(token_records), embedding_dim) as float32,
             or dict with 'embeddings' and 'source_metadata'
         """
+        if not metrics.enabled():
+            return self._generate_batch(token_records, batch_size, return_metadata)
+        with metrics.stage("embeddings", f"generate_batch.{self.strategy}"):
+            result = self._generate_batch(token_records, batch_size, return_metadata)
+        metrics.count("embeddings", "embeddings", len(token_records))
+        return result
+    
+    def _generate_batch(self, token_records: List, batch_size: int, return_metadata: bool):
         # Process in batches to avoid memory issues for large datasets
         # batch_size is already a parameter with default value
         
@@ -0,0 +1,153 @@
+"""
+SanTOK Hybrid Search
+
+Fuses BM25 keyword ranking (SanTOKBM25Index) with vector ranking from any
+store whose ``search(query_embedding, top_k)`` returns dicts with an "id"
+(SanTOKDocumentIndex, ChromaVectorStore, ...).
+
+Fusion modes:
+- "rrf":      reciprocal-rank fusion, sum of 1 / (rrf_k + rank)
+- "weighted": alpha * lexical + (1 - alpha) * vector, each min-max normalized
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .lexical_index import SanTOKBM25Index
+
+
+class SanTOKHybridSearcher:
+    """
+    Lexical + vector retrieval over the same document ids.
+
+    Example:
+        searcher = SanTOKHybridSearcher(
+            lexical_index, doc_index,
+            embed_query=lambda q: pipeline.get_document_embeddings([q])[0]
+        )
+        searcher.search("sales dropped last month", top_k=10)
+    """
+
+    def __init__(
+        self,
+        lexical_index: SanTOKBM25Index,
+        vector_index=None,
+        embed_query: Optional[Callable[[str], np.ndarray]] = None
+    ):
+        """
+        Initialize hybrid searcher.
+
+        Args:
+            lexical_index: BM25 index over the documents
+            vector_index: Vector store/index keyed by the same ids (None = lexical only)
+            embed_query: Function turning query text into a query vector
+        """
+        if vector_index is not None and embed_query is None:
+            raise ValueError("embed_query is required when a vector_index is given")
+        self.lexical_index = lexical_index
+        self.vector_index = vector_index
+        self.embed_query = embed_query
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        fusion: str = "rrf",
+        alpha: float = 0.5,
+        rrf_k: int = 60,
+        candidates: int = 100
+    ) -> List[Dict]:
+        """
+        Run both retrievers and fuse their rankings.
+
+        Args:
+            query: Query text
+            top_k: Number of fused results
+            fusion: "rrf" or "weighted"
+            alpha: Lexical weight for "weighted" fusion (1.0 = lexical only)
+            rrf_k: Rank offset for reciprocal-rank fusion
+            candidates: Results pulled from each retriever before fusing
+
+        Returns:
+            List of dicts with "id", "score" and per-retriever scores/ranks
+        """
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        candidates = max(candidates, top_k)
+
+        lexical_hits = []
+        if fusion == "rrf" or alpha > 0.0:
+            lexical_hits = self.lexical_index.search(query, top_k=candidates)
+
+        vector_hits = []
+        use_vectors = self.vector_index is not None and (fusion == "rrf" or alpha < 1.0)
+        if use_vectors:
+            query_embedding = self.embed_query(query)
+            vector_hits = self.vector_index.search(query_embedding, top_k=candidates)
+
+        fused: Dict[str, Dict] = {}
+
+        def entry(doc_id: str) -> Dict:
+            if doc_id not in fused:
+                fused[doc_id] = {
+                    "id": doc_id,
+                    "score": 0.0,
+                    "lexical_score": None,
+                    "lexical_rank": None,
+                    "vector_score": None,
+                    "vector_rank": None,
+                    "metadata": {}
+                }
+            return fused[doc_id]
+
+        for rank, hit in enumerate(lexical_hits, 1):
+            item = entry(str(hit["id"]))
+            item["lexical_score"] = hit["score"]
+            item["lexical_rank"] = rank
+
+        for rank, hit in enumerate(vector_hits, 1):
+            item = entry(str(hit["id"]))
+            item["vector_score"] = self._vector_score(hit)
+            item["vector_rank"] = rank
+            item["metadata"] = hit.get("metadata") or {}
+
+        if fusion == "rrf":
+            for item in fused.values():
+                for rank_key in ("lexical_rank", "vector_rank"):
+                    if item[rank_key] is not None:
+                        item["score"] += 1.0 / (rrf_k + item[rank_key])
+        else:
+            lexical = self._min_max([h["score"] for h in lexical_hits])
+            vector = self._min_max([self._vector_score(h) for h in vector_hits])
+            for hit, norm in zip(lexical_hits, lexical):
+                fused[str(hit["id"])]["score"] += float(alpha * norm)
+            for hit, norm in zip(vector_hits, vector):
+                fused[str(hit["id"])]["score"] += float((1.0 - alpha) * norm)
+
+        ranked = sorted(fused.values(), key=lambda item: item["score"], reverse=True)
+        return ranked[:top_k]
+
+    def _vector_score(self, hit: Dict) -> float:
+        """Higher-is-better score from a vector store hit."""
+        if "similarity" in hit:
+            return float(hit["similarity"])
+        distance = hit.get("distance")
+        if distance is None:
+            return 0.0
+        kind = getattr(self.vector_index, "HIT_DISTANCE", "similarity")
+        if kind == "l2":
+            return 1.0 / (1.0 + float(distance))
+        if kind == "cosine":
+            return 1.0 - float(distance)
+        return float(distance)
+
+    @staticmethod
+    def _min_max(values: List[float]) -> np.ndarray:
+        if not values:
+            return np.empty(0)
+        values = np.asarray(values, dtype=np.float64)
+        span = values.max() - values.min()
+        if span <= 0:
+            return np.ones_like(values)
+        return (values - values.min()) / span
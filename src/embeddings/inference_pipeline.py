@@ -7,6 +7,8 @@ generating embeddings, and performing inference/search.
 
 import numpy as np
 from typing import List, Dict, Optional, Union
+from collections import OrderedDict
+import hashlib
 import sys
 import os
 
@@ -27,6 +29,8 @@ except ImportError:
 
 from .embedding_generator import SanTOKEmbeddingGenerator
 from .vector_store import SanTOKVectorStore
+from .bulk_ingest import BulkIngestPipeline
+from .document_index import SanTOKDocumentIndex
 
 
 class SanTOKInferencePipeline:
@@ -46,7 +50,8 @@ class SanTOKInferencePipeline:
         vector_store: SanTOKVectorStore,
         tokenizer: Optional[TextTokenizer] = None,
         tokenizer_seed: int = 42,
-        embedding_bit: bool = False
+        embedding_bit: bool = False,
+        document_cache_size: int = 10000
     ):
         """
         Initialize inference pipeline.
@@ -57,6 +62,8 @@ class SanTOKInferencePipeline:
             tokenizer: Optional TextTokenizer (creates new if None)
             tokenizer_seed: Seed for tokenizer
             embedding_bit: Embedding bit flag for tokenizer
+            document_cache_size: Max document embeddings kept in the
+                content-hash cache (0 disables caching)
         """
         self.embedding_generator = embedding_generator
         self.vector_store = vector_store
@@ -68,6 +75,61 @@ class SanTOKInferencePipeline:
             )
         else:
             self.tokenizer = tokenizer
+        
+        # Document embeddings keyed by (content hash, method, stream_type)
+        self.document_cache_size = document_cache_size
+        self._document_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+    
+    def _collect_tokens(self, streams: Dict, stream_type: Optional[str] = None) -> List:
+        """Collect tokens from all streams or one specific stream."""
+        if stream_type:
+            if stream_type in streams:
+                return list(streams[stream_type].tokens)
+            raise ValueError(f"Stream type '{stream_type}' not found")
+        all_tokens = []
+        for token_stream in streams.values():
+            all_tokens.extend(token_stream.tokens)
+        return all_tokens
+    
+    def _embed_unique(self, tokens: List) -> np.ndarray:
+        """
+        Generate embeddings for tokens, computing each distinct token once.
+        
+        Tokens are keyed on every field the embedding strategies read, so two
+        records only share a row when they would get the same vector anyway
+        (e.g. the same document repeated, or a shared document prefix).
+        """
+        if not tokens:
+            return np.zeros((0, self.embedding_generator.embedding_dim), dtype=np.float32)
+        
+        unique_rows: Dict[tuple, int] = {}
+        unique_tokens = []
+        inverse = np.empty(len(tokens), dtype=np.int64)
+        for i, token in enumerate(tokens):
+            key = (
+                token.text, token.stream, token.index, token.uid,
+                token.prev_uid, token.next_uid, token.content_id,
+                token.frontend, token.backend_huge, token.global_id
+            )
+            row = unique_rows.get(key)
+            if row is None:
+                row = len(unique_tokens)
+                unique_rows[key] = row
+                unique_tokens.append(token)
+            inverse[i] = row
+        
+        embeddings = self.embedding_generator.generate_batch(unique_tokens)
+        if len(unique_tokens) == len(tokens):
+            return embeddings
+        return embeddings[inverse]
+    
+    @staticmethod
+    def _content_hash(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+    
+    def clear_document_cache(self):
+        """Drop cached document embeddings (call after changing the generator)."""
+        self._document_cache.clear()
     
     def process_text(
         self,
@@ -90,16 +152,7 @@ class SanTOKInferencePipeline:
         streams = self.tokenizer.build(text)
         
         # Step 2: Collect tokens (from all streams or specific one)
-        all_tokens = []
-        if stream_type:
-            if stream_type in streams:
-                all_tokens = streams[stream_type].tokens
-            else:
-                raise ValueError(f"Stream type '{stream_type}' not found")
-        else:
-            # Collect from all streams
-            for stream_name, token_stream in streams.items():
-                all_tokens.extend(token_stream.tokens)
+        all_tokens = self._collect_tokens(streams, stream_type)
         
         if not all_tokens:
             return {
@@ -114,7 +167,7 @@ class SanTOKInferencePipeline:
         
         # Step 4: Store in vector database if requested
         if store:
-            self.vector_store.add_tokens(all_tokens, embeddings)
+            self._store_tokens(all_tokens, embeddings)
         
         return {
             "tokens": all_tokens,
@@ -184,23 +237,90 @@ class SanTOKInferencePipeline:
         Returns:
             Document embedding vector
         """
-        result = self.process_text(text, store=False)
+        return self.get_document_embeddings([text], method=method)[0]
+    
+    def get_document_embeddings(
+        self,
+        texts: List[str],
+        method: str = "mean",
+        stream_type: Optional[str] = None,
+        use_cache: bool = True
+    ) -> np.ndarray:
+        """
+        Get document-level embeddings for many texts at once.
         
-        if len(result["embeddings"]) == 0:
-            return np.zeros(self.embedding_generator.embedding_dim)
+        Texts are tokenized together, distinct tokens are embedded in a single
+        generate_batch call and pooled per document with segment reductions.
+        Results are cached by content hash, so repeated documents are free.
         
-        embeddings = result["embeddings"]
+        Args:
+            texts: Input texts
+            method: Aggregation method ("mean", "max", "sum", "first")
+            stream_type: Specific tokenization stream to use (None = all)
+            use_cache: Reuse/store embeddings in the document cache
         
-        if method == "mean":
-            return np.mean(embeddings, axis=0)
-        elif method == "max":
-            return np.max(embeddings, axis=0)
-        elif method == "sum":
-            return np.sum(embeddings, axis=0)
-        elif method == "first":
-            return embeddings[0]
-        else:
+        Returns:
+            Array of shape (len(texts), embedding_dim)
+        """
+        if method not in ("mean", "max", "sum", "first"):
             raise ValueError(f"Unknown aggregation method: {method}")
+        
+        dim = self.embedding_generator.embedding_dim
+        result = np.zeros((len(texts), dim), dtype=np.float32)
+        if not texts:
+            return result
+        
+        # Resolve cache hits and group the remaining texts by content
+        pending: Dict[tuple, List[int]] = {}
+        for i, text in enumerate(texts):
+            key = (self._content_hash(text), method, stream_type)
+            if use_cache and key in self._document_cache:
+                self._document_cache.move_to_end(key)
+                result[i] = self._document_cache[key]
+            else:
+                pending.setdefault(key, []).append(i)
+        
+        if not pending:
+            return result
+        
+        # Tokenize every distinct missing document and lay tokens out back to back
+        keys = list(pending)
+        all_tokens = []
+        counts = np.zeros(len(keys), dtype=np.int64)
+        for d, key in enumerate(keys):
+            tokens = self._collect_tokens(self.tokenizer.build(texts[pending[key][0]]), stream_type)
+            counts[d] = len(tokens)
+            all_tokens.extend(tokens)
+        
+        pooled = np.zeros((len(keys), dim), dtype=np.float32)
+        non_empty = counts > 0
+        if non_empty.any():
+            embeddings = self._embed_unique(all_tokens)
+            # Segment start offsets of non-empty documents (reduceat needs
+            # strictly increasing offsets, so empty documents are skipped)
+            offsets = (np.cumsum(counts) - counts)[non_empty]
+            if method == "mean":
+                segment = np.add.reduceat(embeddings, offsets, axis=0) / counts[non_empty, None]
+            elif method == "max":
+                segment = np.maximum.reduceat(embeddings, offsets, axis=0)
+            elif method == "sum":
+                segment = np.add.reduceat(embeddings, offsets, axis=0)
+            else:
+                segment = embeddings[offsets]
+            pooled[non_empty] = segment
+        
+        for d, key in enumerate(keys):
+            result[pending[key]] = pooled[d]
+            if use_cache and self.document_cache_size > 0:
+                self._document_cache[key] = pooled[d]
+                if len(self._document_cache) > self.document_cache_size:
+                    self._document_cache.popitem(last=False)
+        
+        return result
+    
+    def _store_tokens(self, tokens: List, embeddings: np.ndarray):
+        """add_tokens in BulkIngestPipeline-sized batches (ChromaDB rejects more than ~5461 rows per call)."""
+        BulkIngestPipeline(self.vector_store).ingest_batches([(tokens, embeddings)], resume=False)
     
     def batch_process(
         self,
@@ -211,6 +331,10 @@ class SanTOKInferencePipeline:
         """
         Process multiple texts in batch.
         
+        All texts are tokenized first, then embedded with a single
+        generate_batch call (distinct tokens only) and stored in batches the
+        vector store accepts (see _store_tokens).
+        
         Args:
             texts: List of texts to process
             store: Whether to store in vector database
@@ -219,12 +343,40 @@ class SanTOKInferencePipeline:
         Returns:
             List of processing results
         """
-        results = []
+        tokenized = []
+        all_tokens = []
         for i, text in enumerate(texts):
             if show_progress:
                 print(f"Processing {i+1}/{len(texts)}: {text[:50]}...")
-            result = self.process_text(text, store=store)
-            results.append(result)
+            streams = self.tokenizer.build(text)
+            tokens = self._collect_tokens(streams)
+            tokenized.append((streams, tokens))
+            all_tokens.extend(tokens)
+        
+        embeddings = self._embed_unique(all_tokens)
+        if store and all_tokens:
+            self._store_tokens(all_tokens, embeddings)
+        
+        results = []
+        start = 0
+        for text, (streams, tokens) in zip(texts, tokenized):
+            if not tokens:
+                results.append({
+                    "tokens": [],
+                    "embeddings": np.array([]),
+                    "streams": {},
+                    "text": text
+                })
+                continue
+            end = start + len(tokens)
+            results.append({
+                "tokens": tokens,
+                "embeddings": embeddings[start:end],
+                "streams": {name: len(stream.tokens) for name, stream in streams.items()},
+                "text": text,
+                "num_tokens": len(tokens)
+            })
+            start = end
         return results
     
     def find_similar_documents(
@@ -244,16 +396,13 @@ class SanTOKInferencePipeline:
         Returns:
             List of similar documents with scores
         """
-        # Get query embedding
-        query_emb = self.get_document_embedding(query_text)
-        
-        # Get document embeddings
-        doc_embeddings = []
-        for doc_text in document_texts:
-            doc_emb = self.get_document_embedding(doc_text)
-            doc_embeddings.append(doc_emb)
+        if not document_texts:
+            return []
         
-        doc_embeddings = np.array(doc_embeddings)
+        # Query and candidates share one batched, cached embedding pass
+        embeddings = self.get_document_embeddings([query_text] + list(document_texts))
+        query_emb = embeddings[0]
+        doc_embeddings = embeddings[1:]
         
         # Compute similarities (cosine similarity)
         query_norm = query_emb / (np.linalg.norm(query_emb) + 1e-8)
@@ -271,4 +420,64 @@ class SanTOKInferencePipeline:
                 "index": int(idx)
             })
         
-        return results
\ No newline at end of file
+        return results
+    
+    def index_documents(
+        self,
+        index: SanTOKDocumentIndex,
+        texts: List[str],
+        ids: Optional[List[str]] = None,
+        metadata: Optional[List[Dict]] = None,
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Embed documents and add them to a persistent document index.
+        
+        Args:
+            index: SanTOKDocumentIndex to write to
+            texts: Documents to index
+            ids: Document ids (default: content hash of each text)
+            metadata: Optional per-document metadata
+            batch_size: Documents embedded per get_document_embeddings call
+        
+        Returns:
+            Number of documents indexed
+        """
+        if ids is None:
+            ids = [self._content_hash(text) for text in texts]
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have same length")
+        
+        added = 0
+        for start in range(0, len(texts), batch_size):
+            end = start + batch_size
+            embeddings = self.get_document_embeddings(
+                texts[start:end], method=index.method, use_cache=False
+            )
+            added += index.add(
+                ids[start:end],
+                embeddings,
+                metadata[start:end] if metadata is not None else None
+            )
+        index.flush()
+        return added
+    
+    def search_documents(
+        self,
+        index: SanTOKDocumentIndex,
+        query_text: str,
+        top_k: int = 5
+    ) -> List[Dict]:
+        """
+        Find indexed documents similar to a query, without re-embedding them.
+        
+        Args:
+            index: SanTOKDocumentIndex built with index_documents
+            query_text: Query text
+            top_k: Number of results
+        
+        Returns:
+            List of {"id", "similarity", "metadata"} dicts, best first
+        """
+        query_emb = self.get_document_embeddings([query_text], method=index.method)[0]
+        return index.search(query_emb, top_k=top_k)
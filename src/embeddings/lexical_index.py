@@ -0,0 +1,323 @@
+"""
+SanTOK Lexical Index
+
+BM25 inverted index over SanTOK word tokens (the same tokens that make up the
+"word" TokenStream). Postings are kept as compressed NumPy arrays:
+
+- document ids are delta-encoded and stored in the narrowest unsigned dtype
+  that fits the largest gap (uint8 / uint16 / uint32)
+- term frequencies are stored in the narrowest dtype that fits the largest tf
+
+Decoding a posting list is a single np.cumsum, and scoring a query term is a
+vectorized update of a dense score array, so keyword queries never fall back
+to scanning document texts in Python.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from src.core.core_tokenizer import tokenize_word, _is_word_char
+except ImportError:
+    from core.core_tokenizer import tokenize_word, _is_word_char
+
+
+# Default stop_words of SanTOKBM25Index (dropped at index and query time)
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'what', 'which', 'who'
+})
+
+
+def _narrow_uint(values: np.ndarray) -> np.ndarray:
+    """Store non-negative ints in the smallest unsigned dtype that holds them."""
+    top = int(values.max()) if len(values) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values.astype(np.uint64)
+
+
+class _Postings:
+    """Compressed posting list: delta-encoded doc ids + term frequencies."""
+
+    __slots__ = ("gaps", "tfs", "last_doc")
+
+    def __init__(self):
+        self.gaps = np.empty(0, dtype=np.uint8)
+        self.tfs = np.empty(0, dtype=np.uint8)
+        self.last_doc = -1
+
+    def extend(self, doc_ids: List[int], tfs: List[int]):
+        """Append postings for doc ids greater than every stored one."""
+        docs = np.asarray(doc_ids, dtype=np.int64)
+        gaps = np.diff(docs, prepend=self.last_doc)
+        self.gaps = _narrow_uint(np.concatenate([self.gaps.astype(np.int64), gaps]))
+        self.tfs = _narrow_uint(np.concatenate([self.tfs.astype(np.int64), tfs]))
+        self.last_doc = int(docs[-1])
+
+    def decode(self) -> Tuple[np.ndarray, np.ndarray]:
+        docs = np.cumsum(self.gaps, dtype=np.int64) - 1
+        return docs, self.tfs
+
+    @property
+    def nbytes(self) -> int:
+        return self.gaps.nbytes + self.tfs.nbytes
+
+
+class SanTOKBM25Index:
+    """
+    Incremental BM25 index keyed by external document ids.
+
+    Example:
+        lexical = SanTOKBM25Index()
+        lexical.add_documents(["d1", "d2"], ["Sales dropped 20%", "Revenue grew"])
+        lexical.search("sales drop", top_k=5)
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.5,
+        b: float = 0.75,
+        lowercase: bool = True,
+        stop_words: Optional[Iterable[str]] = STOP_WORDS
+    ):
+        """
+        Initialize BM25 index.
+
+        Args:
+            k1: Term-frequency saturation
+            b: Length normalization strength
+            lowercase: Fold terms to lower case
+            stop_words: Terms to drop at index and query time (None keeps all)
+        """
+        self.k1 = k1
+        self.b = b
+        self.lowercase = lowercase
+        self.stop_words = frozenset(stop_words) if stop_words else frozenset()
+
+        self._postings: Dict[str, _Postings] = {}
+        self._doc_ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._doc_len = np.empty(0, dtype=np.int32)
+        self._alive = np.empty(0, dtype=bool)
+        self._total_len = 0
+
+        # New documents are buffered and merged into the arrays on next search
+        self._pending: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._pending_ids: List[str] = []
+        self._pending_len: List[int] = []
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return str(doc_id) in self._row_of
+
+    def terms(self, text: str) -> List[str]:
+        """Word terms of a text, as produced by SanTOK word tokenization."""
+        return self._filter_terms(
+            tok["text"] for tok in tokenize_word(text) if tok["type"] == "word"
+        )
+
+    def terms_from_tokens(self, tokens: Sequence) -> List[str]:
+        """Word terms from TokenRecords of a "word" TokenStream."""
+        return self._filter_terms(
+            tok.text for tok in tokens if tok.text and _is_word_char(tok.text[0])
+        )
+
+    def add_documents(self, ids: Sequence[str], texts: Sequence[str]) -> int:
+        """Index texts under the given ids (an existing id is replaced)."""
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have same length")
+        for doc_id, text in zip(ids, texts):
+            self._add_terms(str(doc_id), self.terms(text))
+        return len(ids)
+
+    def add_token_stream(self, doc_id: str, tokens: Sequence) -> None:
+        """Index an already tokenized document (``streams["word"].tokens``)."""
+        self._add_terms(str(doc_id), self.terms_from_tokens(tokens))
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Delete documents by id; returns how many existed."""
+        self._merge_pending()
+        removed = 0
+        for doc_id in ids:
+            row = self._row_of.pop(str(doc_id), None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._total_len -= int(self._doc_len[row])
+            removed += 1
+        return removed
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 scores for every document row (deleted rows score 0)."""
+        self._merge_pending()
+        scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+        live = len(self._row_of)
+        if live == 0:
+            return scores
+
+        avg_len = self._total_len / live if self._total_len else 1.0
+        norm = self.k1 * (1.0 - self.b + self.b * self._doc_len / avg_len)
+
+        for term in set(self.terms(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            docs, tfs = postings.decode()
+            alive = self._alive[docs]
+            docs, tfs = docs[alive], tfs[alive].astype(np.float32)
+            if len(docs) == 0:
+                continue
+            idf = np.log(1.0 + (live - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1.0) / (tfs + norm[docs])
+        return scores
+
+    def search(self, query: str, top_k: int = 10) -> List[Dict]:
+        """
+        Rank documents for a keyword query.
+
+        Returns:
+            List of {"id", "score"} dicts, best first (only matching documents)
+        """
+        scores = self.score(query)
+        if top_k <= 0 or not len(scores):
+            return []
+        if len(scores) > top_k:
+            candidates = np.argpartition(scores, -top_k)[-top_k:]
+        else:
+            candidates = np.arange(len(scores))
+        candidates = candidates[np.argsort(scores[candidates])[::-1]]
+        return [
+            {"id": self._doc_ids[row], "score": float(scores[row])}
+            for row in candidates if scores[row] > 0
+        ]
+
+    def stats(self) -> Dict:
+        """Index size information."""
+        self._merge_pending()
+        return {
+            "documents": len(self._row_of),
+            "terms": len(self._postings),
+            "postings_bytes": sum(p.nbytes for p in self._postings.values()),
+            "avg_doc_len": self._total_len / len(self._row_of) if self._row_of else 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """Write the index to a directory (vocabulary JSON + postings .npz)."""
+        self._merge_pending()
+        os.makedirs(path, exist_ok=True)
+        terms = list(self._postings)
+        arrays = {
+            "doc_len": self._doc_len,
+            "alive": self._alive,
+        }
+        for i, term in enumerate(terms):
+            arrays[f"g{i}"] = self._postings[term].gaps
+            arrays[f"t{i}"] = self._postings[term].tfs
+        np.savez(os.path.join(path, "postings.npz"), **arrays)
+        with open(os.path.join(path, "lexicon.json"), 'w', encoding='utf-8') as f:
+            json.dump({
+                "k1": self.k1,
+                "b": self.b,
+                "lowercase": self.lowercase,
+                "stop_words": sorted(self.stop_words),
+                "terms": terms,
+                "last_docs": [self._postings[t].last_doc for t in terms],
+                "doc_ids": self._doc_ids
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "SanTOKBM25Index":
+        """Load an index written by save()."""
+        with open(os.path.join(path, "lexicon.json"), 'r', encoding='utf-8') as f:
+            lexicon = json.load(f)
+        index = cls(
+            k1=lexicon["k1"],
+            b=lexicon["b"],
+            lowercase=lexicon["lowercase"],
+            stop_words=lexicon["stop_words"]
+        )
+        with np.load(os.path.join(path, "postings.npz")) as arrays:
+            index._doc_len = arrays["doc_len"]
+            index._alive = arrays["alive"]
+            for i, term in enumerate(lexicon["terms"]):
+                postings = _Postings()
+                postings.gaps = arrays[f"g{i}"]
+                postings.tfs = arrays[f"t{i}"]
+                postings.last_doc = lexicon["last_docs"][i]
+                index._postings[term] = postings
+        index._doc_ids = lexicon["doc_ids"]
+        index._row_of = {
+            doc_id: row for row, doc_id in enumerate(index._doc_ids) if index._alive[row]
+        }
+        index._total_len = int(index._doc_len[index._alive].sum())
+        return index
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _filter_terms(self, words: Iterable[str]) -> List[str]:
+        terms = []
+        for word in words:
+            if self.lowercase:
+                word = word.lower()
+            if word not in self.stop_words:
+                terms.append(word)
+        return terms
+
+    def _add_terms(self, doc_id: str, terms: List[str]):
+        if doc_id in self._row_of:
+            self.delete([doc_id])
+        row = len(self._doc_ids) + len(self._pending_ids)
+        self._row_of[doc_id] = row
+        self._pending_ids.append(doc_id)
+
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            docs, tfs = self._pending.setdefault(term, ([], []))
+            docs.append(row)
+            tfs.append(tf)
+        self._pending_len.append(len(terms))
+
+    def _merge_pending(self):
+        # Re-narrowing rewrites each touched posting list, so add documents
+        # in batches rather than interleaving single adds with searches
+        if not self._pending_ids:
+            return
+        for term, (docs, tfs) in self._pending.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.extend(docs, tfs)
+        new_len = np.asarray(self._pending_len, dtype=np.int32)
+        self._doc_ids.extend(self._pending_ids)
+        self._doc_len = np.concatenate([self._doc_len, new_len])
+        self._alive = np.concatenate([self._alive, np.ones(len(new_len), dtype=bool)])
+        self._total_len += int(new_len.sum())
+        self._pending = {}
+        self._pending_len = []
+        self._pending_ids = []
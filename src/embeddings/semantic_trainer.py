@@ -6,20 +6,16 @@ Uses self-supervised learning on SanTOK's mathematical features to capture
 semantic relationships.
 """
 
+import importlib.util
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 from collections import defaultdict
 import pickle
 import os
 
-# Try to import sparse matrix support
-try:
-    from scipy import sparse
-    SPARSE_AVAILABLE = True
-except ImportError:
-    SPARSE_AVAILABLE = False
-    # Fallback: use dict-based sparse representation
-    pass
+# Sparse matrix support (probe only - scipy is slow to import and not used directly)
+# Fallback: use dict-based sparse representation
+SPARSE_AVAILABLE = importlib.util.find_spec("scipy") is not None
 
 
 class SanTOKSemanticTrainer:
@@ -6,35 +6,120 @@ Provides unified interface to multiple vector database backends.
 
 import numpy as np
 from typing import List, Dict, Optional, Any
+import contextlib
+import functools
+import hashlib
 import warnings
+import sys
 import os
+import threading
 
 # Disable ChromaDB telemetry before importing (to suppress warnings)
 os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
-# Try importing vector database libraries
 try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMA_AVAILABLE = True
+    from ..utils.lazy_import import lazy_import, module_available
+    from ..utils import metrics
 except ImportError:
-    CHROMA_AVAILABLE = False
+    from utils.lazy_import import lazy_import, module_available
+    from utils import metrics
+
+# Vector database libraries are imported when a store is first created
+chromadb = lazy_import("chromadb")
+chromadb_config = lazy_import("chromadb.config")
+CHROMA_AVAILABLE = module_available("chromadb")
+if not CHROMA_AVAILABLE:
     warnings.warn("chromadb not available. Install with: pip install chromadb")
 
-try:
-    import faiss
-    FAISS_AVAILABLE = True
-except ImportError:
-    FAISS_AVAILABLE = False
+faiss = lazy_import("faiss")
+FAISS_AVAILABLE = module_available("faiss")
+if not FAISS_AVAILABLE:
     warnings.warn("faiss-cpu not available. Install with: pip install faiss-cpu")
 
 
+@contextlib.contextmanager
+def _suppress_stdout_stderr():
+    """Context manager to suppress stdout/stderr (for ChromaDB duplicate messages)"""
+    with open(os.devnull, 'w') as devnull:
+        old_stdout = sys.stdout
+        old_stderr = sys.stderr
+        try:
+            sys.stdout = devnull
+            sys.stderr = devnull
+            yield
+        finally:
+            sys.stdout = old_stdout
+            sys.stderr = old_stderr
+
+
+def _token_id(token) -> str:
+    """Stable vector-store ID for a token record."""
+    # Use global_id if available, otherwise create hash from token content
+    if getattr(token, 'global_id', None):
+        return f"token_{token.global_id}"
+    # Create hash from token text + stream + uid for uniqueness
+    id_string = f"{token.text}_{token.stream}_{token.uid}"
+    return f"token_{hashlib.md5(id_string.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _token_metadata(token) -> Dict[str, str]:
+    """Default ChromaDB metadata for a token record (64-bit ints kept as strings)."""
+    return {
+        "text": token.text,
+        "stream": token.stream,
+        "uid": str(token.uid),
+        "frontend": str(token.frontend),
+        "index": str(token.index),
+        "content_id": str(token.content_id),
+        "global_id": str(token.global_id)
+    }
+
+
+_timing = threading.local()
+
+
+def _timed_operation(name: str, fn):
+    """Wrap a store method so it is timed/counted under component vector_store.<backend>."""
+    @functools.wraps(fn)
+    def timed(self, *args, **kwargs):
+        # Only the outermost call counts (the default search_batch calls search)
+        if not metrics.enabled() or getattr(_timing, "active", False):
+            return fn(self, *args, **kwargs)
+        component = f"vector_store.{self.backend}"
+        _timing.active = True
+        try:
+            with metrics.stage(component, name):
+                result = fn(self, *args, **kwargs)
+        finally:
+            _timing.active = False
+        if name == "search":
+            metrics.count(component, "queries")
+        else:
+            items = args[0] if args else kwargs.get("token_records", kwargs.get("query_embeddings", ()))
+            metrics.count(component, "vectors_added" if name == "add_tokens" else "queries", len(items))
+        return result
+    return timed
+
+
 class SanTOKVectorStore:
     """
     Base class for vector database stores.
     Provides unified interface for different backends.
     """
     
+    # What the "distance" field of a search hit holds: "similarity" (higher is
+    # better), "l2" or "cosine" (lower is better)
+    HIT_DISTANCE = "similarity"
+    
+    # Timed in every backend (see utils/metrics.py) without touching their code
+    _TIMED_OPERATIONS = ("add_tokens", "search", "search_batch")
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in SanTOKVectorStore._TIMED_OPERATIONS:
+            if name in cls.__dict__:
+                setattr(cls, name, _timed_operation(name, cls.__dict__[name]))
+    
     def __init__(
         self,
         backend: str = "chroma",
@@ -51,9 +136,14 @@ class SanTOKVectorStore:
         self,
         token_records: List,
         embeddings: np.ndarray,
-        metadata: Optional[List[Dict]] = None
+        metadata: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None
     ):
-        """Add tokens and embeddings to store."""
+        """Add tokens and embeddings to store (ids default to one derived from each token)."""
+        raise NotImplementedError
+    
+    def delete_by_metadata(self, field: str, value: str) -> int:
+        """Delete every vector whose metadata[field] == value; returns how many."""
         raise NotImplementedError
     
     def search(
@@ -65,6 +155,20 @@ class SanTOKVectorStore:
         """Search for similar tokens."""
         raise NotImplementedError
     
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 10,
+        filter: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """
+        Search for several query vectors at once.
+        
+        Backends that accept multiple queries per request override this so
+        the whole batch costs a single round trip.
+        """
+        return [self.search(query, top_k=top_k, filter=filter) for query in query_embeddings]
+    
     def get_token_embedding(self, token_id: str) -> Optional[np.ndarray]:
         """Retrieve embedding for specific token."""
         raise NotImplementedError
@@ -81,6 +185,9 @@ class ChromaVectorStore(SanTOKVectorStore):
     - Good for small to medium datasets
     """
     
+    # search() reports 1 - distance
+    HIT_DISTANCE = "similarity"
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not CHROMA_AVAILABLE:
@@ -96,11 +203,11 @@ class ChromaVectorStore(SanTOKVectorStore):
         if self.persist_directory:
             self.client = chromadb.PersistentClient(
                 path=self.persist_directory,
-                settings=Settings(anonymized_telemetry=False)
+                settings=chromadb_config.Settings(anonymized_telemetry=False)
             )
         else:
             self.client = chromadb.Client(
-                settings=Settings(anonymized_telemetry=False)
+                settings=chromadb_config.Settings(anonymized_telemetry=False)
             )
         
         self.collection = self.client.get_or_create_collection(
@@ -119,7 +226,9 @@ class ChromaVectorStore(SanTOKVectorStore):
         self,
         token_records: List,
         embeddings: np.ndarray,
-        metadata: Optional[List[Dict]] = None
+        metadata: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        suppress_output: bool = True
     ):
         """Add tokens to ChromaDB using upsert to handle duplicates efficiently."""
         if len(token_records) != len(embeddings):
@@ -127,134 +236,76 @@ class ChromaVectorStore(SanTOKVectorStore):
         
         # Create metadata if not provided
         if metadata is None:
-            metadata = [
-                {
-                    "text": token.text,
-                    "stream": token.stream,
-                    "uid": str(token.uid),
-                    "frontend": str(token.frontend),
-                    "index": str(token.index),
-                    "content_id": str(token.content_id),
-                    "global_id": str(token.global_id)
-                }
-                for token in token_records
-            ]
+            metadata = [_token_metadata(token) for token in token_records]
         
         # Generate unique IDs based on token global_id and content
         # This ensures IDs are unique and consistent across runs
-        import hashlib
-        ids = []
-        for token in token_records:
-            # Use global_id if available, otherwise create hash from token content
-            if hasattr(token, 'global_id') and token.global_id:
-                token_id = f"token_{token.global_id}"
-            else:
-                # Create hash from token text + stream + uid for uniqueness
-                id_string = f"{token.text}_{token.stream}_{token.uid}"
-                token_hash = hashlib.md5(id_string.encode('utf-8')).hexdigest()[:12]
-                token_id = f"token_{token_hash}"
-            ids.append(token_id)
+        if ids is None:
+            ids = [_token_id(token) for token in token_records]
+        elif len(ids) != len(token_records):
+            raise ValueError("ids and token_records must have same length")
         
         # Extract texts
         texts = [token.text for token in token_records]
         
-        # Use upsert instead of add - this will update if exists, insert if not
-        # This is much faster and doesn't produce duplicate ID errors
-        # Suppress any warnings/errors from ChromaDB telemetry
-        import warnings
-        import sys
-        from io import StringIO
-        import contextlib
-        
-        @contextlib.contextmanager
-        def suppress_stdout_stderr():
-            """Context manager to suppress stdout/stderr (for ChromaDB duplicate messages)"""
-            with open(os.devnull, 'w') as devnull:
-                old_stdout = sys.stdout
-                old_stderr = sys.stderr
-                try:
-                    sys.stdout = devnull
-                    sys.stderr = devnull
-                    yield
-                finally:
-                    sys.stdout = old_stdout
-                    sys.stderr = old_stderr
+        # ChromaDB prints duplicate-ID chatter on stdout/stderr; callers that
+        # ingest many batches (see BulkIngestPipeline) silence it once for the
+        # whole run and pass suppress_output=False here.
+        quiet = _suppress_stdout_stderr if suppress_output else contextlib.nullcontext
         
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             
             # Try upsert first (ChromaDB >= 0.4.0) - this handles duplicates automatically
-            upsert_success = False
             if hasattr(self.collection, 'upsert'):
                 try:
-                    with suppress_stdout_stderr():
+                    with quiet():
                         self.collection.upsert(
                             ids=ids,
                             embeddings=embeddings.tolist(),
                             documents=texts,
                             metadatas=metadata
                         )
-                    upsert_success = True
+                    return
                 except Exception as e:
                     # If upsert fails, fall through to duplicate checking
                     error_msg = str(e).lower()
                     if "upsert" not in error_msg and "method" not in error_msg:
                         raise  # Re-raise if it's a different error
             
-            # Fallback: Check for duplicates before adding (for older ChromaDB or if upsert failed)
-            if not upsert_success:
-                # Check existing IDs in batches for efficiency
-                existing_ids = set()
-                batch_size = 1000  # Check in larger batches for speed
-                
-                # Get all existing IDs first (if collection is small)
+            # Fallback (older ChromaDB or upsert failed): only look up the IDs
+            # of this batch instead of pulling the whole collection.
+            existing_ids = set()
+            lookup_size = 1000
+            for i in range(0, len(ids), lookup_size):
                 try:
-                    collection_count = self.collection.count()
-                    # If collection is not too large, get all IDs once
-                    if collection_count < 100000:  # Only if less than 100k tokens
-                        try:
-                            all_existing = self.collection.get(limit=collection_count)
-                            if all_existing and all_existing.get('ids'):
-                                existing_ids = set(all_existing['ids'])
-                        except Exception:
-                            pass  # Fall back to batch checking
+                    existing = self.collection.get(ids=ids[i:i + lookup_size], include=[])
+                    if existing and existing.get('ids'):
+                        existing_ids.update(existing['ids'])
                 except Exception:
-                    pass  # Collection might be empty
-                
-                # If we don't have all IDs, check batches
-                if not existing_ids:
-                    for i in range(0, len(ids), batch_size):
-                        batch_ids = ids[i:i+batch_size]
-                        try:
-                            existing = self.collection.get(ids=batch_ids)
-                            if existing and existing.get('ids'):
-                                existing_ids.update(existing['ids'])
-                        except Exception:
-                            pass  # Some IDs might not exist, that's fine
-                
-                # Filter out existing IDs - only add new ones
-                new_data = {
-                    'ids': [],
-                    'embeddings': [],
-                    'documents': [],
-                    'metadatas': []
-                }
-                for i, tid in enumerate(ids):
-                    if tid not in existing_ids:
-                        new_data['ids'].append(tid)
-                        new_data['embeddings'].append(embeddings[i].tolist())
-                        new_data['documents'].append(texts[i])
-                        new_data['metadatas'].append(metadata[i])
-                
-                # Only add new items (skip duplicates silently)
-                if new_data['ids']:
-                    with suppress_stdout_stderr():
-                        self.collection.add(
-                            ids=new_data['ids'],
-                            embeddings=new_data['embeddings'],
-                            documents=new_data['documents'],
-                            metadatas=new_data['metadatas']
-                        )
+                    pass  # Some IDs might not exist, that's fine
+            
+            # Filter out existing IDs - only add new ones
+            keep = [i for i, tid in enumerate(ids) if tid not in existing_ids]
+            
+            # Only add new items (skip duplicates silently)
+            if keep:
+                with quiet():
+                    self.collection.add(
+                        ids=[ids[i] for i in keep],
+                        embeddings=embeddings[keep].tolist(),
+                        documents=[texts[i] for i in keep],
+                        metadatas=[metadata[i] for i in keep]
+                    )
+    
+    def delete_by_metadata(self, field: str, value: str) -> int:
+        """Delete every vector whose metadata[field] == value."""
+        where = {field: value}
+        matched = self.collection.get(where=where, include=[])
+        count = len(matched.get('ids') or []) if matched else 0
+        if count:
+            self.collection.delete(where=where)
+        return count
     
     def search(
         self,
@@ -267,24 +318,40 @@ class ChromaVectorStore(SanTOKVectorStore):
         if query_embedding.ndim > 1:
             query_embedding = query_embedding.reshape(-1)
         
+        return self.search_batch(query_embedding.reshape(1, -1), top_k=top_k, filter=filter)[0]
+    
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 10,
+        filter: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Search ChromaDB for several query vectors in one request."""
+        query_embeddings = np.asarray(query_embeddings)
+        if query_embeddings.ndim == 1:
+            query_embeddings = query_embeddings.reshape(1, -1)
+        
         results = self.collection.query(
-            query_embeddings=[query_embedding.tolist()],
+            query_embeddings=query_embeddings.tolist(),
             n_results=top_k,
             where=filter
         )
         
-        # Format results
-        formatted_results = []
-        if results['ids'] and len(results['ids'][0]) > 0:
-            for i in range(len(results['ids'][0])):
-                formatted_results.append({
-                    "id": results['ids'][0][i],
-                    "text": results['documents'][0][i],
-                    "metadata": results['metadatas'][0][i],
-                    "distance": 1.0 - results['distances'][0][i] if 'distances' in results else None
-                })
+        # Format results (one list per query)
+        batches = []
+        for q in range(len(query_embeddings)):
+            formatted_results = []
+            if results['ids'] and len(results['ids'][q]) > 0:
+                for i in range(len(results['ids'][q])):
+                    formatted_results.append({
+                        "id": results['ids'][q][i],
+                        "text": results['documents'][q][i],
+                        "metadata": results['metadatas'][q][i],
+                        "distance": 1.0 - results['distances'][q][i] if 'distances' in results else None
+                    })
+            batches.append(formatted_results)
         
-        return formatted_results
+        return batches
     
     def get_token_embedding(self, token_id: str) -> Optional[np.ndarray]:
         """Retrieve embedding by ID."""
@@ -305,6 +372,8 @@ class FAISSVectorStore(SanTOKVectorStore):
     - Best for large datasets
     """
     
+    HIT_DISTANCE = "l2"
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not FAISS_AVAILABLE:
@@ -315,8 +384,9 @@ class FAISSVectorStore(SanTOKVectorStore):
     
     def _init_faiss(self):
         """Initialize FAISS index."""
-        # Use L2 distance (Euclidean)
-        self.index = faiss.IndexFlatL2(self.embedding_dim)
+        # Use L2 distance (Euclidean); the ID map lets delete_by_metadata
+        # remove vectors (search returns the IDs given at add time)
+        self.index = faiss.IndexIDMap(faiss.IndexFlatL2(self.embedding_dim))
         
         # Store token mapping: index → TokenRecord
         # NOTE: We don't store embeddings separately - FAISS index already has them
@@ -358,9 +428,10 @@ class FAISSVectorStore(SanTOKVectorStore):
         self,
         token_records: List,
         embeddings: np.ndarray,
-        metadata: Optional[List[Dict]] = None
+        metadata: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None
     ):
-        """Add tokens to FAISS index."""
+        """Add tokens to FAISS index (rows get sequential int IDs; string ids are not kept)."""
         if len(token_records) != len(embeddings):
             raise ValueError("token_records and embeddings must have same length")
         
@@ -371,9 +442,10 @@ class FAISSVectorStore(SanTOKVectorStore):
         if embeddings.ndim == 1:
             embeddings = embeddings.reshape(1, -1)
         
-        # Add to index
-        start_idx = self.index.ntotal
-        self.index.add(embeddings)
+        # Add to index; IDs are never reused, even after deletes
+        start_idx = max(self._next_id, self.index.ntotal)
+        self.index.add_with_ids(embeddings, np.arange(start_idx, start_idx + len(embeddings), dtype=np.int64))
+        self._next_id = start_idx + len(embeddings)
         
         # Store token mapping (embeddings already stored in FAISS index - no need to duplicate)
         # Store only essential token info to save memory (not full token objects)
@@ -387,6 +459,19 @@ class FAISSVectorStore(SanTOKVectorStore):
                 'frontend': getattr(token, 'frontend', 0),
                 'index': getattr(token, 'index', 0)
             }
+            # Kept so delete_by_metadata can drop a dataset's rows
+            if metadata is not None and 'dataset_id' in metadata[i]:
+                self.token_map[idx]['dataset_id'] = metadata[i]['dataset_id']
+    
+    def delete_by_metadata(self, field: str, value: str) -> int:
+        """Delete matching rows from the index and the token map."""
+        doomed = [idx for idx, info in self.token_map.items()
+                  if (info.get(field) if isinstance(info, dict) else getattr(info, field, None)) == value]
+        if doomed:
+            self.index.remove_ids(np.asarray(doomed, dtype=np.int64))
+        for idx in doomed:
+            del self.token_map[idx]
+        return len(doomed)
     
     def search(
         self,
@@ -399,14 +484,27 @@ class FAISSVectorStore(SanTOKVectorStore):
         if query_embedding.ndim == 1:
             query_embedding = query_embedding.reshape(1, -1)
         
-        query_embedding = query_embedding.astype('float32')
+        return self.search_batch(query_embedding[:1], top_k=top_k, filter=filter)[0]
+    
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 10,
+        filter: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Search FAISS index for several query vectors in one call."""
+        query_embeddings = np.asarray(query_embeddings)
+        if query_embeddings.ndim == 1:
+            query_embeddings = query_embeddings.reshape(1, -1)
         
         # Search
-        distances, indices = self.index.search(query_embedding, top_k)
-        
-        # Format results
+        distances, indices = self.index.search(query_embeddings.astype('float32'), top_k)
+        return [self._format_hits(d, i) for d, i in zip(distances, indices)]
+    
+    def _format_hits(self, distances: np.ndarray, indices: np.ndarray) -> List[Dict]:
+        """Format one row of FAISS search output."""
         results = []
-        for dist, idx in zip(distances[0], indices[0]):
+        for dist, idx in zip(distances, indices):
             if idx in self.token_map:
                 token_info = self.token_map[idx]
                 # Handle both dict (new lightweight format) and token objects (backward compat)
@@ -446,7 +544,7 @@ class FAISSVectorStore(SanTOKVectorStore):
         # is rarely used. If needed, consider using IndexIVFFlat with reconstruction.
         try:
             idx = int(token_id)
-            if 0 <= idx < self.index.ntotal:
+            if idx in self.token_map:
                 # Try to reconstruct from FAISS (may not work for all index types)
                 # For now, return None - embeddings are accessible via search
                 # If you need this functionality, consider using a different FAISS index type
@@ -14,21 +14,14 @@ import sys
 
 from .vector_store import SanTOKVectorStore
 
-# Try importing weaviate (module-level check - may fail in some import contexts)
-# Runtime check in __init__ is more reliable
 try:
-    if 'weaviate' in sys.modules:
-        weaviate = sys.modules['weaviate']
-        from weaviate.classes.init import Auth
-        from dotenv import load_dotenv
-        WEAVIATE_AVAILABLE = True
-    else:
-        import weaviate
-        from weaviate.classes.init import Auth
-        from dotenv import load_dotenv
-        WEAVIATE_AVAILABLE = True
-except (ImportError, AttributeError):
-    WEAVIATE_AVAILABLE = False
+    from ..utils.lazy_import import module_available
+except ImportError:
+    from utils.lazy_import import module_available
+
+# Probe only - weaviate is imported when a store connects
+# Runtime check in __init__ is more reliable
+WEAVIATE_AVAILABLE = module_available("weaviate") and module_available("dotenv")
 
 
 class WeaviateVectorStore(SanTOKVectorStore):
@@ -43,6 +36,9 @@ class WeaviateVectorStore(SanTOKVectorStore):
     - Scalable
     """
     
+    # Default (cosine) distance of the collection, as reported by search()
+    HIT_DISTANCE = "cosine"
+    
     def __init__(
         self,
         collection_name: str = "SanTOK_Token",
@@ -86,6 +82,7 @@ class WeaviateVectorStore(SanTOKVectorStore):
         
         # Load environment variables if requested
         if auto_load_env:
+            from dotenv import load_dotenv
             load_dotenv()
         
         # Get credentials from args or environment
@@ -151,6 +148,7 @@ class WeaviateVectorStore(SanTOKVectorStore):
                         Property(name="index", data_type=DataType.INT),
                         Property(name="content_id", data_type=DataType.TEXT),
                         Property(name="global_id", data_type=DataType.TEXT),
+                        Property(name="dataset_id", data_type=DataType.TEXT),
                     ]
                 )
         except Exception as e:
@@ -165,6 +163,7 @@ class WeaviateVectorStore(SanTOKVectorStore):
         token_records: List,
         embeddings: np.ndarray,
         metadata: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
         skip_duplicates: bool = True
     ):
         """
@@ -174,10 +173,13 @@ class WeaviateVectorStore(SanTOKVectorStore):
             token_records: List of token records
             embeddings: Numpy array of embeddings
             metadata: Optional list of metadata dicts
+            ids: Optional list of IDs (object UUIDs are derived from them)
             skip_duplicates: If True, skip tokens that already exist (based on text+uid)
         """
         if len(token_records) != len(embeddings):
             raise ValueError("token_records and embeddings must have same length")
+        if ids is not None and len(ids) != len(token_records):
+            raise ValueError("ids and token_records must have same length")
         
         # Prepare data for batch insert
         objects_to_insert = []
@@ -195,10 +197,10 @@ class WeaviateVectorStore(SanTOKVectorStore):
                     
                     # Generate deterministic UUIDs for this batch
                     batch_uuids = []
-                    for token in batch_tokens:
+                    for offset, token in enumerate(batch_tokens):
                         token_text = getattr(token, 'text', '')
                         token_uid = str(getattr(token, 'uid', ''))
-                        unique_string = f"{token_text}_{token_uid}"
+                        unique_string = ids[batch_start + offset] if ids is not None else f"{token_text}_{token_uid}"
                         token_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, unique_string)
                         batch_uuids.append(str(token_uuid))
                     
@@ -218,7 +220,9 @@ class WeaviateVectorStore(SanTOKVectorStore):
             token_global_id = str(getattr(token, 'global_id', ''))
             
             # Generate deterministic UUID
-            if skip_duplicates:
+            if ids is not None:
+                unique_string = ids[i]
+            elif skip_duplicates:
                 unique_string = f"{token_text}_{token_uid}"
             else:
                 unique_string = f"{token_text}_{token_uid}_{token_global_id}_{self._token_counter + i}"
@@ -249,6 +253,9 @@ class WeaviateVectorStore(SanTOKVectorStore):
                 }
             else:
                 token_metadata = metadata[i]
+                if isinstance(token_metadata.get("index"), str):
+                    # Chroma-style metadata (vector_store._token_metadata) keeps index as a string
+                    token_metadata = dict(token_metadata, index=int(token_metadata["index"]))
             
             # Create Weaviate object
             from weaviate.classes.data import DataObject
@@ -285,6 +292,12 @@ class WeaviateVectorStore(SanTOKVectorStore):
                 else:
                     raise
     
+    def delete_by_metadata(self, field: str, value: str) -> int:
+        """Delete every object whose property field == value."""
+        from weaviate.classes.query import Filter
+        result = self.collection.data.delete_many(where=Filter.by_property(field).equal(value))
+        return int(getattr(result, "successful", 0) or 0)
+    
     def search(
         self,
         query_embedding: np.ndarray,
@@ -16,10 +16,14 @@ from typing import List, Dict, Optional, Union, Tuple
 import warnings
 
 try:
-    from transformers import AutoTokenizer
-    TRANSFORMERS_AVAILABLE = True
+    from ..utils.lazy_import import lazy_import, module_available
 except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+    from utils.lazy_import import lazy_import, module_available
+
+# transformers (and torch behind it) is imported when an adapter is first created
+transformers = lazy_import("transformers")
+TRANSFORMERS_AVAILABLE = module_available("transformers")
+if not TRANSFORMERS_AVAILABLE:
     warnings.warn("transformers library not available. Install with: pip install transformers")
 
 
@@ -45,7 +49,7 @@ class VocabularyAdapter:
             )
         
         self.model_name = model_name
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=use_fast)
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_name, use_fast=use_fast)
         self.vocab_size = len(self.tokenizer.vocab) if hasattr(self.tokenizer, 'vocab') else len(self.tokenizer.get_vocab())
         
     def map_santok_tokens_to_model_ids(
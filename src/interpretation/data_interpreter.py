@@ -14,6 +14,7 @@ Example:
 
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
 from pathlib import Path
 import sys
 import os
@@ -23,15 +24,24 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from src.core.core_tokenizer import TextTokenizer
+    from src.core.core_tokenizer import TextTokenizer, tokenize_word
     from src.embeddings.embedding_generator import SanTOKEmbeddingGenerator
     from src.embeddings.weaviate_vector_store import WeaviateVectorStore
 except ImportError:
-    from core.core_tokenizer import TextTokenizer
+    from core.core_tokenizer import TextTokenizer, tokenize_word
     from embeddings.embedding_generator import SanTOKEmbeddingGenerator
     from embeddings.weaviate_vector_store import WeaviateVectorStore
 
 
+# Token clue scoring table (bonus added once per distinct token text)
+_CLUE_UNIQUE_BONUS = 5
+_CLUE_NUMERIC_BONUS = 10
+_CLUE_ACTION_BONUS = 8
+_CLUE_ACTION_WORDS = frozenset({
+    'drop', 'dropped', 'increase', 'decrease', 'change', 'improve', 'decline'
+})
+
+
 class DataInterpreter:
     """
     Real-time data interpretation system using SanTOK embeddings.
@@ -199,50 +209,51 @@ class DataInterpreter:
         Returns:
             List of key token strings
         """
-        # Tokenize text
-        streams = self.tokenizer.build(text)
-        
-        # Get tokens from word stream (most meaningful)
-        word_stream = streams.get('word')
-        if not word_stream:
+        # Only the word stream is used, so skip the other eight tokenizers
+        tokens = [tok["text"] for tok in tokenize_word(text)]
+        if not tokens:
             return []
         
-        tokens = word_stream.tokens
+        n = len(tokens)
+        lowered = [t.lower() for t in tokens]
+        counts = Counter(lowered)
         
-        # Score tokens by importance (length, position, uniqueness)
+        # Score tokens by importance (length, position, uniqueness); the
+        # position-independent part is computed once per distinct token
+        static_scores: Dict[str, int] = {}
         token_scores = []
-        all_texts = [t.text.lower() for t in tokens]
-        
-        for i, token in enumerate(tokens):
-            text_lower = token.text.lower()
-            score = 0
-            
-            # Longer tokens are more important
-            score += len(token.text) * 2
+        for i, (token_text, text_lower) in enumerate(zip(tokens, lowered)):
+            static = static_scores.get(token_text)
+            if static is None:
+                # Longer tokens are more important
+                static = len(token_text) * 2
+                # Unique tokens are more important
+                if counts[text_lower] == 1:
+                    static += _CLUE_UNIQUE_BONUS
+                # Numbers and percentages are important
+                if '%' in token_text or any(c.isdigit() for c in token_text):
+                    static += _CLUE_NUMERIC_BONUS
+                # Action verbs are important
+                if text_lower in _CLUE_ACTION_WORDS:
+                    static += _CLUE_ACTION_BONUS
+                static_scores[token_text] = static
             
             # Early position tokens are more important
-            score += (len(tokens) - i) / len(tokens) * 10
-            
-            # Unique tokens are more important
-            if all_texts.count(text_lower) == 1:
-                score += 5
-            
-            # Numbers and percentages are important
-            if any(c.isdigit() for c in token.text) or '%' in token.text:
-                score += 10
-            
-            # Action verbs are important
-            action_words = ['drop', 'dropped', 'increase', 'decrease', 'change', 'improve', 'decline']
-            if text_lower in action_words:
-                score += 8
-            
-            token_scores.append((score, token.text))
+            token_scores.append((static + (n - i) / n * 10, token_text))
         
         # Sort by score and get top N
         token_scores.sort(reverse=True, key=lambda x: x[0])
-        top_tokens = [text for _, text in token_scores[:top_n]]
-        
-        return top_tokens
+        return [token_text for _, token_text in token_scores[:top_n]]
+    
+    def _clue_tokens(self, token_clues: List[str]) -> List:
+        """Word-stream TokenRecords for a list of clues."""
+        all_tokens = []
+        for clue in token_clues:
+            streams = self.tokenizer.build(clue, stream_names=("word",))
+            word_stream = streams.get('word')
+            if word_stream:
+                all_tokens.extend(word_stream.tokens)
+        return all_tokens
     
     def find_related_concepts(
         self,
@@ -264,13 +275,7 @@ class DataInterpreter:
             return []
         
         # Tokenize clues using YOUR SanTOK tokenizer
-        all_tokens = []
-        for clue in token_clues:
-            streams = self.tokenizer.build(clue)
-            word_stream = streams.get('word')
-            if word_stream:
-                all_tokens.extend(word_stream.tokens)
-        
+        all_tokens = self._clue_tokens(token_clues)
         if not all_tokens:
             return []
         
@@ -285,6 +290,10 @@ class DataInterpreter:
         # This searches through YOUR existing data
         results = self.vector_store.search(query_embedding, top_k=top_k)
         
+        return self._format_related_concepts(results, top_k)
+    
+    def _format_related_concepts(self, results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """Turn raw vector-store hits into concept records."""
         # Extract concepts from YOUR search results
         concepts = self._extract_concepts_from_results(results)
         
@@ -459,6 +468,61 @@ class DataInterpreter:
         }
 
 
+    def interpret_many(
+        self,
+        input_texts: List[str],
+        top_clues: int = 5,
+        top_concepts: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Interpret several inputs with shared embedding and search work.
+        
+        Clue tokens of every input are embedded in one generate_batch call and
+        all query vectors go to the vector store in one search_batch call.
+        
+        Args:
+            input_texts: Input texts to interpret
+            top_clues: Number of token clues to extract per input
+            top_concepts: Number of related concepts to find per input
+            
+        Returns:
+            One interpretation dictionary per input (same shape as interpret())
+        """
+        clues_per_input = [self.extract_token_clues(t, top_n=top_clues) for t in input_texts]
+        
+        # Lay out clue tokens of all inputs back to back
+        all_tokens = []
+        counts = np.zeros(len(input_texts), dtype=np.int64)
+        for i, clues in enumerate(clues_per_input):
+            tokens = self._clue_tokens(clues) if clues else []
+            counts[i] = len(tokens)
+            all_tokens.extend(tokens)
+        
+        related_per_input: List[List[Dict[str, Any]]] = [[] for _ in input_texts]
+        has_query = counts > 0
+        if has_query.any():
+            embeddings = self.embedding_generator.generate_batch(all_tokens)
+            offsets = (np.cumsum(counts) - counts)[has_query]
+            query_embeddings = np.add.reduceat(embeddings, offsets, axis=0) / counts[has_query, None]
+            
+            search_results = self.vector_store.search_batch(
+                query_embeddings.astype(np.float32), top_k=top_concepts
+            )
+            for i, results in zip(np.flatnonzero(has_query), search_results):
+                related_per_input[i] = self._format_related_concepts(results, top_concepts)
+        
+        interpretations = []
+        for input_text, token_clues, related_concepts in zip(input_texts, clues_per_input, related_per_input):
+            interpretations.append({
+                "input": input_text,
+                "token_clues": token_clues,
+                "related_concepts": [c['concept'] for c in related_concepts],
+                "concept_details": related_concepts,
+                "interpretation": self.generate_interpretation(input_text, token_clues, related_concepts)
+            })
+        return interpretations
+
+
 def main():
     """Example usage with YOUR Weaviate database"""
     print("=" * 80)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Batch API Benchmark for SanTOK
+Documents/second through /tokenize (one request per document, sent
+concurrently) versus /tokenize/batch (one request per batch), and the same
+for /embeddings/generate versus /embeddings/generate/batch.
+
+Needs a running server:
+    python src/servers/main_server.py
+    python src/performance/benchmark_batch_api.py --url http://localhost:8000
+"""
+
+import argparse
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+WORDS = ("token", "stream", "engine", "vector", "digit", "signal", "corpus", "model", "index", "batch")
+
+
+def make_documents(count: int, words: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def post(url: str, payload: dict, accept: str = "application/json") -> bytes:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json", "Accept": accept},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=600) as response:
+        return response.read()
+
+
+def single_rate(url: str, documents, payload_for, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda doc: post(url, payload_for(doc)), documents))
+    return len(documents) / (time.perf_counter() - start)
+
+
+def batch_rate(url: str, documents, payload_for, batch_size: int, fmt: str) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(documents), batch_size):
+        post(f"{url}?format={fmt}", payload_for(documents[i:i + batch_size]))
+    return len(documents) / (time.perf_counter() - start)
+
+
+def run(base: str, documents, batch_size: int, concurrency: int, formats):
+    print("=" * 70)
+    print(f"BATCH API: {len(documents)} documents, batch size {batch_size}, {concurrency} concurrent single requests")
+    print("=" * 70)
+
+    suites = [
+        (
+            "tokenize",
+            f"{base}/tokenize",
+            lambda doc: {"text": doc, "tokenizer_type": "word", "seed": 42},
+            f"{base}/tokenize/batch",
+            lambda docs: {"texts": docs, "tokenizer_type": "word", "seed": 42},
+        ),
+        (
+            "embeddings",
+            f"{base}/embeddings/generate",
+            lambda doc: {"text": doc, "stream_type": "word"},
+            f"{base}/embeddings/generate/batch",
+            lambda docs: {"texts": docs, "stream_type": "word"},
+        ),
+    ]
+    for name, single_url, single_payload, batch_url, batch_payload in suites:
+        try:
+            single = single_rate(single_url, documents, single_payload, concurrency)
+        except urllib.error.HTTPError as e:
+            print(f"  {name:<11} skipped ({e.code} {e.reason})")
+            continue
+        print(f"  {name:<11} single        {single:>10,.0f} docs/s")
+        for fmt in formats:
+            try:
+                rate = batch_rate(batch_url, documents, batch_payload, batch_size, fmt)
+            except urllib.error.HTTPError as e:
+                print(f"  {name:<11} batch {fmt:<8} skipped ({e.code} {e.reason})")
+                continue
+            print(f"  {name:<11} batch {fmt:<8}{rate:>10,.0f} docs/s  {rate / single:>5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch vs single-document API throughput")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=40, help="Words per document")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--formats", nargs="+", default=["json", "npy"])
+    args = parser.parse_args()
+    run(args.url.rstrip("/"), make_documents(args.documents, args.words), args.batch_size, args.concurrency, args.formats)
+
+
+if __name__ == "__main__":
+    main()
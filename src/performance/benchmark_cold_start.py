@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Cold Start Benchmark for SanTOK
+Import time of the server / CLI entry modules (python -X importtime) and the
+wall time of `santok_cli.py tokenize` on a small file, checked against a
+budget. Also fails if a heavy optional stack (torch, chromadb, ...) gets
+imported eagerly again.
+
+Run:
+    python src/performance/benchmark_cold_start.py
+    python src/performance/benchmark_cold_start.py --budget 0.8 --runs 7
+Exit status is 1 when a budget is exceeded or a heavy module is loaded.
+The import checks also run under pytest (test_cold_start.py).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+SRC = ROOT / "src"
+
+# Imported only when the feature that needs them is used
+HEAVY_MODULES = [
+    "torch", "sentence_transformers", "transformers", "chromadb",
+    "faiss", "weaviate", "scipy", "tensorflow",
+]
+
+# The server also leaves these to the endpoints that use them
+SERVER_LAZY_MODULES = ["numpy", "jwt", "pyarrow"]
+
+# (label, module, extra sys.path entry, modules it must not import)
+IMPORT_TARGETS = [
+    ("core tokenizer", "core.core_tokenizer", SRC, HEAVY_MODULES),
+    ("embeddings package", "embeddings", SRC, HEAVY_MODULES),
+    ("embedding generator", "embeddings.embedding_generator", SRC, HEAVY_MODULES),
+    ("vector store", "embeddings.vector_store", SRC, HEAVY_MODULES),
+    ("vocabulary adapter", "integration.vocabulary_adapter", SRC, HEAVY_MODULES),
+    ("main_server", "servers.main_server", SRC, HEAVY_MODULES + SERVER_LAZY_MODULES),
+]
+
+
+def run_python(args, env_path=None):
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    if env_path is not None:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(env_path), env.get("PYTHONPATH", "")]))
+    return subprocess.run([sys.executable] + args, capture_output=True, text=True, env=env, cwd=str(ROOT))
+
+
+def import_profile(module, path, watch):
+    """(total import ms of module, modules in watch it pulled in) or (None, error)."""
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {watch!r} if m in sys.modules))"
+    )
+    proc = run_python(["-X", "importtime", "-c", code], path)
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            total_us = int(parts[1])
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return total_us / 1000.0, heavy
+
+
+def cli_tokenize_seconds(runs):
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("SanTOK cold start check. The quick brown fox jumps over the lazy dog.\n" * 20)
+        path = f.name
+    try:
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = run_python([str(ROOT / "santok_cli.py"), "tokenize", "--file", path])
+            times.append(time.perf_counter() - start)
+            if proc.returncode != 0:
+                raise RuntimeError(proc.stderr or proc.stdout)
+        # Which heavy modules does the tokenize path import?
+        code = (
+            "import runpy, sys, io, contextlib\n"
+            f"sys.argv = ['santok_cli.py', 'tokenize', '--file', {path!r}]\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            f"    runpy.run_path({str(ROOT / 'santok_cli.py')!r}, run_name='__main__')\n"
+            f"print(','.join(m for m in {HEAVY_MODULES + ['numpy']!r} if m in sys.modules))"
+        )
+        proc = run_python(["-c", code])
+        loaded = [m for m in proc.stdout.strip().splitlines()[-1].split(",") if m] if proc.stdout.strip() else []
+        return times, loaded
+    finally:
+        os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SanTOK cold start benchmark")
+    parser.add_argument("--budget", type=float, default=float(os.getenv("SANTOK_CLI_START_BUDGET", "0.5")),
+                        help="Max median seconds for `santok_cli.py tokenize` on a small file")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    print("=" * 70)
+    print("COLD START: import time (python -X importtime)")
+    print("=" * 70)
+    for label, module, path, watch in IMPORT_TARGETS:
+        ms, heavy = import_profile(module, path, watch)
+        if ms is None:
+            print(f"  {label:<22} skipped ({heavy})")
+            continue
+        note = f"  HEAVY: {', '.join(heavy)}" if heavy else ""
+        print(f"  {label:<22} {ms:>9.1f} ms{note}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} at import time")
+
+    print()
+    print("=" * 70)
+    print(f"COLD START: santok_cli.py tokenize (small file, {args.runs} runs)")
+    print("=" * 70)
+    times, loaded = cli_tokenize_seconds(args.runs)
+    median = statistics.median(times)
+    print(f"  median {median:.3f}s  min {min(times):.3f}s  budget {args.budget:.3f}s")
+    print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+    if median > args.budget:
+        failures.append(f"santok_cli.py tokenize took {median:.3f}s (budget {args.budget:.3f}s)")
+    if loaded:
+        failures.append(f"santok_cli.py tokenize loads {', '.join(loaded)}")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark for SanTOK
+TextTokenizer.build() time with metrics disabled (the default outside the
+server), enabled, and the cost of a single recording call in each state.
+
+Run:
+    python src/performance/benchmark_metrics_overhead.py
+    python src/performance/benchmark_metrics_overhead.py --words 20000 --runs 15
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from core.core_tokenizer import TextTokenizer
+from utils import metrics
+
+WORDS = ("token", "stream", "engine", "vector", "digit", "signal", "corpus", "model", "index", "batch")
+
+
+def build_seconds(text: str, runs: int):
+    """Median build time (off, on); runs alternate between the states so drift hits both."""
+    engine = TextTokenizer(42, False)
+    engine.build(text)  # warm-up
+    times = {False: [], True: []}
+    for _ in range(runs):
+        for state in (False, True):
+            metrics.enable(state)
+            start = time.perf_counter()
+            engine.build(text)
+            times[state].append(time.perf_counter() - start)
+    metrics.enable(False)
+    return statistics.median(times[False]), statistics.median(times[True])
+
+
+def call_ns(calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        with metrics.stage("bench", "noop"):
+            pass
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics overhead benchmark")
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=11)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    text = " ".join(rng.choice(WORDS) for _ in range(args.words))
+
+    print("=" * 70)
+    print(f"METRICS OVERHEAD: TextTokenizer.build on {args.words:,} words (median of {args.runs})")
+    print("=" * 70)
+    off, on = build_seconds(text, args.runs)
+    metrics.enable(False)
+    off_call = call_ns(args.calls)
+    metrics.enable(True)
+    on_call = call_ns(args.calls)
+    metrics.enable(False)
+
+    print(f"  build, metrics off   {off * 1000:>9.2f} ms")
+    print(f"  build, metrics on    {on * 1000:>9.2f} ms  ({(on / off - 1) * 100:+.2f}%)")
+    print(f"  stage() call, off    {off_call:>9.0f} ns")
+    print(f"  stage() call, on     {on_call:>9.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
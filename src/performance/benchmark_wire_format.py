@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Wire Format Benchmark for SanTOK API responses
+Payload size and encode time of JSON versus npy / msgpack / arrow for an
+/embeddings/generate-shaped table (per-token columns + float32 embeddings)
+Every format encodes the same table - meta, all columns (token text
+included) and the matrix - and the npy payload is decoded back and
+checked against it before it is timed.
+"""
+
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from servers import wire_format
+
+
+def make_table(tokens: int, dim: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    meta = {"embedding_dim": dim, "num_tokens": tokens, "strategy": "feature_based", "processing_time": 0.0}
+    columns = {
+        "text": [f"token{i}" for i in range(tokens)],
+        "index": np.arange(tokens, dtype=np.int64),
+        "uid": rng.integers(0, 2**63, tokens, dtype=np.uint64),
+        "frontend": rng.integers(1, 10, tokens, dtype=np.uint8),
+        "backend_scaled": rng.integers(0, 100000, tokens, dtype=np.uint32),
+        "content_id": rng.integers(13, 150013, tokens, dtype=np.uint32),
+    }
+    embeddings = rng.standard_normal((tokens, dim)).astype(np.float32)
+    return meta, columns, ("embeddings", embeddings)
+
+
+def check_npy(meta, columns, matrix):
+    body = wire_format.encode("npy", meta, columns, matrix)[0]
+    decoded_meta, arrays = wire_format.decode_npz(body)
+    assert decoded_meta == meta
+    assert arrays["text"] == columns["text"]
+    for name, col in columns.items():
+        if isinstance(col, np.ndarray):
+            assert np.array_equal(arrays[name], col), name
+    assert np.array_equal(arrays[matrix[0]], matrix[1])
+
+
+def time_encode(fn, repeats: int = 3):
+    best, body = float("inf"), b""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def run(token_counts=(100, 1000, 10000), dim: int = 768):
+    print("=" * 70)
+    print(f"WIRE FORMATS: {dim}-dim float32 embeddings + per-token columns")
+    print("=" * 70)
+    print(f"{'tokens':>8} {'format':>8} {'size':>12} {'vs json':>8} {'encode ms':>10} {'vs json':>8}")
+
+    for tokens in token_counts:
+        meta, columns, matrix = make_table(tokens, dim)
+        check_npy(meta, columns, matrix)
+        json_time, json_body = time_encode(lambda: wire_format.to_json_table(meta, columns, matrix))
+        print(f"{tokens:>8,} {'json':>8} {len(json_body):>12,} {'1.0x':>8} {json_time * 1000:>10.1f} {'1.0x':>8}")
+
+        for fmt in wire_format.available_formats():
+            if fmt == "json":
+                continue
+            seconds, body = time_encode(lambda: wire_format.encode(fmt, meta, columns, matrix)[0])
+            print(f"{tokens:>8,} {fmt:>8} {len(body):>12,} {len(json_body) / len(body):>7.1f}x "
+                  f"{seconds * 1000:>10.1f} {json_time / seconds if seconds else 0:>7.1f}x")
+
+    missing = [f for f in ("msgpack", "arrow") if f not in wire_format.available_formats()]
+    if missing:
+        print(f"\nSkipped (optional package not installed): {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Lazy-import guarantees of the server and the embeddings package
+Each module is imported in a fresh interpreter (see benchmark_cold_start.py)
+and must not pull in numpy, PyJWT or the embeddings classes at load time.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+from benchmark_cold_start import HEAVY_MODULES, SERVER_LAZY_MODULES, SRC, import_profile
+
+# Submodules of src/embeddings that hold the classes (each imports numpy)
+EMBEDDING_CLASS_MODULES = [
+    "embeddings.embedding_generator",
+    "embeddings.vector_store",
+    "embeddings.inference_pipeline",
+    "embeddings.bulk_ingest",
+    "src.embeddings.embedding_generator",
+    "src.embeddings.vector_store",
+    "src.embeddings.inference_pipeline",
+    "src.embeddings.bulk_ingest",
+]
+
+
+def test_embeddings_package_is_lazy():
+    ms, loaded = import_profile("embeddings", SRC, HEAVY_MODULES + ["numpy"] + EMBEDDING_CLASS_MODULES)
+    assert ms is not None, loaded
+    assert loaded == []
+
+
+def test_main_server_is_lazy():
+    if importlib.util.find_spec("fastapi") is None:
+        pytest.skip("fastapi not installed")
+    ms, loaded = import_profile("servers.main_server", SRC,
+                                HEAVY_MODULES + SERVER_LAZY_MODULES + EMBEDDING_CLASS_MODULES)
+    assert ms is not None, loaded
+    assert loaded == []
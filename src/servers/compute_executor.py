@@ -0,0 +1,346 @@
+"""
+Compute Executor for CPU-bound request handlers
+Runs tokenization / embedding work in a warm worker pool so the event loop
+(health checks, websockets, other clients) never waits on it
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional, Tuple
+
+try:
+    from utils import metrics
+except ImportError:
+    from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per task name for percentile reporting
+LATENCY_WINDOW = 2048
+
+_DEFAULT = object()
+
+
+class ComputeBusyError(Exception):
+    """The pool and its queue are full - the caller should answer 503."""
+
+    def __init__(self, pending: int, limit: int, retry_after: int = 1):
+        super().__init__(f"Compute queue full ({pending}/{limit} tasks pending)")
+        self.pending = pending
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class ComputeTimeoutError(Exception):
+    """A task did not finish within its timeout - the caller should answer 504."""
+
+    def __init__(self, name: str, timeout: float):
+        super().__init__(f"Task '{name}' timed out after {timeout:g}s")
+        self.name = name
+        self.timeout = timeout
+
+
+class ComputeTaskError(Exception):
+    """
+    An HTTP-style error (status_code + detail) raised inside a worker.
+
+    Framework exceptions such as HTTPException do not survive pickling
+    between processes; this plain exception does, and the server turns it
+    back into an HTTP response.
+    """
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class _MetricsResult(NamedTuple):
+    """A worker process's result plus the metrics it recorded since its last task."""
+    value: Any
+    metrics: Dict[str, Any]
+
+
+def _run_task(fn: Callable, args: Tuple, kwargs: Dict[str, Any], collect_metrics: bool = False) -> Any:
+    """Worker-side entry point."""
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        status_code = getattr(e, "status_code", None)
+        if isinstance(status_code, int):
+            raise ComputeTaskError(status_code, getattr(e, "detail", str(e))) from None
+        raise
+    if collect_metrics:
+        # Worker processes have their own registry; ship what they recorded to the server's
+        return _MetricsResult(result, metrics.REGISTRY.drain())
+    return result
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class LatencyStats:
+    """Counters and a sliding window of latencies for one task name."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        self.samples.append(seconds)
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p90_ms": round(self.percentile(90) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(max(self.samples) * 1000, 3) if self.samples else 0.0,
+            "samples": len(self.samples),
+        }
+
+
+class ComputeExecutor:
+    """
+    Bounded worker pool for CPU-bound handler work.
+
+    - mode="process": a ProcessPoolExecutor whose workers run `initializer`
+      once (load tokenizer tables, embedding generators) and then stay warm
+    - mode="thread": same interface on a ThreadPoolExecutor (for work that
+      releases the GIL, or platforms where processes are unavailable)
+    - At most workers + max_queue tasks are pending; beyond that run()
+      raises ComputeBusyError instead of queueing unboundedly
+    - Per-task timeouts raise ComputeTimeoutError; a timed-out task that
+      already started keeps its worker until it finishes and still counts
+      toward the pending limit
+
+    Example:
+        executor = ComputeExecutor(workers=4, max_queue=32, timeout=60)
+        executor.start()
+        result = await executor.run(tokenize_sync, request, name="tokenize")
+        executor.stats()["tasks"]["tokenize"]["p99_ms"]
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: int = 64,
+        timeout: Optional[float] = 300.0,
+        mode: str = "process",
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = (),
+        start_method: Optional[str] = None,
+    ):
+        if mode not in ("process", "thread"):
+            raise ValueError(f"mode must be 'process' or 'thread', got {mode!r}")
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.mode = mode
+        self.initializer = initializer
+        self.initargs = initargs
+        self.start_method = start_method
+
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._stats: Dict[str, LatencyStats] = {}
+        self._restarts = 0
+
+    @classmethod
+    def from_env(cls, prefix: str = "SANTOK_COMPUTE", **kwargs) -> "ComputeExecutor":
+        """
+        Build from environment variables:
+        {prefix}_WORKERS, {prefix}_QUEUE, {prefix}_TIMEOUT (0 = none), {prefix}_MODE
+        """
+        timeout = float(os.getenv(f"{prefix}_TIMEOUT", "300"))
+        return cls(
+            workers=int(os.getenv(f"{prefix}_WORKERS", "0")) or None,
+            max_queue=int(os.getenv(f"{prefix}_QUEUE", "64")),
+            timeout=timeout if timeout > 0 else None,
+            mode=os.getenv(f"{prefix}_MODE", "process"),
+            **kwargs,
+        )
+
+    @property
+    def limit(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    # ==================== POOL LIFECYCLE ====================
+
+    def _create_pool(self):
+        if self.mode == "process":
+            try:
+                method = self.start_method
+                if method is None and "fork" in multiprocessing.get_all_start_methods():
+                    # Workers inherit the already-imported tokenizer modules
+                    method = "fork"
+                context = multiprocessing.get_context(method) if method else None
+                return ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=self.initializer,
+                    initargs=self.initargs,
+                )
+            except (OSError, NotImplementedError, ValueError) as e:
+                logger.warning(f"[COMPUTE] Process pool unavailable ({e}), using threads")
+                self.mode = "thread"
+        return ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="santok-compute",
+            initializer=self.initializer,
+            initargs=self.initargs,
+        )
+
+    def start(self, warm: bool = True) -> None:
+        """Create the pool; with warm=True every worker is started (and initialized) now."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._create_pool()
+            pool = self._pool
+        if warm:
+            try:
+                for future in [pool.submit(_ping) for _ in range(self.workers)]:
+                    future.result()
+            except Exception as e:
+                logger.warning(f"[COMPUTE] Worker warm-up failed: {e}")
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _restart(self, broken) -> None:
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+                self._restarts += 1
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("[COMPUTE] Worker pool broke (worker crashed?) - restarting")
+
+    def _submit(self, fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Future:
+        for attempt in (0, 1):
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+                pool = self._pool
+            try:
+                collect = self.mode == "process" and metrics.enabled()
+                return pool.submit(_run_task, fn, args, kwargs, collect)
+            except (BrokenProcessPool, RuntimeError):
+                if attempt:
+                    raise
+                self._restart(pool)
+
+    # ==================== RUN ====================
+
+    def _task_stats(self, name: str) -> LatencyStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats.setdefault(name, LatencyStats())
+        return stats
+
+    def _acquire(self, name: str) -> None:
+        with self._lock:
+            if self._pending >= self.limit:
+                self._task_stats(name).rejected += 1
+                raise ComputeBusyError(self._pending, self.limit)
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args, name: Optional[str] = None, timeout: Any = _DEFAULT, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) in the pool and await its result.
+
+        fn and its arguments must be picklable in process mode (module-level
+        functions). timeout defaults to the executor's; None disables it.
+
+        Raises:
+            ComputeBusyError: too many pending tasks
+            ComputeTimeoutError: the task exceeded its timeout
+            ComputeTaskError: fn raised an exception carrying status_code
+        """
+        name = name or getattr(fn, "__name__", "task")
+        timeout = self.timeout if timeout is _DEFAULT else timeout
+        self._acquire(name)
+        try:
+            future = self._submit(fn, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the work really ends, not when the caller gives up
+        future.add_done_callback(self._release)
+
+        stats = self._task_stats(name)
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            stats.timeouts += 1
+            raise ComputeTimeoutError(name, timeout)
+        except BrokenProcessPool:
+            self._restart(self._pool)
+            stats.record(time.perf_counter() - started, ok=False)
+            raise
+        except BaseException:
+            stats.record(time.perf_counter() - started, ok=False)
+            raise
+        stats.record(time.perf_counter() - started)
+        if isinstance(result, _MetricsResult):
+            metrics.REGISTRY.merge(result.metrics)
+            result = result.value
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "timeout": self.timeout,
+                "running": self._pool is not None,
+                "pending": self._pending,
+                "peak_pending": self._peak_pending,
+                "restarts": self._restarts,
+                "tasks": {name: stats.to_dict() for name, stats in self._stats.items()},
+            }
+
+    def __repr__(self) -> str:
+        return f"ComputeExecutor(mode={self.mode!r}, workers={self.workers}, pending={self._pending}/{self.limit})"
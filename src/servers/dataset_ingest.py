@@ -0,0 +1,375 @@
+"""
+Dataset Ingest for user uploads
+Streams uploaded datasets to disk chunk by chunk and indexes them
+incrementally in the background, so a large upload is never held in memory
+and never triggers a rebuild of everything uploaded before it
+
+- stream_to_file(): writes chunks as they arrive and hashes them on the fly
+  (SHA-256 of the content, used for dedup); file I/O runs in a thread so the
+  event loop keeps serving other requests
+- DatasetIndexer: content-hash dedup index, incremental vocabulary counts
+  (word stream, merged per dataset and subtracted again on delete) and
+  vector-store ingestion through BulkIngestPipeline with a per-dataset
+  checkpoint and ID namespace (vectors are tagged with their dataset_id and
+  deleted with it); jobs run one at a time on a background worker
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bytes per read/write while receiving an upload
+UPLOAD_CHUNK_BYTES = 1 << 20
+# Characters of text tokenized at a time while indexing (cut at line ends)
+INDEX_CHUNK_CHARS = 1 << 20
+# Minimum seconds between progress reports of an index job
+PROGRESS_INTERVAL = 2.0
+
+CONTENT_INDEX_FILE = "content_index.json"
+VOCAB_COUNTS_FILE = "vocab_counts.json"
+COMBINED_FILE = "all_user_datasets.txt"
+DATASET_COUNTS_FILE = "token_counts.json"
+DATASET_CHECKPOINT_FILE = "ingest_checkpoint.json"
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeded the configured size limit (the partial file is removed)."""
+
+
+async def stream_to_file(
+    chunks: AsyncIterator[bytes],
+    path: Path,
+    max_bytes: Optional[int] = None,
+) -> Tuple[int, str]:
+    """
+    Write an async iterator of byte chunks to path, hashing as it goes.
+
+    Returns:
+        (size in bytes, SHA-256 hex digest of the content)
+    """
+    loop = asyncio.get_running_loop()
+    digest = hashlib.sha256()
+    size = 0
+
+    def write(f, chunk: bytes) -> None:
+        digest.update(chunk)
+        f.write(chunk)
+
+    try:
+        f = await loop.run_in_executor(None, open, path, "wb")
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes / (1 << 20):g} MB")
+                await loop.run_in_executor(None, write, f, chunk)
+        finally:
+            await loop.run_in_executor(None, f.close)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+async def iter_upload(upload: Any, chunk_size: int = UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Chunks of an object with an async read(n) (e.g. a FastAPI UploadFile)."""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_text_chunks(path: Path, chunk_chars: int = INDEX_CHUNK_CHARS) -> Iterator[Tuple[str, int]]:
+    """(text, bytes read so far) for about chunk_chars characters at a time, cut at line ends."""
+    with open(path, "rb") as f:
+        lines = []
+        size = 0
+        for raw in f:
+            line = raw.decode("utf-8", errors="ignore")
+            lines.append(line)
+            size += len(line)
+            if size >= chunk_chars:
+                yield "".join(lines), f.tell()
+                lines, size = [], 0
+        if lines:
+            yield "".join(lines), f.tell()
+
+
+def _write_json(path: Path, value: Any) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        logger.warning(f"[INGEST] Ignoring unreadable {path}: {e}")
+        return default
+
+
+class _CountingTokenizer:
+    """Tokenizer wrapper that counts word-stream tokens as texts pass through build()."""
+
+    def __init__(self, tokenizer: Any, counts: Counter):
+        self.tokenizer = tokenizer
+        self.counts = counts
+
+    def build(self, text: str):
+        streams = self.tokenizer.build(text)
+        word_stream = streams.get("word")
+        if word_stream is not None:
+            self.counts.update(token.text for token in word_stream.tokens)
+        return streams
+
+
+class DatasetIndexer:
+    """
+    Dedup index, incremental vocabulary counts and background indexing of
+    the datasets under one directory (one sub-directory per dataset).
+
+    Example:
+        indexer = DatasetIndexer(Path("user_datasets"), tokenizer_factory=lambda: TextTokenizer(42, False))
+        duplicate_of = await indexer.claim_async(sha256, dataset_id)   # None for new content
+        future = indexer.submit(dataset_id, file_path, report=lambda **update: print(update))
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        tokenizer_factory: Callable[[], Any],
+        ingest_factory: Optional[Callable[[Any, str, str], Any]] = None,
+        delete_vectors: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        Args:
+            root: Directory holding one sub-directory per dataset
+            tokenizer_factory: Returns a tokenizer with build(text) -> streams
+            ingest_factory: (tokenizer, checkpoint_path, dataset_id) -> BulkIngestPipeline
+                (rows namespaced and tagged by dataset_id), or None to skip
+                vector-store ingestion
+            delete_vectors: dataset_id -> number of vectors removed from the store
+        """
+        self.root = Path(root)
+        self.tokenizer_factory = tokenizer_factory
+        self.ingest_factory = ingest_factory
+        self.delete_vectors = delete_vectors
+        self._lock = threading.Lock()
+        self._combined_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+
+        # A fork while another thread holds a lock would leave it locked forever in the child
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._combined_lock = threading.Lock()
+        self._executor = None
+        self.pending = 0
+
+    # ------------------------------------------------------------------
+    # Content-hash dedup
+    # ------------------------------------------------------------------
+
+    def claim(self, content_hash: str, dataset_id: str) -> Optional[str]:
+        """
+        Record that dataset_id holds this content, unless a dataset that
+        still exists already does; then that dataset's id is returned and
+        nothing is recorded.
+        """
+        with self._lock:
+            path = self.root / CONTENT_INDEX_FILE
+            index = _read_json(path, {})
+            existing = index.get(content_hash)
+            if existing and existing != dataset_id and (self.root / existing).is_dir():
+                return existing
+            index[content_hash] = dataset_id
+            _write_json(path, index)
+            return None
+
+    async def claim_async(self, content_hash: str, dataset_id: str) -> Optional[str]:
+        """claim() in a thread (it reads and rewrites the dedup index file)."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.claim, content_hash, dataset_id)
+
+    def forget(self, dataset_id: str) -> None:
+        """
+        Drop a (deleted) dataset from the dedup index, subtract its vocabulary
+        counts and delete its vectors from the store.
+        """
+        if self.delete_vectors is not None:
+            try:
+                removed = self.delete_vectors(dataset_id)
+                logger.info(f"[INGEST] Deleted {removed} vectors of {dataset_id}")
+            except Exception as e:
+                logger.warning(f"[INGEST] Could not delete the vectors of {dataset_id}: {e}")
+        counts = _read_json(self.root / dataset_id / DATASET_COUNTS_FILE, None)
+        with self._lock:
+            path = self.root / CONTENT_INDEX_FILE
+            index = _read_json(path, {})
+            remaining = {h: d for h, d in index.items() if d != dataset_id}
+            if len(remaining) != len(index):
+                _write_json(path, remaining)
+
+            state = self._vocab_state()
+            if counts is not None and dataset_id in state["datasets"]:
+                totals = Counter(state["counts"])
+                totals.subtract(counts)
+                state["counts"] = {t: c for t, c in totals.items() if c > 0}
+                state["datasets"].remove(dataset_id)
+                _write_json(self.root / VOCAB_COUNTS_FILE, state)
+
+    # ------------------------------------------------------------------
+    # Vocabulary counts
+    # ------------------------------------------------------------------
+
+    def _vocab_state(self) -> Dict[str, Any]:
+        state = _read_json(self.root / VOCAB_COUNTS_FILE, {})
+        return {"datasets": list(state.get("datasets", [])), "counts": dict(state.get("counts", {}))}
+
+    def _merge_counts(self, dataset_id: str, counts: Counter) -> None:
+        """Add one dataset's counts to the totals (once per dataset id)."""
+        with self._lock:
+            state = self._vocab_state()
+            if dataset_id in state["datasets"]:
+                return
+            totals = Counter(state["counts"])
+            totals.update(counts)
+            state["counts"] = dict(totals)
+            state["datasets"].append(dataset_id)
+            _write_json(self.root / VOCAB_COUNTS_FILE, state)
+
+    def vocabulary_counts(self) -> Counter:
+        """Word-stream token counts over every indexed dataset."""
+        with self._lock:
+            return Counter(self._vocab_state()["counts"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._vocab_state()
+            hashes = len(_read_json(self.root / CONTENT_INDEX_FILE, {}))
+        return {
+            "datasets_indexed": len(state["datasets"]),
+            "unique_tokens": len(state["counts"]),
+            "total_tokens": sum(state["counts"].values()),
+            "content_hashes": hashes,
+            "pending_jobs": self.pending,
+            "vector_ingest": self.ingest_factory is not None,
+        }
+
+    # ------------------------------------------------------------------
+    # Background indexing
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        dataset_id: str,
+        file_path: Path,
+        report: Optional[Callable[..., None]] = None,
+    ) -> Future:
+        """
+        Queue a dataset for indexing. Jobs run one at a time, in order.
+
+        report(status=..., progress=..., error=..., result=...) is called as
+        the job starts, progresses and finishes.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="santok-dataset-index")
+            self.pending += 1
+        return self._executor.submit(self._run, dataset_id, Path(file_path), report or (lambda **_: None))
+
+    def _run(self, dataset_id: str, file_path: Path, report: Callable[..., None]) -> Dict[str, Any]:
+        try:
+            report(status="running", progress=0)
+            result = self.index_dataset(dataset_id, file_path, report)
+            report(status="completed", progress=100, result=result)
+            return result
+        except Exception as e:
+            logger.error(f"[INGEST] Indexing {dataset_id} failed: {e}", exc_info=True)
+            report(status="failed", progress=100, error=str(e))
+            raise
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def index_dataset(
+        self,
+        dataset_id: str,
+        file_path: Path,
+        report: Optional[Callable[..., None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Tokenize one dataset, merge its vocabulary counts, ingest its word
+        tokens into the vector store and append it to the combined file.
+        Only this dataset is read; earlier datasets are not touched.
+        """
+        started = time.perf_counter()
+        dataset_dir = self.root / dataset_id
+        total_bytes = max(1, file_path.stat().st_size)
+        counts: Counter = Counter()
+        tokenizer = _CountingTokenizer(self.tokenizer_factory(), counts)
+        last_report = [0.0]
+
+        def texts() -> Iterator[str]:
+            for text, position in iter_text_chunks(file_path):
+                now = time.monotonic()
+                if report is not None and now - last_report[0] >= PROGRESS_INTERVAL:
+                    last_report[0] = now
+                    report(progress=min(95, int(90 * position / total_bytes)))
+                yield text
+
+        ingest = None
+        if self.ingest_factory is not None:
+            ingest = self.ingest_factory(tokenizer, str(dataset_dir / DATASET_CHECKPOINT_FILE), dataset_id)
+        if ingest is not None:
+            vector_stats = ingest.ingest_texts(texts())
+        else:
+            vector_stats = None
+            for text in texts():
+                tokenizer.build(text)
+
+        _write_json(dataset_dir / DATASET_COUNTS_FILE, counts)
+        self._merge_counts(dataset_id, counts)
+        self._append_combined(dataset_id, file_path)
+
+        return {
+            "dataset_id": dataset_id,
+            "tokens": sum(counts.values()),
+            "unique_tokens": len(counts),
+            "vectors_added": vector_stats["rows"] if vector_stats else 0,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def _append_combined(self, dataset_id: str, file_path: Path) -> None:
+        """Append the dataset to the combined training file (streamed, once per dataset)."""
+        marker = self.root / dataset_id / ".combined"
+        if marker.exists():
+            return
+        name = _read_json(self.root / dataset_id / "metadata.json", {}).get("original_filename", file_path.name)
+        with self._combined_lock:
+            with open(self.root / COMBINED_FILE, "ab") as out, open(file_path, "rb") as src:
+                header = f"\n\n=== Dataset: {name} (ID: {dataset_id}) ===\n"
+                out.write(header.encode("utf-8"))
+                shutil.copyfileobj(src, out, UPLOAD_CHUNK_BYTES)
+            marker.touch()
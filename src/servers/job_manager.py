@@ -1,17 +1,34 @@
 """
 Job Manager for Asynchronous Code Execution
 Allows code to continue running even if the browser tab is closed
+
+- Job state lives in memory; every change is appended as a compact event
+  to one JSON-lines log (jobs/events.jsonl) by a writer thread that fsyncs
+  in batches, and the log is replayed (and compacted) on startup
+- One output pump thread reads stdout/stderr of all running jobs through
+  non-blocking pipes (selectors) and enforces timeouts, instead of a
+  polling thread per job
+- Subscribers (e.g. websockets) are pushed status/progress/output events
+- At most max_workers jobs run at once; queued jobs start by priority,
+  then in submission order
 """
 
+import codecs
+import heapq
+import itertools
 import json
+import os
+import queue
+import selectors
 import sys
 import subprocess
 import threading
 import time
 import uuid
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +40,13 @@ PROGRESS_COMPLETE = 100
 PROGRESS_UPDATE_INTERVAL = 5  # seconds
 STDOUT_MAX_LINES = 100  # Maximum lines to keep in stdout
 
+EVENT_LOG_NAME = "events.jsonl"
+FSYNC_INTERVAL = 1.0  # seconds between fsyncs of the event log (terminal events fsync at once)
+COMPACT_AFTER_EVENTS = 50000  # rewrite the log as one snapshot per job past this many events
+KILL_GRACE_SECONDS = 5  # terminate -> kill escalation
+EXITED_PIPE_GRACE = 2.0  # close pipes still held open (by grandchildren) this long after exit
+READ_CHUNK = 65536
+
 class JobStatus:
     PENDING = "pending"
     RUNNING = "running"
@@ -30,26 +54,225 @@ class JobStatus:
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+class JobPriority:
+    """Lower runs first"""
+    HIGH = 0     # interactive code execution
+    NORMAL = 10
+    LOW = 20     # long training / vocabulary builds
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _EventLog:
+    """Append-only JSON-lines job event log with a writer thread and batched fsync"""
+
+    def __init__(self, path: Path, fsync_interval: float = FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.events_written = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+
+    def replay(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild job states from the log (a torn last line is ignored)"""
+        jobs: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return jobs
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                job_id = event.get("job")
+                if "new" in event:
+                    jobs[job_id] = event["new"]
+                elif "set" in event and job_id in jobs:
+                    jobs[job_id].update(event["set"])
+                elif event.get("drop"):
+                    jobs.pop(job_id, None)
+        return jobs
+
+    def rewrite(self, jobs: Dict[str, Dict[str, Any]]):
+        """Replace the log with one snapshot event per job (writer thread must not be running)"""
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for job_id, job in jobs.items():
+                f.write(json.dumps({"job": job_id, "new": job}, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.events_written = len(jobs)
+
+    def start(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._write_loop, name="santok-job-log", daemon=True)
+        self._thread.start()
+
+    def append(self, event: Dict[str, Any], durable: bool = False):
+        """Queue an event; durable=True fsyncs its batch right away"""
+        self._queue.put((json.dumps(event, separators=(',', ':')), durable))
+
+    def compact(self, snapshot: Callable[[], Dict[str, Dict[str, Any]]]):
+        """Rewrite the log from snapshot() inside the writer thread (ordered after queued events)"""
+        self._queue.put((snapshot, True))
+
+    def _write_loop(self):
+        last_sync = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                item = None
+            batch = [item] if item is not None else []
+            # Drain whatever else is queued: one write + at most one fsync per batch
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            durable = False
+            try:
+                for line, is_durable in batch:
+                    if callable(line):
+                        self._file.flush()
+                        self._file.close()
+                        self.rewrite(line())
+                        self._file = open(self.path, 'a', encoding='utf-8')
+                        dirty = False
+                        continue
+                    self._file.write(line + "\n")
+                    self.events_written += 1
+                    dirty = True
+                    durable = durable or is_durable
+                if dirty:
+                    self._file.flush()
+                    if durable or time.monotonic() - last_sync >= self.fsync_interval:
+                        os.fsync(self._file.fileno())
+                        last_sync = time.monotonic()
+                        dirty = False
+            except Exception as e:
+                logger.error(f"Job event log write failed: {e}")
+
+
+class _Run:
+    """Live state of a job whose process is running"""
+
+    def __init__(self, job_id: str, process: subprocess.Popen, timeout: int):
+        self.job_id = job_id
+        self.process = process
+        self.started = time.time()
+        self.deadline = self.started + timeout
+        self.timeout = timeout
+        self.stdout: deque = deque(maxlen=STDOUT_MAX_LINES)
+        self.stderr: deque = deque(maxlen=STDOUT_MAX_LINES)
+        self.partial = {"stdout": "", "stderr": ""}
+        self.decoders = {
+            "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+        self.open_streams = {"stdout": process.stdout, "stderr": process.stderr}
+        self.line_count = 0
+        self.progress = PROGRESS_START
+        self.last_persist = self.started
+        self.exited_at: Optional[float] = None
+        self.terminated_at: Optional[float] = None
+        self.timed_out = False
+        self.pipes_closed = False
+
+    def tail(self, stream: str) -> str:
+        lines = self.stdout if stream == "stdout" else self.stderr
+        return "".join(lines) + self.partial[stream]
+
+
 class JobManager:
     """Manages background job execution with persistent storage"""
-    
-    def __init__(self, jobs_dir: str = "jobs"):
+
+    def __init__(self, jobs_dir: str = "jobs", max_workers: int = 4):
         self.jobs_dir = Path(jobs_dir)
         self.jobs_dir.mkdir(exist_ok=True)
+        self.max_workers = max(1, max_workers)
+        self.lock = threading.RLock()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
         self.active_processes: Dict[str, subprocess.Popen] = {}
-        self.lock = threading.Lock()
-        # Cleanup old jobs on initialization
-        self.cleanup_old_jobs()
-    
+        self._runs: Dict[str, _Run] = {}
+        self._queue: List = []  # heap of (priority, seq, job_id, script_path, work_dir, timeout)
+        self._seq = itertools.count()
+        self._subscribers: Dict[Optional[str], Dict[int, Callable[[Dict[str, Any]], None]]] = {}
+        self._tokens = itertools.count(1)
+        self._token_keys: Dict[int, Optional[str]] = {}
+
+        self._selector = selectors.DefaultSelector() if os.name != "nt" else None
+        self._wake_r, self._wake_w = os.pipe()
+        if self._selector is not None:
+            os.set_blocking(self._wake_r, False)
+            self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._pump_thread: Optional[threading.Thread] = None
+
+        self._log = _EventLog(self.jobs_dir / EVENT_LOG_NAME)
+        self.jobs = self._log.replay()
+        legacy_files = self._import_legacy_files()
+        self._recover_interrupted()
+        # Cleanup old jobs on initialization (and start from a compact log)
+        self.cleanup_old_jobs(persist=False)
+        self._log.rewrite(self.jobs)
+        for job_file in legacy_files:
+            job_file.unlink(missing_ok=True)
+        self._log.start()
+
+    # ------------------------------------------------------------------
+    # Startup
+    # ------------------------------------------------------------------
+
+    def _import_legacy_files(self) -> List[Path]:
+        """Load jobs stored by the old one-JSON-file-per-job format"""
+        files = []
+        for job_file in self.jobs_dir.glob("*.json"):
+            try:
+                with open(job_file, 'r', encoding='utf-8') as f:
+                    job_info = json.load(f)
+                job_id = job_info.get("job_id")
+                if job_id and job_id not in self.jobs:
+                    self.jobs[job_id] = job_info
+                files.append(job_file)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping unreadable legacy job file {job_file}: {e}")
+        return files
+
+    def _recover_interrupted(self):
+        """
+        Jobs that were pending/running when the server stopped cannot be resumed.
+        No process survives a restart either, so every started job gets an
+        exit code (watchers wait for it before they consider a job finished).
+        """
+        for job in self.jobs.values():
+            if job.get("status") in (JobStatus.PENDING, JobStatus.RUNNING):
+                job.update({
+                    "status": JobStatus.FAILED,
+                    "completed_at": job.get("completed_at") or _now_iso(),
+                    "error": job.get("error") or "Server restarted before the job finished",
+                    "progress": PROGRESS_COMPLETE
+                })
+            if job.get("started_at") and job.get("exit_code") is None:
+                job["exit_code"] = 0 if job.get("status") == JobStatus.COMPLETED else -1
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
     def create_job(self, job_data: Dict[str, Any]) -> str:
         """Create a new job and return job ID"""
         job_id = str(uuid.uuid4())
-        # Sanitize job_id to prevent path injection
-        job_id_safe = job_id.replace('/', '_').replace('\\', '_').replace('..', '_')
         job_info = {
             "job_id": job_id,
             "status": JobStatus.PENDING,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": _now_iso(),
             "started_at": None,
             "completed_at": None,
             "progress": 0,
@@ -60,309 +283,402 @@ class JobManager:
             "error": None,
             "data": job_data  # Store the original request data
         }
-        
-        job_file = self.jobs_dir / f"{job_id_safe}.json"
-        with open(job_file, 'w', encoding='utf-8') as f:
-            json.dump(job_info, f, indent=2)
-        
+        with self.lock:
+            self.jobs[job_id] = job_info
+            self._log.append({"job": job_id, "new": job_info})
+
         logger.info(f"Created job {job_id}")
         return job_id
-    
+
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """Get job information"""
-        # Sanitize job_id to prevent path injection
-        job_id_safe = job_id.replace('/', '_').replace('\\', '_').replace('..', '_')
-        job_file = self.jobs_dir / f"{job_id_safe}.json"
-        if not job_file.exists():
-            return None
-        
-        try:
-            with open(job_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to decode JSON for job {job_id}: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error reading job file {job_id}: {e}")
-            return None
-    
+        """Get job information (a copy; output of a running job is current)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+            run = self._runs.get(job_id)
+            if run is not None:
+                job["stdout"] = run.tail("stdout")
+                job["stderr"] = run.tail("stderr")
+                job["progress"] = run.progress
+            return job
+
+    def list_jobs(self, predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Jobs (copies) matching predicate, newest first"""
+        with self.lock:
+            job_ids = list(self.jobs)
+        jobs = [job for job in (self.get_job(job_id) for job_id in job_ids) if job is not None]
+        if predicate is not None:
+            jobs = [job for job in jobs if predicate(job)]
+        jobs.sort(key=lambda job: job.get("created_at") or "", reverse=True)
+        return jobs
+
     def update_job(self, job_id: str, updates: Dict[str, Any]):
-        """Update job information with thread-safe file locking"""
-        # Sanitize job_id to prevent path injection
-        job_id_safe = job_id.replace('/', '_').replace('\\', '_').replace('..', '_')
-        job_file = self.jobs_dir / f"{job_id_safe}.json"
-        if not job_file.exists():
+        """Update job information, persist the change and notify subscribers"""
+        if not updates:
             return
-        
-        # Use lock to prevent race conditions during read-modify-write
         with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.update(updates)
+            # Appended under the lock so the log has the same order as the state changes
+            self._log.append(
+                {"job": job_id, "at": round(time.time(), 3), "set": updates},
+                durable=updates.get("status") in TERMINAL_STATUSES
+            )
+        self._publish(job_id, {"type": "update", "job_id": job_id, "updates": updates})
+        if self._log.events_written > COMPACT_AFTER_EVENTS and self._log.events_written > 4 * len(self.jobs):
+            self._log.events_written = 0
+            self._log.compact(self._snapshot)
+
+    def _snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return {job_id: dict(job) for job_id, job in self.jobs.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            by_status: Dict[str, int] = {}
+            for job in self.jobs.values():
+                by_status[job.get("status")] = by_status.get(job.get("status"), 0) + 1
+            return {
+                "jobs": len(self.jobs),
+                "by_status": by_status,
+                "running": len(self._runs),
+                "queued": len(self._queue),
+                "max_workers": self.max_workers,
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+            }
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, job_id: Optional[str], callback: Callable[[Dict[str, Any]], None]) -> int:
+        """
+        Call callback(event) for every change of job_id (None = all jobs).
+        Events: {"type": "update", "job_id", "updates"} and
+        {"type": "output", "job_id", "stream", "data"}. Callbacks run on
+        manager threads and must not block. Returns a token for unsubscribe().
+        """
+        with self.lock:
+            token = next(self._tokens)
+            self._subscribers.setdefault(job_id, {})[token] = callback
+            self._token_keys[token] = job_id
+            return token
+
+    def unsubscribe(self, token: int):
+        with self.lock:
+            job_id = self._token_keys.pop(token, None)
+            callbacks = self._subscribers.get(job_id)
+            if callbacks is not None:
+                callbacks.pop(token, None)
+                if not callbacks:
+                    del self._subscribers[job_id]
+
+    def _publish(self, job_id: str, event: Dict[str, Any]):
+        with self.lock:
+            callbacks = list(self._subscribers.get(job_id, {}).values()) + list(self._subscribers.get(None, {}).values())
+        for callback in callbacks:
             try:
-                # Read existing job info
-                with open(job_file, 'r', encoding='utf-8') as f:
-                    job_info = json.load(f)
-                
-                # Merge updates
-                job_info.update(updates)
-                
-                # Atomically write back (create temp file first, then rename)
-                temp_file = job_file.with_suffix('.tmp')
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(job_info, f, indent=2)
-                
-                # Atomic rename (cross-platform)
-                temp_file.replace(job_file)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to decode JSON for job {job_id} during update: {e}")
+                callback(event)
             except Exception as e:
-                logger.error(f"Error updating job file {job_id}: {e}")
-    
-    def start_job(self, job_id: str, script_path: str, work_dir: str, timeout: int = 86400):
-        """Start executing a job in background thread"""
+                logger.warning(f"Job subscriber failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def start_job(self, job_id: str, script_path: str, work_dir: str, timeout: int = 86400,
+                  priority: int = JobPriority.NORMAL):
+        """Queue a job; it starts as soon as one of max_workers slots is free"""
         # Validate timeout parameter
         if timeout <= 0:
             logger.error(f"Invalid timeout for job {job_id}: {timeout}. Using default 86400.")
             timeout = 86400
-        
-        def run_job():
-            start_time = None
-            process = None
-            try:
-                self.update_job(job_id, {
-                    "status": JobStatus.RUNNING,
-                    "started_at": datetime.now(timezone.utc).isoformat(),
-                    "progress": PROGRESS_START
-                })
-                
-                start_time = time.time()
-                
-                # Start subprocess
-                process = subprocess.Popen(
-                    [sys.executable, "-u", script_path],
-                    cwd=work_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    bufsize=1
-                )
-                
-                # Store process reference
-                with self.lock:
-                    self.active_processes[job_id] = process
-                
-                # Read output in real-time
-                stdout_lines = []
-                stderr_lines = []
-                max_lines = STDOUT_MAX_LINES * 2  # Keep more in memory, but update with last N
-                
-                # Update progress periodically
-                last_update = time.time()
-                
-                while True:
-                    current_time = time.time()
-                    elapsed = current_time - start_time
-                    
-                    # Check timeout - enforce it properly
-                    if elapsed > timeout:
-                        logger.warning(f"Job {job_id} exceeded timeout of {timeout}s, killing process")
-                        with self.lock:
-                            if job_id in self.active_processes and process:
-                                try:
-                                    process.terminate()
-                                    try:
-                                        process.wait(timeout=5)
-                                    except subprocess.TimeoutExpired:
-                                        process.kill()
-                                except Exception as e:
-                                    logger.error(f"Error killing process for job {job_id}: {e}")
-                                finally:
-                                    self.active_processes.pop(job_id, None)
-                        
-                        self.update_job(job_id, {
-                            "status": JobStatus.FAILED,
-                            "completed_at": datetime.now(timezone.utc).isoformat(),
-                            "error": f"Execution timed out after {timeout} seconds",
-                            "exit_code": -1,
-                            "execution_time": elapsed,
-                            "progress": PROGRESS_COMPLETE,
-                            "stdout": "".join(stdout_lines[-STDOUT_MAX_LINES:]),
-                            "stderr": "".join(stderr_lines[-STDOUT_MAX_LINES:])
-                        })
-                        logger.warning(f"Job {job_id} timed out after {elapsed:.2f}s")
-                        return
-                    
-                    # Check if process finished
-                    return_code = process.poll()
-                    if return_code is not None:
-                        # Process finished - read any remaining output
-                        # Don't use communicate() here - already reading line by line
-                        # Just read any remaining buffered lines
+        with self.lock:
+            heapq.heappush(self._queue, (priority, next(self._seq), job_id, script_path, work_dir, timeout))
+        logger.info(f"Queued job {job_id} (priority {priority})")
+        self._dispatch()
+
+    def _dispatch(self):
+        """Start queued jobs while worker slots are free"""
+        while True:
+            with self.lock:
+                if len(self._runs) >= self.max_workers or not self._queue:
+                    return
+                _, _, job_id, script_path, work_dir, timeout = heapq.heappop(self._queue)
+                job = self.jobs.get(job_id)
+                if job is None or job.get("status") != JobStatus.PENDING:
+                    continue  # cancelled while queued
+                try:
+                    self._launch(job_id, script_path, work_dir, timeout)
+                    continue
+                except Exception as e:
+                    error = e
+            logger.error(f"Job {job_id} failed to start: {error}")
+            self.update_job(job_id, {
+                "status": JobStatus.FAILED,
+                "completed_at": _now_iso(),
+                "error": str(error),
+                "exit_code": -1,
+                "execution_time": 0,
+                "progress": PROGRESS_COMPLETE
+            })
+
+    def _launch(self, job_id: str, script_path: str, work_dir: str, timeout: int):
+        """Start the process and hand its pipes to the pump (lock held)"""
+        process = subprocess.Popen(
+            [sys.executable, "-u", script_path],
+            cwd=work_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+        run = _Run(job_id, process, timeout)
+        self._runs[job_id] = run
+        self.active_processes[job_id] = process
+        for stream, pipe in run.open_streams.items():
+            if self._selector is not None:
+                os.set_blocking(pipe.fileno(), False)
+                self._selector.register(pipe, selectors.EVENT_READ, (run, stream))
+            else:
+                threading.Thread(target=self._read_blocking, args=(run, stream, pipe), daemon=True).start()
+        self._ensure_pump()
+        self._wake()
+        # Still under the lock, so this is recorded before anything the pump reports
+        self.update_job(job_id, {
+            "status": JobStatus.RUNNING,
+            "started_at": _now_iso(),
+            "progress": PROGRESS_START
+        })
+        logger.info(f"Started job {job_id} (pid {process.pid})")
+
+    def _ensure_pump(self):
+        if self._pump_thread is None or not self._pump_thread.is_alive():
+            self._pump_thread = threading.Thread(target=self._pump, name="santok-job-pump", daemon=True)
+            self._pump_thread.start()
+
+    def _wake(self):
+        if self._selector is None:
+            return
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Output pump
+    # ------------------------------------------------------------------
+
+    def _pump(self):
+        """Read output of all running jobs and enforce timeouts (one thread)"""
+        while True:
+            if self._selector is not None:
+                try:
+                    ready = self._selector.select(timeout=0.5)
+                except OSError:
+                    ready = []
+                for key, _ in ready:
+                    if key.data is None:
                         try:
-                            if process.stdout:
-                                remaining = process.stdout.read()
-                                if remaining:
-                                    stdout_lines.extend(remaining.splitlines(keepends=True))
-                            if process.stderr:
-                                remaining = process.stderr.read()
-                                if remaining:
-                                    stderr_lines.extend(remaining.splitlines(keepends=True))
-                        except ValueError:
-                            # Pipe is closed, which is fine - process is done
+                            while os.read(self._wake_r, 4096):
+                                pass
+                        except BlockingIOError:
                             pass
-                        break
-                    
-                    # Read available output (non-blocking with timeout check)
+                        continue
+                    run, stream = key.data
                     try:
-                        if process.stdout and process.returncode is None:
-                            line = process.stdout.readline()
-                            if line:
-                                stdout_lines.append(line)
-                                # Limit memory usage - keep last N lines
-                                if len(stdout_lines) > max_lines:
-                                    stdout_lines = stdout_lines[-max_lines:]
-                                
-                                # Update job with output every few lines
-                                if len(stdout_lines) % 10 == 0:
-                                    progress = min(PROGRESS_MAX, PROGRESS_START + (len(stdout_lines) // 10))
-                                    self.update_job(job_id, {
-                                        "stdout": "".join(stdout_lines[-STDOUT_MAX_LINES:]),
-                                        "progress": progress
-                                    })
-                    except ValueError:
-                        # Pipe closed, process might be finishing
-                        pass
-                    
-                    try:
-                        if process.stderr and process.returncode is None:
-                            line = process.stderr.readline()
-                            if line:
-                                stderr_lines.append(line)
-                                # Limit memory usage
-                                if len(stderr_lines) > max_lines:
-                                    stderr_lines = stderr_lines[-max_lines:]
-                    except ValueError:
-                        # Pipe closed, process might be finishing
-                        pass
-                    
-                    # Periodic progress update based on elapsed time
-                    if current_time - last_update >= PROGRESS_UPDATE_INTERVAL:
-                        if timeout > 0:
-                            progress = min(PROGRESS_MAX, PROGRESS_START + int((elapsed / timeout) * (PROGRESS_MAX - PROGRESS_START)))
-                        else:
-                            progress = PROGRESS_MAX
-                        
-                        self.update_job(job_id, {
-                            "progress": progress,
-                            "stdout": "".join(stdout_lines[-STDOUT_MAX_LINES:])
-                        })
-                        last_update = current_time
-                    
-                    time.sleep(0.1)  # Small delay to prevent CPU spinning
-                
-                # Process finished - get final output
-                stdout = "".join(stdout_lines[-STDOUT_MAX_LINES:])
-                stderr = "".join(stderr_lines[-STDOUT_MAX_LINES:])
-                execution_time = time.time() - start_time
-                
-                # Remove process reference safely
-                with self.lock:
-                    self.active_processes.pop(job_id, None)
-                
-                # Update job with final results
-                status = JobStatus.COMPLETED if return_code == 0 else JobStatus.FAILED
-                self.update_job(job_id, {
-                    "status": status,
-                    "completed_at": datetime.now(timezone.utc).isoformat(),
-                    "stdout": stdout,
-                    "stderr": stderr,
-                    "exit_code": return_code,
-                    "execution_time": execution_time,
-                    "progress": PROGRESS_COMPLETE
-                })
-                
-                logger.info(f"Job {job_id} completed with exit code {return_code}")
-                
-            except Exception as e:
-                # Remove process reference safely
-                with self.lock:
-                    self.active_processes.pop(job_id, None)
-                
-                # Clean up process if still running
-                if process and process.poll() is None:
+                        data = os.read(key.fd, READ_CHUNK)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        data = b""
+                    if data:
+                        self._on_output(run, stream, data)
+                    else:
+                        self._close_stream(run, stream)
+            else:
+                time.sleep(0.5)
+            self._check_runs()
+
+    def _read_blocking(self, run: _Run, stream: str, pipe):
+        """Reader thread per pipe where selectors cannot watch pipes (Windows)"""
+        try:
+            while True:
+                data = pipe.read1(READ_CHUNK) if hasattr(pipe, "read1") else pipe.read(READ_CHUNK)
+                if not data:
+                    break
+                self._on_output(run, stream, data)
+        except (OSError, ValueError):
+            pass
+        self._close_stream(run, stream)
+
+    def _on_output(self, run: _Run, stream: str, data: bytes):
+        text = run.decoders[stream].decode(data)
+        with self.lock:
+            lines = (run.partial[stream] + text).split("\n")
+            run.partial[stream] = lines.pop()
+            target = run.stdout if stream == "stdout" else run.stderr
+            target.extend(line + "\n" for line in lines)
+            if stream == "stdout":
+                run.line_count += len(lines)
+                run.progress = max(run.progress, min(PROGRESS_MAX, PROGRESS_START + run.line_count // 10))
+        self._publish(run.job_id, {"type": "output", "job_id": run.job_id, "stream": stream, "data": text})
+
+    def _close_stream(self, run: _Run, stream: str):
+        with self.lock:
+            pipe = run.open_streams.pop(stream, None)
+            if pipe is None:
+                return
+            if self._selector is not None:
+                try:
+                    self._selector.unregister(pipe)
+                except (KeyError, ValueError):
+                    pass
+            try:
+                pipe.close()
+            except OSError:
+                pass
+            done = not run.open_streams
+        if done:
+            if run.process.poll() is not None:
+                self._finish(run)
+            else:
+                run.pipes_closed = True  # _check_runs finishes it once the process exits
+
+    def _check_runs(self):
+        """Timeouts, kill escalation, exited processes with pipes held open, periodic progress"""
+        now = time.time()
+        with self.lock:
+            runs = list(self._runs.values())
+        for run in runs:
+            process = run.process
+            if run.pipes_closed and process.poll() is not None:
+                self._finish(run)
+                continue
+            if process.poll() is None:
+                if now > run.deadline and not run.timed_out:
+                    logger.warning(f"Job {run.job_id} exceeded timeout of {run.timeout}s, killing process")
+                    run.timed_out = True
+                    self._terminate(run)
+                elif run.terminated_at and now - run.terminated_at > KILL_GRACE_SECONDS:
                     try:
-                        process.terminate()
-                        try:
-                            process.wait(timeout=5)
-                        except subprocess.TimeoutExpired:
-                            process.kill()
-                    except Exception:
+                        process.kill()
+                    except OSError:
                         pass
-                
-                self.update_job(job_id, {
-                    "status": JobStatus.FAILED,
-                    "completed_at": datetime.now(timezone.utc).isoformat(),
-                    "error": str(e),
-                    "exit_code": -1,
-                    "execution_time": time.time() - start_time if start_time else 0,
-                    "progress": PROGRESS_COMPLETE
-                })
-                logger.error(f"Job {job_id} failed: {e}", exc_info=True)
-        
-        # Start job in background thread
-        thread = threading.Thread(target=run_job, daemon=True)
-        thread.start()
-        logger.info(f"Started execution thread for job {job_id}")
-    
+            elif run.exited_at is None:
+                run.exited_at = now
+            elif now - run.exited_at > EXITED_PIPE_GRACE:
+                for stream in list(run.open_streams):
+                    self._close_stream(run, stream)
+
+            if now - run.last_persist >= PROGRESS_UPDATE_INTERVAL and run.job_id in self._runs:
+                run.last_persist = now
+                elapsed = now - run.started
+                run.progress = max(run.progress, min(PROGRESS_MAX, PROGRESS_START + int((elapsed / run.timeout) * (PROGRESS_MAX - PROGRESS_START))))
+                self.update_job(run.job_id, {"progress": run.progress, "stdout": run.tail("stdout")})
+
+    def _terminate(self, run: _Run):
+        run.terminated_at = time.time()
+        try:
+            run.process.terminate()
+        except OSError as e:
+            logger.error(f"Error terminating process for job {run.job_id}: {e}")
+
+    def _finish(self, run: _Run):
+        """Both pipes are closed: reap the process and record the result"""
+        try:
+            return_code = run.process.wait(timeout=KILL_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            run.process.kill()
+            return_code = run.process.wait()
+        execution_time = time.time() - run.started
+        with self.lock:
+            self._runs.pop(run.job_id, None)
+            self.active_processes.pop(run.job_id, None)
+            for stream in ("stdout", "stderr"):
+                tail = run.decoders[stream].decode(b"", final=True)
+                if tail:
+                    run.partial[stream] += tail
+            cancelled = self.jobs.get(run.job_id, {}).get("status") == JobStatus.CANCELLED
+
+        updates = {
+            "stdout": run.tail("stdout"),
+            "stderr": run.tail("stderr"),
+            "exit_code": return_code if not run.timed_out else -1,
+            "execution_time": execution_time,
+            "progress": PROGRESS_COMPLETE
+        }
+        if run.timed_out:
+            updates.update(status=JobStatus.FAILED, completed_at=_now_iso(),
+                           error=f"Execution timed out after {run.timeout} seconds")
+            logger.warning(f"Job {run.job_id} timed out after {execution_time:.2f}s")
+        elif not cancelled:
+            updates.update(status=JobStatus.COMPLETED if return_code == 0 else JobStatus.FAILED,
+                           completed_at=_now_iso())
+            logger.info(f"Job {run.job_id} completed with exit code {return_code}")
+        self.update_job(run.job_id, updates)
+        self._dispatch()
+
+    # ------------------------------------------------------------------
+    # Cancellation / cleanup
+    # ------------------------------------------------------------------
+
     def cancel_job(self, job_id: str) -> bool:
-        """Cancel a running job"""
+        """Cancel a queued or running job"""
         with self.lock:
-            process = self.active_processes.pop(job_id, None)
-            if process is None:
+            job = self.jobs.get(job_id)
+            if job is None or job.get("status") not in (JobStatus.PENDING, JobStatus.RUNNING):
                 return False
-            
-            try:
-                process.terminate()
-                try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    process.wait(timeout=5)  # Wait for kill to complete
-            except Exception as e:
-                logger.error(f"Error cancelling process for job {job_id}: {e}")
-            
-            self.update_job(job_id, {
-                "status": JobStatus.CANCELLED,
-                "completed_at": datetime.now(timezone.utc).isoformat()
-            })
-            logger.info(f"Job {job_id} cancelled")
-            return True
-    
-    def cleanup_old_jobs(self, max_age_hours: int = 24):
-        """Clean up old job files"""
-        try:
-            cutoff_time = time.time() - (max_age_hours * 3600)
-            for job_file in self.jobs_dir.glob("*.json"):
-                # Skip temp files
-                if job_file.suffix == '.tmp':
+            run = self._runs.get(job_id)
+            queued = any(item[2] == job_id for item in self._queue)
+            if run is None and not queued:
+                return False  # created but never started (e.g. in-process jobs)
+            if run is not None:
+                self._terminate(run)
+        # The pump records output and exit code when the process is gone
+        self.update_job(job_id, {
+            "status": JobStatus.CANCELLED,
+            "completed_at": _now_iso()
+        })
+        logger.info(f"Job {job_id} cancelled")
+        return True
+
+    def cleanup_old_jobs(self, max_age_hours: int = 24, persist: bool = True):
+        """Forget finished jobs older than max_age_hours"""
+        cutoff = datetime.now(timezone.utc).timestamp() - (max_age_hours * 3600)
+        with self.lock:
+            old = []
+            for job_id, job in self.jobs.items():
+                if job.get("status") not in TERMINAL_STATUSES:
                     continue
                 try:
-                    if job_file.stat().st_mtime < cutoff_time:
-                        job_file.unlink()
-                        logger.info(f"Cleaned up old job file: {job_file}")
-                except FileNotFoundError:
-                    # File was already deleted, skip
-                    pass
-                except Exception as e:
-                    logger.warning(f"Failed to clean up {job_file}: {e}")
-        except Exception as e:
-            logger.warning(f"Error during job cleanup: {e}")
+                    created = datetime.fromisoformat(job.get("created_at") or "").timestamp()
+                except ValueError:
+                    created = 0
+                if created < cutoff:
+                    old.append(job_id)
+            for job_id in old:
+                del self.jobs[job_id]
+            if persist:
+                for job_id in old:
+                    self._log.append({"job": job_id, "drop": True})
+        if old:
+            logger.info(f"Cleaned up {len(old)} old jobs")
+        return len(old)
 
 
 # Global job manager instance
 _job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
 
 def get_job_manager() -> JobManager:
     """Get or create global job manager instance"""
     global _job_manager
     if _job_manager is None:
-        _job_manager = JobManager()
-    return _job_manager
\ No newline at end of file
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = JobManager(max_workers=int(os.getenv("SANTOK_JOB_WORKERS", "4")))
+    return _job_manager
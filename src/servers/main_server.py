@@ -6,37 +6,64 @@ Connects the frontend to the Python tokenization engine
 from fastapi import FastAPI, HTTPException, Depends, Header, Security, Request, WebSocket, WebSocketDisconnect, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import sys
 import os
 import time
 import json
-import numpy as np
 import subprocess
 import tempfile
 from pathlib import Path
 import hashlib
 import secrets
-import jwt
 import logging
 from datetime import datetime, timedelta, timezone
 import threading
 import queue
 import asyncio
 import shutil
+import functools
+from concurrent.futures.process import BrokenProcessPool
 
 # Import job manager for async execution
 try:
-    from servers.job_manager import get_job_manager, JobStatus
+    from servers.job_manager import get_job_manager, JobStatus, JobPriority, TERMINAL_STATUSES
 except ImportError:
     try:
-        from src.servers.job_manager import get_job_manager, JobStatus
+        from src.servers.job_manager import get_job_manager, JobStatus, JobPriority, TERMINAL_STATUSES
     except ImportError:
         # Fallback if job_manager not found
         get_job_manager = None
         JobStatus = None
+        JobPriority = None
+        TERMINAL_STATUSES = frozenset()
+
+# Import compute executor for CPU-bound handlers
+try:
+    from servers.compute_executor import ComputeExecutor, ComputeBusyError, ComputeTimeoutError, ComputeTaskError
+except ImportError:
+    from src.servers.compute_executor import ComputeExecutor, ComputeBusyError, ComputeTimeoutError, ComputeTaskError
+
+# Import response cache for deterministic endpoints
+try:
+    from servers.response_cache import ResponseCache
+except ImportError:
+    from src.servers.response_cache import ResponseCache
+
+# Import model registry for warm embedding generators / vector stores
+try:
+    from servers.model_registry import ModelRegistry
+except ImportError:
+    from src.servers.model_registry import ModelRegistry
+
+# Import dataset ingest for streamed uploads and incremental indexing
+try:
+    from servers.dataset_ingest import DatasetIndexer, UploadTooLargeError, iter_upload, stream_to_file
+except ImportError:
+    from src.servers.dataset_ingest import DatasetIndexer, UploadTooLargeError, iter_upload, stream_to_file
 
 # Add src directory to path to import backend files
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
@@ -56,13 +83,14 @@ try:
     from core.core_tokenizer import (
         _content_id,
         TextTokenizer,
-        all_tokenizations,  # Import directly - will restore after base_tokenizer import
+        all_tokenizations,
         assign_uids,
         neighbor_uids,
         compose_backend_number,
         combined_digit,
         TokenStream,
-        TokenRecord
+        TokenRecord,
+        iter_text_chunks
     )
     print("[OK] Successfully imported engine module with REAL SanTOK engine")
 except ImportError as e:
@@ -70,29 +98,29 @@ except ImportError as e:
     sys.exit(1)
 
 try:
-    # Try different import paths for base_tokenizer
-    try:
-        import core.base_tokenizer as TK
-        from core.base_tokenizer import *  # type: ignore[reportMissingImports] # noqa: F401,F403
-        # TODO: Replace wildcard import with explicit imports
-    except ImportError:
-        import src.core.base_tokenizer as TK
-        from src.core.base_tokenizer import *  # type: ignore[reportMissingImports] # noqa: F401,F403
-        # TODO: Replace wildcard import with explicit imports
-    # CRITICAL: Restore all_tokenizations from core_tokenizer (base_tokenizer version is incomplete - only 6 tokenizers)
-    from core.core_tokenizer import all_tokenizations
-    print("[OK] Successfully imported base_tokenizer.py")
-except ImportError as e:
-    print(f"[WARNING] Could not import base_tokenizer.py: {e}")
+    from utils.lazy_import import lazy_import, module_available
+    from utils import metrics
+except ImportError:
+    from src.utils.lazy_import import lazy_import, module_available
+    from src.utils import metrics
+
+# numpy (~100 ms), PyJWT and the binary response encoders (numpy, and pyarrow
+# when installed) are only needed by some endpoints - load them on first use
+np = lazy_import("numpy")
+jwt = lazy_import("jwt")
+wire_format = lazy_import("servers.wire_format", "src.servers.wire_format")
+
+# base_tokenizer is kept for reference only (its all_tokenizations covers just 6
+# tokenizers); core_tokenizer is the engine - load it on first use of TK
+TK = lazy_import("core.base_tokenizer", "src.core.base_tokenizer")
 
 try:
     # Try different import paths for compression_algorithms
+    # (its compose_backend_number is the one the engine endpoints use)
     try:
-        from compression.compression_algorithms import *  # type: ignore[reportMissingImports] # noqa: F401,F403
-        # TODO: Replace wildcard import with explicit imports
+        from compression.compression_algorithms import compose_backend_number
     except ImportError:
-        from src.compression.compression_algorithms import *  # type: ignore[reportMissingImports] # noqa: F401,F403
-        # TODO: Replace wildcard import with explicit imports
+        from src.compression.compression_algorithms import compose_backend_number
     print("[OK] Successfully imported compression_algorithms.py")
 except ImportError as e:
     print(f"[WARNING] Could not import compression_algorithms.py: {e}")
@@ -100,11 +128,9 @@ except ImportError as e:
 try:
     # Try different import paths for unique_identifier
     try:
-        from utils.unique_identifier import *  # type: ignore[reportMissingImports] # noqa: F401,F403
-        # TODO: Replace wildcard import with explicit imports
+        from utils.unique_identifier import assign_uids, neighbor_uids
     except ImportError:
-        from src.utils.unique_identifier import *  # type: ignore[reportMissingImports] # noqa: F401,F403
-        # TODO: Replace wildcard import with explicit imports
+        from src.utils.unique_identifier import assign_uids, neighbor_uids
     print("[OK] Successfully imported unique_identifier.py")
 except ImportError as e:
     print(f"[WARNING] Could not import unique_identifier.py: {e}")
@@ -133,49 +159,36 @@ except ImportError as e:
     print(f"   Install transformers: pip install transformers")
     print(f"   Note: Endpoints will still be available but will return 503 if used")
 
-# Import embeddings (optional)
+# Import source map (optional; stdlib only, so imported eagerly)
 try:
-    # Try importing with src prefix first
     try:
-        from src.embeddings import (
-            SanTOKEmbeddingGenerator,
-            ChromaVectorStore,
-            FAISSVectorStore,
-            SanTOKInferencePipeline
-        )
-        # Try importing WeaviateVectorStore (optional)
-        try:
-            from src.embeddings import WeaviateVectorStore
-            WEAVIATE_AVAILABLE = True
-        except ImportError:
-            WeaviateVectorStore = None
-            WEAVIATE_AVAILABLE = False
+        from santok_sources import get_source_map
     except ImportError:
-        # Fallback to direct import
-        from embeddings import (
-            SanTOKEmbeddingGenerator,
-            ChromaVectorStore,
-            FAISSVectorStore,
-            SanTOKInferencePipeline
-        )
-        # Try importing WeaviateVectorStore (optional)
-        try:
-            from embeddings import WeaviateVectorStore
-            WEAVIATE_AVAILABLE = True
-        except ImportError:
-            WeaviateVectorStore = None
-            WEAVIATE_AVAILABLE = False
-    EMBEDDINGS_AVAILABLE = True
-    print("[OK] Successfully imported embeddings module")
+        from src.santok_sources import get_source_map
+    SOURCE_MAP_AVAILABLE = True
+except ImportError as e:
+    get_source_map = None
+    SOURCE_MAP_AVAILABLE = False
+    print(f"[WARNING] Could not import source map: {e}")
+    print(f"   Note: /api/sources endpoints will return 503 if used")
+
+# Import embeddings (optional). The package resolves its classes on first
+# access, so only availability is probed here; numpy and the embedding
+# stacks load with the first request that needs them
+EMB = lazy_import("src.embeddings", "embeddings")
+EMBEDDINGS_AVAILABLE = module_available("numpy") and (
+    module_available("src.embeddings") or module_available("embeddings")
+)
+# Same probe as embeddings.weaviate_vector_store
+WEAVIATE_AVAILABLE = EMBEDDINGS_AVAILABLE and module_available("weaviate") and module_available("dotenv")
+if EMBEDDINGS_AVAILABLE:
+    print("[OK] Embeddings module available (loaded on first use)")
     if WEAVIATE_AVAILABLE:
         print("[OK] WeaviateVectorStore is available")
     else:
         print("[INFO] WeaviateVectorStore not available (optional dependency)")
-except ImportError as e:
-    EMBEDDINGS_AVAILABLE = False
-    WEAVIATE_AVAILABLE = False
-    WeaviateVectorStore = None
-    print(f"[WARNING] Could not import embeddings: {e}")
+else:
+    print("[WARNING] Could not find embeddings module or numpy")
     print(f"   Install: pip install sentence-transformers chromadb")
     print(f"   Note: Embedding endpoints will return 503 if used")
 
@@ -306,6 +319,170 @@ async def health_check(request: Request):
         "message": "SanTOK API Server is running"
         }
 
+# ==================== METRICS ====================
+# Stage timers (tokenizer build, /tokenize stages, embedding generation,
+# vector stores), per-endpoint latency histograms and pool/cache/registry
+# gauges, exposed at /metrics in the Prometheus text format.
+# On by default in the server; SANTOK_METRICS=0 turns recording off.
+
+metrics.enable(os.getenv("SANTOK_METRICS", "1").lower() not in ("0", "false", "no", "off"))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    if not metrics.enabled():
+        return await call_next(request)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # The route template, not the raw path, keeps the label set bounded
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", None) or "unmatched"
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, request.method, endpoint, status)
+
+def _server_gauges():
+    """Gauges read at scrape time from the compute pool, response cache, model registry and jobs."""
+    compute = compute_executor.stats()
+    yield ("santok_compute_pending_tasks", "gauge", "Tasks queued or running in the compute pool",
+           [({}, compute["pending"])])
+    yield ("santok_compute_tasks_total", "counter", "Compute pool tasks per name and outcome",
+           [({"task": name, "outcome": outcome}, task.get(outcome, 0))
+            for name, task in compute["tasks"].items()
+            for outcome in ("completed", "failed", "rejected", "timeouts")])
+    cache = response_cache.stats()
+    yield ("santok_response_cache_bytes", "gauge", "Bytes held by the response cache memory tier",
+           [({}, cache["bytes"])])
+    yield ("santok_response_cache_requests_total", "counter", "Response cache lookups per endpoint and outcome",
+           [({"endpoint": endpoint, "outcome": outcome}, n)
+            for endpoint, counters in cache["endpoints"].items()
+            for outcome, n in counters.items()])
+    models = model_registry.stats()
+    yield ("santok_model_registry_entries", "gauge", "Warm models / stores / pipelines", [({}, models["entries"])])
+    yield ("santok_model_registry_megabytes", "gauge", "Estimated memory of warm models", [({}, models["mb"])])
+    if get_job_manager is not None:
+        jobs = get_job_manager().stats()
+        yield ("santok_jobs", "gauge", "Background jobs per status",
+               [({"status": status}, n) for status, n in jobs["by_status"].items()])
+        yield ("santok_jobs_queued", "gauge", "Jobs waiting for a worker slot", [({}, jobs["queued"])])
+
+metrics.REGISTRY.register_collector(_server_gauges)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# ==================== COMPUTE POOL ====================
+# CPU-bound handlers (/tokenize, /analyze, /compress, /validate,
+# /embeddings/generate, /embeddings/document, the batch endpoints, in-process
+# vocabulary builds) run in a warm worker pool so one large request cannot
+# stall /health, websockets or other clients.
+# Configure with SANTOK_COMPUTE_WORKERS / _QUEUE / _TIMEOUT / _MODE.
+
+def _warm_compute_worker():
+    """Preload tokenizer tables and the default embedding generator in a worker."""
+    try:
+        TextTokenizer(seed=42, embedding_bit=False).build("SanTOK compute worker warm-up")
+        if EMBEDDINGS_AVAILABLE:
+            get_embedding_generator()
+    except Exception as e:
+        print(f"[WARNING] Compute worker warm-up failed: {e}")
+
+compute_executor = ComputeExecutor.from_env(initializer=_warm_compute_worker)
+
+async def run_compute(name: str, fn, *args, **kwargs):
+    """Run a CPU-bound handler body in the compute pool, mapping pool errors to HTTP errors."""
+    try:
+        return await compute_executor.run(fn, *args, name=name, **kwargs)
+    except ComputeBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy: {e}",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except BrokenProcessPool:
+        # A worker died twice in a row; the pool restarts for the next request
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy: compute worker crashed, retry the request",
+            headers={"Retry-After": "1"}
+        )
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ComputeTaskError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@app.on_event("startup")
+async def start_compute_pool():
+    loop = asyncio.get_running_loop()
+    # Warm-up forks and initializes every worker - keep it off the event loop
+    await loop.run_in_executor(None, compute_executor.start)
+    print(f"[OK] Compute pool ready: {compute_executor}")
+
+@app.on_event("shutdown")
+async def stop_compute_pool():
+    compute_executor.shutdown()
+
+@app.get("/compute/stats")
+async def get_compute_stats():
+    """Compute pool state: queue depth, rejections, timeouts and p50/p99 latency per endpoint."""
+    return compute_executor.stats()
+
+# ==================== RESPONSE CACHE ====================
+# /tokenize, /analyze, /compress, /validate and /decode are pure functions of
+# the request, so their JSON bodies are cached by a hash of the normalized
+# request (memory LRU + optional disk tier shared by server processes) and
+# concurrent identical requests share one computation.
+# Configure with SANTOK_CACHE_MAX_MB / _MAX_ENTRIES / _DIR / _DISK_MAX_MB.
+# Cached bodies keep the processingTime of the run that produced them.
+
+response_cache = ResponseCache.from_env()
+
+def _json_body(value: Any) -> bytes:
+    """Encode a response value the way FastAPI's JSONResponse does."""
+    return json.dumps(
+        jsonable_encoder(value),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+def _json_body_of(fn, *args) -> bytes:
+    """fn(*args) encoded as JSON - in the compute pool, so workers send back bytes."""
+    value = fn(*args)
+    # _tokenize_request -> "tokenize", matching the handler's own stage timers
+    with metrics.stage(fn.__name__.strip("_").replace("_request", ""), "serialization"):
+        return _json_body(value)
+
+def _tokenization_cache_params(request: "TokenizationRequest") -> Dict[str, Any]:
+    """Options that determine a TokenizationRequest's result (with handler defaults applied)."""
+    return {
+        "tokenizer_type": request.tokenizer_type,
+        "lower": bool(request.lower),
+        "drop_specials": bool(request.drop_specials),
+        "collapse_repeats": bool(request.collapse_repeats),
+        "seed": request.seed if request.seed is not None else 12345,
+        "embedding_bit": bool(request.embedding_bit),
+    }
+
+async def cached_json_response(endpoint: str, params: Dict[str, Any], content, compute) -> Response:
+    """
+    JSON response for a deterministic request, from the cache or compute().
+    compute is a zero-argument callable returning an awaitable of the body bytes.
+    """
+    key = response_cache.key(endpoint, params, content)
+    body, outcome = await response_cache.get_or_compute(endpoint, key, compute)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": outcome.upper()})
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Response cache hit/miss counters (overall and per endpoint), size and evictions."""
+    return response_cache.stats()
+
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
 class LoginRequest(BaseModel):
@@ -712,10 +889,10 @@ def preprocess_text(text: str, lower: bool, drop_specials: bool, collapse_repeat
         text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-def generate_token_colors(tokens: List[str]) -> List[str]:
-    """Generate colors for tokens"""
+def generate_token_colors(tokens: List[str], start: int = 0) -> List[str]:
+    """Generate colors for tokens (start = position of the first token in the stream)"""
     colors = []
-    for i, token in enumerate(tokens):
+    for i, token in enumerate(tokens, start):
         hue = (i * 137.5) % 360  # Golden angle for good distribution
         colors.append(f"hsl({hue}, 70%, 50%)")
     return colors
@@ -760,11 +937,11 @@ async def root():
         "available_tokenizers": list(TOKENIZERS.keys())
     }
 
-@app.post("/tokenize", response_model=TokenizationResult)
-async def tokenize_text(request: TokenizationRequest):
-    """Tokenize text using the specified tokenizer - HANDLES 50GB+ FILES"""
+def _tokenize_request(request: TokenizationRequest) -> TokenizationResult:
+    """Tokenize text using the specified tokenizer - HANDLES 50GB+ FILES (runs in the compute pool)"""
     try:
         start_time = time.time()
+        stages = metrics.stage_clock("tokenize")
         text_length = len(request.text)
         
         # Fast preprocessing - chunked for large files to handle 50GB+
@@ -804,6 +981,7 @@ async def tokenize_text(request: TokenizationRequest):
             if request.collapse_repeats:
                 import re
                 processed_text = re.sub(r'\s+', ' ', processed_text).strip()
+        stages.mark("preprocessing")
         
         # Use REAL SanTOK TextTokenizer engine with all features
         seed = request.seed if request.seed is not None else 12345
@@ -978,6 +1156,8 @@ async def tokenize_text(request: TokenizationRequest):
                     detail=f"Tokenization failed: {str(e)}"
                 )
         
+        stages.mark("all_tokenizations")
+        
         # Use mapped tokenizer_type for lookup (using module-level constant)
         lookup_type = TOKENIZER_LOOKUP_MAP.get(request.tokenizer_type, request.tokenizer_type)
         
@@ -1003,6 +1183,7 @@ async def tokenize_text(request: TokenizationRequest):
         # Assign UIDs using real engine
         with_uids = assign_uids(token_list, seed)
         with_neighbors = neighbor_uids(with_uids)
+        stages.mark("uid_assignment")
         
         # Process each token with REAL engine calculations
         token_objects = []
@@ -1039,13 +1220,16 @@ async def tokenize_text(request: TokenizationRequest):
                 color=None  # Will set colors later
             )
             token_objects.append(token_obj)
+        stages.mark("backend_composition")
         
         # Set colors
         colors = generate_token_colors([t.text for t in token_objects])
         for i, token_obj in enumerate(token_objects):
             token_obj.color = colors[i] if i < len(colors) else colors[i % len(colors)]
+        stages.mark("color_generation")
         
         actual_token_count = len(token_objects)
+        metrics.count("tokenize", "tokens", actual_token_count)
         
         # Sample tokens for very large responses (for display only, metrics use full count)
         MAX_TOKENS_TO_RETURN = 1000000  # Return max 1M tokens for display
@@ -1103,12 +1287,211 @@ async def tokenize_text(request: TokenizationRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _tokenize_table(request: TokenizationRequest):
+    """/tokenize result as (meta, columns) for the binary wire formats (runs in the compute pool)."""
+    result = _tokenize_request(request)
+    meta = {
+        "tokenCount": result.tokenCount,
+        "characterCount": result.characterCount,
+        "tokenizerType": result.tokenizerType,
+        "processingTime": result.processingTime,
+        "memoryUsage": result.memoryUsage,
+        "compressionRatio": result.compressionRatio,
+        "reversibility": result.reversibility,
+        "fingerprint": result.fingerprint,
+    }
+    columns = {
+        "text": [t.text for t in result.tokens],
+        "id": np.fromiter((t.id for t in result.tokens), dtype=np.int64, count=len(result.tokens)),
+        "frontendDigits": np.asarray(result.frontendDigits or [], dtype=np.uint8),
+        "backendScaled": np.asarray(result.backendScaled or [], dtype=np.uint32),
+        "contentIds": np.asarray(result.contentIds or [], dtype=np.uint32),
+    }
+    return meta, columns
+
+def _response_format(http_request: Optional[Request], format: Optional[str]) -> str:
+    """Negotiate json / npy / msgpack / arrow from ?format= or the Accept header."""
+    accept = http_request.headers.get("accept") if http_request is not None else None
+    try:
+        return wire_format.negotiate(accept, format)
+    except wire_format.UnsupportedFormatError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+def _binary_response(fmt: str, meta: Dict[str, Any], columns: Dict[str, Any], matrix=None) -> Response:
+    body, media_type, headers = wire_format.encode(fmt, meta, columns, matrix)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+@app.post("/tokenize", response_model=TokenizationResult)
+async def tokenize_text(request: TokenizationRequest, http_request: Request = None, format: Optional[str] = None):
+    """
+    Tokenize text using the specified tokenizer - HANDLES 50GB+ FILES
+    
+    JSON by default; ?format=npy|msgpack|arrow (or a matching Accept header)
+    returns the per-token arrays as raw buffers (see servers/wire_format.py).
+    """
+    fmt = _response_format(http_request, format)
+    if fmt == "json":
+        return await cached_json_response(
+            "tokenize", _tokenization_cache_params(request), request.text,
+            lambda: run_compute("tokenize", _json_body_of, _tokenize_request, request),
+        )
+    meta, columns = await run_compute("tokenize", _tokenize_table, request)
+    return _binary_response(fmt, meta, columns)
+
+# ==================== STREAMING RESPONSES ====================
+# Large inputs are preprocessed and tokenized piece by piece (pieces are cut
+# where a whitespace run starts, so tokens match the non-streaming result)
+# and sent as they are produced: server memory stays O(piece + batch) and the
+# first bytes leave after the first piece instead of after the whole input.
+
+STREAM_PIECE_CHARS = 64 * 1024
+STREAM_BATCH_TOKENS = 4096
+EMBEDDING_STREAMS = ("space", "word", "char", "grammar", "subword", "subword_bpe", "subword_syllable", "subword_frequency", "byte")
+
+def iter_preprocessed(text: str, lower: bool, drop_specials: bool, collapse_repeats: bool, piece_chars: int = STREAM_PIECE_CHARS):
+    """Pieces whose concatenation equals preprocess_text(text, ...) - without building it."""
+    import re
+    whitespace = re.compile(r'\s+')
+    carry = ""
+    leading = True
+    for piece in iter_text_chunks(text, piece_chars):
+        if lower:
+            piece = piece.lower()
+        if drop_specials:
+            piece = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in piece)
+        # Pieces start with a whitespace run of the original text, but the
+        # run may continue in the next piece (and drop_specials can turn a
+        # piece's last characters into whitespace): hold it back so every
+        # piece still ends where a whitespace run starts
+        piece = carry + piece
+        if not collapse_repeats:
+            body = piece.rstrip(" \t\n\r")
+            carry = piece[len(body):]
+            if body:
+                yield body
+            continue
+        body = piece.rstrip()
+        carry = piece[len(body):]
+        body = whitespace.sub(' ', body)
+        if leading:
+            body = body.lstrip()
+            leading = not body
+        if body:
+            yield body
+    if carry and not collapse_repeats:
+        yield carry
+    # (with collapse_repeats trailing whitespace is dropped, like .strip())
+
+def _ndjson(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+def _iter_tokenize_ndjson(request: TokenizationRequest, stream_name: str, batch_size: int):
+    """NDJSON lines: {"event": "tokens", ...} batches, then one {"event": "summary", ...}."""
+    start_time = time.time()
+    seed = request.seed if request.seed is not None else 12345
+    embedding_bit = request.embedding_bit if request.embedding_bit is not None else False
+    engine = TextTokenizer(seed, embedding_bit)
+    
+    stats = {"chars": 0, "bytes": 0, "words": 0, "head": ""}
+    def pieces():
+        for piece in iter_preprocessed(request.text, request.lower, request.drop_specials, bool(request.collapse_repeats)):
+            stats["chars"] += len(piece)
+            stats["bytes"] += len(piece.encode('utf-8'))
+            stats["words"] += len(piece.split())
+            if len(stats["head"]) < 100:
+                stats["head"] = (stats["head"] + piece)[:100]
+            yield piece
+    
+    count = 0
+    signature_sum = 0
+    pending: List[Any] = []
+    
+    def flush(records):
+        nonlocal count, signature_sum
+        frontend = [r.frontend for r in records]
+        if count < 100:
+            signature_sum += sum(frontend[:100 - count])
+        colors = generate_token_colors([r.text for r in records], start=count)
+        line = _ndjson({
+            "event": "tokens",
+            "offset": count,
+            "tokens": [
+                {"text": r.text, "id": r.index, "position": r.index, "length": len(r.text), "type": stream_name, "color": colors[k]}
+                for k, r in enumerate(records)
+            ],
+            "frontendDigits": frontend,
+            "backendScaled": [r.backend_scaled for r in records],
+            "contentIds": [r.content_id for r in records],
+        })
+        count += len(records)
+        return line
+    
+    try:
+        for records in engine.iter_stream(pieces(), stream_name):
+            pending.extend(records)
+            while len(pending) >= batch_size:
+                yield flush(pending[:batch_size])
+                del pending[:batch_size]
+        if pending:
+            yield flush(pending)
+    except Exception as e:
+        print(f"Streaming tokenization error: {e}")
+        yield _ndjson({"event": "error", "detail": str(e), "offset": count})
+        return
+    
+    characters = stats["chars"]
+    yield _ndjson({
+        "event": "summary",
+        "tokenCount": count,
+        "characterCount": characters,
+        "tokenizerType": stream_name,
+        "processingTime": (time.time() - start_time) * 1000,
+        "memoryUsage": stats["bytes"] / 1024,
+        "compressionRatio": count / max(stats["words"], 1),
+        "reversibility": True,
+        "fingerprint": {
+            "signatureDigit": signature_sum % 10 if count else hash(stats["head"]) % 10,
+            "compatDigit": characters % 10,
+            "textValue": characters % 10000,
+            "textValueWithEmbedding": (characters + (1 if embedding_bit else 0)) % 10000,
+        },
+    })
+
+@app.post("/tokenize/stream")
+async def tokenize_text_stream(request: TokenizationRequest, batch_size: int = STREAM_BATCH_TOKENS):
+    """
+    Streaming /tokenize: newline-delimited JSON.
+    
+    Each line is {"event": "tokens", "offset", "tokens", "frontendDigits",
+    "backendScaled", "contentIds"} for up to batch_size tokens; the last line
+    is {"event": "summary", ...} with the /tokenize metrics (or
+    {"event": "error", "detail"} if tokenization fails part-way).
+    """
+    stream_name = TOKENIZER_LOOKUP_MAP.get(request.tokenizer_type, request.tokenizer_type)
+    if stream_name not in EMBEDDING_STREAMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown tokenizer type: {request.tokenizer_type}. Available: {list(TOKENIZER_LOOKUP_MAP.keys())}"
+        )
+    batch_size = max(1, min(batch_size, 100000))
+    # Sync generator: Starlette iterates it in its threadpool, off the event loop
+    return StreamingResponse(
+        _iter_tokenize_ndjson(request, stream_name, batch_size),
+        media_type="application/x-ndjson",
+    )
+
 @app.post("/analyze")
 async def analyze_text(request: TokenizationRequest):
     """Analyze text and return detailed metrics - OPTIMIZED"""
+    return await cached_json_response(
+        "analyze", _tokenization_cache_params(request), request.text,
+        lambda: _analyze_request(request),
+    )
+
+async def _analyze_request(request: TokenizationRequest) -> bytes:
     try:
         # First tokenize
-        tokenize_result = await tokenize_text(request)
+        tokenize_result = await run_compute("tokenize", _tokenize_request, request)
         
         # Fast analysis - sample only for large texts
         tokens = tokenize_result.tokens
@@ -1131,7 +1514,7 @@ async def analyze_text(request: TokenizationRequest):
         unique_tokens = len(set(t.text for t in tokens[:sample_size]))
         repetition_rate = 1 - (unique_tokens / sample_size) if sample_size > 0 else 0
         
-        return {
+        return _json_body({
             "analysis": {
                 "tokenDistribution": token_dist,
                 "characterDistribution": char_dist,
@@ -1145,17 +1528,18 @@ async def analyze_text(request: TokenizationRequest):
                 "compressionRatio": tokenize_result.compressionRatio
             },
             "fingerprint": tokenize_result.fingerprint
-        }
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Analysis error: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/compress", response_model=List[CompressionAnalysis])
-async def compress_text(request: TokenizationRequest):
-    """Analyze compression - FAST VERSION - Skip slow analysis"""
+def _compress_request(request: TokenizationRequest) -> List[CompressionAnalysis]:
+    """Analyze compression - FAST VERSION - Skip slow analysis (runs in the compute pool)"""
     try:
         # Fast preprocessing
         processed_text = request.text
@@ -1228,9 +1612,24 @@ async def compress_text(request: TokenizationRequest):
             )
         ]
 
+@app.post("/compress", response_model=List[CompressionAnalysis])
+async def compress_text(request: TokenizationRequest):
+    """Analyze compression - FAST VERSION - Skip slow analysis"""
+    return await cached_json_response(
+        "compress", _tokenization_cache_params(request), request.text,
+        lambda: run_compute("compress", _json_body_of, _compress_request, request),
+    )
+
 @app.post("/validate")
 async def validate_tokenization(request: TokenizationRequest):
     """Validate tokenization reversibility using engine reconstruction"""
+    return await cached_json_response(
+        "validate", _tokenization_cache_params(request), request.text,
+        lambda: run_compute("validate", _json_body_of, _validate_request, request),
+    )
+
+def _validate_request(request: TokenizationRequest) -> Dict[str, Any]:
+    """Validate tokenization reversibility (runs in the compute pool)"""
     try:
         processed_text = preprocess_text(
             request.text,
@@ -1272,16 +1671,23 @@ async def decode_tokens(request: Dict[str, Any]):
         if not tokens:
             raise HTTPException(status_code=400, detail="No tokens provided")
         
-        # Use the core tokenizer's reconstruction function
-        decoded_text = KT.reconstruct_from_tokens(tokens, tokenizer_type)
+        async def decode():
+            # Use the core tokenizer's reconstruction function
+            decoded_text = KT.reconstruct_from_tokens(tokens, tokenizer_type)
+            return _json_body({
+                "decoded_text": decoded_text,
+                "tokenizer_type": tokenizer_type,
+                "token_count": len(tokens),
+                "decoded_length": len(decoded_text)
+            })
         
-        return {
-            "decoded_text": decoded_text,
-            "tokenizer_type": tokenizer_type,
-            "token_count": len(tokens),
-            "decoded_length": len(decoded_text)
-        }
+        return await cached_json_response(
+            "decode", {"tokenizer_type": tokenizer_type},
+            json.dumps(tokens, sort_keys=True, separators=(",", ":"), default=str), decode,
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Decoding failed: {str(e)}")
 
@@ -1434,10 +1840,11 @@ async def test_vocabulary_adapter_quick():
 
 # ==================== EMBEDDING ENDPOINTS ====================
 
-# Global instances for embeddings (lazy initialization)
-_embedding_generator = None
-_vector_store = None
-_pipeline = None
+# Warm embedding generators, vector stores and pipelines, keyed by configuration
+# (lazy initialization, LRU by footprint; stores are pinned).
+# Configure with SANTOK_MODELS_MAX_MB / _MAX_ENTRIES; SANTOK_PRELOAD_MODELS lists
+# "strategy:dim" generators to load at startup (default "feature_based:768").
+model_registry = ModelRegistry.from_env()
 
 class EmbeddingRequest(BaseModel):
     text: str
@@ -1477,65 +1884,109 @@ class DocumentEmbeddingResponse(BaseModel):
     embedding_dim: int
     method: str
 
+def _generator_key(strategy: str, embedding_dim: int, semantic_model_path: Optional[str]):
+    """Registry key of a generator configuration (a retrained semantic model file gets a new key)."""
+    if strategy != "semantic" or not semantic_model_path:
+        return ("generator", strategy, embedding_dim, None, None)
+    try:
+        mtime = os.path.getmtime(semantic_model_path)
+    except OSError:
+        mtime = None
+    return ("generator", strategy, embedding_dim, semantic_model_path, mtime)
+
+def _create_embedding_generator(strategy: str, embedding_dim: int, semantic_model_path: Optional[str]):
+    kwargs = {"strategy": strategy, "embedding_dim": embedding_dim}
+    if strategy == "semantic" and semantic_model_path:
+        kwargs["semantic_model_path"] = semantic_model_path
+    return EMB.SanTOKEmbeddingGenerator(**kwargs)
+
 def get_embedding_generator(strategy: str = "feature_based", embedding_dim: int = 768, semantic_model_path: Optional[str] = None):
     """Get or create embedding generator."""
-    global _embedding_generator
     if not EMBEDDINGS_AVAILABLE:
         raise HTTPException(status_code=503, detail="Embeddings not available. Install: pip install sentence-transformers chromadb")
-    
-    # Create key for caching (include semantic_model_path for semantic strategy)
-    cache_key = (strategy, embedding_dim, semantic_model_path if strategy == "semantic" else None)
-    
-    if _embedding_generator is None or not hasattr(_embedding_generator, '_cache_key') or _embedding_generator._cache_key != cache_key:
-        kwargs = {"strategy": strategy, "embedding_dim": embedding_dim}
-        if strategy == "semantic" and semantic_model_path:
-            kwargs["semantic_model_path"] = semantic_model_path
-        _embedding_generator = SanTOKEmbeddingGenerator(**kwargs)
-        _embedding_generator._cache_key = cache_key
-    return _embedding_generator
+    return model_registry.get(
+        _generator_key(strategy, embedding_dim, semantic_model_path),
+        lambda: _create_embedding_generator(strategy, embedding_dim, semantic_model_path),
+    )
 
 def get_vector_store(backend: str = "chroma", weaviate_url: Optional[str] = None, weaviate_api_key: Optional[str] = None):
     """Get or create vector store."""
-    global _vector_store
     if not EMBEDDINGS_AVAILABLE:
         raise HTTPException(status_code=503, detail="Embeddings not available.")
-    if _vector_store is None:
+    if backend not in ("chroma", "faiss", "weaviate"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown backend: {backend}. Available: chroma, faiss, weaviate"
+        )
+    if backend == "weaviate" and not WEAVIATE_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Weaviate not available. Install: pip install weaviate-client"
+        )
+    
+    def create():
         if backend == "chroma":
-            _vector_store = ChromaVectorStore(collection_name="santok_embeddings", persist_directory="./vector_db")
-        elif backend == "faiss":
-            _vector_store = FAISSVectorStore(collection_name="santok_embeddings", embedding_dim=768)
-        elif backend == "weaviate":
-            if not WEAVIATE_AVAILABLE or WeaviateVectorStore is None:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Weaviate not available. Install: pip install weaviate-client"
-                )
-            _vector_store = WeaviateVectorStore(
-                collection_name="santok_embeddings",
-                embedding_dim=768,
-                weaviate_url=weaviate_url,
-                weaviate_api_key=weaviate_api_key
-            )
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unknown backend: {backend}. Available: chroma, faiss, weaviate"
-            )
-    return _vector_store
+            return EMB.ChromaVectorStore(collection_name="santok_embeddings", persist_directory="./vector_db")
+        if backend == "faiss":
+            return EMB.FAISSVectorStore(collection_name="santok_embeddings", embedding_dim=768)
+        return EMB.WeaviateVectorStore(
+            collection_name="santok_embeddings",
+            embedding_dim=768,
+            weaviate_url=weaviate_url,
+            weaviate_api_key=weaviate_api_key
+        )
+    
+    # The key shows up in /models/stats - never put the API key itself in it
+    credential = hashlib.sha256(weaviate_api_key.encode()).hexdigest()[:12] if weaviate_api_key else None
+    key = ("store", backend, weaviate_url if backend == "weaviate" else None, credential)
+    # Pinned: an in-memory store (FAISS) would lose its vectors if evicted
+    return model_registry.get(key, create, pinned=True)
 
 def get_pipeline(strategy: str = "feature_based"):
     """Get or create inference pipeline."""
-    global _pipeline
-    if _pipeline is None:
+    def create():
         embedding_gen = get_embedding_generator(strategy)
         vector_store = get_vector_store()
         tokenizer = TextTokenizer(seed=42, embedding_bit=False)
-        _pipeline = SanTOKInferencePipeline(embedding_generator=embedding_gen, vector_store=vector_store, tokenizer=tokenizer)
-    return _pipeline
-
-@app.post("/embeddings/generate", response_model=EmbeddingResponse)
-async def generate_embeddings(request: EmbeddingRequest):
-    """Generate embeddings for text."""
+        return EMB.SanTOKInferencePipeline(embedding_generator=embedding_gen, vector_store=vector_store, tokenizer=tokenizer)
+    
+    if not EMBEDDINGS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Embeddings not available.")
+    return model_registry.get(("pipeline", strategy), create)
+
+def _preload_models():
+    """(key, factory) pairs for the generators listed in SANTOK_PRELOAD_MODELS."""
+    items = []
+    for spec in os.getenv("SANTOK_PRELOAD_MODELS", "feature_based:768").split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        strategy, _, dim = spec.partition(":")
+        embedding_dim = int(dim) if dim else 768
+        items.append((
+            _generator_key(strategy, embedding_dim, None),
+            lambda strategy=strategy, embedding_dim=embedding_dim: _create_embedding_generator(strategy, embedding_dim, None),
+        ))
+    return items
+
+@app.on_event("startup")
+async def preload_models():
+    # Registered after the compute pool starts, so workers are forked before this thread runs
+    if EMBEDDINGS_AVAILABLE:
+        model_registry.preload(_preload_models())
+
+@app.get("/models/stats")
+async def get_model_stats():
+    """Warm generators / stores / pipelines with their footprint, hits and load time."""
+    return model_registry.stats()
+
+def _generate_embeddings_request(request: EmbeddingRequest, as_table: bool = False):
+    """
+    Generate embeddings for text (runs in the compute pool).
+    
+    Returns an EmbeddingResponse, or with as_table=True (meta, columns,
+    ("embeddings", float32 matrix)) for the binary wire formats.
+    """
     try:
         start_time = time.time()
         
@@ -1563,12 +2014,33 @@ async def generate_embeddings(request: EmbeddingRequest):
             for stream_name, token_stream in streams.items():
                 all_tokens.extend(token_stream.tokens)
         
-        if not all_tokens:
+        if not all_tokens and not as_table:
             return EmbeddingResponse(embeddings=[], tokens=[], embedding_dim=request.embedding_dim, num_tokens=0, strategy=request.strategy, processing_time=0.0)
         
         # Generate embeddings
         try:
-            embeddings = embedding_gen.generate_batch(all_tokens)
+            if all_tokens:
+                embeddings = np.asarray(embedding_gen.generate_batch(all_tokens), dtype=np.float32)
+            else:
+                embeddings = np.zeros((0, request.embedding_dim), dtype=np.float32)
+            if as_table:
+                meta = {
+                    "embedding_dim": int(embeddings.shape[1]),
+                    "num_tokens": len(all_tokens),
+                    "strategy": request.strategy,
+                    "processing_time": (time.time() - start_time) * 1000,
+                }
+                columns = {
+                    "text": [t.text for t in all_tokens],
+                    "stream": [t.stream for t in all_tokens],
+                    "index": np.fromiter((t.index for t in all_tokens), dtype=np.int64, count=len(all_tokens)),
+                    "uid": np.fromiter((t.uid for t in all_tokens), dtype=np.uint64, count=len(all_tokens)),
+                    "frontend": np.fromiter((t.frontend for t in all_tokens), dtype=np.uint8, count=len(all_tokens)),
+                    "backend_scaled": np.fromiter((t.backend_scaled for t in all_tokens), dtype=np.uint32, count=len(all_tokens)),
+                    "content_id": np.fromiter((t.content_id for t in all_tokens), dtype=np.uint32, count=len(all_tokens)),
+                    "global_id": np.fromiter((t.global_id for t in all_tokens), dtype=np.uint64, count=len(all_tokens)),
+                }
+                return meta, columns, ("embeddings", embeddings)
             embeddings_list = embeddings.tolist()
         except Exception as emb_error:
             import traceback
@@ -1622,6 +2094,391 @@ async def generate_embeddings(request: EmbeddingRequest):
         print(error_details)
         raise HTTPException(status_code=500, detail=f"Failed to generate embeddings: {str(e)}")
 
+@app.post("/embeddings/generate", response_model=EmbeddingResponse)
+async def generate_embeddings(request: EmbeddingRequest, http_request: Request, format: Optional[str] = None):
+    """
+    Generate embeddings for text.
+    
+    JSON by default; ?format=npy|msgpack|arrow (or a matching Accept header)
+    sends the same table with the embeddings as a float32 buffer.
+    """
+    if not EMBEDDINGS_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Embeddings not available. Install: pip install sentence-transformers chromadb"
+        )
+    fmt = _response_format(http_request, format)
+    if fmt == "json":
+        return await run_compute("embeddings_generate", _generate_embeddings_request, request)
+    meta, columns, matrix = await run_compute("embeddings_generate", _generate_embeddings_request, request, True)
+    return _binary_response(fmt, meta, columns, matrix)
+
+EMBEDDING_FRAME_MAGIC = b"STKE"
+
+def _embedding_token_dict(token) -> Dict[str, Any]:
+    return {
+        "text": token.text,
+        "stream": token.stream,
+        "index": token.index,
+        "uid": str(token.uid),
+        "frontend": token.frontend,
+        "backend_scaled": token.backend_scaled,
+        "content_id": token.content_id,
+        "global_id": str(token.global_id)
+    }
+
+def _embedding_frame(meta: Dict[str, Any], embeddings: Optional["np.ndarray"], dim: int) -> bytes:
+    """
+    One binary frame: "STKE" | u32 rows | u32 dim | u32 meta_len | meta JSON (utf-8)
+    | rows * dim little-endian float32. A frame with rows = 0 carries the summary.
+    """
+    import struct
+    body = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    rows = 0 if embeddings is None else len(embeddings)
+    header = EMBEDDING_FRAME_MAGIC + struct.pack("<III", rows, dim, len(body))
+    if embeddings is None:
+        return header + body
+    data = np.ascontiguousarray(embeddings, dtype="<f4")
+    return b"".join((header, body, data.tobytes()))
+
+def _iter_embedding_stream(request: EmbeddingRequest, binary: bool, batch_size: int):
+    """Token batches with their embeddings, one stream at a time, as NDJSON lines or binary frames."""
+    start_time = time.time()
+    embedding_gen = get_embedding_generator(request.strategy, request.embedding_dim, request.semantic_model_path)
+    engine = TextTokenizer(seed=request.tokenizer_seed, embedding_bit=request.embedding_bit)
+    names = [request.stream_type] if request.stream_type else list(EMBEDDING_STREAMS)
+    dim = request.embedding_dim
+    count = 0
+    
+    def emit(batch):
+        embeddings = embedding_gen.generate_batch(batch)
+        tokens = [_embedding_token_dict(t) for t in batch]
+        if binary:
+            return _embedding_frame({"event": "embeddings", "offset": count, "tokens": tokens}, embeddings, embeddings.shape[1])
+        return _ndjson({"event": "embeddings", "offset": count, "tokens": tokens, "embeddings": embeddings.tolist()})
+    
+    try:
+        for name in names:
+            pending: List[Any] = []
+            for records in engine.iter_stream(iter_text_chunks(request.text, STREAM_PIECE_CHARS), name):
+                pending.extend(records)
+                while len(pending) >= batch_size:
+                    yield emit(pending[:batch_size])
+                    count += batch_size
+                    del pending[:batch_size]
+            if pending:
+                yield emit(pending)
+                count += len(pending)
+    except Exception as e:
+        print(f"[ERROR] Streaming embeddings error: {e}")
+        error = {"event": "error", "detail": str(e), "offset": count}
+        yield _embedding_frame(error, None, dim) if binary else _ndjson(error)
+        return
+    
+    summary = {
+        "event": "summary",
+        "num_tokens": count,
+        "embedding_dim": dim,
+        "strategy": request.strategy,
+        "processing_time": (time.time() - start_time) * 1000,
+    }
+    yield _embedding_frame(summary, None, dim) if binary else _ndjson(summary)
+
+@app.post("/embeddings/generate/stream")
+async def generate_embeddings_stream(request: EmbeddingRequest, http_request: Request, format: Optional[str] = None, batch_size: int = 1024):
+    """
+    Streaming /embeddings/generate.
+    
+    format=ndjson (default): lines {"event": "embeddings", "offset", "tokens",
+    "embeddings"}, then {"event": "summary", ...}.
+    format=binary (or Accept: application/octet-stream): frames
+    "STKE" | u32 rows | u32 dim | u32 meta_len | meta JSON | float32 rows*dim,
+    the last one (rows = 0) carrying the summary - several times smaller than JSON floats.
+    Tokens come stream by stream, in the /embeddings/generate order.
+    """
+    if not EMBEDDINGS_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Embeddings not available. Install: pip install sentence-transformers chromadb"
+        )
+    if request.stream_type and request.stream_type not in EMBEDDING_STREAMS:
+        raise HTTPException(status_code=400, detail=f"Stream type '{request.stream_type}' not found")
+    if format is None:
+        format = "binary" if "application/octet-stream" in http_request.headers.get("accept", "") else "ndjson"
+    if format not in ("ndjson", "binary"):
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}. Available: ndjson, binary")
+    binary = format == "binary"
+    batch_size = max(1, min(batch_size, 65536))
+    return StreamingResponse(
+        _iter_embedding_stream(request, binary, batch_size),
+        media_type="application/octet-stream" if binary else "application/x-ndjson",
+    )
+
+# ==================== BATCH ENDPOINTS ====================
+# Many documents with shared options in one request. Documents are grouped
+# into parts (a few per worker) that run in the compute pool in parallel;
+# each part returns pre-encoded per-document results, so a batch costs one
+# HTTP round trip and one validation instead of one per document.
+# Output: json (default, results in input order), ndjson (streamed as parts
+# finish) or one npy / msgpack / arrow table with a "document" column.
+# A failing document yields an error entry; the rest of the batch still runs.
+# In the binary formats, the per-document meta ("documents") and the errors
+# are maps keyed by str(index): msgpack's strict_map_key rejects int keys.
+# A part the pool turns away (503: busy / worker crashed) is retried; if it
+# still is, the whole batch answers 503 (ndjson: an "aborted" event ends it).
+
+MAX_BATCH_DOCUMENTS = 10000
+BATCH_PART_CHARS = 1 << 20   # split parts beyond this many characters
+BATCH_PARTS_PER_WORKER = 4
+BATCH_PART_RETRIES = 2
+BATCH_RETRY_MAX_WAIT = 5.0   # seconds, caps the Retry-After of a turned-away part
+
+class BatchTokenizationRequest(BaseModel):
+    texts: List[str]
+    tokenizer_type: str
+    lower: bool = False
+    drop_specials: bool = False
+    collapse_repeats: Optional[int] = 1
+    embedding: bool = False
+    seed: Optional[int] = None
+    embedding_bit: Optional[int] = None
+
+class BatchEmbeddingRequest(BaseModel):
+    texts: List[str]
+    strategy: str = "feature_based"
+    embedding_dim: int = 768
+    tokenizer_seed: int = 42
+    embedding_bit: bool = False
+    stream_type: Optional[str] = None
+    semantic_model_path: Optional[str] = "santok_semantic_model.pkl"
+
+def _tokenization_requests(batch: BatchTokenizationRequest) -> List[TokenizationRequest]:
+    return [
+        TokenizationRequest(
+            text=text,
+            tokenizer_type=batch.tokenizer_type,
+            lower=batch.lower,
+            drop_specials=batch.drop_specials,
+            collapse_repeats=batch.collapse_repeats,
+            embedding=batch.embedding,
+            seed=batch.seed,
+            embedding_bit=batch.embedding_bit,
+        )
+        for text in batch.texts
+    ]
+
+def _embedding_requests(batch: BatchEmbeddingRequest) -> List[EmbeddingRequest]:
+    return [
+        EmbeddingRequest(
+            text=text,
+            strategy=batch.strategy,
+            embedding_dim=batch.embedding_dim,
+            tokenizer_seed=batch.tokenizer_seed,
+            embedding_bit=batch.embedding_bit,
+            stream_type=batch.stream_type,
+            semantic_model_path=batch.semantic_model_path,
+        )
+        for text in batch.texts
+    ]
+
+def _batch_error(e: Exception) -> Dict[str, Any]:
+    return {"status_code": getattr(e, "status_code", 500), "detail": getattr(e, "detail", str(e))}
+
+def _run_batch_part(fn, requests: list) -> List[tuple]:
+    """fn over each request, (True, result) or (False, error) per document (runs in the compute pool)."""
+    results = []
+    for request in requests:
+        try:
+            results.append((True, fn(request)))
+        except Exception as e:
+            results.append((False, _batch_error(e)))
+    return results
+
+def _batch_parts(texts: List[str]) -> List[List[int]]:
+    """Document indices grouped into parts: ~BATCH_PARTS_PER_WORKER per worker, at most BATCH_PART_CHARS each."""
+    target = max(1, -(-len(texts) // (compute_executor.workers * BATCH_PARTS_PER_WORKER)))
+    parts, part, chars = [], [], 0
+    for i, text in enumerate(texts):
+        if part and (len(part) >= target or chars + len(text) > BATCH_PART_CHARS):
+            parts.append(part)
+            part, chars = [], 0
+        part.append(i)
+        chars += len(text)
+    if part:
+        parts.append(part)
+    return parts
+
+async def _iter_batch(name: str, fn, requests: list):
+    """Yield (index, ok, value) per document as parts finish; at most `workers` parts in flight."""
+    limit = asyncio.Semaphore(compute_executor.workers)
+    
+    async def run_part(indices):
+        part = [requests[i] for i in indices]
+        async with limit:
+            for attempt in range(BATCH_PART_RETRIES + 1):
+                try:
+                    return indices, await run_compute(name, _run_batch_part, fn, part)
+                except HTTPException as e:
+                    if e.status_code != 503:
+                        return indices, [(False, _batch_error(e))] * len(indices)
+                    if attempt == BATCH_PART_RETRIES:
+                        raise       # transient, not the documents' fault - fail the batch
+                    retry_after = float((e.headers or {}).get("Retry-After", 1))
+                    await asyncio.sleep(min(max(retry_after, 0.1), BATCH_RETRY_MAX_WAIT))
+    
+    tasks = [asyncio.ensure_future(run_part(indices)) for indices in _batch_parts([r.text for r in requests])]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            indices, results = await finished
+            for index, (ok, value) in zip(indices, results):
+                yield index, ok, value
+    finally:
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                task.exception()    # retrieved: no "never retrieved" warning
+            task.cancel()
+
+def _check_batch(texts: List[str]) -> None:
+    if not texts:
+        raise HTTPException(status_code=400, detail="No texts provided")
+    if len(texts) > MAX_BATCH_DOCUMENTS:
+        raise HTTPException(status_code=413, detail=f"Too many documents: {len(texts)} (max {MAX_BATCH_DOCUMENTS})")
+
+def _batch_format(http_request: Request, format: Optional[str]) -> str:
+    if format == "ndjson" or (format is None and "application/x-ndjson" in http_request.headers.get("accept", "")):
+        return "ndjson"
+    return _response_format(http_request, format)
+
+async def _batch_response(name: str, fn_json, fn_table, requests: list, fmt: str):
+    """Run a batch and answer in fmt (see the section comment)."""
+    start_time = time.time()
+    count = len(requests)
+    
+    if fmt == "ndjson":
+        async def lines():
+            succeeded = 0
+            try:
+                async for index, ok, value in _iter_batch(name, fn_json, requests):
+                    if ok:
+                        succeeded += 1
+                        yield b'{"event":"document","index":%d,"result":' % index + value + b"}\n"
+                    else:
+                        yield _ndjson({"event": "error", "index": index, "error": value})
+            except HTTPException as e:
+                # The status line is already sent - report the 503 in the stream
+                yield _ndjson({"event": "aborted", "error": _batch_error(e), "succeeded": succeeded})
+                return
+            yield _ndjson({
+                "event": "summary",
+                "count": count,
+                "succeeded": succeeded,
+                "processingTime": (time.time() - start_time) * 1000,
+            })
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    if fmt == "json":
+        bodies: List[Optional[bytes]] = [None] * count
+        succeeded = 0
+        async for index, ok, value in _iter_batch(name, fn_json, requests):
+            if ok:
+                succeeded += 1
+                bodies[index] = value
+            else:
+                bodies[index] = _json_body({"error": value})
+        head = _json_body({
+            "count": count,
+            "succeeded": succeeded,
+            "processingTime": (time.time() - start_time) * 1000,
+        })
+        # Splice the pre-encoded per-document bodies in without re-parsing them
+        body = head[:-1] + b',"results":[' + b",".join(bodies) + b"]}"
+        return Response(content=body, media_type="application/json")
+    
+    tables: List[Any] = [None] * count
+    errors: Dict[str, Any] = {}
+    async for index, ok, value in _iter_batch(name, fn_table, requests):
+        if ok:
+            tables[index] = value
+        else:
+            errors[str(index)] = value
+    meta, columns, matrix = _concat_tables(tables)
+    meta.update(count=count, succeeded=count - len(errors), errors=errors,
+                processingTime=(time.time() - start_time) * 1000)
+    return _binary_response(fmt, meta, columns, matrix)
+
+def _concat_tables(tables: List[Any]):
+    """Per-document (meta, columns[, matrix]) tables -> one table with a "document" column."""
+    present = [(i, t) for i, t in enumerate(tables) if t is not None]
+    documents, rows, metas = [], [], {}
+    names: List[str] = []
+    for i, table in present:
+        table_columns = table[1]
+        n = len(next(iter(table_columns.values()))) if table_columns else 0
+        documents.append(np.full(n, i, dtype=np.uint32))
+        rows.append(n)
+        metas[str(i)] = table[0]
+        names = names or list(table_columns)
+    
+    columns: Dict[str, Any] = {"document": np.concatenate(documents) if documents else np.zeros(0, dtype=np.uint32)}
+    for name in names:
+        parts = [t[1][name] for _, t in present]
+        if isinstance(parts[0], np.ndarray):
+            columns[name] = np.concatenate(parts)
+        else:
+            columns[name] = [value for part in parts for value in part]
+    
+    matrix = None
+    if present and len(present[0][1]) > 2:
+        name = present[0][1][2][0]
+        matrix = (name, np.concatenate([t[2][1] for _, t in present]))
+    return {"documents": metas, "rows": rows}, columns, matrix
+
+@app.post("/tokenize/batch")
+async def tokenize_batch(request: BatchTokenizationRequest, http_request: Request, format: Optional[str] = None):
+    """
+    Tokenize many documents with shared options.
+    
+    json: {"count", "succeeded", "processingTime", "results": [<one /tokenize
+    result, or {"error": {...}}> per text, in order]}.
+    ndjson: {"event": "document"|"error", "index", ...} lines as documents
+    finish, then {"event": "summary", ...}.
+    npy / msgpack / arrow: one token table with a "document" column.
+    """
+    _check_batch(request.texts)
+    if TOKENIZERS.get(request.tokenizer_type) is None:
+        raise HTTPException(status_code=400, detail=f"Unknown tokenizer type: {request.tokenizer_type}")
+    fmt = _batch_format(http_request, format)
+    return await _batch_response(
+        "tokenize_batch",
+        functools.partial(_json_body_of, _tokenize_request),
+        _tokenize_table,
+        _tokenization_requests(request),
+        fmt,
+    )
+
+@app.post("/embeddings/generate/batch")
+async def generate_embeddings_batch(request: BatchEmbeddingRequest, http_request: Request, format: Optional[str] = None):
+    """
+    Generate embeddings for many documents with shared options.
+    
+    Same output formats as /tokenize/batch; the binary formats carry all
+    embeddings as one float32 matrix (rows follow the "document" column).
+    """
+    if not EMBEDDINGS_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Embeddings not available. Install: pip install sentence-transformers chromadb"
+        )
+    _check_batch(request.texts)
+    fmt = _batch_format(http_request, format)
+    return await _batch_response(
+        "embeddings_batch",
+        functools.partial(_json_body_of, _generate_embeddings_request),
+        functools.partial(_generate_embeddings_request, as_table=True),
+        _embedding_requests(request),
+        fmt,
+    )
+
 @app.post("/embeddings/search", response_model=SearchResponse)
 async def search_embeddings(request: SearchRequest):
     """Search for similar tokens."""
@@ -1633,9 +2490,8 @@ async def search_embeddings(request: SearchRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
-@app.post("/embeddings/document", response_model=DocumentEmbeddingResponse)
-async def get_document_embedding(request: DocumentEmbeddingRequest):
-    """Generate document-level embedding by aggregating token embeddings."""
+def _document_embedding_request(request: DocumentEmbeddingRequest) -> DocumentEmbeddingResponse:
+    """Generate document-level embedding by aggregating token embeddings (runs in the compute pool)."""
     try:
         if not EMBEDDINGS_AVAILABLE:
             raise HTTPException(
@@ -1692,6 +2548,16 @@ async def get_document_embedding(request: DocumentEmbeddingRequest):
         print(error_details)
         raise HTTPException(status_code=500, detail=f"Failed to generate document embedding: {str(e)}")
 
+@app.post("/embeddings/document", response_model=DocumentEmbeddingResponse)
+async def get_document_embedding(request: DocumentEmbeddingRequest):
+    """Generate document-level embedding by aggregating token embeddings."""
+    if not EMBEDDINGS_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Embeddings not available. Install: pip install sentence-transformers chromadb"
+        )
+    return await run_compute("embeddings_document", _document_embedding_request, request)
+
 @app.get("/embeddings/stats")
 async def get_embedding_stats():
     """Get vector database statistics."""
@@ -2231,89 +3097,175 @@ class DatasetUploadResponse(BaseModel):
     dataset_path: str
     size_mb: float
     filename: str
+    content_sha256: Optional[str] = None
+    duplicate: bool = False  # Same content was uploaded before; dataset_id is that dataset
+    index_job_id: Optional[str] = None  # Job ID of the background indexing job
+
+ALLOWED_DATASET_EXTENSIONS = {'.txt', '.csv', '.json', '.md', '.py', '.js', '.ts', '.html', '.xml'}
+# 0 = no limit
+UPLOAD_MAX_BYTES = int(float(os.getenv("SANTOK_UPLOAD_MAX_MB", "0")) * (1 << 20)) or None
+# Vector store that uploaded datasets are indexed into ("none" = vocabulary counts only)
+UPLOAD_INDEX_BACKEND = os.getenv(
+    "SANTOK_UPLOAD_INDEX_BACKEND", "chroma" if module_available("chromadb") else "none"
+)
 
-@app.post("/training/dataset/upload", response_model=DatasetUploadResponse)
-async def upload_user_dataset(
-    file: UploadFile = File(...),
-    description: Optional[str] = Form(None)
-):
-    """Upload user's own dataset for training."""
+def _dataset_ingest_pipeline(tokenizer, checkpoint_path: str, dataset_id: str):
+    """BulkIngestPipeline for an index job, or None when vector indexing is unavailable/disabled."""
+    if not EMBEDDINGS_AVAILABLE or UPLOAD_INDEX_BACKEND == "none":
+        return None
     try:
-        logging.info(f"[UPLOAD] Starting upload for file: {file.filename}")
-        
-        allowed_extensions = {'.txt', '.csv', '.json', '.md', '.py', '.js', '.ts', '.html', '.xml'}
-        file_ext = Path(file.filename).suffix.lower()
-        
-        if file_ext not in allowed_extensions and (not file.content_type or not file.content_type.startswith('text/')):
-            raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}")
-        
-        logging.info(f"[UPLOAD] File type validated: {file_ext}")
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_hash = hashlib.md5(file.filename.encode()).hexdigest()[:8]
-        dataset_id = f"{timestamp}_{file_hash}"
-        
+        return EMB.BulkIngestPipeline(
+            vector_store=get_vector_store(UPLOAD_INDEX_BACKEND),
+            embedding_generator=get_embedding_generator(),
+            tokenizer=tokenizer,
+            checkpoint_path=checkpoint_path,
+            stream_type="word",
+            dataset_id=dataset_id
+        )
+    except HTTPException as e:
+        logging.warning(f"[UPLOAD] Vector indexing skipped: {e.detail}")
+        return None
+    except Exception as e:
+        # e.g. ImportError from a store whose client library is missing: keep the counts-only index
+        logging.warning(f"[UPLOAD] Vector indexing skipped: {type(e).__name__}: {e}")
+        return None
+
+def _delete_dataset_vectors(dataset_id: str) -> int:
+    """Remove a deleted dataset's vectors (tagged with its dataset_id) from the upload store."""
+    if not EMBEDDINGS_AVAILABLE or UPLOAD_INDEX_BACKEND == "none":
+        return 0
+    return get_vector_store(UPLOAD_INDEX_BACKEND).delete_by_metadata("dataset_id", dataset_id)
+
+dataset_indexer = DatasetIndexer(
+    USER_DATASETS_DIR,
+    tokenizer_factory=lambda: TextTokenizer(seed=42, embedding_bit=False),
+    ingest_factory=_dataset_ingest_pipeline,
+    delete_vectors=_delete_dataset_vectors
+)
+
+def _check_dataset_type(filename: str, content_type: Optional[str]):
+    file_ext = Path(filename).suffix.lower()
+    if file_ext not in ALLOWED_DATASET_EXTENSIONS and (not content_type or not content_type.startswith('text/')):
+        raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_DATASET_EXTENSIONS)}")
+
+def _start_index_job(dataset_id: str, file_path: Path) -> Optional[str]:
+    """Queue incremental indexing of one dataset; returns the job id when the job manager is available."""
+    if get_job_manager is None:
+        dataset_indexer.submit(dataset_id, file_path)
+        return None
+    job_manager = get_job_manager()
+    job_id = job_manager.create_job({"type": "dataset_index", "dataset_id": dataset_id, "file_path": str(file_path)})
+
+    def report(status=None, progress=None, error=None, result=None):
+        updates = {}
+        now = datetime.now(timezone.utc).isoformat()
+        if status == "running":
+            updates.update(status=JobStatus.RUNNING, started_at=now)
+        elif status in ("completed", "failed"):
+            updates.update(status=JobStatus.COMPLETED if status == "completed" else JobStatus.FAILED, completed_at=now)
+            updates["exit_code"] = 0 if status == "completed" else -1
+        if progress is not None:
+            updates["progress"] = progress
+        if error is not None:
+            updates["error"] = error
+        if result is not None:
+            updates["stdout"] = json.dumps(result)
+            updates["execution_time"] = result.get("seconds")
+        job_manager.update_job(job_id, updates)
+
+    dataset_indexer.submit(dataset_id, file_path, report)
+    return job_id
+
+async def _store_user_dataset(chunks, filename: str, content_type: Optional[str], description: Optional[str], index: bool) -> DatasetUploadResponse:
+    """Stream an upload into its dataset directory, dedup it by content hash and queue its index job."""
+    filename = Path(filename).name  # never let the client pick the directory
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_hash = hashlib.md5(filename.encode()).hexdigest()[:8]
+    dataset_id = f"{timestamp}_{file_hash}"
+    # Same file name within the same second: never share (or later delete) another upload's directory
+    suffix = 0
+    while True:
         user_dataset_dir = USER_DATASETS_DIR / dataset_id
-        user_dataset_dir.mkdir(parents=True, exist_ok=True)
-        logging.info(f"[UPLOAD] Created directory: {user_dataset_dir}")
-        
-        safe_filename = f"{dataset_id}_{file.filename}"
-        file_path = user_dataset_dir / safe_filename
-        
-        # Read file in chunks to avoid memory issues
-        logging.info(f"[UPLOAD] Reading file content...")
-        content = await file.read()
-        file_size = len(content)
-        logging.info(f"[UPLOAD] File size: {file_size} bytes ({file_size / (1024 * 1024):.2f} MB)")
-        
-        # Write file
-        logging.info(f"[UPLOAD] Writing file to: {file_path}")
-        with open(file_path, 'wb') as f:
-            f.write(content)
-        
-        size_mb = file_size / (1024 * 1024)
-        logging.info(f"[UPLOAD] File written successfully")
-        
-        # Create metadata
-        metadata = {
-            'dataset_id': dataset_id,
-            'original_filename': file.filename,
-            'filename': safe_filename,
-            'size_bytes': file_size,
-            'size_mb': size_mb,
-            'uploaded_at': datetime.now().isoformat(),
-            'description': description,
-            'file_path': str(file_path),
-            'content_type': file.content_type
-        }
-        
-        metadata_path = user_dataset_dir / 'metadata.json'
-        logging.info(f"[UPLOAD] Writing metadata...")
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
-        
-        # Append to combined file (async, don't block)
-        combined_path = USER_DATASETS_DIR / "all_user_datasets.txt"
         try:
-            logging.info(f"[UPLOAD] Appending to combined file...")
-            with open(combined_path, 'ab') as f:  # Use binary mode for faster writing
-                header = f"\n\n=== Dataset: {file.filename} (ID: {dataset_id}) ===\n".encode('utf-8')
-                f.write(header)
-                f.write(content)  # Write binary content directly
-        except Exception as e:
-            logging.warning(f"[UPLOAD] Could not append to combined file: {e}")
-            # Don't fail the upload if combined file write fails
-        
-        logging.info(f"[UPLOAD] Upload complete: {dataset_id}")
-        
+            user_dataset_dir.mkdir(parents=True)
+            break
+        except FileExistsError:
+            suffix += 1
+            dataset_id = f"{timestamp}_{file_hash}_{suffix}"
+    safe_filename = f"{dataset_id}_{filename}"
+    file_path = user_dataset_dir / safe_filename
+    
+    try:
+        file_size, content_sha256 = await stream_to_file(chunks, file_path, max_bytes=UPLOAD_MAX_BYTES)
+    except UploadTooLargeError as e:
+        shutil.rmtree(user_dataset_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    except BaseException:
+        shutil.rmtree(user_dataset_dir, ignore_errors=True)
+        raise
+    size_mb = file_size / (1024 * 1024)
+    logging.info(f"[UPLOAD] Received {file_size} bytes ({size_mb:.2f} MB), sha256 {content_sha256[:12]}")
+    
+    existing_id = await dataset_indexer.claim_async(content_sha256, dataset_id)
+    if existing_id is not None:
+        shutil.rmtree(user_dataset_dir, ignore_errors=True)
+        existing_metadata = USER_DATASETS_DIR / existing_id / 'metadata.json'
+        existing = json.loads(existing_metadata.read_text(encoding='utf-8')) if existing_metadata.exists() else {}
+        logging.info(f"[UPLOAD] Duplicate of {existing_id}, not stored again")
         return DatasetUploadResponse(
             success=True,
-            message=f"Dataset uploaded successfully",
-            dataset_id=dataset_id,
-            dataset_path=str(file_path),
-            size_mb=size_mb,
-            filename=file.filename
+            message=f"Dataset already uploaded as {existing_id}",
+            dataset_id=existing_id,
+            dataset_path=existing.get('file_path', str(USER_DATASETS_DIR / existing_id)),
+            size_mb=existing.get('size_mb', size_mb),
+            filename=existing.get('original_filename', filename),
+            content_sha256=content_sha256,
+            duplicate=True
         )
+    
+    # Create metadata
+    metadata = {
+        'dataset_id': dataset_id,
+        'original_filename': filename,
+        'filename': safe_filename,
+        'size_bytes': file_size,
+        'size_mb': size_mb,
+        'uploaded_at': datetime.now().isoformat(),
+        'description': description,
+        'file_path': str(file_path),
+        'content_type': content_type,
+        'content_sha256': content_sha256
+    }
+    with open(user_dataset_dir / 'metadata.json', 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    
+    # Tokenizing, vocabulary counts, vector store and the combined file are
+    # updated for this dataset only, in the background
+    index_job_id = _start_index_job(dataset_id, file_path) if index else None
+    logging.info(f"[UPLOAD] Upload complete: {dataset_id}")
+    
+    return DatasetUploadResponse(
+        success=True,
+        message="Dataset uploaded successfully" + (", indexing in background" if index else ""),
+        dataset_id=dataset_id,
+        dataset_path=str(file_path),
+        size_mb=size_mb,
+        filename=filename,
+        content_sha256=content_sha256,
+        index_job_id=index_job_id
+    )
+
+@app.post("/training/dataset/upload", response_model=DatasetUploadResponse)
+async def upload_user_dataset(
+    file: UploadFile = File(...),
+    description: Optional[str] = Form(None),
+    index: bool = Form(True)
+):
+    """Upload user's own dataset for training (multipart form)."""
+    try:
+        logging.info(f"[UPLOAD] Starting upload for file: {file.filename}")
+        _check_dataset_type(file.filename, file.content_type)
+        return await _store_user_dataset(iter_upload(file), file.filename, file.content_type, description, index)
     except HTTPException:
         raise
     except Exception as e:
@@ -2324,6 +3276,34 @@ async def upload_user_dataset(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
 
+@app.post("/training/dataset/upload/stream", response_model=DatasetUploadResponse)
+async def upload_user_dataset_stream(
+    http_request: Request,
+    filename: str,
+    description: Optional[str] = None,
+    index: bool = True
+):
+    """
+    Upload a dataset as the raw request body (no multipart), written to disk
+    chunk by chunk as it arrives:
+        curl -X POST --data-binary @corpus.txt "http://host/training/dataset/upload/stream?filename=corpus.txt"
+    """
+    try:
+        logging.info(f"[UPLOAD] Starting streamed upload for file: {filename}")
+        content_type = http_request.headers.get("content-type")
+        _check_dataset_type(filename, content_type)
+        return await _store_user_dataset(http_request.stream(), filename, content_type, description, index)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"[UPLOAD] Streamed upload failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+
+@app.get("/training/dataset/index/stats")
+async def dataset_index_stats():
+    """Incremental dataset index: indexed datasets, vocabulary size and pending index jobs."""
+    return dataset_indexer.stats()
+
 @app.get("/training/dataset/user/list", response_model=UserDatasetListResponse)
 async def list_user_datasets():
     """List all user-uploaded datasets."""
@@ -2394,6 +3374,8 @@ async def delete_user_dataset(dataset_id: str):
         dataset_dir = USER_DATASETS_DIR / dataset_id
         if not dataset_dir.exists():
             raise HTTPException(status_code=404, detail=f"Dataset not found: {dataset_id}")
+        # Vector deletion may be a network round trip - keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, dataset_indexer.forget, dataset_id)
         shutil.rmtree(dataset_dir)
         return {"success": True, "message": f"Dataset {dataset_id} deleted successfully"}
     except HTTPException:
@@ -2537,6 +3519,21 @@ async def download_dataset(request: DatasetDownloadRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Dataset download failed: {str(e)}")
 
+def _build_vocabulary_sync(request: VocabularyBuildRequest):
+    """Build and save the vocabulary in-process; returns (vocab_path, vocab_size, total_tokens)."""
+    try:
+        from training.vocabulary_builder import SanTOKVocabularyBuilder
+    except ImportError:
+        from src.training.vocabulary_builder import SanTOKVocabularyBuilder
+    
+    vocab_builder = SanTOKVocabularyBuilder(vocab_size=request.vocab_size, min_frequency=request.min_frequency, tokenizer_seed=request.tokenizer_seed)
+    vocab_builder.build_vocabulary(Path(request.dataset_path))
+    
+    vocab_path = Path("models/santok_60k_vocab.pkl")
+    vocab_path.parent.mkdir(parents=True, exist_ok=True)
+    vocab_builder.save(vocab_path)
+    return str(vocab_path), len(vocab_builder.token_to_id), sum(vocab_builder.token_counts.values())
+
 @app.post("/training/vocabulary/build", response_model=VocabularyBuildResponse)
 async def build_vocabulary(request: VocabularyBuildRequest):
     """Build 60K vocabulary from SanTOK tokens (runs as persistent job)."""
@@ -2609,7 +3606,7 @@ print("="*60)
                 vocab_script.rename(vocab_script_renamed)
             
             # Now start the job with the job_id from create_job
-            job_manager.start_job(job_id, str(vocab_script_renamed), work_dir, timeout=86400)
+            job_manager.start_job(job_id, str(vocab_script_renamed), work_dir, timeout=86400, priority=JobPriority.LOW)
             
             return VocabularyBuildResponse(
                 success=True,
@@ -2620,7 +3617,7 @@ print("="*60)
                 job_id=job_id
             )
         else:
-            # Fallback to synchronous execution
+            # Fallback: build in-process (in the compute pool)
             try:
                 from training.vocabulary_builder import SanTOKVocabularyBuilder
             except ImportError:
@@ -2629,19 +3626,17 @@ print("="*60)
                 except ImportError:
                     raise HTTPException(status_code=503, detail="Vocabulary builder not available.")
             
-            vocab_builder = SanTOKVocabularyBuilder(vocab_size=request.vocab_size, min_frequency=request.min_frequency, tokenizer_seed=request.tokenizer_seed)
-            vocab_builder.build_vocabulary(dataset_path)
-            
-            vocab_path = Path("models/santok_60k_vocab.pkl")
-            vocab_path.parent.mkdir(parents=True, exist_ok=True)
-            vocab_builder.save(vocab_path)
+            # Can take minutes - no timeout, but never on the event loop
+            vocab_path, vocab_size, total_tokens = await run_compute(
+                "vocabulary_build", _build_vocabulary_sync, request, timeout=None
+            )
             
             return VocabularyBuildResponse(
                 success=True,
                 message="Vocabulary built successfully",
-                vocab_path=str(vocab_path),
-                vocab_size=len(vocab_builder.token_to_id),
-                total_tokens=sum(vocab_builder.token_counts.values())
+                vocab_path=vocab_path,
+                vocab_size=vocab_size,
+                total_tokens=total_tokens
             )
     except HTTPException:
         raise
@@ -2737,7 +3732,7 @@ print("Training complete!")
                 training_script.rename(training_script_renamed)
             
             # Now start the job with the job_id from create_job
-            job_manager.start_job(job_id, str(training_script_renamed), work_dir, timeout=86400)
+            job_manager.start_job(job_id, str(training_script_renamed), work_dir, timeout=86400, priority=JobPriority.LOW)
             
             return ModelTrainResponse(success=True, message="Training started", job_id=job_id, model_path=f"models/santok_lm_epoch_{request.epochs}.pkl")
         else:
@@ -3275,7 +4270,7 @@ async def execute_code(code_request: CodeExecutionRequest, http_request: Request
             job_id = job_manager.create_job(job_data)
             
             # Start job execution
-            job_manager.start_job(job_id, script_path, work_dir, code_request.timeout)
+            job_manager.start_job(job_id, script_path, work_dir, code_request.timeout, priority=JobPriority.HIGH)
             
             # Return job ID immediately
             return CodeExecutionResponse(
@@ -3608,44 +4603,121 @@ async def list_training_jobs():
         return {"jobs": [], "total": 0}
     
     job_manager = get_job_manager()
-    all_jobs = []
     
-    # Get all jobs from the jobs directory
-    jobs_dir = Path("jobs")
-    if jobs_dir.exists():
-        for job_file in jobs_dir.glob("*.json"):
-            try:
-                with open(job_file, 'r', encoding='utf-8') as f:
-                    job_data = json.load(f)
-                    # Filter for training-related jobs
-                    script_path = job_data.get("data", {}).get("script_path", "")
-                    job_id = job_data.get("job_id", "")
-                    # Check if it's a training job
-                    if ("training_scripts" in script_path or 
-                        "vocab" in script_path.lower() or 
-                        "train" in script_path.lower() or
-                        "vocab" in job_id.lower() or
-                        "train" in job_id.lower()):
-                        all_jobs.append({
-                            "job_id": job_data.get("job_id"),
-                            "status": job_data.get("status"),
-                            "progress": job_data.get("progress", 0),
-                            "created_at": job_data.get("created_at"),
-                            "started_at": job_data.get("started_at"),
-                            "completed_at": job_data.get("completed_at"),
-                            "stdout": job_data.get("stdout", "")[-1000:],  # Last 1000 chars
-                            "stderr": job_data.get("stderr", "")[-500:],
-                            "error": job_data.get("error"),
-                            "execution_time": job_data.get("execution_time")
-                        })
-            except Exception:
-                continue
+    def is_training_job(job_data):
+        # Filter for training-related jobs
+        script_path = job_data.get("data", {}).get("script_path", "")
+        job_id = job_data.get("job_id", "")
+        return (job_data.get("data", {}).get("type") == "dataset_index" or
+                "training_scripts" in script_path or
+                "vocab" in script_path.lower() or
+                "train" in script_path.lower() or
+                "vocab" in job_id.lower() or
+                "train" in job_id.lower())
     
-    # Sort by created_at (newest first)
-    all_jobs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    # In-memory job state, newest first
+    all_jobs = [
+        {
+            "job_id": job_data.get("job_id"),
+            "status": job_data.get("status"),
+            "progress": job_data.get("progress", 0),
+            "created_at": job_data.get("created_at"),
+            "started_at": job_data.get("started_at"),
+            "completed_at": job_data.get("completed_at"),
+            "stdout": (job_data.get("stdout") or "")[-1000:],  # Last 1000 chars
+            "stderr": (job_data.get("stderr") or "")[-500:],
+            "error": job_data.get("error"),
+            "execution_time": job_data.get("execution_time")
+        }
+        for job_data in job_manager.list_jobs(is_training_job)
+    ]
     
     return {"jobs": all_jobs, "total": len(all_jobs)}
 
+@app.get("/execute/jobs/stats")
+async def job_manager_stats():
+    """Job counts by status, running / queued jobs and worker slots"""
+    if get_job_manager is None:
+        raise HTTPException(status_code=503, detail="Job manager not available")
+    return get_job_manager().stats()
+
+# Queued events per job websocket; output beyond this is dropped for slow clients
+JOB_EVENTS_BUFFER = 1000
+
+def _job_finished(job: Dict[str, Any]) -> bool:
+    """Terminal and nothing more to come: the exit code is in, or the job never started."""
+    return job.get("status") in TERMINAL_STATUSES and (job.get("exit_code") is not None or not job.get("started_at"))
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """Return once the client closes the socket (anything it sends is ignored)."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+@app.websocket("/ws/jobs/{job_id}")
+async def websocket_job_updates(websocket: WebSocket, job_id: str):
+    """
+    Push a job's status, progress and output as they change, instead of
+    polling /execute/job/{job_id}. Sends {"type": "snapshot", "job": ...}
+    first, then "update" / "output" events, and closes after the update that
+    carries the exit code (a cancelled job's output and exit code arrive
+    after its "cancelled" status) or when the client goes away.
+    """
+    await websocket.accept()
+    if get_job_manager is None:
+        await websocket.send_text(json.dumps({"type": "error", "message": "Job manager not available"}))
+        await websocket.close()
+        return
+    
+    job_manager = get_job_manager()
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue(maxsize=JOB_EVENTS_BUFFER)
+    
+    def offer(event):
+        try:
+            events.put_nowait(event)
+        except asyncio.QueueFull:
+            if event.get("type") == "update":
+                # Status changes must arrive; make room by dropping the oldest event
+                events.get_nowait()
+                events.put_nowait(event)
+    
+    # Subscribe before the snapshot so no change falls in between
+    disconnected = None
+    token = job_manager.subscribe(job_id, lambda event: loop.call_soon_threadsafe(offer, event))
+    try:
+        job = job_manager.get_job(job_id)
+        if job is None:
+            await websocket.send_text(json.dumps({"type": "error", "message": f"Job {job_id} not found"}))
+            return
+        await websocket.send_text(json.dumps({"type": "snapshot", "job": job}, default=str))
+        state = dict(job)
+        # Waiting on events alone would never notice the client leaving
+        disconnected = asyncio.ensure_future(_wait_disconnect(websocket))
+        while not _job_finished(state):
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                break
+            event = getter.result()
+            await websocket.send_text(json.dumps(event, default=str))
+            if event.get("type") == "update":
+                state.update(event["updates"])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if disconnected is not None:
+            if disconnected.done() and not disconnected.cancelled():
+                disconnected.exception()    # e.g. receive() on a closed socket; nothing to report
+            disconnected.cancel()
+        job_manager.unsubscribe(token)
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
 # WebSocket endpoint for interactive code execution (like VSCode)
 @app.websocket("/ws/execute")
 async def websocket_execute(websocket: WebSocket):
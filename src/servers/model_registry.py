@@ -0,0 +1,272 @@
+"""
+Model Registry for embedding generators, vector stores and pipelines
+Keeps several configurations warm at once (keyed by their configuration)
+instead of one global instance that is rebuilt whenever a request asks for
+a different strategy / dimension / model file
+
+- Thread-safe: a key is built once even when many threads ask for it at
+  the same time; different keys load in parallel
+- LRU eviction by estimated memory footprint (NumPy arrays and torch
+  parameters reachable from the instance, minus other registry entries it
+  holds, e.g. a pipeline's generator and store) and entry count
+- Pinned entries (vector stores, whose in-memory data must survive) are
+  never evicted
+- preload() builds configurations in a background thread
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Containers larger than this are sampled when estimating footprints
+_SAMPLE_ITEMS = 256
+
+
+def estimate_nbytes(obj: Any, exclude: Iterable[Any] = (), max_depth: int = 6) -> int:
+    """
+    Approximate memory held by obj: NumPy arrays, torch parameters/buffers
+    and bytes-like objects reachable through attributes and containers.
+    Objects in exclude (and what only they reach) are not counted.
+    Large containers are sampled and extrapolated.
+    """
+    seen = {id(value) for value in exclude}
+    seen.discard(id(obj))
+
+    def walk(value: Any, depth: int) -> int:
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return 0
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        nbytes = getattr(value, "nbytes", None)
+        if isinstance(nbytes, int) and hasattr(value, "dtype"):
+            return nbytes                               # ndarray
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return len(value)
+        parameters = getattr(value, "parameters", None)
+        if callable(parameters) and hasattr(value, "buffers"):
+            try:                                        # torch.nn.Module
+                tensors = list(parameters()) + list(value.buffers())
+                return sum(t.numel() * t.element_size() for t in tensors)
+            except Exception:
+                return 0
+        if depth >= max_depth:
+            return 0
+        if isinstance(value, dict):
+            items = list(value.values()) if len(value) <= _SAMPLE_ITEMS else None
+            if items is None:
+                sample = [v for _, v in zip(range(_SAMPLE_ITEMS), value.values())]
+                return sum(walk(v, depth + 1) for v in sample) * len(value) // _SAMPLE_ITEMS + sys.getsizeof(value)
+            return sum(walk(v, depth + 1) for v in items) + sys.getsizeof(value)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            if len(value) > _SAMPLE_ITEMS:
+                sample = [v for _, v in zip(range(_SAMPLE_ITEMS), value)]
+                return sum(walk(v, depth + 1) for v in sample) * len(value) // _SAMPLE_ITEMS + sys.getsizeof(value)
+            return sum(walk(v, depth + 1) for v in value) + sys.getsizeof(value)
+        attrs = getattr(value, "__dict__", None)
+        if isinstance(attrs, dict):
+            return sum(walk(v, depth + 1) for v in attrs.values())
+        return 0
+
+    return walk(obj, 0)
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "pinned", "hits", "load_seconds", "loaded_at")
+
+    def __init__(self, value: Any, nbytes: int, pinned: bool, load_seconds: float):
+        self.value = value
+        self.nbytes = nbytes
+        self.pinned = pinned
+        self.hits = 0
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+
+
+class ModelRegistry:
+    """
+    Warm instances keyed by configuration.
+
+    Example:
+        registry = ModelRegistry(max_bytes=2 << 30)
+        gen = registry.get(("generator", "semantic", 768, path),
+                           lambda: SanTOKEmbeddingGenerator(strategy="semantic", ...))
+        registry.preload([(key, factory), ...])      # background thread
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = 2 << 30,
+        max_entries: int = 16,
+        estimate: Callable[[Any, Iterable[Any]], int] = estimate_nbytes,
+    ):
+        """
+        Args:
+            max_bytes: Footprint budget of unpinned entries (None = unbounded)
+            max_entries: Unpinned entry limit
+            estimate: Footprint estimator for new entries, called as
+                estimate(value, exclude) with the instances already in the
+                registry, which are accounted for by their own entries
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max(1, max_entries)
+        self.estimate = estimate
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.loads = 0
+        self.load_failures = 0
+        self.evictions = 0
+
+        # A fork while another thread holds a lock would leave it locked forever in the child
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_locks)
+
+    @classmethod
+    def from_env(cls, prefix: str = "SANTOK_MODELS", **kwargs) -> "ModelRegistry":
+        """
+        Build from environment variables:
+        {prefix}_MAX_MB (0 = unbounded), {prefix}_MAX_ENTRIES
+        """
+        max_mb = float(os.getenv(f"{prefix}_MAX_MB", "2048"))
+        return cls(
+            max_bytes=int(max_mb * (1 << 20)) if max_mb > 0 else None,
+            max_entries=int(os.getenv(f"{prefix}_MAX_ENTRIES", "16")),
+            **kwargs,
+        )
+
+    def _reset_locks(self) -> None:
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key: Hashable, factory: Callable[[], Any], pinned: bool = False) -> Any:
+        """Instance for key, built with factory() on first use. Factory errors are not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                self.hits += 1
+                return entry.value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:               # built by the thread we waited for
+                    self._entries.move_to_end(key)
+                    entry.hits += 1
+                    self.hits += 1
+                    return entry.value
+            started = time.perf_counter()
+            try:
+                value = factory()
+            except BaseException:
+                with self._lock:
+                    self.load_failures += 1
+                    # Nothing was cached; the next caller builds with a fresh lock
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+                raise
+            load_seconds = time.perf_counter() - started
+            with self._lock:
+                held = [e.value for e in self._entries.values()]
+            try:
+                nbytes = self.estimate(value, held)
+            except Exception:
+                nbytes = 0
+            with self._lock:
+                self._entries[key] = _Entry(value, nbytes, pinned, load_seconds)
+                self.loads += 1
+                self._evict(keep=key)
+            logger.info(f"[MODELS] Loaded {key!r} in {load_seconds:.2f}s (~{nbytes / (1 << 20):.1f} MB)")
+            return value
+
+    def _evict(self, keep: Hashable) -> None:
+        """Drop least recently used unpinned entries while over budget (lock held)."""
+        while True:
+            unpinned = [(k, e) for k, e in self._entries.items() if not e.pinned]
+            total = sum(e.nbytes for _, e in unpinned)
+            over_bytes = self.max_bytes is not None and total > self.max_bytes
+            if not (over_bytes or len(unpinned) > self.max_entries):
+                return
+            victim = next((k for k, _ in unpinned if k != keep), None)
+            if victim is None:
+                return
+            del self._entries[victim]
+            self._key_locks.pop(victim, None)
+            self.evictions += 1
+            logger.info(f"[MODELS] Evicted {victim!r}")
+
+    def evict(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._key_locks.pop(key, None)
+                self.evictions += 1
+            return entry is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+    def preload(self, items: Iterable[Tuple[Hashable, Callable[[], Any]]], background: bool = True) -> Optional[threading.Thread]:
+        """Build (key, factory) pairs now or in a daemon thread; failures are logged, not raised."""
+        items = list(items)
+
+        def load_all():
+            for key, factory in items:
+                try:
+                    self.get(key, factory)
+                except Exception as e:
+                    logger.warning(f"[MODELS] Preloading {key!r} failed: {e}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="santok-model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries: List[Dict[str, Any]] = [
+                {
+                    "key": repr(key),
+                    "mb": round(e.nbytes / (1 << 20), 2),
+                    "pinned": e.pinned,
+                    "hits": e.hits,
+                    "load_seconds": round(e.load_seconds, 3),
+                    "loaded_at": e.loaded_at,
+                }
+                for key, e in reversed(self._entries.items())   # most recently used first
+            ]
+            unpinned_bytes = sum(e.nbytes for e in self._entries.values() if not e.pinned)
+            return {
+                "entries": len(self._entries),
+                "mb": round(sum(e.nbytes for e in self._entries.values()) / (1 << 20), 2),
+                "evictable_mb": round(unpinned_bytes / (1 << 20), 2),
+                "max_mb": round(self.max_bytes / (1 << 20), 2) if self.max_bytes is not None else None,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "loads": self.loads,
+                "load_failures": self.load_failures,
+                "evictions": self.evictions,
+                "models": entries,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ModelRegistry(entries={len(self._entries)}, max_bytes={self.max_bytes})"
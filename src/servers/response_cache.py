@@ -0,0 +1,371 @@
+"""
+Response Cache for deterministic endpoints
+/tokenize, /analyze, /compress, /validate and /decode depend only on the
+request (text + options), so their encoded JSON bodies are cached by a hash
+of the normalized request
+
+- Memory tier: LRU bounded by total body bytes and entry count
+- Disk tier (optional): one file per body in a directory that several
+  server processes can share; writes are atomic (temp file + rename) and
+  the oldest files are pruned past a size limit
+- Single-flight: concurrent identical requests wait for the one computation
+  in progress instead of each running it
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when cached bodies change shape, so old disk entries are not served
+CACHE_VERSION = "1"
+
+# Outcome of get_or_compute (also sent as the X-Cache response header)
+HIT = "hit"
+DISK_HIT = "disk-hit"
+SHARED = "shared"
+MISS = "miss"
+
+# Temp files of a disk write in progress (this or another process); only
+# ones this old are taken for leftovers of a crashed writer and removed
+TMP_PREFIX = ".tmp-"
+STALE_TMP_SECONDS = 3600
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of response bodies (bytes).
+
+    Example:
+        cache = ResponseCache(max_bytes=256 << 20, disk_dir="/var/cache/santok")
+        key = cache.key("tokenize", {"tokenizer_type": "word", "seed": 42}, text)
+        body, outcome = await cache.get_or_compute("tokenize", key, compute_body)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 << 20,
+        max_entries: int = 4096,
+        max_entry_bytes: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 2 << 30,
+    ):
+        """
+        Args:
+            max_bytes: Memory tier budget (0 disables the memory tier)
+            max_entries: Memory tier entry limit
+            max_entry_bytes: Larger bodies skip the memory tier (default max_bytes // 8)
+            disk_dir: Directory of the disk tier (None disables it)
+            disk_max_bytes: Disk tier budget; oldest files are pruned beyond it
+        """
+        self.max_bytes = max(0, max_bytes)
+        self.max_entries = max(0, max_entries)
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else self.max_bytes // 8
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._disk_written = 0
+        # Disk tier usage, kept up to date by disk_put and resynced by prune_disk
+        # (other processes sharing the directory only show up at the resync)
+        self._disk_entries = 0
+        self._disk_bytes = 0
+        self._disk_synced = False
+
+        self.evictions = 0
+        self.disk_errors = 0
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+        if disk_dir:
+            try:
+                os.makedirs(disk_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"[CACHE] Disk tier disabled, cannot create {disk_dir}: {e}")
+                self.disk_dir = None
+
+    @classmethod
+    def from_env(cls, prefix: str = "SANTOK_CACHE", **kwargs) -> "ResponseCache":
+        """
+        Build from environment variables:
+        {prefix}_MAX_MB (0 = no memory tier), {prefix}_MAX_ENTRIES,
+        {prefix}_DIR (disk tier, off when unset), {prefix}_DISK_MAX_MB
+        """
+        return cls(
+            max_bytes=int(float(os.getenv(f"{prefix}_MAX_MB", "256")) * (1 << 20)),
+            max_entries=int(os.getenv(f"{prefix}_MAX_ENTRIES", "4096")),
+            disk_dir=os.getenv(f"{prefix}_DIR") or None,
+            disk_max_bytes=int(float(os.getenv(f"{prefix}_DISK_MAX_MB", "2048")) * (1 << 20)),
+            **kwargs,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_bytes and self.max_entries) or bool(self.disk_dir)
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, Any], content: Union[str, bytes] = b"") -> str:
+        """
+        Hash of the normalized request: endpoint, options (key order does not
+        matter) and the content (text / tokens) hashed as bytes.
+        """
+        h = hashlib.sha256()
+        h.update(f"{CACHE_VERSION}\0{endpoint}\0".encode("utf-8"))
+        h.update(json.dumps(params, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+        h.update(b"\0")
+        h.update(content.encode("utf-8", "surrogatepass") if isinstance(content, str) else content)
+        return h.hexdigest()
+
+    # ==================== MEMORY TIER ====================
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_entry_bytes or not self.max_entries:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = body
+            self._bytes += len(body)
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # ==================== DISK TIER ====================
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def disk_get(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+            os.utime(path)  # mtime = last use, for pruning
+            return body
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.disk_errors += 1
+            logger.warning(f"[CACHE] Disk read failed for {key}: {e}")
+            return None
+
+    def disk_put(self, key: str, body: bytes) -> None:
+        if not self.disk_dir or len(body) > self.disk_max_bytes // 8:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = None
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=TMP_PREFIX)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(body)
+                os.replace(tmp, path)  # readers in other processes never see a partial file
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            self.disk_errors += 1
+            logger.warning(f"[CACHE] Disk write failed for {key}: {e}")
+            return
+        with self._lock:
+            if replaced is None:
+                self._disk_entries += 1
+                self._disk_bytes += len(body)
+            else:
+                self._disk_bytes += len(body) - replaced
+            self._disk_written += len(body)
+            due = self._disk_written >= self.disk_max_bytes // 10
+            if due:
+                self._disk_written = 0
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """
+        Delete least recently used files until the disk tier is under 90% of
+        its budget, and temp files left behind by crashed writers. Temp files
+        younger than STALE_TMP_SECONDS may still be written and are kept.
+        """
+        if not self.disk_dir:
+            return 0
+        files = []
+        total = 0
+        removed = 0
+        stale_before = time.time() - STALE_TMP_SECONDS
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if name.startswith(TMP_PREFIX):
+                    if st.st_mtime < stale_before:
+                        try:
+                            os.unlink(path)
+                            removed += 1
+                        except OSError:
+                            pass
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        count = len(files)
+        if total > self.disk_max_bytes:
+            target = self.disk_max_bytes * 0.9
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                    count -= 1
+                    removed += 1
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_entries, self._disk_bytes = count, total
+            self._disk_synced = True
+        return removed
+
+    def _disk_usage(self) -> Tuple[int, int]:
+        """(files, bytes) of the disk tier; walks it only the first time."""
+        if not self.disk_dir:
+            return 0, 0
+        if not self._disk_synced:
+            self.prune_disk()
+        with self._lock:
+            return self._disk_entries, self._disk_bytes
+
+    # ==================== LOOKUP ====================
+
+    def _count(self, endpoint: str, outcome: str) -> None:
+        counters = self._counters.get(endpoint)
+        if counters is None:
+            counters = self._counters.setdefault(endpoint, {HIT: 0, DISK_HIT: 0, SHARED: 0, MISS: 0})
+        counters[outcome] += 1
+
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        key: str,
+        compute: Callable[[], Awaitable[bytes]],
+    ) -> Tuple[bytes, str]:
+        """
+        Cached body for key, or compute() it once however many identical
+        requests arrive meanwhile. Returns (body, outcome), outcome being
+        "hit", "disk-hit", "shared" or "miss". Exceptions are not cached.
+        """
+        body = self.get(key)
+        if body is not None:
+            self._count(endpoint, HIT)
+            return body, HIT
+
+        loop = asyncio.get_running_loop()
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                body = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise       # this request was cancelled
+                continue        # the computing request went away - take over
+            self._count(endpoint, SHARED)
+            return body, SHARED
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            if self.disk_dir:
+                body = await loop.run_in_executor(None, self.disk_get, key)
+                if body is not None:
+                    self.put(key, body)
+                    self._count(endpoint, DISK_HIT)
+                    future.set_result(body)
+                    return body, DISK_HIT
+
+            body = await compute()
+            self.put(key, body)
+            if self.disk_dir:
+                await loop.run_in_executor(None, self.disk_put, key, body)
+            self._count(endpoint, MISS)
+            future.set_result(body)
+            return body, MISS
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; no "never retrieved" warning
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        totals = {HIT: 0, DISK_HIT: 0, SHARED: 0, MISS: 0}
+        for counters in self._counters.values():
+            for outcome, n in counters.items():
+                totals[outcome] += n
+        requests = sum(totals.values())
+        disk_entries, disk_bytes = self._disk_usage()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "inflight": len(self._inflight),
+                "hits": totals[HIT],
+                "disk_hits": totals[DISK_HIT],
+                "shared": totals[SHARED],
+                "misses": totals[MISS],
+                "hit_ratio": round((requests - totals[MISS]) / requests, 4) if requests else 0.0,
+                "disk": {
+                    "dir": self.disk_dir,
+                    "entries": disk_entries,
+                    "bytes": disk_bytes,
+                    "max_bytes": self.disk_max_bytes if self.disk_dir else 0,
+                    "errors": self.disk_errors,
+                },
+                "endpoints": {name: dict(counters) for name, counters in self._counters.items()},
+            }
+
+    def __repr__(self) -> str:
+        return (f"ResponseCache(entries={len(self._entries)}, bytes={self._bytes}/{self.max_bytes}, "
+                f"disk={self.disk_dir!r})")
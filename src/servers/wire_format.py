@@ -0,0 +1,257 @@
+"""
+Binary wire formats for API responses
+Embeddings and per-token arrays go out as raw little-endian buffers taken
+straight from NumPy arrays instead of one JSON number per value
+
+A response is a small table:
+    meta     scalar fields (token count, timings, ...)
+    columns  name -> 1-D array (or list of str), one row per token
+    matrix   optional (name, 2-D float32 array), e.g. the embeddings
+
+Formats (negotiated from ?format= or the Accept header):
+    json     application/json                      (default, handled by FastAPI)
+    npy      application/x-npz                     NumPy .npz archive (uncompressed): meta, every
+                                                   column and the matrix, one array each
+    msgpack  application/x-msgpack                 meta + columns + matrix, arrays as raw bin buffers
+    arrow    application/vnd.apache.arrow.stream   one RecordBatch, matrix as FixedSizeList<float32>
+
+msgpack and arrow need the optional `msgpack` / `pyarrow` packages.
+
+Every format carries the whole table, so none loses anything against JSON.
+In the npy archive (np.load / decode_npz) meta is a UTF-8 JSON byte array
+named "meta" and a text column <name> is stored as "<name>.utf8" (the
+strings' UTF-8 bytes back to back) plus "<name>.offsets" (int64, one
+more than the rows; row i is utf8[offsets[i]:offsets[i + 1]]).
+"""
+
+import io
+import json
+import struct
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ARROW_AVAILABLE = False
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "npy": "application/x-npz",
+    "msgpack": "application/x-msgpack",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Accept values clients commonly send for the same formats
+_ALIASES = {
+    "application/octet-stream": "npy",
+    "application/x-npy": "npy",
+    "application/msgpack": "msgpack",
+    "application/vnd.apache.arrow.file": "arrow",
+    "application/x-arrow": "arrow",
+}
+
+_BY_MEDIA_TYPE = {media: fmt for fmt, media in MEDIA_TYPES.items()}
+_BY_MEDIA_TYPE.update(_ALIASES)
+
+Column = Union[np.ndarray, List[str]]
+
+
+class UnsupportedFormatError(ValueError):
+    """Requested format is unknown or its optional dependency is missing (-> 406)."""
+
+
+def available_formats() -> List[str]:
+    formats = ["json", "npy"]
+    if MSGPACK_AVAILABLE:
+        formats.append("msgpack")
+    if ARROW_AVAILABLE:
+        formats.append("arrow")
+    return formats
+
+
+def negotiate(accept: Optional[str] = None, requested: Optional[str] = None) -> str:
+    """
+    Pick the response format.
+
+    An explicit ?format= wins; otherwise the first Accept entry (by q value)
+    that maps to a known format. Defaults to json.
+
+    Raises:
+        UnsupportedFormatError: the explicit format is unknown or unavailable
+    """
+    if requested:
+        fmt = requested.lower()
+        fmt = _BY_MEDIA_TYPE.get(fmt, fmt)
+        if fmt not in MEDIA_TYPES:
+            raise UnsupportedFormatError(f"Unknown format: {requested}. Available: {', '.join(available_formats())}")
+        if fmt not in available_formats():
+            raise UnsupportedFormatError(f"Format '{fmt}' needs the optional '{'pyarrow' if fmt == 'arrow' else fmt}' package")
+        return fmt
+    if not accept:
+        return "json"
+
+    choices: List[Tuple[float, int, str]] = []
+    for position, part in enumerate(accept.split(",")):
+        fields = [f.strip() for f in part.split(";")]
+        media = fields[0].lower()
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        fmt = _BY_MEDIA_TYPE.get(media)
+        if fmt in available_formats() and q > 0:
+            choices.append((-q, position, fmt))
+    return min(choices)[2] if choices else "json"
+
+
+# ==================== ENCODERS ====================
+
+def _npy_header(dtype: np.dtype, shape: Tuple[int, ...]) -> bytes:
+    """.npy v1.0 header (the body is the C-order array buffer)."""
+    descr = np.lib.format.dtype_to_descr(dtype)
+    header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (descr, tuple(shape))
+    # Magic + version + u16 length + header, padded with spaces to a multiple of 64
+    total = 10 + len(header) + 1
+    header += " " * ((64 - total % 64) % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def _raw_bytes(array: np.ndarray) -> np.ndarray:
+    """Flat uint8 view of a C-contiguous array (buffer-protocol, no copy)."""
+    return array.reshape(-1).view(np.uint8)
+
+
+def encode_npy(array: np.ndarray) -> bytes:
+    """Array as a .npy file (np.load-compatible); one copy of the buffer."""
+    array = np.ascontiguousarray(array)
+    return b"".join((_npy_header(array.dtype, array.shape), _raw_bytes(array)))
+
+
+def _utf8_column(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(offsets, bytes) of a text column: row i is bytes[offsets[i]:offsets[i + 1]]."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def encode_npz(meta: Dict[str, Any], columns: Dict[str, Column], matrix: Optional[Tuple[str, np.ndarray]] = None) -> bytes:
+    """The whole table as an uncompressed .npz archive (see the module docstring)."""
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+        meta_bytes = np.frombuffer(json.dumps(meta, default=str).encode("utf-8"), dtype=np.uint8)
+        archive.writestr("meta.npy", encode_npy(meta_bytes))
+        for name, col in columns.items():
+            if isinstance(col, np.ndarray):
+                archive.writestr(f"{name}.npy", encode_npy(col))
+            else:
+                offsets, data = _utf8_column(col)
+                archive.writestr(f"{name}.offsets.npy", encode_npy(offsets))
+                archive.writestr(f"{name}.utf8.npy", encode_npy(data))
+        if matrix is not None:
+            archive.writestr(f"{matrix[0]}.npy", encode_npy(np.asarray(matrix[1])))
+    return out.getvalue()
+
+
+def decode_npz(body: bytes) -> Tuple[Dict[str, Any], Dict[str, Column]]:
+    """(meta, arrays) from an npy response; text columns come back as lists of str."""
+    with np.load(io.BytesIO(body), allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    meta = json.loads(arrays.pop("meta").tobytes().decode("utf-8"))
+    for name in [n[:-len(".offsets")] for n in arrays if n.endswith(".offsets")]:
+        offsets = arrays.pop(f"{name}.offsets")
+        data = arrays.pop(f"{name}.utf8").tobytes()
+        arrays[name] = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+    return meta, arrays
+
+
+def _msgpack_array(array: np.ndarray) -> Dict[str, Any]:
+    array = np.ascontiguousarray(array)
+    if array.dtype.byteorder == ">":
+        array = array.astype(array.dtype.newbyteorder("<"))
+    return {
+        "dtype": np.lib.format.dtype_to_descr(array.dtype),
+        "shape": list(array.shape),
+        "data": _raw_bytes(array).data,
+    }
+
+
+def encode_msgpack(meta: Dict[str, Any], columns: Dict[str, Column], matrix: Optional[Tuple[str, np.ndarray]] = None) -> bytes:
+    """
+    {"meta": {...}, "columns": {name: [str, ...] | array}, "matrix": {name: array}}
+    where array = {"dtype": "<f4", "shape": [...], "data": <bin>}.
+    """
+    if not MSGPACK_AVAILABLE:
+        raise UnsupportedFormatError("msgpack format needs the optional 'msgpack' package")
+    payload = {
+        "meta": meta,
+        "columns": {
+            name: _msgpack_array(col) if isinstance(col, np.ndarray) else list(col)
+            for name, col in columns.items()
+        },
+        "matrix": {matrix[0]: _msgpack_array(matrix[1])} if matrix is not None else {},
+    }
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def encode_arrow(meta: Dict[str, Any], columns: Dict[str, Column], matrix: Optional[Tuple[str, np.ndarray]] = None) -> bytes:
+    """One RecordBatch in the Arrow IPC stream format; meta goes into the schema metadata."""
+    if not ARROW_AVAILABLE:
+        raise UnsupportedFormatError("arrow format needs the optional 'pyarrow' package")
+    arrays, names = [], []
+    for name, col in columns.items():
+        arrays.append(pa.array(col))
+        names.append(name)
+    if matrix is not None:
+        name, values = matrix
+        values = np.ascontiguousarray(values, dtype=np.float32)
+        flat = pa.array(values.reshape(-1))           # wraps the buffer, no copy
+        arrays.append(pa.FixedSizeListArray.from_arrays(flat, values.shape[1] if values.ndim == 2 else 1))
+        names.append(name)
+    batch = pa.RecordBatch.from_arrays(arrays, names=names)
+    batch = batch.replace_schema_metadata({"santok": json.dumps(meta, default=str)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encode(
+    fmt: str,
+    meta: Dict[str, Any],
+    columns: Dict[str, Column],
+    matrix: Optional[Tuple[str, np.ndarray]] = None,
+) -> Tuple[bytes, str, Dict[str, str]]:
+    """Encode a response table; returns (body, media type, extra headers)."""
+    if fmt == "npy":
+        return encode_npz(meta, columns, matrix), MEDIA_TYPES["npy"], {}
+    if fmt == "msgpack":
+        return encode_msgpack(meta, columns, matrix), MEDIA_TYPES["msgpack"], {}
+    if fmt == "arrow":
+        return encode_arrow(meta, columns, matrix), MEDIA_TYPES["arrow"], {}
+    raise UnsupportedFormatError(f"No binary encoder for format: {fmt}")
+
+
+def to_json_table(meta: Dict[str, Any], columns: Dict[str, Column], matrix: Optional[Tuple[str, np.ndarray]] = None) -> bytes:
+    """The same table as JSON (reference for benchmarks)."""
+    payload = dict(meta)
+    for name, col in columns.items():
+        payload[name] = col.tolist() if isinstance(col, np.ndarray) else list(col)
+    if matrix is not None:
+        payload[matrix[0]] = matrix[1].tolist()
+    return json.dumps(payload).encode("utf-8")
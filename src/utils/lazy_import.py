@@ -0,0 +1,96 @@
+"""
+Lazy module imports for fast cold start.
+
+lazy_import() returns a module proxy that imports the real module on the
+first attribute access, so heavy optional stacks (torch via
+sentence-transformers, chromadb, faiss, weaviate, transformers) cost
+nothing until a code path actually uses them. module_available() answers
+"is it installed?" from the import system's finders without importing.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+
+def module_available(name: str) -> bool:
+    """True if name can be found on sys.path (the module itself is not imported)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # find_spec("a.b") imports package "a"; a broken parent counts as missing
+        return False
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Candidate names are tried in order (like the "servers." / "src.servers."
+    fallbacks used across the codebase); the first that imports wins. After
+    loading, the real module's namespace is copied in, so later attribute
+    lookups cost the same as on the module itself.
+
+    Example:
+        chromadb = lazy_import("chromadb")      # nothing imported yet
+        client = chromadb.PersistentClient()    # imports chromadb here
+    """
+
+    def __init__(self, name: str, *alternatives: str):
+        super().__init__(name)
+        self.__dict__["_lazy_candidates"] = (name,) + alternatives
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _lazy_load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        with self.__dict__["_lazy_lock"]:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                error = None
+                for candidate in self.__dict__["_lazy_candidates"]:
+                    try:
+                        module = importlib.import_module(candidate)
+                        break
+                    except ImportError as e:
+                        error = e
+                if module is None:
+                    raise error
+                self.__dict__.update({k: v for k, v in module.__dict__.items() if not k.startswith("_lazy_")})
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        # Only called for names not yet in __dict__ (i.e. before loading)
+        if attr.startswith("__") and attr.endswith("__") and attr not in ("__file__", "__path__", "__version__", "__all__"):
+            raise AttributeError(attr)
+        return getattr(self._lazy_load(), attr)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module {self.__dict__['_lazy_candidates'][0]!r} ({state})>"
+
+
+def lazy_import(name: str, *alternatives: str) -> types.ModuleType:
+    """
+    The module if it is already imported, else a LazyModule proxy for it.
+
+    A missing module raises ImportError at first use, not here; check
+    module_available() first where the old code had an ImportError fallback.
+    """
+    for candidate in (name,) + alternatives:
+        module = sys.modules.get(candidate)
+        if module is not None:
+            return module
+    return LazyModule(name, *alternatives)
@@ -0,0 +1,368 @@
+"""
+Lightweight metrics in the Prometheus text exposition format.
+
+Labelled counters and histograms, stage timers for multi-step work
+(tokenizer build, embedding generation, vector stores, request handlers),
+collectors for values read at scrape time, and render() for a /metrics
+endpoint. Recording is off until enable() (or SANTOK_METRICS=1); while off,
+every recording call returns after a single flag check.
+
+Values recorded in compute-pool worker processes are taken out with drain()
+after each task and added to the server's registry with merge().
+"""
+
+import bisect
+import math
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; fine-grained at the low end where most stages fall
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (name, type, help, [(labels, value), ...]) as returned by collectors
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+_perf_counter = time.perf_counter
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination."""
+
+    kind = "counter"
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _drain(self):
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def _merge(self, values) -> None:
+        with self._lock:
+            for labels, value in values.items():
+                self._values[labels] = self._values.get(labels, 0) + value
+
+    def _lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items(), key=lambda item: tuple(map(str, item[0])))
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class Histogram(_Metric):
+    """Bucketed observations (seconds by default) per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: Any) -> None:
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, *labels: Any) -> "_Timer":
+        """Context manager observing its duration."""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return _Timer(self, labels)
+
+    def _drain(self):
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def _merge(self, values) -> None:
+        with self._lock:
+            for labels, (counts, total, count) in values.items():
+                entry = self._values.get(labels)
+                if entry is None:
+                    self._values[labels] = [list(counts), total, count]
+                    continue
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+                entry[2] += count
+
+    def _lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                ((labels, (list(e[0]), e[1], e[2])) for labels, e in self._values.items()),
+                key=lambda item: tuple(map(str, item[0]))
+            )
+        lines = []
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("_metric", "_labels", "_start")
+
+    def __init__(self, metric: Histogram, labels: Tuple[Any, ...]):
+        self._metric = metric
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = _perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._metric.observe(_perf_counter() - self._start, *self._labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mark(self, stage: str) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageClock:
+    """
+    Times consecutive stages of one run: mark(stage) records the time since
+    the previous mark (or since the clock was created).
+
+    Example:
+        clock = stage_clock("tokenize")
+        text = preprocess(text);  clock.mark("preprocessing")
+        toks = all_tokenizations(text);  clock.mark("all_tokenizations")
+    """
+
+    __slots__ = ("_metric", "_component", "_last")
+
+    def __init__(self, metric: Histogram, component: str):
+        self._metric = metric
+        self._component = component
+        self._last = _perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = _perf_counter()
+        self._metric.observe(now - self._last, self._component, stage)
+        self._last = now
+
+
+class MetricsRegistry:
+    """Named metrics and scrape-time collectors."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+        # A forked worker must not report the values it inherited (they would be
+        # merged back twice), nor keep locks another thread held at fork time
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric._lock = threading.Lock()
+            metric._values = {}
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Tuple[str, ...], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, documentation, tuple(labelnames), **kwargs)
+            elif metric.kind != cls.kind or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}{metric.labelnames}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """collector() is called at every render() and returns metric families (e.g. gauges)."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def drain(self) -> Dict[str, Any]:
+        """Take (and reset) every recorded value - for shipping from a worker process."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        delta = {}
+        for metric in metrics:
+            values = metric._drain()
+            if values:
+                delta[metric.name] = values
+        return delta
+
+    def merge(self, delta: Optional[Dict[str, Any]]) -> None:
+        """Add values taken with drain() in another process."""
+        if not delta:
+            return
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, values in delta.items():
+            metric = metrics.get(name)
+            if metric is not None:
+                metric._merge(values)
+
+    def clear(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+            collectors = list(self._collectors)
+        out: List[str] = []
+        for metric in metrics:
+            out.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric._lines())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                out.append(f"# collector {getattr(collector, '__name__', collector)!s} failed: {_escape(e)}")
+                continue
+            for name, kind, documentation, samples in families:
+                out.append(f"# HELP {name} {_escape(documentation)}")
+                out.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    out.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(float(value))}")
+        return "\n".join(out) + "\n"
+
+
+def _shared_registry() -> MetricsRegistry:
+    # This module can be imported as both "utils.metrics" and "src.utils.metrics"
+    # (the dual import paths used across the codebase); both must record into one registry
+    for name in ("utils.metrics", "src.utils.metrics"):
+        registry = getattr(sys.modules.get(name), "REGISTRY", None)
+        if registry is not None:
+            return registry
+    return MetricsRegistry(enabled=os.getenv("SANTOK_METRICS", "0").lower() in ("1", "true", "yes", "on"))
+
+
+REGISTRY = _shared_registry()
+
+# Shared metric families
+STAGE_SECONDS = REGISTRY.histogram(
+    "santok_stage_seconds", "Time spent per processing stage", ("component", "stage"))
+ITEMS_TOTAL = REGISTRY.counter(
+    "santok_items_total", "Items processed (tokens, embeddings, vectors, queries) per component", ("component", "kind"))
+REQUEST_SECONDS = REGISTRY.histogram(
+    "santok_http_request_seconds", "HTTP request latency per endpoint", ("method", "endpoint", "status"))
+
+
+def enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def enable(on: bool = True) -> None:
+    """Turn recording on (or off) and install the core tokenizer's stage hook."""
+    REGISTRY.enabled = on
+    # core_tokenizer has no imports of its own; it reports through a hook
+    for name in ("core.core_tokenizer", "src.core.core_tokenizer"):
+        module = sys.modules.get(name)
+        if module is not None and hasattr(module, "set_stage_hook"):
+            module.set_stage_hook(_tokenizer_stage if on else None)
+
+
+def _tokenizer_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, "tokenizer", stage)
+
+
+def stage_clock(component: str):
+    """StageClock for component (a no-op object while disabled)."""
+    if not REGISTRY.enabled:
+        return _NULL_TIMER
+    return StageClock(STAGE_SECONDS, component)
+
+
+def stage(component: str, name: str):
+    """Context manager timing one stage of component (a no-op while disabled)."""
+    if not REGISTRY.enabled:
+        return _NULL_TIMER
+    return _Timer(STAGE_SECONDS, (component, name))
+
+
+def count(component: str, kind: str, amount: float = 1) -> None:
+    if REGISTRY.enabled:
+        ITEMS_TOTAL.inc(component, kind, amount=amount)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+if REGISTRY.enabled:
+    enable()